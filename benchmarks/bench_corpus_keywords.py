@@ -0,0 +1,55 @@
+"""
+Throughput benchmark: corpus-level hashed n-gram keywords vs per-story YAKE.
+
+Usage:
+    python benchmarks/bench_corpus_keywords.py --stories 200000
+    python benchmarks/bench_corpus_keywords.py --csv stories.csv --yake-sample 2000
+
+YAKE (``extract_keywords`` + ``top_n_unique_values``) is timed on a sample of
+``--yake-sample`` stories and reported as stories/sec, since running it over the full
+corpus takes far longer than the corpus mode.
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_yake_keywords import synthetic_stories  # noqa: E402
+from sous_chef.tasks.aggregator_tasks import top_n_unique_values  # noqa: E402
+from sous_chef.tasks.corpus_keyword_tasks import top_corpus_keywords  # noqa: E402
+from sous_chef.tasks.keyword_tasks import extract_keywords  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--stories", type=int, default=100_000)
+    parser.add_argument("--words", type=int, default=400, help="words per synthetic story")
+    parser.add_argument("--csv", help="read stories from a CSV instead")
+    parser.add_argument("--yake-sample", type=int, default=500)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv) if args.csv else synthetic_stories(args.stories, args.words)
+    if "language" not in df.columns:
+        df["language"] = "en"
+    print(f"{len(df)} stories")
+
+    for rank_by in ("document_frequency", "tfidf"):
+        start = time.perf_counter()
+        top = top_corpus_keywords.fn(df, top_n=50, rank_by=rank_by)
+        elapsed = time.perf_counter() - start
+        print(f"corpus ({rank_by}): {elapsed:.1f}s, {len(df) / elapsed:,.0f} stories/sec")
+    print(top.head(10).to_string(index=False))
+
+    sample = df.head(args.yake_sample).copy()
+    start = time.perf_counter()
+    top_n_unique_values.fn(extract_keywords.fn(sample), column="keywords", top_n=50)
+    elapsed = time.perf_counter() - start
+    print(f"yake (sample of {len(sample)}): {len(sample) / elapsed:,.0f} stories/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Accuracy drift and latency / throughput of the ONNX Runtime backend vs PyTorch on CPU.
+
+Usage:
+    python benchmarks/bench_onnx_backend.py --task zeroshot            # bge-m3-zeroshot-v2.0
+    python benchmarks/bench_onnx_backend.py --task sentiment           # deberta-v3-base-absa
+    python benchmarks/bench_onnx_backend.py --task zeroshot --csv stories.csv --threads 4
+
+Runs the same inputs through the PyTorch pipeline, ONNX fp32 and ONNX int8. Drift is
+reported against PyTorch: max / mean absolute score difference and top-label agreement.
+Latency is per call (one story for zero-shot, one batch for sentiment), p50 / p95;
+throughput is items/sec over the whole run. Exports land in the sous-chef cache dir and
+are reused on later runs (the first run includes a one-off export, not timed).
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_targeted_sentiment import synthetic_sentences  # noqa: E402
+from bench_yake_keywords import synthetic_stories  # noqa: E402
+from sous_chef.tasks.nlp import load_onnx_pipeline, load_transformers_pipeline  # noqa: E402
+from sous_chef.tasks.sentiment_tasks import DEFAULT_TRANSFORMER_MODEL, classify_aspect_sentiment  # noqa: E402
+from sous_chef.tasks.zeroshot import DEFAULT_ZEROSHOT_MODEL  # noqa: E402
+
+ZEROSHOT_LABELS = ["politics", "economy", "transportation", "housing", "education", "climate"]
+
+
+def run_zeroshot(clf, texts: List[str], labels: List[str]) -> Tuple[List[Dict[str, float]], List[float]]:
+    scores, latencies = [], []
+    for text in texts:
+        start = time.perf_counter()
+        out = clf(text, labels, hypothesis_template="This text is about {}", multi_label=True)
+        latencies.append(time.perf_counter() - start)
+        scores.append(dict(zip(out["labels"], out["scores"])))
+    return scores, latencies
+
+
+def run_sentiment(clf, sentences: List[str], target: str, batch_size: int) -> Tuple[List[Dict[str, float]], List[float]]:
+    scores, latencies = [], []
+    for start_at in range(0, len(sentences), batch_size):
+        batch = sentences[start_at:start_at + batch_size]
+        start = time.perf_counter()
+        outputs = classify_aspect_sentiment(clf, batch, target, batch_size=batch_size)
+        latencies.append(time.perf_counter() - start)
+        scores.extend({o["label"]: o["score"]} for o in outputs)
+    return scores, latencies
+
+
+def drift(reference: List[Dict[str, float]], candidate: List[Dict[str, float]]) -> Tuple[float, float, float]:
+    diffs, agree = [], 0
+    for ref, cand in zip(reference, candidate):
+        agree += max(ref, key=ref.get, default=None) == max(cand, key=cand.get, default=None)
+        diffs.extend(abs(ref[k] - cand[k]) for k in ref if k in cand)
+    if not diffs:
+        return float("nan"), float("nan"), agree / max(len(reference), 1)
+    return max(diffs), float(np.mean(diffs)), agree / max(len(reference), 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--task", choices=["zeroshot", "sentiment"], default="zeroshot")
+    parser.add_argument("--model", help="default: the task's production model")
+    parser.add_argument("--items", type=int, default=200, help="synthetic stories / sentences")
+    parser.add_argument("--csv", help="read texts from a CSV instead")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--target", default="Mamdani", help="sentiment target")
+    parser.add_argument("--batch-size", type=int, default=32, help="sentiment batch size")
+    parser.add_argument("--threads", type=int, default=0, help="ONNX Runtime / torch threads (0 = all)")
+    args = parser.parse_args()
+
+    if args.threads > 0:
+        import torch
+
+        torch.set_num_threads(args.threads)
+
+    if args.task == "zeroshot":
+        model = args.model or DEFAULT_ZEROSHOT_MODEL
+        texts = (
+            pd.read_csv(args.csv)[args.text_column].dropna().astype(str).str[:2000].tolist()
+            if args.csv else synthetic_stories(args.items, 120)["text"].tolist()
+        )
+        hf_task = "zero-shot-classification"
+
+        def run(clf, items):
+            return run_zeroshot(clf, items, ZEROSHOT_LABELS)
+    else:
+        model = args.model or DEFAULT_TRANSFORMER_MODEL
+        texts = (
+            pd.read_csv(args.csv)[args.text_column].dropna().astype(str).tolist()
+            if args.csv else synthetic_sentences(args.items, args.target)
+        )
+        hf_task = "text-classification"
+
+        def run(clf, items):
+            return run_sentiment(clf, items, args.target, args.batch_size)
+
+    backends = {
+        "pytorch": lambda: load_transformers_pipeline(hf_task, model, tokenizer=model),
+        "onnx-fp32": lambda: load_onnx_pipeline(hf_task, model, quantize=False, threads=args.threads or None),
+        "onnx-int8": lambda: load_onnx_pipeline(hf_task, model, quantize=True, threads=args.threads or None),
+    }
+
+    print(f"{args.task}: {len(texts)} items, model {model}, {os.cpu_count()} CPUs")
+    print(
+        f"{'backend':>10} {'items/s':>9} {'speedup':>8} {'p50 ms':>8} {'p95 ms':>8}"
+        f" {'max |d|':>9} {'mean |d|':>9} {'top agree':>10}"
+    )
+    reference = None
+    baseline = None
+    for name, load in backends.items():
+        clf = load()
+        run(clf, texts[:8])  # warm-up
+        start = time.perf_counter()
+        scores, latencies = run(clf, texts)
+        rate = len(texts) / (time.perf_counter() - start)
+        if reference is None:
+            reference, baseline = scores, rate
+        max_d, mean_d, agree = drift(reference, scores)
+        latencies_ms = sorted(1000 * x for x in latencies)
+        p95 = latencies_ms[min(len(latencies_ms) - 1, int(0.95 * len(latencies_ms)))]
+        print(
+            f"{name:>10} {rate:>9.1f} {rate / baseline:>7.2f}x {statistics.median(latencies_ms):>8.1f}"
+            f" {p95:>8.1f} {max_d:>9.2e} {mean_d:>9.2e} {agree:>10.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
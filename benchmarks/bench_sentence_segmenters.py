@@ -0,0 +1,105 @@
+"""
+Accuracy and throughput of the sentence segmentation backends used by ``matching_sentences``.
+
+Usage:
+    python benchmarks/bench_sentence_segmenters.py                  # test fixtures
+    python benchmarks/bench_sentence_segmenters.py --csv stories.csv --text-column text
+
+Accuracy is measured against the ``--reference`` backend (the dependency parser by
+default) on the tokenization test fixtures (or the CSV): precision / recall / F1 of
+sentence start offsets, and the share of reference sentences reproduced exactly.
+Throughput is docs/sec over ``--copies`` copies of the same texts, best of
+``--repeats`` after one warm-up pass.
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Sequence, Set
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sous_chef.tasks.nlp import SENTENCE_SEGMENTERS, load_sentence_segmenter, parse_texts  # noqa: E402
+
+
+def fixture_texts() -> List[str]:
+    from sous_chef.tasks.test import test_tokenization_tasks as fixtures
+
+    return [fixtures.FIXTURE_1, fixtures.FIXTURE_2, fixtures.FIXTURE_3]
+
+
+def sentence_starts(doc) -> Set[int]:
+    """Character offsets where non-blank sentences start (the text start excluded)."""
+    return {sent.start_char for sent in doc.sents if sent.text.strip() and sent.start_char > 0}
+
+
+def compare(reference_docs: Sequence, candidate_docs: Sequence) -> Dict[str, float]:
+    true_positive = predicted = actual = exact = total = 0
+    for ref, cand in zip(reference_docs, candidate_docs):
+        ref_starts, cand_starts = sentence_starts(ref), sentence_starts(cand)
+        true_positive += len(ref_starts & cand_starts)
+        predicted += len(cand_starts)
+        actual += len(ref_starts)
+        ref_sentences = [s.text.strip() for s in ref.sents if s.text.strip()]
+        cand_sentences = {s.text.strip() for s in cand.sents}
+        exact += sum(s in cand_sentences for s in ref_sentences)
+        total += len(ref_sentences)
+    precision = true_positive / predicted if predicted else 1.0
+    recall = true_positive / actual if actual else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "precision": precision,
+        "recall": recall,
+        "f1": f1,
+        "exact": exact / total if total else 1.0,
+    }
+
+
+def docs_per_second(nlp, texts: List[str], repeats: int) -> float:
+    parse_texts(nlp, texts[:8], use_cache=False)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        parse_texts(nlp, texts, use_cache=False)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", default="en_core_web_sm")
+    parser.add_argument("--backends", default=",".join(SENTENCE_SEGMENTERS))
+    parser.add_argument("--reference", default="parser", choices=SENTENCE_SEGMENTERS)
+    parser.add_argument("--csv", help="read stories from a CSV instead of the test fixtures")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--copies", type=int, default=100, help="copies of the texts to time")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.csv:
+        texts = [t for t in pd.read_csv(args.csv)[args.text_column].tolist() if isinstance(t, str)]
+    else:
+        texts = fixture_texts()
+
+    reference_docs = parse_texts(
+        load_sentence_segmenter(args.model, args.reference), texts, use_cache=False
+    )
+    timed = texts * max(1, args.copies)
+    print(f"{len(texts)} texts for accuracy (reference: {args.reference}), {len(timed)} timed")
+    print(f"{'backend':>12} {'sents':>6} {'prec':>6} {'recall':>6} {'f1':>6} {'exact':>6} {'docs/sec':>10}")
+    for backend in args.backends.split(","):
+        nlp = load_sentence_segmenter(args.model, backend)
+        docs = parse_texts(nlp, texts, use_cache=False)
+        scores = compare(reference_docs, docs)
+        sentences = sum(1 for doc in docs for s in doc.sents if s.text.strip())
+        rate = docs_per_second(nlp, timed, args.repeats)
+        print(
+            f"{backend:>12} {sentences:>6} {scores['precision']:>6.3f} {scores['recall']:>6.3f}"
+            f" {scores['f1']:>6.3f} {scores['exact']:>6.3f} {rate:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Throughput of batched vs per-sentence ABSA inference in ``add_targeted_sentiment``.
+
+Usage:
+    python benchmarks/bench_targeted_sentiment.py                      # 3000 synthetic sentences
+    python benchmarks/bench_targeted_sentiment.py --csv sentences.csv --target Mamdani
+
+``--batch-sizes`` always includes 1 (the old one-call-per-sentence loop) as the
+baseline; each other size reports sentences/sec, speedup, and label agreement / max
+score difference against the baseline. The model is loaded (and warmed up) before timing.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sous_chef.tasks.nlp import load_transformers_pipeline  # noqa: E402
+from sous_chef.tasks.sentiment_tasks import (  # noqa: E402
+    DEFAULT_TRANSFORMER_MODEL,
+    classify_aspect_sentiment,
+)
+
+CLAUSES = [
+    "{t} promised fast and free buses",
+    "critics said the plan by {t} would cost too much",
+    "supporters praised {t} for the new housing budget",
+    "the council questioned whether {t} could deliver",
+    "{t} met with union leaders on Tuesday",
+    "a spokesperson for {t} declined to comment",
+    "observers say the proposal has shifted the conversation",
+    "the first month in office has been a cascade of failures",
+]
+
+
+def synthetic_sentences(n: int, target: str, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(n):
+        clauses = [c.format(t=target) for c in rng.choices(CLAUSES, k=rng.randint(1, 6))]
+        sentences.append(", and ".join(clauses).capitalize() + ".")
+    return sentences
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", default=DEFAULT_TRANSFORMER_MODEL)
+    parser.add_argument("--target", default="Mamdani")
+    parser.add_argument("--sentences", type=int, default=3000)
+    parser.add_argument("--csv", help="read sentences from a CSV instead")
+    parser.add_argument("--text-column", default="sentence_text")
+    parser.add_argument("--batch-sizes", default="8,16,32,64")
+    parser.add_argument("--device", type=int, default=-1)
+    args = parser.parse_args()
+
+    if args.csv:
+        sentences = pd.read_csv(args.csv)[args.text_column].dropna().astype(str).tolist()
+    else:
+        sentences = synthetic_sentences(args.sentences, args.target)
+
+    absa = load_transformers_pipeline(
+        "text-classification", args.model, device=args.device, tokenizer=args.model
+    )
+    classify_aspect_sentiment(absa, sentences[:16], args.target, batch_size=16)
+
+    print(f"{len(sentences)} sentences, model {args.model}")
+    print(f"{'batch':>6} {'sent/sec':>10} {'speedup':>8} {'labels':>8} {'max |dscore|':>13}")
+    baseline = None
+    reference = None
+    for batch_size in [1] + [int(b) for b in args.batch_sizes.split(",") if int(b) > 1]:
+        start = time.perf_counter()
+        outputs = classify_aspect_sentiment(absa, sentences, args.target, batch_size=batch_size)
+        rate = len(sentences) / (time.perf_counter() - start)
+        if reference is None:
+            baseline, reference = rate, outputs
+        agree = sum(a["label"] == b["label"] for a, b in zip(reference, outputs)) / len(outputs)
+        drift = max(abs(a["score"] - b["score"]) for a, b in zip(reference, outputs))
+        print(f"{batch_size:>6} {rate:>10.1f} {rate / baseline:>7.2f}x {agree:>8.4f} {drift:>13.2e}")
+
+
+if __name__ == "__main__":
+    main()
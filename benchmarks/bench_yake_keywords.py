@@ -0,0 +1,90 @@
+"""
+Throughput benchmark for ``extract_keywords`` at 1, 2, 4 and 8 workers.
+
+Usage:
+    python benchmarks/bench_yake_keywords.py                 # synthetic stories
+    python benchmarks/bench_yake_keywords.py --csv stories.csv --text-column text
+
+Each worker count gets one untimed warm-up call (spawning the pool and building the
+per-worker extractors), then ``--repeats`` timed calls; the best run is reported.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sous_chef.tasks.keyword_tasks import extract_keywords, shutdown_keyword_pool  # noqa: E402
+
+WORDS = {
+    "en": (
+        "city council budget transit vote mayor housing school district election "
+        "climate policy court ruling hospital workers strike economy inflation rate"
+    ).split(),
+    "es": (
+        "ciudad consejo presupuesto transporte alcalde vivienda escuela elección "
+        "clima política tribunal hospital trabajadores huelga economía inflación"
+    ).split(),
+}
+
+
+def synthetic_stories(n: int, words_per_story: int, seed: int = 0) -> pd.DataFrame:
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        language = "es" if rng.random() < 0.2 else "en"
+        sentences = []
+        for _ in range(max(1, words_per_story // 12)):
+            sentence = " ".join(rng.choices(WORDS[language], k=12))
+            sentences.append(sentence.capitalize() + ".")
+        rows.append({"text": " ".join(sentences), "language": language})
+    return pd.DataFrame(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--stories", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=400, help="words per synthetic story")
+    parser.add_argument("--csv", help="read stories from a CSV instead")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--language-column", default="language")
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument("--repeats", type=int, default=2)
+    args = parser.parse_args()
+
+    if args.csv:
+        df = pd.read_csv(args.csv)
+        if args.language_column not in df.columns:
+            df[args.language_column] = "en"
+    else:
+        df = synthetic_stories(args.stories, args.words)
+
+    print(f"{len(df)} stories, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'docs/sec':>10} {'speedup':>8}")
+    baseline = None
+    for workers in [int(w) for w in args.workers.split(",")]:
+        kwargs = dict(
+            text_column=args.text_column,
+            language_column=args.language_column,
+            workers=workers,
+            chunk_size=args.chunk_size,
+        )
+        extract_keywords.fn(df.head(args.chunk_size * max(workers, 1) + 1).copy(), **kwargs)
+        best = float("inf")
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            extract_keywords.fn(df.copy(), **kwargs)
+            best = min(best, time.perf_counter() - start)
+        rate = len(df) / best
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>10.1f} {rate / baseline:>7.2f}x")
+    shutdown_keyword_pool()
+
+
+if __name__ == "__main__":
+    main()
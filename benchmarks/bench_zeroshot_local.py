@@ -0,0 +1,89 @@
+"""
+Throughput of batched vs per-story local zero-shot classification.
+
+Usage:
+    python benchmarks/bench_zeroshot_local.py                        # 200 synthetic stories
+    python benchmarks/bench_zeroshot_local.py --csv stories.csv --runtime onnx
+
+``--batch-sizes`` always includes 1 (one pipeline call per story, the old loop) as the
+baseline; each other size reports docs/sec, speedup, and whether the label columns match
+the baseline plus the max score difference. The model is loaded and warmed up first.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from unittest.mock import patch
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_yake_keywords import synthetic_stories  # noqa: E402
+from sous_chef.tasks.zeroshot import DEFAULT_ZEROSHOT_MODEL  # noqa: E402
+from sous_chef.tasks.zeroshot import local  # noqa: E402
+
+LABELS = ["politics", "economy", "transportation", "housing", "education", "climate", "crime", "health"]
+
+
+def max_score_diff(a: pd.Series, b: pd.Series) -> float:
+    worst = 0.0
+    for x, y in zip(a, b):
+        for s, t in zip(json.loads(x), json.loads(y)):
+            worst = max(worst, abs(s - t))
+    return worst
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", default=DEFAULT_ZEROSHOT_MODEL)
+    parser.add_argument("--stories", type=int, default=200)
+    parser.add_argument("--words", type=int, default=300, help="words per synthetic story")
+    parser.add_argument("--csv", help="read stories from a CSV instead")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--labels", default=",".join(LABELS))
+    parser.add_argument("--batch-sizes", default="16,32,64")
+    parser.add_argument("--runtime", choices=["pytorch", "onnx"], default="pytorch")
+    parser.add_argument("--device", type=int, default=-1)
+    args = parser.parse_args()
+
+    if args.csv:
+        df = pd.read_csv(args.csv)
+    else:
+        df = synthetic_stories(args.stories, args.words)
+    labels = args.labels.split(",")
+
+    # Load the pipeline once and hand the same object to every run
+    if args.runtime == "onnx":
+        clf = local.load_onnx_pipeline("zero-shot-classification", args.model)
+    else:
+        clf = local.pipeline("zero-shot-classification", model=args.model, device=args.device, framework="pt")
+
+    def classify(frame: pd.DataFrame, batch_size: int) -> pd.DataFrame:
+        with patch.object(local, "pipeline", return_value=clf), \
+                patch.object(local, "load_onnx_pipeline", return_value=clf):
+            return local.add_zero_shot_classification_local(
+                frame, labels, text_column=args.text_column, model=args.model,
+                runtime=args.runtime, batch_size=batch_size,
+            )
+
+    classify(df.head(4), 32)
+
+    print(f"{len(df)} stories x {len(labels)} labels, model {args.model} ({args.runtime})")
+    print(f"{'batch':>6} {'docs/sec':>10} {'speedup':>8} {'labels':>8} {'max |dscore|':>13}")
+    baseline = None
+    reference = None
+    for batch_size in [1] + [int(b) for b in args.batch_sizes.split(",") if int(b) > 1]:
+        start = time.perf_counter()
+        out = classify(df, batch_size)
+        rate = len(df) / (time.perf_counter() - start)
+        if reference is None:
+            baseline, reference = rate, out
+        same = (out["zeroshot_labels_json"] == reference["zeroshot_labels_json"]).mean()
+        drift = max_score_diff(reference["zeroshot_scores_json"], out["zeroshot_scores_json"])
+        print(f"{batch_size:>6} {rate:>10.1f} {rate / baseline:>7.2f}x {same:>8.4f} {drift:>13.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Zero-shot post-processing on the dense score matrix vs parsing the JSON columns.
+
+Usage:
+    python benchmarks/bench_zeroshot_postprocess.py                   # 100k stories x 50 labels
+    python benchmarks/bench_zeroshot_postprocess.py --stories 10000 --labels 20
+
+Random scores stand in for a classified frame, so no model is loaded. Each path runs the
+steps a flow runs after classification: threshold and selected-label columns, summary
+label counts, and per-story tag scores for export. The "json" path drops the frame's
+matrix first, as for a frame read back from CSV, and must agree with the matrix path.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sous_chef.tasks.zeroshot import (  # noqa: E402
+    ZeroShotScoreMatrix,
+    build_zero_shot_tag_scores_json,
+    compute_zero_shot_label_counts,
+)
+from sous_chef.tasks.zeroshot.common import (  # noqa: E402
+    _append_passing_threshold_column,
+    _append_selected_labels_column,
+)
+from sous_chef.tasks.zeroshot.scores import SCORE_MATRIX_ATTR  # noqa: E402
+
+
+def classified_frame(stories: int, labels: list, failure_rate: float = 0.01) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    failed = rng.random(stories) < failure_rate
+    scores = rng.random((stories, len(labels)))
+    scores[failed] = np.nan
+    matrix = ZeroShotScoreMatrix(tuple(labels), scores, failed, pd.RangeIndex(stories))
+    df = pd.DataFrame({"story_id": np.arange(stories)})
+    df["zeroshot_labels_json"], df["zeroshot_scores_json"] = matrix.json_columns()
+    df["zeroshot_top_label"], df["zeroshot_top_score"] = matrix.top()
+    df["zeroshot_error"] = np.where(failed, "RuntimeError: synthetic", "")
+    df.attrs[SCORE_MATRIX_ATTR] = matrix
+    return df
+
+
+def postprocess(df: pd.DataFrame, labels: list, threshold: float, top_n: int):
+    out = _append_passing_threshold_column(df, labels, threshold)
+    out, _ = _append_selected_labels_column(out, labels, passing_score_threshold=threshold, top_n=top_n)
+    counts = compute_zero_shot_label_counts(out, labels, threshold, top_n)
+    tags = build_zero_shot_tag_scores_json(out, passing_score_threshold=threshold, top_n=top_n)
+    return out, counts, tags
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--stories", type=int, default=100_000)
+    parser.add_argument("--labels", type=int, default=50)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    parser.add_argument("--top-n", type=int, default=3)
+    args = parser.parse_args()
+
+    labels = [f"label_{i:02d}" for i in range(args.labels)]
+    start = time.perf_counter()
+    df = classified_frame(args.stories, labels)
+    print(f"{args.stories} stories x {args.labels} labels (built in {time.perf_counter() - start:.1f}s)")
+
+    results = {}
+    for name in ("matrix", "json"):
+        frame = df.copy()
+        if name == "json":
+            frame.attrs = {}
+        start = time.perf_counter()
+        results[name] = postprocess(frame, labels, args.threshold, args.top_n)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>6}: {elapsed:.2f}s, {args.stories / elapsed:,.0f} stories/sec")
+
+    (m_out, m_counts, m_tags), (j_out, j_counts, j_tags) = results["matrix"], results["json"]
+    columns = ["zeroshot_labels_passing_threshold_json", "zeroshot_labels_selected_json"]
+    same = m_out[columns].equals(j_out[columns]) and m_counts == j_counts and m_tags == j_tags
+    print(f"outputs match: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Scaling of sharded local zero-shot classification from 1 to N worker processes.
+
+Usage:
+    python benchmarks/bench_zeroshot_sharding.py                       # 1, 2, 4, ... up to all cores
+    python benchmarks/bench_zeroshot_sharding.py --workers 1,4,8,16 --csv stories.csv
+
+``1`` is the single-process run (all cores as intra-op threads). Every other entry runs
+``workers`` replicas with ``cores / workers`` threads each, after a warm-up call that
+starts the pool and loads the replicas, and reports docs/sec, speedup and efficiency
+against 1 plus the max score difference. The memory budget still applies
+(``--memory-budget-mb`` or ``ZEROSHOT_SHARD_MEMORY_BUDGET_MB``), so the replicas
+actually started are printed too.
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_yake_keywords import synthetic_stories  # noqa: E402
+from bench_zeroshot_local import LABELS, max_score_diff  # noqa: E402
+from sous_chef.tasks.zeroshot import DEFAULT_ZEROSHOT_MODEL  # noqa: E402
+from sous_chef.tasks.zeroshot import local, sharded  # noqa: E402
+
+
+def default_workers() -> str:
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return ",".join(map(str, counts))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--model", default=DEFAULT_ZEROSHOT_MODEL)
+    parser.add_argument("--stories", type=int, default=400)
+    parser.add_argument("--words", type=int, default=300, help="words per synthetic story")
+    parser.add_argument("--csv", help="read stories from a CSV instead")
+    parser.add_argument("--text-column", default="text")
+    parser.add_argument("--labels", default=",".join(LABELS))
+    parser.add_argument("--workers", default=default_workers())
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--runtime", choices=["pytorch", "onnx"], default="pytorch")
+    parser.add_argument("--memory-budget-mb", type=float)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv) if args.csv else synthetic_stories(args.stories, args.words)
+    labels = args.labels.split(",")
+    kwargs = dict(
+        text_column=args.text_column, model=args.model, runtime=args.runtime,
+        batch_size=args.batch_size,
+    )
+    budget = sharded.shard_memory_budget_bytes(args.memory_budget_mb)
+    replica = sharded.estimate_replica_bytes(args.model)
+    print(
+        f"{len(df)} stories x {len(labels)} labels, model {args.model} ({args.runtime}), "
+        f"{os.cpu_count()} cores, replica ~{replica / 2**20:.0f} MB, budget {budget / 2**20:.0f} MB"
+    )
+
+    clf = local.load_local_zeroshot_classifier(args.model, -1, args.runtime)
+    local.add_zero_shot_classification_local(df.head(4), labels, load_classifier=lambda: clf, **kwargs)
+
+    print(f"{'workers':>8} {'replicas':>9} {'docs/sec':>10} {'speedup':>8} {'efficiency':>11} {'max |dscore|':>13}")
+    baseline = reference = None
+    for workers in [int(w) for w in args.workers.split(",")]:
+        replicas = 1
+        if workers == 1:
+            start = time.perf_counter()
+            out = local.add_zero_shot_classification_local(df, labels, load_classifier=lambda: clf, **kwargs)
+        else:
+            replicas = sharded.plan_replicas(workers, replica, budget, resident_replicas=1)
+
+            def run(frame: pd.DataFrame) -> pd.DataFrame:
+                return sharded.add_zero_shot_classification_sharded(
+                    frame, labels, workers=workers, memory_budget_mb=args.memory_budget_mb,
+                    load_classifier=lambda: clf, **kwargs,
+                )
+
+            # Start the pool and load one replica per worker before timing
+            run(pd.concat([df.head(2)] * replicas, ignore_index=True))
+            start = time.perf_counter()
+            out = run(df)
+        rate = len(df) / (time.perf_counter() - start)
+        if reference is None:
+            baseline, reference = rate, out
+        drift = max_score_diff(reference["zeroshot_scores_json"], out["zeroshot_scores_json"])
+        speedup = rate / baseline
+        print(
+            f"{workers:>8} {replicas:>9} {rate:>10.1f} {speedup:>7.2f}x "
+            f"{speedup / replicas:>10.0%} {drift:>13.2e}"
+        )
+    sharded.shutdown_zeroshot_workers()
+
+
+if __name__ == "__main__":
+    main()
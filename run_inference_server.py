@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Long-lived local inference server for the zero-shot and targeted-sentiment models.
+
+Run one per worker; flow runs with ``ZEROSHOT_BACKEND=server`` / ``sentiment_backend="server"``
+and ``SOUS_CHEF_INFERENCE_SERVER`` pointing at it share its models instead of loading
+their own (see ``sous_chef/tasks/nlp/inference_server.py``).
+
+Usage:
+    # Unix socket (default), models loaded on first request
+    python run_inference_server.py
+
+    # Localhost HTTP, both default models loaded up front
+    python run_inference_server.py --listen http://127.0.0.1:8765 \\
+        --preload zero-shot-classification:MoritzLaurer/bge-m3-zeroshot-v2.0 \\
+        --preload text-classification:yangheng/deberta-v3-base-absa-v1.1
+
+    # Check it
+    curl --unix-socket /tmp/sous-chef-inference.sock http://localhost/v1/health
+"""
+import logging
+import os
+import signal
+import sys
+import threading
+from pathlib import Path
+from typing import Tuple
+
+import click
+
+# Add sous-chef to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sous_chef.tasks.nlp.inference_server import (
+    DEFAULT_INFERENCE_SERVER_ADDRESS,
+    DEFAULT_MAX_BATCH_ITEMS,
+    DEFAULT_MAX_WAIT_MS,
+    INFERENCE_SERVER_ENV,
+    InferenceServer,
+)
+from sous_chef.tasks.nlp.registry import _parse_preload_spec
+
+
+@click.command()
+@click.option(
+    "--listen",
+    default=lambda: os.environ.get(INFERENCE_SERVER_ENV) or DEFAULT_INFERENCE_SERVER_ADDRESS,
+    show_default=f"${INFERENCE_SERVER_ENV} or {DEFAULT_INFERENCE_SERVER_ADDRESS}",
+    help="unix:///path.sock or http://127.0.0.1:<port>",
+)
+@click.option("--runtime", type=click.Choice(["pytorch", "onnx"]), default="pytorch", show_default=True)
+@click.option("--device", type=int, default=-1, show_default=True, help="GPU id, or -1 for CPU")
+@click.option("--batch-size", type=int, default=32, show_default=True, help="Pairs / inputs per forward pass")
+@click.option(
+    "--max-wait-ms",
+    type=float,
+    default=DEFAULT_MAX_WAIT_MS,
+    show_default=True,
+    help="How long a batch waits for requests from other clients",
+)
+@click.option("--max-batch-items", type=int, default=DEFAULT_MAX_BATCH_ITEMS, show_default=True)
+@click.option(
+    "--allow-remote",
+    is_flag=True,
+    help="Allow a non-loopback --listen host; requests are not authenticated",
+)
+@click.option(
+    "--preload",
+    multiple=True,
+    help="<task>:<model> to load at start (zero-shot-classification or text-classification)",
+)
+def main(
+    listen: str,
+    runtime: str,
+    device: int,
+    batch_size: int,
+    max_wait_ms: float,
+    max_batch_items: int,
+    allow_remote: bool,
+    preload: Tuple[str, ...],
+) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    server = InferenceServer(
+        runtime=runtime,
+        device=device,
+        batch_size=batch_size,
+        max_wait_ms=max_wait_ms,
+        max_batch_items=max_batch_items,
+    )
+    for spec in preload:
+        task, model = _parse_preload_spec(spec)
+        info = server.load(task, model)
+        click.echo(f"loaded {model} ({task}) in {info['load_ms'] / 1000:.1f}s")
+
+    server.bind(listen, allow_remote=allow_remote)
+
+    def stop(signum, frame):
+        # shutdown() waits for serve_forever() to return, so it cannot run on this thread
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    click.echo(f"serving {runtime} inference on {listen} (export {INFERENCE_SERVER_ENV}={listen})")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
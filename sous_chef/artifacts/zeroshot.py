@@ -41,6 +41,27 @@ class ZeroShotClassificationSummary(BaseArtifact):
     summary_top_n: Optional[int] = None
     """If set and >0, distribution counts labels from each story's top-N results."""
 
+    score_cache_hits: int = 0
+    """(story, label) scores served from the zero-shot score cache (0 when it is off)."""
+
+    score_cache_misses: int = 0
+    """(story, label) scores inferred because the score cache did not have them."""
+
+    cascade_top_k: Optional[int] = None
+    """Labels shortlisted per story by the embedding cascade (None when it is off)."""
+
+    cascade_recall: Optional[float] = None
+    """Share of labels full NLI selects on the validation sample that the cascade shortlisted."""
+
+    cascade_validation_stories: int = 0
+    """Stories scored on every label to measure cascade_recall."""
+
+    taxonomy_nli_passes: Optional[int] = None
+    """Story-label NLI passes run with the label taxonomy (None when it is off)."""
+
+    taxonomy_nli_passes_saved: int = 0
+    """Passes the taxonomy skipped compared with scoring every story on every label."""
+
     distribution_mode: str = "top_label"
     """One of 'top_label', 'threshold_ge', or 'top_n'."""
 
@@ -70,4 +91,14 @@ class ZeroShotClassificationSummary(BaseArtifact):
         )
         if self.stories_classification_failed:
             base += f"; {self.stories_classification_failed} inference failure(s)"
+        if self.score_cache_hits:
+            total = self.score_cache_hits + self.score_cache_misses
+            base += f"; {self.score_cache_hits} of {total} label scores from cache"
+        if self.cascade_top_k is not None:
+            base += f"; cascade top-{self.cascade_top_k}"
+            if self.cascade_recall is not None:
+                base += f" (recall {self.cascade_recall:.2f} on {self.cascade_validation_stories} stories)"
+        if self.taxonomy_nli_passes is not None:
+            flat = self.taxonomy_nli_passes + self.taxonomy_nli_passes_saved
+            base += f"; taxonomy ran {self.taxonomy_nli_passes} of {flat} NLI passes"
         return base
@@ -14,6 +14,7 @@ from .llm_demo_flow import llm_demo_flow
 from .aboutness_filter_flow import aboutness_filter_flow
 from .aboutness_filtered_summaries_flow import tagged_filtered_summaries_flow
 from .zeroshot_demo_flow import zeroshot_demo_flow
+from .zeroshot_reselect_flow import zeroshot_reselect_flow
 from .llm_quotes_flow import llm_quotes_flow
 from .top_images_flow import top_images_flow
 
@@ -29,4 +30,5 @@ __all__ = [
     "aboutness_filter_flow",
     "tagged_filtered_summaries_flow",
     "zeroshot_demo_flow",
+    "zeroshot_reselect_flow",
 ]
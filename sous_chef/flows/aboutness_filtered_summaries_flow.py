@@ -40,10 +40,13 @@ from ..tasks import (
     ZEROSHOT_CLASSIFY_DEVICE,
     ZEROSHOT_STORY_TEXT_COLUMN,
     compute_zero_shot_label_counts,
+    zeroshot_cascade_stats,
+    zeroshot_taxonomy_stats,
     zeroshot_classification_failure_details,
+    zeroshot_score_cache_counts,
     zero_shot_classify_stories,
 )
-from ..tasks.zeroshot import build_zero_shot_tag_scores_json_for_row
+from ..tasks.zeroshot import build_zero_shot_tag_scores_json
 from ..utils import create_url_safe_slug, get_logger
 
 
@@ -349,6 +352,8 @@ def tagged_filtered_summaries_flow(
             device=ZEROSHOT_CLASSIFY_DEVICE,
             passing_score_threshold=params.zeroshot_score_threshold,
             top_n=params.zeroshot_top_n,
+            label_taxonomy=params.classification_label_taxonomy,
+            taxonomy_parent_threshold=params.taxonomy_parent_threshold,
         )
     label_counts, stories_without_prediction, stories_failed = (
         compute_zero_shot_label_counts(
@@ -359,6 +364,9 @@ def tagged_filtered_summaries_flow(
         )
     )
     failure_details = zeroshot_classification_failure_details(classified_df)
+    cache_hits, cache_misses = zeroshot_score_cache_counts(classified_df)
+    cascade = zeroshot_cascade_stats(classified_df)
+    taxonomy = zeroshot_taxonomy_stats(classified_df)
     mark_step(
         "zeroshot_classification_end",
         meta={
@@ -380,6 +388,13 @@ def tagged_filtered_summaries_flow(
         stories_without_prediction=stories_without_prediction,
         stories_classification_failed=stories_failed,
         classification_failure_details=failure_details,
+        score_cache_hits=cache_hits,
+        score_cache_misses=cache_misses,
+        cascade_top_k=cascade.get("top_k"),
+        cascade_recall=cascade.get("recall"),
+        cascade_validation_stories=cascade.get("validation_stories", 0),
+        taxonomy_nli_passes=taxonomy.get("pairs_scored"),
+        taxonomy_nli_passes_saved=taxonomy.get("pairs_saved", 0),
         summary_score_threshold=params.zeroshot_score_threshold,
         summary_top_n=params.zeroshot_top_n,
         distribution_mode=zeroshot_mode,
@@ -406,13 +421,11 @@ def tagged_filtered_summaries_flow(
         "zeroshot_labels_selected_json", "[]"
     )
 
-    summarized_df["zero-shot-tag-scores"] = [
-        build_zero_shot_tag_scores_json_for_row(
-            row,
-            selection_mode=zeroshot_mode,
-        )
-        for _, row in summarized_df.iterrows()
-    ]
+    summarized_df["zero-shot-tag-scores"] = build_zero_shot_tag_scores_json(
+        summarized_df,
+        passing_score_threshold=params.zeroshot_score_threshold,
+        top_n=params.zeroshot_top_n,
+    )
 
     # Step 7: Export (no full text)
     export_df = summarized_df.drop(columns=["text"], errors="ignore").copy()
@@ -6,10 +6,11 @@ This flow demonstrates:
 - Extracting named entities from each article using SpaCy
 - Aggregating entities to find the top entities by type
 - Filtering and sorting options for entity analysis
+- Optionally exporting an entity co-occurrence edge list (CSV or Parquet)
 
 Can run with or without Prefect.
 """
-from typing import Optional
+from typing import Dict, Optional
 from pydantic import BaseModel
 
 from ..flow import register_flow, BaseFlowOutput
@@ -21,7 +22,8 @@ from ..params.webhook_callback import WebhookCallbackParam
 from ..artifacts import MediacloudQuerySummary, FileUploadArtifact
 from ..tasks.discovery_tasks import query_online_news
 from ..tasks.extraction_tasks import extract_entities, top_n_entities
-from ..tasks.export_tasks import csv_to_b2
+from ..tasks.cooccurrence_tasks import entity_cooccurrence
+from ..tasks.export_tasks import csv_to_b2, parquet_to_b2
 from ..tasks.email_tasks import send_run_summary_email
 from ..utils import create_url_safe_slug
 
@@ -29,15 +31,22 @@ from ..utils import create_url_safe_slug
 class EntitiesDemoParams(MediacloudQuery, CsvExportParams, EmailRecipientParam, WebhookCallbackParam):
     """Parameters for the entities demo flow."""
     spacy_model: str = "en_core_web_sm"  # SpaCy model to use for NER
+    spacy_models: Optional[Dict[str, str]] = None  # Extra {language: model} routes; other languages are skipped
     top_n: int = 20  # Number of top entities to return
     filter_type: Optional[str] = None  # Optional entity type filter (e.g., "PERSON", "ORG", "GPE")
     sort_by: str = "total"  # Sort by "total" or "percentage"
+    aggregation_method: str = "exact"  # "exact" or "sketch" (bounded memory, approximate counts)
+    cooccurrence_format: Optional[str] = None  # "csv" or "parquet" to also export co-occurrence edges
+    cooccurrence_weight: str = "pmi"  # Edge ranking: "count", "pmi" or "npmi"
+    cooccurrence_top_k: int = 20  # Strongest edges kept per entity (0 keeps all)
+    cooccurrence_min_count: int = 1  # Minimum number of shared documents per edge (same default as entity_cooccurrence)
 
 
 class EntitiesFlowOutput(BaseFlowOutput):
     """Output artifacts for the entities demo flow."""
     query_summary: MediacloudQuerySummary
     b2_artifact: FileUploadArtifact
+    cooccurrence_artifact: FileUploadArtifact
 
 
 @register_flow(
@@ -64,6 +73,8 @@ def entities_demo_flow(params: EntitiesDemoParams) -> EntitiesFlowOutput:
         Dictionary containing only artifact objects:
         - query_summary: MediacloudQuerySummary artifact with query context and statistics
         - b2_artifact: FileUploadArtifact with upload details for the exported CSV
+        - cooccurrence_artifact: FileUploadArtifact for the co-occurrence edge list
+          (empty when ``cooccurrence_format`` is not set)
     """
     
     # Step 1: Query MediaCloud for articles
@@ -84,7 +95,8 @@ def entities_demo_flow(params: EntitiesDemoParams) -> EntitiesFlowOutput:
     articles = extract_entities(
         articles,
         text_column="text",
-        model=params.spacy_model
+        model=params.spacy_model,
+        models=params.spacy_models,
     )
     mark_step("entity_extraction_end", meta={"articles": len(articles)})
     
@@ -95,7 +107,8 @@ def entities_demo_flow(params: EntitiesDemoParams) -> EntitiesFlowOutput:
         entities_column="entities",
         top_n=params.top_n,
         filter_type=params.filter_type,
-        sort_by=params.sort_by
+        sort_by=params.sort_by,
+        method=params.aggregation_method,
     )
     mark_step("entity_aggregation_end", meta={"rows": len(top_entities)})
     
@@ -113,6 +126,34 @@ def entities_demo_flow(params: EntitiesDemoParams) -> EntitiesFlowOutput:
             ensure_unique=params.b2_ensure_unique,
     )
     
+    # Optional Step 5: Export entity co-occurrence edges
+    cooccurrence_artifact = FileUploadArtifact(bucket="", object_key="")
+    if params.cooccurrence_format:
+        if params.cooccurrence_format not in ("csv", "parquet"):
+            raise ValueError(
+                f"cooccurrence_format must be 'csv' or 'parquet', got '{params.cooccurrence_format}'"
+            )
+        mark_step("entity_cooccurrence_start")
+        edges = entity_cooccurrence(
+            articles,
+            entities_column="entities",
+            entity_types=[params.filter_type] if params.filter_type else None,
+            min_cooccurrence=params.cooccurrence_min_count,
+            weight=params.cooccurrence_weight,
+            top_k=params.cooccurrence_top_k,
+        )
+        mark_step("entity_cooccurrence_end", meta={"edges": len(edges)})
+        edges_object_name = (
+            f"{params.b2_object_prefix}/DATE/{slug}{filter_suffix}-entity-cooccurrence.{params.cooccurrence_format}"
+        )
+        export = parquet_to_b2 if params.cooccurrence_format == "parquet" else csv_to_b2
+        _, cooccurrence_artifact = export(
+            edges,
+            object_name=edges_object_name,
+            add_date_slug=params.b2_add_date_slug,
+            ensure_unique=params.b2_ensure_unique,
+        )
+    
     # Send email notification if recipients are specified
     if params.email_to:
         email_result = send_run_summary_email(
@@ -127,4 +168,5 @@ def entities_demo_flow(params: EntitiesDemoParams) -> EntitiesFlowOutput:
     return EntitiesFlowOutput(
         query_summary=query_summary,
         b2_artifact=b2_artifact,
+        cooccurrence_artifact=cooccurrence_artifact,
     )
@@ -5,6 +5,7 @@ This flow demonstrates:
 - Querying MediaCloud for articles
 - Extracting keywords from each article
 - Keeping keywords associated with their source text in a DataFrame
+- Optionally ranking corpus-level terms directly (keyword_mode="corpus")
 
 Can run with or without Prefect.
 """
@@ -17,6 +18,7 @@ from ..params.webhook_callback import WebhookCallbackParam
 from ..artifacts import MediacloudQuerySummary, FileUploadArtifact
 from ..tasks.discovery_tasks import query_online_news
 from ..tasks.keyword_tasks import extract_keywords
+from ..tasks.corpus_keyword_tasks import top_corpus_keywords
 from ..tasks.aggregator_tasks import top_n_unique_values
 from ..tasks.export_tasks import csv_to_b2
 from ..tasks.email_tasks import send_email, send_templated_email, send_run_summary_email
@@ -31,6 +33,9 @@ class KeywordsDemoParams(
     """Parameters for the keywords demo flow."""
 
     top_n: int = 50  # Number of keywords to extract per article
+    keyword_workers: int = 1  # Worker processes for YAKE (1 = in-process)
+    keyword_mode: str = "yake"  # "yake" (per-article) or "corpus" (hashed n-gram counts, much faster)
+    corpus_rank_by: str = "document_frequency"  # corpus mode: "document_frequency" or "tfidf"
 
 
 class KeywordsFlowOutput(BaseFlowOutput):
@@ -77,25 +82,41 @@ def keywords_demo_flow(params: KeywordsDemoParams) -> KeywordsFlowOutput:
         upload_dedup_summary=params.upload_dedup_summary,
     )
 
-    # Step 2: Extract keywords from each article
-    # This adds a 'keywords' column to the DataFrame
-    mark_step("keyword_extraction_start", meta={"articles": len(articles)})
-    articles = extract_keywords(
-        articles,
-        text_column="text",
-        language_column="language",
-        top_n=params.top_n
-    )
-    mark_step("keyword_extraction_end", meta={"articles": len(articles)})
-    
-    # Step 3: Aggregate keywords to find the top 50 most common keywords
-    mark_step("keyword_aggregation_start")
-    top_keywords = top_n_unique_values(
-        articles,
-        column="keywords",
-        top_n=50
-    )
-    mark_step("keyword_aggregation_end", meta={"rows": len(top_keywords)})
+    if params.keyword_mode not in ("yake", "corpus"):
+        raise ValueError(f"keyword_mode must be 'yake' or 'corpus', got '{params.keyword_mode}'")
+
+    if params.keyword_mode == "corpus":
+        # Steps 2+3 in one pass: count hashed 1-3-grams across the whole corpus
+        mark_step("keyword_aggregation_start", meta={"articles": len(articles), "mode": "corpus"})
+        top_keywords = top_corpus_keywords(
+            articles,
+            text_column="text",
+            language_column="language",
+            top_n=50,
+            rank_by=params.corpus_rank_by,
+        )
+        mark_step("keyword_aggregation_end", meta={"rows": len(top_keywords)})
+    else:
+        # Step 2: Extract keywords from each article
+        # This adds a 'keywords' column to the DataFrame
+        mark_step("keyword_extraction_start", meta={"articles": len(articles)})
+        articles = extract_keywords(
+            articles,
+            text_column="text",
+            language_column="language",
+            top_n=params.top_n,
+            workers=params.keyword_workers,
+        )
+        mark_step("keyword_extraction_end", meta={"articles": len(articles)})
+
+        # Step 3: Aggregate keywords to find the top 50 most common keywords
+        mark_step("keyword_aggregation_start")
+        top_keywords = top_n_unique_values(
+            articles,
+            column="keywords",
+            top_n=50
+        )
+        mark_step("keyword_aggregation_end", meta={"rows": len(top_keywords)})
 
     # Optional Step 4: Export top keywords to Backblaze B2 as CSV
  
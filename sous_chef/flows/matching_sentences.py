@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
 import re
 from pydantic import BaseModel
 
@@ -20,7 +20,9 @@ from ..utils import create_url_safe_slug
 class MatchingSentencesParams(MediacloudQuery, CsvExportParams, EmailRecipientParam, WebhookCallbackParam):
     """Parameters for the flow."""
     spacy_model: str = "en_core_web_sm"  # SpaCy model to use for NER
+    spacy_models: Optional[Dict[str, str]] = None  # Extra {language: model} routes; other languages are skipped
     inclusion_filters: Optional[List[re.Pattern]] = None
+    sentence_segmenter: str = "parser"  # "parser", "senter" (model's sentence recognizer) or "sentencizer" (rules, fastest)
 
 
 class MatchingSentencesFlowOutput(BaseFlowOutput):
@@ -61,6 +63,8 @@ def matching_sentences_flow(params: MatchingSentencesParams) -> MatchingSentence
         deduplicaed_articles,
         model=params.spacy_model,
         inclusion_filters=params.inclusion_filters,
+        segmenter=params.sentence_segmenter,
+        models=params.spacy_models,
     )
     mark_step("sentence_matching_end", meta={"rows": len(sentences_df)})
     
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
 import re
 from pydantic import BaseModel
 
@@ -21,8 +21,12 @@ from ..utils import create_url_safe_slug
 class TargetedSentimentParams(MediacloudQuery, CsvExportParams, EmailRecipientParam, WebhookCallbackParam):
     """Parameters for flow."""
     spacy_model: str = "en_core_web_sm"  # SpaCy model to use for NER
+    spacy_models: Optional[Dict[str, str]] = None  # Extra {language: model} routes; other languages are skipped
     inclusion_filters: Optional[List[re.Pattern]] = None
+    sentence_segmenter: str = "parser"  # "parser", "senter" (model's sentence recognizer) or "sentencizer" (rules, fastest)
     target_entity: str
+    sentiment_batch_size: int = 32  # Sentences per ABSA inference batch (1 = one at a time)
+    sentiment_backend: str = "local"  # "local" (PyTorch), "onnx" (ONNX Runtime, int8) or "server" (shared inference server)
 
 
 class TargetedSentimentFlowOutput(BaseFlowOutput):
@@ -63,6 +67,8 @@ def targeted_sentiment_flow(params: TargetedSentimentParams) -> TargetedSentimen
         deduplicaed_articles,
         model=params.spacy_model,
         inclusion_filters=params.inclusion_filters,
+        segmenter=params.sentence_segmenter,
+        models=params.spacy_models,
     )
     mark_step("sentence_matching_end", meta={"rows": len(sentences_df)})
 
@@ -71,6 +77,8 @@ def targeted_sentiment_flow(params: TargetedSentimentParams) -> TargetedSentimen
     sentences_with_sentiment_df = targeted_sentiment(
         sentences_df,
         sentiment_target=params.target_entity,
+        batch_size=params.sentiment_batch_size,
+        backend=params.sentiment_backend,
     )
     mark_step("targeted_sentiment_end", meta={"rows": len(sentences_with_sentiment_df)})
 
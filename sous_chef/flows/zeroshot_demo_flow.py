@@ -1,6 +1,11 @@
 """
 Demo flow: MediaCloud query → zero-shot classification (BGE-M3 zeroshot) → CSV on B2.
+
+The raw per-label scores are also uploaded as Parquet next to the CSV, so
+``zeroshot_reselect`` can redo selections without re-running the model.
 """
+from pydantic import Field
+
 from ..flow import BaseFlowOutput, register_flow
 from ..runtime import mark_step
 from ..params.csv_export import CsvExportParams
@@ -14,7 +19,7 @@ from ..artifacts import (
     ZeroShotClassificationSummary,
 )
 from ..tasks.discovery_tasks import query_online_news
-from ..tasks.export_tasks import csv_to_b2
+from ..tasks.export_tasks import csv_to_b2, parquet_to_b2
 from ..tasks.email_tasks import send_run_summary_email
 from ..tasks.zeroshot_tasks import (
     DEFAULT_ZEROSHOT_MODEL,
@@ -22,7 +27,11 @@ from ..tasks.zeroshot_tasks import (
     ZEROSHOT_STORY_TEXT_COLUMN,
     compute_zero_shot_label_counts,
     story_dataframe_for_zeroshot_csv,
+    zeroshot_cascade_stats,
+    zeroshot_taxonomy_stats,
     zeroshot_classification_failure_details,
+    zeroshot_score_cache_counts,
+    zeroshot_scores_frame,
     zero_shot_classify_stories,
 )
 from ..utils import create_url_safe_slug, get_logger
@@ -37,11 +46,22 @@ class ZeroshotDemoParams(
 ):
     """Parameters for the zero-shot classification demo flow."""
 
+    export_zeroshot_scores: bool = Field(
+        default=True,
+        title="Export score matrix",
+        description=(
+            "Also upload every story's score for every label as Parquet next to the CSV, "
+            "so thresholds and top-N can be changed later without re-running the model."
+        ),
+    )
+
 
 class ZeroshotDemoFlowOutput(BaseFlowOutput):
     query_summary: MediacloudQuerySummary
     zeroshot_summary: ZeroShotClassificationSummary
     b2_artifact: FileUploadArtifact
+    # Populated when export_zeroshot_scores is enabled.
+    scores_artifact: FileUploadArtifact
 
 
 @register_flow(
@@ -90,6 +110,8 @@ def zeroshot_demo_flow(params: ZeroshotDemoParams) -> ZeroshotDemoFlowOutput:
         device=ZEROSHOT_CLASSIFY_DEVICE,
         passing_score_threshold=params.zeroshot_score_threshold,
         top_n=params.zeroshot_top_n,
+        label_taxonomy=params.classification_label_taxonomy,
+        taxonomy_parent_threshold=params.taxonomy_parent_threshold,
     )
     label_counts, stories_without_prediction, stories_failed = (
         compute_zero_shot_label_counts(
@@ -100,6 +122,9 @@ def zeroshot_demo_flow(params: ZeroshotDemoParams) -> ZeroshotDemoFlowOutput:
         )
     )
     failure_details = zeroshot_classification_failure_details(articles)
+    cache_hits, cache_misses = zeroshot_score_cache_counts(articles)
+    cascade = zeroshot_cascade_stats(articles)
+    taxonomy = zeroshot_taxonomy_stats(articles)
     mark_step(
         "zeroshot_classification_end",
         meta={
@@ -121,6 +146,13 @@ def zeroshot_demo_flow(params: ZeroshotDemoParams) -> ZeroshotDemoFlowOutput:
         stories_without_prediction=stories_without_prediction,
         stories_classification_failed=stories_failed,
         classification_failure_details=failure_details,
+        score_cache_hits=cache_hits,
+        score_cache_misses=cache_misses,
+        cascade_top_k=cascade.get("top_k"),
+        cascade_recall=cascade.get("recall"),
+        cascade_validation_stories=cascade.get("validation_stories", 0),
+        taxonomy_nli_passes=taxonomy.get("pairs_scored"),
+        taxonomy_nli_passes_saved=taxonomy.get("pairs_saved", 0),
         summary_score_threshold=params.zeroshot_score_threshold,
         summary_top_n=params.zeroshot_top_n,
         distribution_mode=zeroshot_mode,
@@ -141,6 +173,27 @@ def zeroshot_demo_flow(params: ZeroshotDemoParams) -> ZeroshotDemoFlowOutput:
         ensure_unique=params.b2_ensure_unique,
     )
 
+    scores_artifact = FileUploadArtifact(bucket="", object_key="")
+    if params.export_zeroshot_scores:
+        scores_df = zeroshot_scores_frame(
+            articles,
+            params.classification_labels,
+            run={
+                "model_id": DEFAULT_ZEROSHOT_MODEL,
+                "hypothesis_template": params.hypothesis_template,
+                "multi_label": params.multi_label,
+                "query": params.query,
+            },
+        )
+        scores_object_name = f"{params.b2_object_prefix}/DATE/{slug}-zeroshot-scores.parquet"
+        logger.info("uploading zeroshot score matrix: %s", scores_object_name)
+        _, scores_artifact = parquet_to_b2(
+            scores_df,
+            object_name=scores_object_name,
+            add_date_slug=params.b2_add_date_slug,
+            ensure_unique=params.b2_ensure_unique,
+        )
+
     if params.email_to:
         send_run_summary_email(
             email_to=params.email_to,
@@ -154,4 +207,5 @@ def zeroshot_demo_flow(params: ZeroshotDemoParams) -> ZeroshotDemoFlowOutput:
         query_summary=query_summary,
         zeroshot_summary=zeroshot_summary,
         b2_artifact=b2_artifact,
+        scores_artifact=scores_artifact,
     )
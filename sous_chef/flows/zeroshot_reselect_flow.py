@@ -0,0 +1,145 @@
+"""
+Re-select zero-shot labels from a stored score matrix → CSV on B2 (no model load).
+
+Reads the ``-zeroshot-scores.parquet`` written by ``zeroshot_classification`` and
+recomputes selected labels, the label distribution and the per-story CSV for a new
+threshold / top-N or label subset.
+"""
+from typing import List, Optional
+
+from pydantic import Field
+
+from ..flow import BaseFlowOutput, register_flow
+from ..runtime import mark_step
+from ..params.csv_export import CsvExportParams
+from ..params.webhook_callback import WebhookCallbackParam
+from ..artifacts import FileUploadArtifact, ZeroShotClassificationSummary
+from ..tasks.export_tasks import csv_to_b2, parquet_from_b2
+from ..tasks.zeroshot_tasks import (
+    compute_zero_shot_label_counts,
+    reselect_zero_shot_stories,
+    stored_zeroshot_labels,
+    story_dataframe_for_zeroshot_csv,
+    zeroshot_classification_failure_details,
+    zeroshot_scores_run,
+)
+from ..utils import create_url_safe_slug, get_logger
+
+
+class ZeroshotReselectParams(CsvExportParams, WebhookCallbackParam):
+    """Parameters for re-selecting zero-shot labels from stored scores."""
+
+    scores_object: str = Field(
+        title="Stored scores",
+        description=(
+            "B2 object key of a zeroshot_classification run's -zeroshot-scores.parquet "
+            "(or a local path to one)."
+        ),
+    )
+    classification_labels: Optional[List[str]] = Field(
+        default=None,
+        title="Labels (optional)",
+        description="Subset of the stored labels to select among; all stored labels if unset.",
+    )
+    zeroshot_score_threshold: Optional[float] = Field(
+        default=None,
+        ge=0.0,
+        le=1.0,
+        title="Score threshold (optional)",
+        description=(
+            "If set: select every label whose score is ≥ this value. If unset: only the "
+            "single top label per story. Ignored when Top-N labels is set."
+        ),
+    )
+    zeroshot_top_n: Optional[int] = Field(
+        default=None,
+        ge=1,
+        title="Top-N labels (optional)",
+        description="If set: select the highest-scoring N labels per story.",
+    )
+    output_name: Optional[str] = Field(
+        default=None,
+        title="Output name (optional)",
+        description=(
+            "Used in the CSV object name: <prefix>/DATE/<output_name>-reselected-zeroshot-stories.csv. "
+            "Defaults to the stored run's query slug."
+        ),
+    )
+
+
+class ZeroshotReselectFlowOutput(BaseFlowOutput):
+    zeroshot_summary: ZeroShotClassificationSummary
+    b2_artifact: FileUploadArtifact
+
+
+@register_flow(
+    name="zeroshot_reselect",
+    description=(
+        "Re-run zero-shot label selection (threshold / top-N / label subset) on the score "
+        "matrix stored by zeroshot_classification, and upload a new per-story CSV to B2. "
+        "No model is loaded."
+    ),
+    params_model=ZeroshotReselectParams,
+    output_model=ZeroshotReselectFlowOutput,
+    log_prints=True,
+)
+def zeroshot_reselect_flow(params: ZeroshotReselectParams) -> ZeroshotReselectFlowOutput:
+    logger = get_logger()
+    logger.info("starting zeroshot_reselect flow on %s", params.scores_object)
+
+    scores = parquet_from_b2(params.scores_object)
+    labels = params.classification_labels or stored_zeroshot_labels(scores)
+    run = zeroshot_scores_run(scores)
+    mark_step("zeroshot_reselect_start", meta={"stories": len(scores), "labels": len(labels)})
+
+    articles = reselect_zero_shot_stories(
+        scores,
+        labels,
+        passing_score_threshold=params.zeroshot_score_threshold,
+        top_n=params.zeroshot_top_n,
+    )
+    label_counts, stories_without_prediction, stories_failed = (
+        compute_zero_shot_label_counts(
+            articles,
+            labels,
+            params.zeroshot_score_threshold,
+            params.zeroshot_top_n,
+        )
+    )
+
+    zeroshot_mode = "top_label"
+    if params.zeroshot_top_n is not None and params.zeroshot_top_n > 0:
+        zeroshot_mode = "top_n"
+    elif params.zeroshot_score_threshold is not None:
+        zeroshot_mode = "threshold_ge"
+
+    zeroshot_summary = ZeroShotClassificationSummary(
+        input_labels=labels,
+        label_counts=label_counts,
+        stories_classified=len(articles),
+        stories_without_prediction=stories_without_prediction,
+        stories_classification_failed=stories_failed,
+        classification_failure_details=zeroshot_classification_failure_details(articles),
+        summary_score_threshold=params.zeroshot_score_threshold,
+        summary_top_n=params.zeroshot_top_n,
+        distribution_mode=zeroshot_mode,
+        multi_label=run.get("multi_label", True),
+        hypothesis_template=run.get("hypothesis_template", "This text is about {}"),
+        model_id=run.get("model_id", ""),
+    )
+
+    export_df = story_dataframe_for_zeroshot_csv(articles)
+    slug = params.output_name or create_url_safe_slug(run.get("query") or "zeroshot")
+    object_name = f"{params.b2_object_prefix}/DATE/{slug}-reselected-zeroshot-stories.csv"
+    logger.info("uploading re-selected zeroshot story CSV: %s", object_name)
+    _, b2_artifact = csv_to_b2(
+        export_df,
+        object_name=object_name,
+        add_date_slug=params.b2_add_date_slug,
+        ensure_unique=params.b2_ensure_unique,
+    )
+
+    return ZeroshotReselectFlowOutput(
+        zeroshot_summary=zeroshot_summary,
+        b2_artifact=b2_artifact,
+    )
@@ -3,7 +3,7 @@ Parameters for zero-shot classification flows (Kitchen / frontend grouping).
 """
 from typing import ClassVar, Dict, List, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
 
 
 class ZeroShotClassificationParams(BaseModel):
@@ -36,6 +36,23 @@ class ZeroShotClassificationParams(BaseModel):
             "Labels omitted from the map continue to use hypothesis_template."
         ),
     )
+    classification_label_taxonomy: Optional[Dict[str, List[str]]] = Field(
+        default=None,
+        title="Label taxonomy (optional)",
+        description=(
+            "Optional map of parent label -> child labels (children may have their own). "
+            "Top-level labels are scored first; a parent's children are scored only when the "
+            "parent passes the taxonomy parent threshold, so large label sets cost far fewer "
+            "NLI passes. Every label must also be in classification_labels."
+        ),
+    )
+    taxonomy_parent_threshold: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=1.0,
+        title="Taxonomy parent threshold",
+        description="Score a parent label must reach for its child labels to be scored.",
+    )
     multi_label: bool = Field(
         default=True,
         title="Multi-label",
@@ -104,3 +121,29 @@ class ZeroShotClassificationParams(BaseModel):
                 continue
             out[key] = val
         return out or None
+
+    @field_validator("classification_label_taxonomy")
+    @classmethod
+    def _normalize_label_taxonomy(
+        cls,
+        v: Optional[Dict[str, List[str]]],
+        info: ValidationInfo,
+    ) -> Optional[Dict[str, List[str]]]:
+        if v is None:
+            return None
+        out: Dict[str, List[str]] = {}
+        for raw_key, raw_children in v.items():
+            key = str(raw_key).strip()
+            children = [str(c).strip() for c in raw_children or [] if c and str(c).strip()]
+            if key and children:
+                out[key] = children
+        labels = info.data.get("classification_labels")
+        if labels is not None:
+            unknown = sorted(
+                {label for key, children in out.items() for label in [key, *children]} - set(labels)
+            )
+            if unknown:
+                raise ValueError(
+                    f"classification_label_taxonomy labels must be in classification_labels: {unknown}"
+                )
+        return out or None
@@ -8,6 +8,8 @@ active runtime_session; outside a session, mark_step is a no-op.
 from __future__ import annotations
 
 import json
+import logging
+import os
 import sys
 import time
 from contextlib import contextmanager
@@ -16,8 +18,14 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Dict, Iterator, List, Optional
 
+logger = logging.getLogger(__name__)
+
 DEFAULT_MAX_EVENTS = 2000
 
+# Same name as registry.PRELOAD_MODELS_ENV; checked here so sessions without it never
+# import the NLP stack.
+_PRELOAD_MODELS_ENV = "SOUS_CHEF_PRELOAD_MODELS"
+
 _current: ContextVar[Optional["RuntimeRecorder"]] = ContextVar(
     "sous_chef_runtime_recorder", default=None
 )
@@ -142,6 +150,19 @@ def mark_step(name: str, meta: Optional[Dict[str, Any]] = None) -> None:
         rec.mark_step(name, meta)
 
 
+def _preload_models() -> None:
+    """Warm the model registry from ``SOUS_CHEF_PRELOAD_MODELS`` (once per process)."""
+    if not os.environ.get(_PRELOAD_MODELS_ENV, "").strip():
+        return
+    try:
+        from ..tasks.nlp.registry import preload_models_from_env
+
+        preload_models_from_env()
+    except Exception as e:
+        # Tasks load their models lazily anyway; a bad preload list must not fail the run.
+        logger.warning("Model preload failed: %s", e)
+
+
 @contextmanager
 def runtime_session(
     recipe_name: str,
@@ -159,6 +180,7 @@ def runtime_session(
     token = _current.set(rec)
     try:
         rec.record_recipe_start()
+        _preload_models()
         yield rec
     finally:
         err = sys.exc_info()[1]
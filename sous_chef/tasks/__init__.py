@@ -45,9 +45,11 @@ collect those artifacts into the FlowOutput model.
 
 from .discovery_tasks import query_online_news
 from .keyword_tasks import extract_keywords
+from .corpus_keyword_tasks import top_corpus_keywords
 from .extraction_tasks import extract_entities, top_n_entities
+from .cooccurrence_tasks import entity_cooccurrence
 from .aggregator_tasks import top_n_unique_values
-from .export_tasks import csv_to_b2
+from .export_tasks import csv_to_b2, parquet_from_b2, parquet_to_b2
 from .email_tasks import send_email, send_templated_email, send_run_summary_email
 from .llm_article_summary import summarize_articles_llm
 from .llm_aboutness import score_aboutness_llm
@@ -60,18 +62,27 @@ from .zeroshot_tasks import (
     add_zero_shot_classification,
     compute_zero_shot_label_counts,
     get_zeroshot_backend,
+    reselect_zero_shot_stories,
     story_dataframe_for_zeroshot_csv,
+    zeroshot_cascade_stats,
     zeroshot_classification_failure_details,
+    zeroshot_score_cache_counts,
+    zeroshot_scores_frame,
+    zeroshot_taxonomy_stats,
     zero_shot_classify_stories,
 )
 
 __all__ = [
     "query_online_news",
     "extract_keywords",
+    "top_corpus_keywords",
     "extract_entities",
     "top_n_entities",
+    "entity_cooccurrence",
     "top_n_unique_values",
     "csv_to_b2",
+    "parquet_from_b2",
+    "parquet_to_b2",
     "send_email",
     "send_templated_email",
     "send_run_summary_email",
@@ -85,7 +96,12 @@ __all__ = [
     "ZEROSHOT_STORY_TEXT_COLUMN",
     "ZEROSHOT_TEXT_MAX_CHARS_DEFAULT",
     "get_zeroshot_backend",
+    "reselect_zero_shot_stories",
     "story_dataframe_for_zeroshot_csv",
+    "zeroshot_cascade_stats",
     "zeroshot_classification_failure_details",
+    "zeroshot_score_cache_counts",
+    "zeroshot_scores_frame",
+    "zeroshot_taxonomy_stats",
     "zero_shot_classify_stories",
 ]
@@ -0,0 +1,269 @@
+"""
+Entity co-occurrence aggregation on top of ``extract_entities`` output.
+
+Entities are keyed by ``(text, type)``. Documents are turned into a sparse binary
+document-by-entity matrix ``X``; co-occurrence counts are the sparse product
+``X.T @ X``, computed one block of entity rows at a time and pruned (minimum count,
+top-k per entity) before the next block, so memory is bounded by the matrix ``X``,
+one block product, and the kept edges rather than by the full entity-by-entity
+matrix.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from prefect import task
+from scipy import sparse
+
+from .extraction_tasks import _iter_row_entities
+from ..utils import get_logger
+
+COOCCURRENCE_COLUMNS = [
+    "source",
+    "source_type",
+    "target",
+    "target_type",
+    "cooccurrence",
+    "source_document_count",
+    "target_document_count",
+    "pmi",
+    "npmi",
+]
+COOCCURRENCE_WEIGHTS = ("count", "pmi", "npmi")
+
+
+def build_document_entity_matrix(
+    entities: pd.Series,
+    entity_types: Optional[Sequence[str]] = None,
+) -> Tuple[sparse.csr_matrix, pd.DataFrame]:
+    """
+    Binary document-by-entity matrix for an ``entities`` column.
+
+    Args:
+        entities: Column of entity-dict lists (as produced by ``extract_entities``)
+        entity_types: Optional entity types to keep (e.g. ``["PERSON", "ORG", "GPE"]``)
+
+    Returns:
+        ``(X, vocabulary)`` where ``X`` is a ``len(entities) x n_entities`` CSR matrix
+        with 1 where the document mentions the entity, and ``vocabulary`` has columns
+        ``entity``, ``type`` and ``document_count`` indexed by matrix column.
+    """
+    keep_types = set(entity_types) if entity_types else None
+    ids: Dict[Tuple[Any, Any], int] = {}
+    indptr = [0]
+    indices: List[int] = []
+    row_count = 0
+    for pos, pairs in _iter_row_entities(entities):
+        # Empty rows between documents with entities
+        indptr.extend([len(indices)] * (pos - row_count))
+        row_count = pos
+        doc_ids = {
+            ids.setdefault(pair, len(ids))
+            for pair in pairs
+            if keep_types is None or pair[1] in keep_types
+        }
+        indices.extend(sorted(doc_ids))
+        indptr.append(len(indices))
+        row_count += 1
+    indptr.extend([len(indices)] * (len(entities) - row_count))
+
+    matrix = sparse.csr_matrix(
+        (
+            np.ones(len(indices), dtype=np.int32),
+            np.asarray(indices, dtype=np.int32),
+            np.asarray(indptr, dtype=np.int64),
+        ),
+        shape=(len(entities), len(ids)),
+    )
+    keys = list(ids)
+    vocabulary = pd.DataFrame(
+        {
+            "entity": [text for text, _ in keys],
+            "type": [entity_type for _, entity_type in keys],
+            "document_count": np.asarray(matrix.sum(axis=0)).ravel().astype(np.int64),
+        }
+    )
+    return matrix, vocabulary
+
+
+def _block_edges(
+    block: sparse.csr_matrix,
+    offset: int,
+    document_counts: np.ndarray,
+    number_of_documents: int,
+    min_cooccurrence: int,
+    weight: str,
+    top_k: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Kept ``(source, target, count)`` edges for one block of co-occurrence rows."""
+    coo = block.tocoo()
+    sources = coo.row.astype(np.int64) + offset
+    targets = coo.col.astype(np.int64)
+    counts = coo.data
+    keep = (sources != targets) & (counts >= min_cooccurrence)
+    if top_k <= 0:
+        # No per-entity pruning: each undirected edge once
+        keep &= sources < targets
+    sources, targets, counts = sources[keep], targets[keep], counts[keep]
+    if top_k <= 0 or len(sources) == 0:
+        return sources, targets, counts
+
+    scores = _edge_weight(
+        weight, counts, document_counts[sources], document_counts[targets], number_of_documents
+    )
+    # Rank each source's edges by weight (ties: higher count, then lower target id)
+    order = np.lexsort((targets, -counts, -scores, sources))
+    sources, targets, counts = sources[order], targets[order], counts[order]
+    starts = np.flatnonzero(np.r_[True, sources[1:] != sources[:-1]])
+    run_lengths = np.diff(np.r_[starts, len(sources)])
+    rank = np.arange(len(sources)) - np.repeat(starts, run_lengths)
+    keep = rank < top_k
+    return sources[keep], targets[keep], counts[keep]
+
+
+def _pmi(counts, source_counts, target_counts, number_of_documents) -> np.ndarray:
+    return np.log(
+        counts.astype(np.float64) * number_of_documents
+        / (source_counts.astype(np.float64) * target_counts)
+    )
+
+
+def _npmi(counts, source_counts, target_counts, number_of_documents) -> np.ndarray:
+    pmi = _pmi(counts, source_counts, target_counts, number_of_documents)
+    joint = -np.log(counts.astype(np.float64) / number_of_documents)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Pairs present in every document are perfectly associated
+        return np.where(joint > 0, pmi / joint, 1.0)
+
+
+def _edge_weight(weight, counts, source_counts, target_counts, number_of_documents) -> np.ndarray:
+    if weight == "count":
+        return counts.astype(np.float64)
+    if weight == "pmi":
+        return _pmi(counts, source_counts, target_counts, number_of_documents)
+    return _npmi(counts, source_counts, target_counts, number_of_documents)
+
+
+@task
+def entity_cooccurrence(
+    df: pd.DataFrame,
+    entities_column: str = "entities",
+    entity_types: Optional[List[str]] = None,
+    min_document_count: int = 1,
+    min_cooccurrence: int = 1,
+    weight: str = "pmi",
+    top_k: int = 20,
+    block_size: int = 2048,
+) -> pd.DataFrame:
+    """
+    Build a weighted entity co-occurrence edge list from an entities column.
+
+    Two entities co-occur when they are mentioned in the same document. Entities are
+    keyed by ``(text, type)``, so "Apple"/ORG and "Apple"/PRODUCT are separate nodes.
+
+    Args:
+        df: Input DataFrame with entities column (output of ``extract_entities``)
+        entities_column: Name of column containing lists of entity dicts
+        entity_types: Optional entity types to keep (e.g. ["PERSON", "ORG", "GPE"])
+        min_document_count: Drop entities mentioned in fewer documents than this
+        min_cooccurrence: Drop pairs that co-occur in fewer documents than this
+        weight: Edge ranking for top-k pruning and output order: "count", "pmi"
+            (pointwise mutual information) or "npmi" (PMI normalized to [-1, 1])
+        top_k: Keep each entity's k strongest edges (an edge survives if it is in the
+            top k of either endpoint); 0 or less keeps every edge
+        block_size: Entity rows per block of the sparse product; lower it to reduce
+            peak memory on very large vocabularies
+
+    Returns:
+        DataFrame with one row per undirected edge (``source`` < ``target`` in first-seen
+        order) and columns:
+        - source / source_type, target / target_type: the entity pair
+        - cooccurrence: Number of documents mentioning both
+        - source_document_count / target_document_count: Documents mentioning each
+        - pmi: log(P(a, b) / (P(a) P(b))) over documents
+        - npmi: pmi / -log(P(a, b))
+
+        Sorted by ``weight`` descending.
+
+    Example:
+        articles = extract_entities(articles)
+        edges = entity_cooccurrence(articles, entity_types=["PERSON", "ORG"], top_k=10)
+    """
+    if weight not in COOCCURRENCE_WEIGHTS:
+        raise ValueError(f"weight must be one of {COOCCURRENCE_WEIGHTS}, got '{weight}'")
+    if df.empty:
+        return pd.DataFrame(columns=COOCCURRENCE_COLUMNS)
+    if entities_column not in df.columns:
+        raise ValueError(
+            f"Column '{entities_column}' not found in DataFrame. "
+            f"Available columns: {list(df.columns)}"
+        )
+
+    logger = get_logger()
+    matrix, vocabulary = build_document_entity_matrix(df[entities_column], entity_types)
+    keep = np.flatnonzero(vocabulary["document_count"].to_numpy() >= max(min_document_count, 1))
+    matrix = matrix[:, keep].tocsr()
+    vocabulary = vocabulary.iloc[keep].reset_index(drop=True)
+    number_of_documents = len(df)
+    document_counts = vocabulary["document_count"].to_numpy()
+    n_entities = len(vocabulary)
+    logger.info(
+        f"[EntityCooccurrence] {number_of_documents} documents, {n_entities} entities, "
+        f"{matrix.nnz} mentions"
+    )
+    if n_entities < 2:
+        return pd.DataFrame(columns=COOCCURRENCE_COLUMNS)
+
+    transposed = matrix.T.tocsr()
+    kept_sources: List[np.ndarray] = []
+    kept_targets: List[np.ndarray] = []
+    kept_counts: List[np.ndarray] = []
+    for start in range(0, n_entities, block_size):
+        block = transposed[start:start + block_size] @ matrix
+        sources, targets, counts = _block_edges(
+            block.tocsr(),
+            start,
+            document_counts,
+            number_of_documents,
+            min_cooccurrence,
+            weight,
+            top_k,
+        )
+        kept_sources.append(sources)
+        kept_targets.append(targets)
+        kept_counts.append(counts)
+
+    sources = np.concatenate(kept_sources)
+    targets = np.concatenate(kept_targets)
+    counts = np.concatenate(kept_counts).astype(np.int64)
+    if len(sources) == 0:
+        return pd.DataFrame(columns=COOCCURRENCE_COLUMNS)
+
+    # Undirected: an edge kept from either endpoint is reported once
+    pair_ids, first = np.unique(
+        np.minimum(sources, targets) * n_entities + np.maximum(sources, targets),
+        return_index=True,
+    )
+    sources, targets, counts = pair_ids // n_entities, pair_ids % n_entities, counts[first]
+
+    source_counts = document_counts[sources]
+    target_counts = document_counts[targets]
+    edges = pd.DataFrame(
+        {
+            "source": vocabulary["entity"].to_numpy()[sources],
+            "source_type": vocabulary["type"].to_numpy()[sources],
+            "target": vocabulary["entity"].to_numpy()[targets],
+            "target_type": vocabulary["type"].to_numpy()[targets],
+            "cooccurrence": counts,
+            "source_document_count": source_counts,
+            "target_document_count": target_counts,
+            "pmi": _pmi(counts, source_counts, target_counts, number_of_documents),
+            "npmi": _npmi(counts, source_counts, target_counts, number_of_documents),
+        }
+    )
+    sort_column = "cooccurrence" if weight == "count" else weight
+    edges = edges.sort_values(
+        [sort_column, "cooccurrence"], ascending=False, kind="stable"
+    ).reset_index(drop=True)
+    logger.info(f"[EntityCooccurrence] kept {len(edges)} edges (top_k={top_k}, weight={weight})")
+    return edges
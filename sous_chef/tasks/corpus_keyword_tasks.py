@@ -0,0 +1,284 @@
+"""
+Corpus-level keyword counting with hashed sparse n-gram matrices.
+
+An alternative to per-document YAKE + ``top_n_unique_values`` when only corpus-level
+top terms are needed. Texts are tokenized once per chunk of stories, tokens are
+factorized and hashed, and 1..``ngram_max``-grams are hashed into a fixed feature
+space (the "hashing trick") to build a sparse document-term matrix per chunk. Terms
+are then ranked by document frequency or summed TF-IDF with NumPy/SciPy.
+
+Stopwords come from YAKE's per-language lists (the same ones ``extract_keywords``
+uses): an n-gram may not start or end with a stopword, number or one-letter token,
+and never spans punctuation or a document boundary.
+"""
+import re
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from prefect import task
+from scipy import sparse
+
+from ..utils import get_logger
+
+CORPUS_KEYWORD_COLUMNS = ["value", "count"]
+CORPUS_RANKINGS = ("document_frequency", "tfidf")
+CORPUS_CHUNK_SIZE = 20_000
+DEFAULT_HASH_FEATURES = 2 ** 24
+
+_TOKEN_PATTERN = re.compile(r"\w+(?:['’\-]\w+)*|[^\w\s]")
+# Joins a chunk's texts so one findall tokenizes the whole chunk; it is a punctuation
+# token, so n-grams never cross it
+_DOC_SEPARATOR = "\x01"
+# Odd 64-bit multipliers mixing token hashes at each n-gram position
+_POSITION_MULTIPLIERS = np.array(
+    [0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93],
+    dtype=np.uint64,
+)
+
+_STOPWORDS: Dict[str, Set[str]] = {}
+
+
+def stopwords_for(language: str) -> Set[str]:
+    """YAKE's stopword list for ``language`` (cached per process)."""
+    if language not in _STOPWORDS:
+        import yake
+
+        _STOPWORDS[language] = set(yake.KeywordExtractor(lan=language).stopword_set)
+    return _STOPWORDS[language]
+
+
+def _hash_tokens(tokens: np.ndarray) -> np.ndarray:
+    return pd.util.hash_array(tokens.astype(object), categorize=False)
+
+
+def _chunk_occurrences(
+    texts: List[str],
+    languages: List[str],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flat token stream for a chunk of texts.
+
+    Returns ``(token_hash, doc, position, boundary, edge_ok)`` aligned per token:
+    ``boundary`` marks punctuation, ``edge_ok`` tokens may start / end an n-gram.
+    """
+    joined = f" {_DOC_SEPARATOR} ".join(
+        text.replace(_DOC_SEPARATOR, " ") if _DOC_SEPARATOR in text else text for text in texts
+    )
+    flat = np.array(_TOKEN_PATTERN.findall(joined.lower()), dtype=object)
+    codes, uniques = pd.factorize(flat, sort=False)
+    uniques = np.asarray(uniques, dtype=object)
+
+    separator = uniques == _DOC_SEPARATOR
+    is_separator = separator[codes] if len(codes) else np.zeros(0, dtype=bool)
+    doc = np.cumsum(is_separator)[~is_separator]
+    codes = codes[~is_separator]
+    doc_starts = np.searchsorted(doc, np.arange(len(texts)))
+    position = np.arange(len(doc), dtype=np.int64) - doc_starts[doc]
+    token_hash = _hash_tokens(uniques)[codes] if len(uniques) else np.zeros(0, dtype=np.uint64)
+
+    # Tokens starting with a digit (numbers, dates) can sit inside but not at the edge
+    is_word = np.array([u[0].isalpha() for u in uniques], dtype=bool)
+    is_punct = np.array([not u[0].isalnum() for u in uniques], dtype=bool)
+    long_enough = np.array([len(u) > 1 for u in uniques], dtype=bool)
+    edge_vocab = is_word & long_enough
+
+    # Stopwords depend on each document's language
+    edge_ok = edge_vocab[codes] if len(codes) else np.zeros(0, dtype=bool)
+    doc_languages = np.asarray(languages, dtype=object)[doc] if len(doc) else np.zeros(0, dtype=object)
+    for language in dict.fromkeys(languages):
+        stop = np.fromiter((u in stopwords_for(language) for u in uniques), dtype=bool, count=len(uniques))
+        in_language = doc_languages == language
+        edge_ok[in_language] &= ~stop[codes[in_language]]
+    boundary = is_punct[codes] if len(codes) else np.zeros(0, dtype=bool)
+    return token_hash, doc, position, boundary, edge_ok
+
+
+def _ngram_features(
+    token_hash: np.ndarray,
+    doc: np.ndarray,
+    boundary: np.ndarray,
+    edge_ok: np.ndarray,
+    ngram_max: int,
+    n_features: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """``(feature, doc, start token index, n)`` for every valid n-gram in the stream."""
+    n_tokens = len(token_hash)
+    boundaries_before = np.r_[0, np.cumsum(boundary)]
+    features, docs, starts, sizes = [], [], [], []
+    for n in range(1, ngram_max + 1):
+        if n_tokens < n:
+            break
+        start = np.arange(n_tokens - n + 1)
+        end = start + n - 1
+        valid = (
+            (doc[start] == doc[end])
+            & (boundaries_before[end + 1] - boundaries_before[start] == 0)
+            & edge_ok[start]
+            & edge_ok[end]
+        )
+        start = start[valid]
+        combined = np.zeros(len(start), dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for offset in range(n):
+                combined ^= token_hash[start + offset] * _POSITION_MULTIPLIERS[offset]
+            combined ^= np.uint64(n)
+        features.append((combined % np.uint64(n_features)).astype(np.int64))
+        docs.append(doc[start])
+        starts.append(start)
+        sizes.append(np.full(len(start), n, dtype=np.int64))
+    if not features:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, empty
+    return (
+        np.concatenate(features),
+        np.concatenate(docs),
+        np.concatenate(starts),
+        np.concatenate(sizes),
+    )
+
+
+def _term_text(text: str, position: int, n: int) -> str:
+    tokens = _TOKEN_PATTERN.findall(text.lower())[position:position + n]
+    return " ".join(tokens)
+
+
+def build_hashed_ngram_matrix(
+    texts: List[str],
+    languages: List[str],
+    ngram_max: int = 3,
+    n_features: int = DEFAULT_HASH_FEATURES,
+    chunk_size: int = CORPUS_CHUNK_SIZE,
+) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    Sparse document-term count matrix of hashed 1..``ngram_max``-grams.
+
+    Returns:
+        ``(X, first_seen)``: ``X`` is ``len(texts) x n_features`` (CSR, int32 counts);
+        ``first_seen`` is a ``(features found, 4)`` int64 array of ``(feature, document,
+        token position, n)`` for the first occurrence of each feature, sorted by feature,
+        used to turn winning features back into text. Only the sparse matrix is sized
+        by ``n_features``.
+    """
+    first_seen = np.zeros((0, 4), dtype=np.int64)
+    blocks: List[sparse.csr_matrix] = []
+    for chunk_start in range(0, len(texts), chunk_size):
+        chunk_texts = texts[chunk_start:chunk_start + chunk_size]
+        chunk_languages = languages[chunk_start:chunk_start + chunk_size]
+        token_hash, doc, position, boundary, edge_ok = _chunk_occurrences(chunk_texts, chunk_languages)
+        features, docs, starts, sizes = _ngram_features(
+            token_hash, doc, boundary, edge_ok, ngram_max, n_features
+        )
+        block = sparse.csr_matrix(
+            (np.ones(len(features), dtype=np.int32), (docs, features)),
+            shape=(len(chunk_texts), n_features),
+        )
+        block.sum_duplicates()
+        blocks.append(block)
+
+        # Any occurrence of a feature spells the same n-gram (barring hash collisions);
+        # keep the chunk's first one for features no earlier chunk had
+        found, first = np.unique(features, return_index=True)
+        new = ~np.isin(found, first_seen[:, 0], assume_unique=True)
+        found, first = found[new], first[new]
+        if len(found):
+            added = np.column_stack(
+                (found, docs[first] + chunk_start, position[starts[first]], sizes[first])
+            )
+            first_seen = np.concatenate((first_seen, added))
+            first_seen = first_seen[np.argsort(first_seen[:, 0], kind="stable")]
+
+    if not blocks:
+        return sparse.csr_matrix((0, n_features), dtype=np.int32), first_seen
+    return sparse.vstack(blocks, format="csr"), first_seen
+
+
+@task
+def top_corpus_keywords(
+    df: pd.DataFrame,
+    text_column: str = "text",
+    language_column: str = "language",
+    top_n: int = 50,
+    ngram_max: int = 3,
+    rank_by: str = "document_frequency",
+    n_features: int = DEFAULT_HASH_FEATURES,
+    min_document_frequency: int = 1,
+    chunk_size: int = CORPUS_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Rank corpus-level keywords (1..ngram_max-grams) without per-document YAKE.
+
+    Args:
+        df: DataFrame with text and language columns
+        text_column: Name of column containing text
+        language_column: Name of column containing language codes (stopword lists);
+            missing values use English
+        top_n: Number of top terms to return
+        ngram_max: Maximum n-gram size
+        rank_by: "document_frequency" (stories containing the term) or "tfidf"
+            (sum over stories of L2-normalized tf * smoothed idf)
+        n_features: Size of the hashed feature space; rare collisions merge terms
+        min_document_frequency: Ignore terms found in fewer stories than this
+        chunk_size: Stories tokenized per chunk (bounds peak memory)
+
+    Returns:
+        DataFrame with the same columns as ``top_n_unique_values`` on a keywords
+        column - ``value`` (term) and ``count`` (number of stories containing it) -
+        plus ``score`` when ``rank_by="tfidf"``. Sorted by the ranking, descending.
+
+    Example:
+        top_keywords = top_corpus_keywords(articles, top_n=50)
+        top_keywords = top_corpus_keywords(articles, rank_by="tfidf")
+    """
+    if rank_by not in CORPUS_RANKINGS:
+        raise ValueError(f"rank_by must be one of {CORPUS_RANKINGS}, got '{rank_by}'")
+    columns = CORPUS_KEYWORD_COLUMNS + (["score"] if rank_by == "tfidf" else [])
+    if df.empty:
+        return pd.DataFrame(columns=columns)
+    if text_column not in df.columns:
+        raise ValueError(
+            f"Column '{text_column}' not found in DataFrame. Available columns: {list(df.columns)}"
+        )
+
+    logger = get_logger()
+    texts = [t if isinstance(t, str) else "" for t in df[text_column].tolist()]
+    if language_column in df.columns:
+        languages = [l if isinstance(l, str) and l else "en" for l in df[language_column].tolist()]
+    else:
+        languages = ["en"] * len(texts)
+
+    matrix, first_seen = build_hashed_ngram_matrix(
+        texts, languages, ngram_max=ngram_max, n_features=n_features, chunk_size=chunk_size
+    )
+    # Per-term arrays cover only the features that occur, not the whole hashed space
+    features, term_of_entry, document_frequency = np.unique(
+        matrix.indices, return_inverse=True, return_counts=True
+    )
+    if rank_by == "document_frequency":
+        scores = document_frequency.astype(np.float64)
+    else:
+        number_of_documents = matrix.shape[0]
+        idf = np.log((1 + number_of_documents) / (1 + document_frequency)) + 1.0
+        weights = matrix.data * idf[term_of_entry]
+        # L2-normalize each story's tf-idf vector so long stories don't dominate
+        row_of_entry = np.repeat(np.arange(number_of_documents), np.diff(matrix.indptr))
+        row_norms = np.sqrt(np.bincount(row_of_entry, weights=weights ** 2, minlength=number_of_documents))
+        scores = np.bincount(
+            term_of_entry, weights=weights / row_norms[row_of_entry], minlength=len(features)
+        )
+    scores[document_frequency < max(min_document_frequency, 1)] = 0
+
+    candidates = np.flatnonzero(scores > 0)
+    order = candidates[np.lexsort((candidates, -document_frequency[candidates], -scores[candidates]))]
+    top = order[:top_n] if top_n > 0 else order
+
+    seen = first_seen[np.searchsorted(first_seen[:, 0], features[top])]
+    values = [_term_text(texts[doc], position, n) for _, doc, position, n in seen]
+    result = pd.DataFrame({"value": values, "count": document_frequency[top].astype(int)})
+    if rank_by == "tfidf":
+        result["score"] = scores[top]
+    logger.info(
+        f"[CorpusKeywords] {len(texts)} stories, {matrix.nnz} story-term pairs, "
+        f"{len(candidates)} distinct hashed terms"
+    )
+    return result
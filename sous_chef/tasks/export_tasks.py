@@ -4,11 +4,15 @@ Export tasks for sous-chef-two.
 Currently provides:
 - csv_to_b2: upload a pandas DataFrame as a CSV to Backblaze B2 using the
   S3-compatible API.
+- parquet_to_b2: same, as Parquet (typed columns, much smaller for large
+  numeric tables such as co-occurrence edge lists).
+- parquet_from_b2: read an uploaded Parquet object (or a local file) back
+  into a DataFrame, e.g. stored zero-shot scores for re-selection.
 """
 import os
 from datetime import date
 from io import BytesIO
-from typing import Dict, Any
+from typing import Callable, Dict, Any
 import tempfile
 
 import pandas as pd
@@ -107,21 +111,108 @@ def csv_to_b2(
     Example:
         metadata, artifact = csv_to_b2(df, "output.csv")
     """
+    return _dataframe_to_b2(
+        df,
+        object_name,
+        file_type="csv",
+        content_type="text/csv",
+        write=lambda frame, target: frame.to_csv(
+            target, index=False, encoding='utf-8', lineterminator='\n'
+        ),
+        log_tag="CSVToB2",
+        add_date_slug=add_date_slug,
+        ensure_unique=ensure_unique,
+        b2_block_name=b2_block_name,
+        dry_run=dry_run,
+        auto_dry_run_on_missing_creds=auto_dry_run_on_missing_creds,
+    )
+
+
+@task
+def parquet_to_b2(
+    df: pd.DataFrame,
+    object_name: str,
+    add_date_slug: bool = True,
+    ensure_unique: bool = True,
+    b2_block_name: str = "b2-s3-credentials",
+    dry_run: bool = False,
+    auto_dry_run_on_missing_creds: bool = True,
+) -> ArtifactResult[Dict[str, Any]]:
+    """
+    Upload a DataFrame as a Parquet file to Backblaze B2 (S3-compatible).
+
+    Same naming, uniqueness, and dry-run behavior as :func:`csv_to_b2`; the
+    returned artifact has ``file_type="parquet"``.
+
+    Example:
+        metadata, artifact = parquet_to_b2(edges, "graphs/DATE/edges.parquet")
+    """
+    return _dataframe_to_b2(
+        df,
+        object_name,
+        file_type="parquet",
+        content_type="application/vnd.apache.parquet",
+        write=lambda frame, target: frame.to_parquet(target, index=False),
+        log_tag="ParquetToB2",
+        add_date_slug=add_date_slug,
+        ensure_unique=ensure_unique,
+        b2_block_name=b2_block_name,
+        dry_run=dry_run,
+        auto_dry_run_on_missing_creds=auto_dry_run_on_missing_creds,
+    )
+
+
+@task
+def parquet_from_b2(
+    object_name: str,
+    b2_block_name: str = "b2-s3-credentials",
+) -> pd.DataFrame:
+    """
+    Read a Parquet object from Backblaze B2 (S3-compatible) into a DataFrame.
+
+    ``object_name`` is the final key reported by :func:`parquet_to_b2` (``metadata["object"]``).
+    An existing local path is read directly instead, which covers the local copy written
+    in dry-run mode.
+    """
+    if os.path.isfile(object_name):
+        return pd.read_parquet(object_name)
+    bucket_name = get_b2_bucket_name()
+    client = get_b2_s3_client(block_name=b2_block_name)
+    response = client.get_object(Bucket=bucket_name, Key=object_name.lstrip("/"))
+    get_logger().info(f"[ParquetFromB2] Read {bucket_name}/{object_name}")
+    return pd.read_parquet(BytesIO(response["Body"].read()))
+
+
+def _dataframe_to_b2(
+    df: pd.DataFrame,
+    object_name: str,
+    *,
+    file_type: str,
+    content_type: str,
+    write: Callable[[pd.DataFrame, Any], None],
+    log_tag: str,
+    add_date_slug: bool,
+    ensure_unique: bool,
+    b2_block_name: str,
+    dry_run: bool,
+    auto_dry_run_on_missing_creds: bool,
+) -> ArtifactResult[Dict[str, Any]]:
+    """Shared upload path for csv_to_b2 / parquet_to_b2; ``write(df, path_or_buffer)`` serializes."""
     if df is None:
-        raise ValueError("csv_to_b2: DataFrame 'df' must not be None")
+        raise ValueError(f"{file_type}_to_b2: DataFrame 'df' must not be None")
 
     logger = get_logger()
     
     # Auto-enable dry_run in test mode
     if is_test_mode() and not dry_run:
-        logger.info("[CSVToB2] Test mode detected - using dry_run")
+        logger.info(f"[{log_tag}] Test mode detected - using dry_run")
         dry_run = True
     
     # Auto-detect missing credentials and switch to dry_run
     if not dry_run and auto_dry_run_on_missing_creds:
         if not _b2_credentials_available(block_name=b2_block_name):
             logger.warning(
-                f"[CSVToB2] B2 credentials not available. "
+                f"[{log_tag}] B2 credentials not available. "
                 f"Switching to dry_run mode for testing. "
                 f"Set auto_dry_run_on_missing_creds=False to disable this behavior."
             )
@@ -129,10 +220,10 @@ def csv_to_b2(
     
     # Get bucket name from Prefect variable or environment
     bucket_name = get_b2_bucket_name()
-    # Build CSV into an in-memory buffer
-    csv_buffer = BytesIO()
-    df.to_csv(csv_buffer, index=False, encoding='utf-8', lineterminator='\n')
-    csv_buffer.seek(0)
+    # Serialize into an in-memory buffer
+    buffer = BytesIO()
+    write(df, buffer)
+    buffer.seek(0)
 
 
     # Insert date slug if requested
@@ -176,22 +267,22 @@ def csv_to_b2(
 
     if not dry_run:
         # Log detailed client configuration before put_object
-        logger.info(f"[CSVToB2] Preparing to upload CSV")
-        logger.info(f"[CSVToB2] Bucket: {bucket_name}, Key: {put_name}")
-        logger.info(f"[CSVToB2] Client endpoint: {client.meta.endpoint_url}")
-        logger.info(f"[CSVToB2] Client region: {client.meta.region_name}")
+        logger.info(f"[{log_tag}] Preparing to upload {file_type}")
+        logger.info(f"[{log_tag}] Bucket: {bucket_name}, Key: {put_name}")
+        logger.info(f"[{log_tag}] Client endpoint: {client.meta.endpoint_url}")
+        logger.info(f"[{log_tag}] Client region: {client.meta.region_name}")
         
-        logger.info(f"[CSVToB2] CSV buffer size: {len(csv_buffer.getvalue())} bytes")
+        logger.info(f"[{log_tag}] {file_type} buffer size: {len(buffer.getvalue())} bytes")
         
         client.put_object(
-            Body=csv_buffer,#.getvalue(),
+            Body=buffer,#.getvalue(),
             Bucket=bucket_name,
             Key=put_name,
-            ContentType="text/csv"
-            #ContentLength=len(csv_buffer.getvalue())
+            ContentType=content_type
+            #ContentLength=len(buffer.getvalue())
         )
         
-        logger.info(f"[CSVToB2] Successfully uploaded to {bucket_name}/{put_name}")
+        logger.info(f"[{log_tag}] Successfully uploaded to {bucket_name}/{put_name}")
 
     # Best-effort URL construction using the configured endpoint, if present.
     # In dry_run mode, don't create a URL
@@ -215,7 +306,7 @@ def csv_to_b2(
             url=url,
             bucket=bucket_name,
             object_key=put_name,
-            file_type="csv",
+            file_type=file_type,
             columns_saved=list(df.columns),
             row_count=len(df)
         )
@@ -226,13 +317,13 @@ def csv_to_b2(
         final_dir = "/".join(local_file_name.split("/")[:-1])
         os.makedirs(tmp_dir+"/"+final_dir, exist_ok=True)
         local_path = f"{tmp_dir}/{local_file_name}"
-        df.to_csv(local_path, index=False)
-        logger.info(f"[CSVToB2] Dry run mode - CSV also saved locally to {local_path} for inspection")
+        write(df, local_path)
+        logger.info(f"[{log_tag}] Dry run mode - {file_type} also saved locally to {local_path} for inspection")
         artifact = FileUploadArtifact(
             url=None,                    
             bucket="test-bucket",          # or "test-bucket" if you prefer
             object_key=local_path,         # includes "test-" prefix
-            file_type="csv",
+            file_type=file_type,
             columns_saved=list(df.columns),
             row_count=len(df),
         )
@@ -3,17 +3,19 @@ Entity extraction tasks.
 
 Extract named entities from texts using SpaCy NER models.
 """
-from typing import List, Dict, Optional
+from typing import Any, Iterator, List, Dict, Optional, Tuple
 from prefect import task
+import numpy as np
 import pandas as pd
-from collections import Counter
-from .utils import add_column_from_function
+from .nlp import load_spacy_model, parse_texts
+from .nlp.chunking import max_doc_chars
+from .nlp.memo import memoized_column, row_key
+from .nlp.routing import normalize_language, route_by_language
+from .sketches import CountMinSketch, SpaceSaving
 
-# Lazy import to avoid requiring spacy at module load time
-try:
-    import spacy_download
-except ImportError:
-    spacy_download = None
+TOP_ENTITIES_COLUMNS = ["entity", "type", "count", "appearance_percent", "document_count"]
+SKETCH_ERROR_COLUMNS = ["count_error_bound", "document_count_error_bound"]
+SKETCH_CHUNK_ROWS = 10_000
 
 
 def extract_entities_row(
@@ -34,21 +36,28 @@ def extract_entities_row(
         Example: [{"text": "Apple", "type": "ORG"}, {"text": "New York", "type": "GPE"}]
     """
     
-    document = nlp(text)
-    
-    entities = [
+    # Long texts are chunked on paragraph boundaries; entity offsets are stitched back
+    return entities_from_doc(parse_texts(nlp, [text], use_cache=False)[0])
+
+
+def entities_from_doc(document) -> List[Dict[str, str]]:
+    """Entity dicts ({"text", "type"}) for an already-parsed SpaCy Doc."""
+    return [
         {"text": ent.text, "type": ent.label_}
         for ent in document.ents
     ]
-    
-    return entities
 
 
 @task
 def extract_entities(
     df: pd.DataFrame,
     text_column: str = "text",
-    model: str = "en_core_web_sm"
+    model: str = "en_core_web_sm",
+    use_doc_cache: Optional[bool] = None,
+    max_chars_per_doc: Optional[int] = None,
+    use_memo: Optional[bool] = None,
+    language_column: Optional[str] = "language",
+    models: Optional[Dict[str, str]] = None,
 ) -> pd.DataFrame:
     """
     Extract named entities from DataFrame texts using SpaCy NER.
@@ -57,10 +66,24 @@ def extract_entities(
     dictionaries for each row. Each entity dict has "text" and "type" keys.
     This keeps entities associated with their source text.
     
+    Rows are grouped by ``language_column`` and each group is parsed in one batch by
+    the model for its language (``model`` covers its own language, ``models`` adds
+    more). Rows in other languages get an empty list instead of being parsed with the
+    wrong model; rows with no language value go to ``model``.
+    
     Args:
         df: DataFrame with text column
         text_column: Name of column containing text
         model: SpaCy model name (e.g., "en_core_web_sm", "en_core_web_lg")
+        use_doc_cache: Reuse / store parses in the shared document cache
+            (default: SOUS_CHEF_DOC_CACHE, off)
+        max_chars_per_doc: Truncate longer texts at a paragraph boundary
+            (default: SOUS_CHEF_MAX_DOC_CHARS, 300k; <= 0 disables)
+        use_memo: Serve previously extracted rows from the local enrichment memo
+            before loading the model (default: SOUS_CHEF_ENRICHMENT_MEMO, off)
+        language_column: Column with language codes (None / missing: every row uses ``model``)
+        models: Extra ``{language: model}`` routes, e.g. ``{"es": "es_core_news_sm"}``;
+            an ``"xx"`` entry catches all otherwise unrouted languages
         
     Returns:
         DataFrame with 'entities' column added
@@ -74,22 +97,232 @@ def extract_entities(
         # entities[i] contains entities extracted from text[i]
         # Each entity is {"text": "...", "type": "ORG"} etc.
     """
+    if df.empty:
+        df["entities"] = []
+        return df
 
-    if spacy_download is None:
-        raise ImportError(
-            "spacy-download is required for entity extraction. "
-            "Install it with: pip install spacy-download"
+    texts = df[text_column].tolist()
+    languages = (
+        df[language_column].tolist()
+        if language_column and language_column in df.columns
+        else [None] * len(df)
+    )
+
+    def compute(positions: List[int]) -> List[List[Dict[str, str]]]:
+        # Rows in languages without a model keep an empty entity list
+        results: List[List[Dict[str, str]]] = [[] for _ in positions]
+        groups, _ = route_by_language(
+            [languages[i] for i in positions], model, models, task="extract_entities"
         )
-    
-    nlp = spacy_download.load_spacy(model)
-
-    return add_column_from_function(
-        df,
-        extract_entities_row,
-        input_cols=[text_column],
-        output_col="entities",
-        nlp = nlp
+        for routed_model, group in groups.items():
+            # Reuses the worker's already-loaded pipeline when one exists; never
+            # loaded at all when every row is served from the enrichment memo
+            nlp = load_spacy_model(routed_model)
+            # Parses are shared with other spaCy tasks (e.g. matching_sentences) via the doc cache
+            docs = parse_texts(
+                nlp,
+                [texts[positions[j]] for j in group],
+                model=routed_model,
+                use_cache=use_doc_cache,
+                max_chars=max_chars_per_doc,
+            )
+            for j, doc in zip(group, docs):
+                results[j] = entities_from_doc(doc)
+        return results
+
+    df["entities"] = memoized_column(
+        [row_key(text, normalize_language(language)) for text, language in zip(texts, languages)],
+        compute,
+        task="extract_entities",
+        params={
+            "model": model,
+            "models": dict(models or {}),
+            "max_chars_per_doc": max_doc_chars(max_chars_per_doc),
+        },
+        use_memo=use_memo,
+    )
+    return df
+
+
+def _iter_row_entities(
+    entities: pd.Series,
+    filter_type: Optional[str] = None,
+) -> Iterator[Tuple[int, List[Tuple[Any, Any]]]]:
+    """Yield (row position, [(entity text, entity type), ...]) for well-formed entity dicts."""
+    for pos, row_entities in enumerate(entities.tolist()):
+        if row_entities is None:
+            continue
+        
+        # Handle single dict case (convert to list)
+        if isinstance(row_entities, dict):
+            row_entities = [row_entities]
+        
+        # Handle empty lists
+        if not isinstance(row_entities, list) or len(row_entities) == 0:
+            continue
+        
+        pairs = [
+            (e.get("text"), e.get("type"))
+            for e in row_entities
+            if isinstance(e, dict)
+            and e.get("text") is not None
+            and (not filter_type or e.get("type") == filter_type)
+        ]
+        if pairs:
+            yield pos, pairs
+
+
+def _flatten_entities(entities: pd.Series, filter_type: Optional[str] = None) -> pd.DataFrame:
+    """One row per entity mention: doc (row position), text, type, pos (mention order)."""
+    docs: List[int] = []
+    texts: List[Any] = []
+    types: List[Any] = []
+    for pos, pairs in _iter_row_entities(entities, filter_type):
+        docs.extend([pos] * len(pairs))
+        for text, entity_type in pairs:
+            texts.append(text)
+            types.append(entity_type)
+    return pd.DataFrame({
+        "doc": np.asarray(docs, dtype=np.int64),
+        "text": pd.Series(texts, dtype=object),
+        "type": pd.Series(types, dtype=object),
+        "pos": np.arange(len(texts), dtype=np.int64),
+    })
+
+
+def _type_vote_key(text: Any, entity_type: Any) -> str:
+    return f"{text}\x1f{entity_type}"
+
+
+def _top_n_entities_exact(
+    entities: pd.Series,
+    top_n: int,
+    filter_type: Optional[str],
+    sort_by: str,
+) -> pd.DataFrame:
+    flat = _flatten_entities(entities, filter_type)
+    if flat.empty:
+        return pd.DataFrame(columns=TOP_ENTITIES_COLUMNS)
+
+    # Factorize entity texts once; all counting is then integer groupby / bincount
+    codes, uniques = pd.factorize(flat["text"], sort=False)
+    n_entities = len(uniques)
+    total = np.bincount(codes, minlength=n_entities)
+    doc_codes = pd.DataFrame({"doc": flat["doc"].to_numpy(), "code": codes}).drop_duplicates()
+    doc_count = np.bincount(doc_codes["code"].to_numpy(), minlength=n_entities)
+
+    # Modal type per entity; ties go to the type seen first (as Counter.most_common does)
+    type_votes = (
+        pd.DataFrame({"code": codes, "type": flat["type"], "pos": flat["pos"]})
+        .groupby(["code", "type"], dropna=False, sort=False)
+        .agg(votes=("pos", "size"), first=("pos", "min"))
+        .reset_index()
+        .sort_values(["code", "votes", "first"], ascending=[True, False, True], kind="stable")
+        .drop_duplicates("code")
     )
+    modal_type = np.empty(n_entities, dtype=object)
+    modal_type[type_votes["code"].to_numpy()] = type_votes["type"].to_numpy()
+
+    if sort_by == "total":
+        key = total
+    elif sort_by == "percentage":
+        key = doc_count
+    else:
+        raise ValueError(f"sort_by must be 'total' or 'percentage', got '{sort_by}'")
+
+    # Codes are in first-seen order, so a stable sort keeps first-seen order among ties
+    order = np.argsort(-key, kind="stable")
+    if top_n > 0:
+        order = order[:top_n]
+
+    number_of_documents = len(entities)
+    return pd.DataFrame({
+        "entity": np.asarray(uniques, dtype=object)[order],
+        # If filter_type is specified, all entities have that type; otherwise use most common type
+        "type": [filter_type] * len(order) if filter_type else modal_type[order],
+        "count": total[order].astype(int),
+        "appearance_percent": doc_count[order] / number_of_documents * 100,
+        "document_count": doc_count[order].astype(int),
+    })
+
+
+def _top_n_entities_sketch(
+    entities: pd.Series,
+    top_n: int,
+    filter_type: Optional[str],
+    sort_by: str,
+    sketch_capacity: int,
+    sketch_epsilon: float,
+    sketch_delta: float,
+    chunk_size: int = SKETCH_CHUNK_ROWS,
+) -> pd.DataFrame:
+    if sort_by not in ("total", "percentage"):
+        raise ValueError(f"sort_by must be 'total' or 'percentage', got '{sort_by}'")
+    if top_n > sketch_capacity:
+        raise ValueError("top_n must not exceed sketch_capacity in sketch mode")
+
+    # Space-Saving tracks the ranking metric; Count-Min estimates the other metric and
+    # type votes for whichever entities end up in the top-n. Rows are flattened one
+    # chunk at a time and fed as pre-aggregated (key, count) updates, so memory is
+    # bounded by the chunk plus the sketches.
+    heavy = SpaceSaving(capacity=sketch_capacity)
+    other = CountMinSketch.from_error_rate(sketch_epsilon, sketch_delta)
+    votes = CountMinSketch.from_error_rate(sketch_epsilon, sketch_delta)
+    seen_types: Dict[Any, None] = {}
+
+    for start in range(0, len(entities), chunk_size):
+        flat = _flatten_entities(entities.iloc[start:start + chunk_size], filter_type)
+        if flat.empty:
+            continue
+        total = flat.groupby("text", sort=False).size()
+        docs = flat.drop_duplicates(["doc", "text"]).groupby("text", sort=False).size()
+        ranked, secondary = (total, docs) if sort_by == "total" else (docs, total)
+        heavy.update(ranked.index, ranked.to_numpy())
+        other.update(secondary.index, secondary.to_numpy())
+
+        type_counts = flat.groupby(["text", "type"], dropna=False, sort=False).size()
+        votes.update(
+            [_type_vote_key(text, entity_type) for text, entity_type in type_counts.index],
+            type_counts.to_numpy(),
+        )
+        seen_types.update(dict.fromkeys(flat["type"].drop_duplicates().tolist()))
+
+    top = heavy.top(top_n if top_n > 0 else None)
+    if not top:
+        return pd.DataFrame(columns=TOP_ENTITIES_COLUMNS + SKETCH_ERROR_COLUMNS)
+
+    texts = [text for text, _, _ in top]
+    estimates = np.array([estimate for _, estimate, _ in top], dtype=np.int64)
+    errors = np.array([error for _, _, error in top], dtype=np.int64)
+    other_estimates = other.estimate_many(texts)
+
+    if filter_type:
+        types = [filter_type] * len(texts)
+    else:
+        candidates = list(seen_types)
+        type_votes = votes.estimate_many(
+            [_type_vote_key(text, t) for text in texts for t in candidates]
+        ).reshape(len(texts), len(candidates))
+        types = [candidates[i] for i in type_votes.argmax(axis=1)]
+
+    number_of_documents = len(entities)
+    if sort_by == "total":
+        total, total_err = estimates, errors
+        doc_count = np.minimum(other_estimates, number_of_documents)
+        doc_err = np.full(len(texts), other.error_bound)
+    else:
+        total, total_err = other_estimates, np.full(len(texts), other.error_bound)
+        doc_count, doc_err = np.minimum(estimates, number_of_documents), errors
+
+    return pd.DataFrame({
+        "entity": texts,
+        "type": types,
+        "count": total.astype(int),
+        "appearance_percent": doc_count / number_of_documents * 100,
+        "document_count": doc_count.astype(int),
+        "count_error_bound": total_err.astype(int),
+        "document_count_error_bound": doc_err.astype(int),
+    })
 
 
 @task
@@ -98,7 +331,11 @@ def top_n_entities(
     entities_column: str = "entities",
     top_n: int = 10,
     filter_type: Optional[str] = None,
-    sort_by: str = "total"
+    sort_by: str = "total",
+    method: str = "exact",
+    sketch_capacity: int = 10_000,
+    sketch_epsilon: float = 1e-4,
+    sketch_delta: float = 0.01,
 ) -> pd.DataFrame:
     """
     Find the top-n entities across all documents, with optional filtering by entity type.
@@ -107,12 +344,24 @@ def top_n_entities(
     It can filter by entity type (e.g., "PERSON", "ORG", "GPE") and sort by either
     total count or percentage of articles containing each entity.
     
+    The default "exact" method flattens all mentions into columnar arrays and counts
+    with groupby / bincount. For corpora too large to count exactly, method="sketch"
+    keeps memory bounded: a Space-Saving summary of ``sketch_capacity`` counters ranks
+    entities by the sort metric, and Count-Min sketches (error ``sketch_epsilon`` * N
+    with probability 1 - ``sketch_delta``) estimate the other metric and the modal type.
+    Counts in sketch mode are upper-bound estimates; the maximum overestimate of each is
+    reported in ``count_error_bound`` / ``document_count_error_bound``.
+    
     Args:
         df: Input DataFrame with entities column
         entities_column: Name of column containing lists of entity dicts
         top_n: Number of top entities to return (-1 for all)
         filter_type: Optional entity type to filter by (e.g., "PERSON", "ORG", "GPE")
         sort_by: How to sort results - "total" (by total count) or "percentage" (by % of articles)
+        method: "exact" (default) or "sketch" (bounded memory, approximate)
+        sketch_capacity: Space-Saving counters kept in sketch mode (>= top_n)
+        sketch_epsilon: Count-Min relative error in sketch mode
+        sketch_delta: Count-Min failure probability in sketch mode
         
     Returns:
         DataFrame with columns:
@@ -121,6 +370,7 @@ def top_n_entities(
         - count: Total number of times the entity appears across all documents
         - appearance_percent: Percentage of documents containing this entity
         - document_count: Number of documents containing this entity
+        - count_error_bound / document_count_error_bound: sketch mode only
         
         Results are sorted by the specified method and limited to top_n rows.
         
@@ -136,7 +386,7 @@ def top_n_entities(
         # Returns top 20 entities sorted by how many articles mention them
     """
     if df.empty:
-        return pd.DataFrame(columns=["entity", "type", "count", "appearance_percent", "document_count"])
+        return pd.DataFrame(columns=TOP_ENTITIES_COLUMNS)
     
     if entities_column not in df.columns:
         raise ValueError(
@@ -144,95 +394,16 @@ def top_n_entities(
             f"Available columns: {list(df.columns)}"
         )
     
-    # Counters for total occurrences and document appearances
-    entity_total_count = Counter()  # Total count across all documents
-    entity_doc_count = Counter()    # Number of documents containing each entity
-    entity_types = {}                # Track most common type for each entity
-    
-    number_of_documents = len(df)
-    
-    # Process each row's entities
-    for idx, row_entities in df[entities_column].items():
-        if row_entities is None:
-            continue
-        
-        # Handle single dict case (convert to list)
-        if isinstance(row_entities, dict):
-            row_entities = [row_entities]
-        
-        # Handle empty lists
-        if not isinstance(row_entities, list) or len(row_entities) == 0:
-            continue
-        
-        # Filter by type if specified
-        if filter_type:
-            row_entities = [
-                e for e in row_entities
-                if isinstance(e, dict) and e.get("type") == filter_type
-            ]
-        
-        # Track unique entities in this document for appearance counting
-        unique_entities_in_doc = set()
-        
-        # Count all entity occurrences
-        for entity in row_entities:
-            if not isinstance(entity, dict):
-                continue
-            
-            entity_text = entity.get("text")
-            entity_type = entity.get("type")
-            
-            if entity_text is None:
-                continue
-            
-            # Count total occurrences
-            entity_total_count[entity_text] += 1
-            
-            # Track entity type (keep most common type)
-            if entity_text not in entity_types:
-                entity_types[entity_text] = Counter()
-            entity_types[entity_text][entity_type] += 1
-            
-            # Track for document appearance (count once per document)
-            unique_entities_in_doc.add(entity_text)
-        
-        # Count document appearances (each entity counted once per document)
-        for entity_text in unique_entities_in_doc:
-            entity_doc_count[entity_text] += 1
-    
-    # Get most common type for each entity
-    entity_type_map = {
-        entity: types.most_common(1)[0][0]
-        for entity, types in entity_types.items()
-    }
-    
-    # Build results
-    if len(entity_total_count) == 0:
-        return pd.DataFrame(columns=["entity", "type", "count", "appearance_percent", "document_count"])
-    
-    # Sort entities
-    if sort_by == "total":
-        sorted_entities = [e[0] for e in entity_total_count.most_common(top_n if top_n > 0 else None)]
-    elif sort_by == "percentage":
-        sorted_entities = [e[0] for e in entity_doc_count.most_common(top_n if top_n > 0 else None)]
-    else:
-        raise ValueError(f"sort_by must be 'total' or 'percentage', got '{sort_by}'")
-    
-    # Build result DataFrame
-    results = []
-    for entity_text in sorted_entities:
-        total_count = entity_total_count[entity_text]
-        doc_count = entity_doc_count[entity_text]
-        appearance_percent = (doc_count / number_of_documents * 100) if number_of_documents > 0 else 0.0
-        # If filter_type is specified, all entities have that type; otherwise use most common type
-        entity_type = filter_type if filter_type else entity_type_map.get(entity_text, "UNKNOWN")
-        
-        results.append({
-            "entity": entity_text,
-            "type": entity_type,
-            "count": total_count,
-            "appearance_percent": appearance_percent,
-            "document_count": doc_count
-        })
-    
-    return pd.DataFrame(results)
+    if method == "exact":
+        return _top_n_entities_exact(df[entities_column], top_n, filter_type, sort_by)
+    if method == "sketch":
+        return _top_n_entities_sketch(
+            df[entities_column],
+            top_n,
+            filter_type,
+            sort_by,
+            sketch_capacity=sketch_capacity,
+            sketch_epsilon=sketch_epsilon,
+            sketch_delta=sketch_delta,
+        )
+    raise ValueError(f"method must be 'exact' or 'sketch', got '{method}'")
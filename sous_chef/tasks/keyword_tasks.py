@@ -2,52 +2,87 @@
 Keyword extraction tasks.
 
 Extract keywords from texts using YAKE keyword extractor.
+
+``KeywordExtractor`` objects are kept in a process-wide pool (one per language and
+parameter set), so repeated task calls in a worker reuse them. With ``workers > 1``,
+rows are sent in chunks to a long-lived process pool whose workers hold their own
+extractor pools. The extraction itself lives in ``sous_chef.workers.keywords`` so a
+spawned worker never imports the ``sous_chef.tasks`` package.
 """
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
 import yake
-from typing import List
 from prefect import task
 import pandas as pd
-from .utils import add_column_from_function
+from .nlp.memo import memoized_column, row_key
+# Pool workers import only this module, never the sous_chef.tasks package
+from ..workers.keywords import (
+    extract_keywords_chunk,
+    extract_keywords_row,
+    get_extractor_pool,
+)
 
+KEYWORD_CHUNK_SIZE = 64
 
-def extract_keywords_row(
-    text: str,
-    language: str,
-    extractors: dict,
-    top_n: int = 50,
-    ngram_max: int = 3,
-    dedup_limit: float = 0.9
-) -> List[str]:
-    """
-    Extract keywords from a single text using YAKE.
-    
-    This is the core row-processing function.
-    
-    Args:
-        text: Text to extract keywords from
-        language: Language code (e.g., "en", "es")
-        extractors: Dict of language -> KeywordExtractor (for caching)
-        top_n: Number of top keywords to return
-        ngram_max: Maximum n-gram size
-        dedup_limit: Deduplication limit
-        
-    Returns:
-        List of keywords
-    """
-    # Get or create extractor for this language
-    if language not in extractors:
-        extractors[language] = yake.KeywordExtractor(
-            lan=language,
-            n=ngram_max,
-            dedupLim=dedup_limit,
-            top=top_n,
-            features=None
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_workers = 0
+_process_pool_lock = threading.Lock()
+
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Shared worker pool, rebuilt only when the requested size changes."""
+    global _process_pool, _process_pool_workers
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_workers != workers:
+            if _process_pool is not None:
+                _process_pool.shutdown(wait=True)
+            # spawn: never fork a process that may hold Prefect / torch threads
+            _process_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _process_pool_workers = workers
+        return _process_pool
+
+
+def _keywords_for(
+    texts: Sequence[str],
+    languages: Sequence[str],
+    params: Tuple[int, int, float],
+    workers: int = 1,
+    chunk_size: int = KEYWORD_CHUNK_SIZE,
+) -> List[List[str]]:
+    """Keywords for each text, in this process or across the worker pool."""
+    if workers > 1 and len(texts) > chunk_size:
+        chunks = [
+            (texts[i:i + chunk_size], languages[i:i + chunk_size])
+            for i in range(0, len(texts), chunk_size)
+        ]
+        # Executor.map yields results in submission order, so rows stay aligned
+        results = _get_process_pool(workers).map(
+            extract_keywords_chunk,
+            chunks,
+            [params] * len(chunks),
         )
-    
-    extractor = extractors[language]
-    keywords = extractor.extract_keywords(text)
-    # Extract just the keyword text (first element of each tuple)
-    return [kw[0] for kw in keywords]
+        return [keywords for chunk in results for keywords in chunk]
+
+    # Reuse this process's extractors (one per language) across calls
+    return extract_keywords_chunk((texts, languages), params)
+
+
+@atexit.register
+def shutdown_keyword_pool() -> None:
+    """Stop the parallel keyword workers (also runs at interpreter exit)."""
+    global _process_pool, _process_pool_workers
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True)
+        _process_pool = None
+        _process_pool_workers = 0
 
 
 @task
@@ -57,7 +92,10 @@ def extract_keywords(
     language_column: str = "language",
     top_n: int = 50,
     ngram_max: int = 3,
-    dedup_limit: float = 0.9
+    dedup_limit: float = 0.9,
+    workers: int = 1,
+    chunk_size: int = KEYWORD_CHUNK_SIZE,
+    use_memo: Optional[bool] = None,
 ) -> pd.DataFrame:
     """
     Extract keywords from DataFrame texts.
@@ -65,6 +103,10 @@ def extract_keywords(
     Adds a 'keywords' column to the DataFrame containing lists of keywords
     for each row. This keeps keywords associated with their source text.
     
+    With ``workers > 1`` the rows are split into chunks of ``chunk_size`` and
+    processed by a process pool that is kept alive between calls; output order
+    always matches the input.
+    
     Args:
         df: DataFrame with text and language columns
         text_column: Name of column containing text
@@ -72,6 +114,10 @@ def extract_keywords(
         top_n: Number of top keywords to extract per text
         ngram_max: Maximum n-gram size for keyword extraction
         dedup_limit: Deduplication limit for YAKE
+        workers: Number of worker processes (1 = run in this process)
+        chunk_size: Rows sent to a worker at a time in parallel mode
+        use_memo: Serve previously computed rows from the local enrichment memo
+            (default: SOUS_CHEF_ENRICHMENT_MEMO, off)
         
     Returns:
         DataFrame with 'keywords' column added
@@ -84,16 +130,34 @@ def extract_keywords(
         # articles now has: text, language, keywords columns
         # keywords[i] contains keywords extracted from text[i]
     """
-    # Create shared extractor cache (one per language)
-    extractors = {}
-    
-    return add_column_from_function(
-        df,
-        extract_keywords_row,
-        input_cols=[text_column, language_column],
-        output_col="keywords",
-        extractors=extractors,
-        top_n=top_n,
-        ngram_max=ngram_max,
-        dedup_limit=dedup_limit
-    )
\ No newline at end of file
+    if df.empty:
+        df["keywords"] = []
+        return df
+
+    texts = df[text_column].tolist()
+    languages = df[language_column].tolist()
+    params = (top_n, ngram_max, dedup_limit)
+
+    def compute(positions: List[int]) -> List[List[str]]:
+        return _keywords_for(
+            [texts[i] for i in positions],
+            [languages[i] for i in positions],
+            params,
+            workers=workers,
+            chunk_size=chunk_size,
+        )
+
+    # Rows seen before with the same parameters are served from the memo (opt-in)
+    df["keywords"] = memoized_column(
+        [row_key(text, language) for text, language in zip(texts, languages)],
+        compute,
+        task="extract_keywords",
+        params={
+            "yake": getattr(yake, "__version__", ""),
+            "top_n": top_n,
+            "ngram_max": ngram_max,
+            "dedup_limit": dedup_limit,
+        },
+        use_memo=use_memo,
+    )
+    return df
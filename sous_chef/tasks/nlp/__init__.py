@@ -0,0 +1,67 @@
+"""
+Shared NLP infrastructure for spaCy / ``transformers`` backed tasks.
+
+- :mod:`.registry`: process-wide model registry (lazy load, LRU eviction, preloading).
+- :mod:`.doc_cache`: on-disk ``DocBin`` cache so each document is parsed once across tasks.
+- :mod:`.chunking`: paragraph-aligned chunking and per-document caps for very long texts.
+- :mod:`.memo`: opt-in SQLite memo of per-story keyword / entity results across runs.
+- :mod:`.routing`: groups rows by language so each goes to a model for that language.
+- :mod:`.onnx_backend`: ONNX Runtime (optionally int8) stand-ins for classification pipelines.
+- :mod:`.embeddings`: mean-pooled, normalised sentence embeddings from a bi-encoder.
+- :mod:`.inference_server`: one long-lived process serving models to concurrent flow runs.
+"""
+from __future__ import annotations
+
+from .chunking import cap_text, pipe_chunked, split_text
+from .doc_cache import DocAnalysisCache, doc_cache_enabled, parse_texts
+from .embeddings import DEFAULT_EMBEDDING_MODEL, embed_texts, load_embedding_model
+from .inference_server import (
+    INFERENCE_SERVER_ENV,
+    InferenceServer,
+    InferenceServerClient,
+    connect_inference_server,
+)
+from .memo import EnrichmentMemo, memo_enabled, memoized_column
+from .onnx_backend import export_onnx_model, load_onnx_pipeline
+from .routing import model_language, route_by_language
+from .registry import (
+    SENTENCE_SEGMENTERS,
+    ModelRegistry,
+    get_model_registry,
+    load_sentence_segmenter,
+    load_spacy_model,
+    load_transformers_pipeline,
+    preload_models,
+    resolve_torch_device,
+)
+
+__all__ = [
+    "cap_text",
+    "pipe_chunked",
+    "split_text",
+    "DocAnalysisCache",
+    "doc_cache_enabled",
+    "parse_texts",
+    "DEFAULT_EMBEDDING_MODEL",
+    "embed_texts",
+    "load_embedding_model",
+    "INFERENCE_SERVER_ENV",
+    "InferenceServer",
+    "InferenceServerClient",
+    "connect_inference_server",
+    "EnrichmentMemo",
+    "memo_enabled",
+    "memoized_column",
+    "export_onnx_model",
+    "load_onnx_pipeline",
+    "model_language",
+    "route_by_language",
+    "SENTENCE_SEGMENTERS",
+    "ModelRegistry",
+    "get_model_registry",
+    "load_sentence_segmenter",
+    "load_spacy_model",
+    "load_transformers_pipeline",
+    "preload_models",
+    "resolve_torch_device",
+]
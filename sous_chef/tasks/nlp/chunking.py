@@ -0,0 +1,140 @@
+"""
+Length-aware chunking for very long documents (transcripts, live blogs).
+
+spaCy refuses texts over ``nlp.max_length`` and parser/NER memory grows with document
+length. :func:`split_text` cuts a text into pieces of at most ``max_chars`` on the
+coarsest boundary available (blank-line paragraph, line, sentence, whitespace, then a
+hard cut). Pieces concatenate back to the exact original text, and each cut is placed
+*before* the whitespace run so every piece after the first starts at a boundary.
+
+:func:`pipe_chunked` sends all chunks of all documents through one batched
+``nlp.pipe`` and stitches each document's chunks back with ``Doc.from_docs``; entity
+character offsets and sentence order in the stitched Doc are those of the original
+text. :func:`cap_text` truncates an outlier document to a per-document budget.
+"""
+from __future__ import annotations
+
+import os
+import re
+from typing import Any, Iterable, List, Optional, Tuple
+
+# Chunks well under spaCy's default max_length (1,000,000) keep parser memory flat
+DEFAULT_CHUNK_CHARS = 100_000
+MAX_DOC_CHARS_ENV = "SOUS_CHEF_MAX_DOC_CHARS"
+DEFAULT_MAX_DOC_CHARS = 300_000
+
+# Boundaries from coarsest to finest; each matches the whitespace run to cut before
+_BOUNDARIES = [
+    re.compile(r"\s*\n\s*\n\s*"),
+    re.compile(r"\s*\n\s*"),
+    re.compile(r"(?<=[.!?])\s+"),
+    re.compile(r"\s+"),
+]
+
+
+def _cut_points(text: str, level: int) -> List[int]:
+    if level >= len(_BOUNDARIES):
+        return []
+    return [m.start() for m in _BOUNDARIES[level].finditer(text) if m.start() > 0]
+
+
+def _split(text: str, max_chars: int, level: int) -> List[str]:
+    if len(text) <= max_chars:
+        return [text]
+    if level >= len(_BOUNDARIES):
+        return [text[i:i + max_chars] for i in range(0, len(text), max_chars)]
+
+    segments: List[str] = []
+    previous = 0
+    for cut in _cut_points(text, level) + [len(text)]:
+        if cut > previous:
+            segments.append(text[previous:cut])
+            previous = cut
+
+    # Greedily pack segments; anything still too long is split on a finer boundary
+    pieces: List[str] = []
+    current = ""
+    for segment in segments:
+        if len(segment) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.extend(_split(segment, max_chars, level + 1))
+        elif len(current) + len(segment) > max_chars:
+            pieces.append(current)
+            current = segment
+        else:
+            current += segment
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_text(text: str, max_chars: int = DEFAULT_CHUNK_CHARS) -> List[str]:
+    """Pieces of at most ``max_chars`` whose concatenation is exactly ``text``."""
+    if max_chars < 1:
+        raise ValueError("max_chars must be >= 1")
+    if not text:
+        return [text]
+    return _split(text, max_chars, 0)
+
+
+def cap_text(text: str, max_chars: Optional[int]) -> str:
+    """Longest boundary-aligned prefix of ``text`` within ``max_chars`` (no cap if None/<=0)."""
+    if not max_chars or max_chars <= 0 or len(text) <= max_chars:
+        return text
+    return split_text(text, max_chars)[0]
+
+
+def max_doc_chars(explicit: Optional[int] = None) -> Optional[int]:
+    """Per-document cap: explicit value wins, else ``SOUS_CHEF_MAX_DOC_CHARS``; <= 0 means no cap."""
+    if explicit is None:
+        raw = os.environ.get(MAX_DOC_CHARS_ENV)
+        explicit = int(raw) if raw and raw.strip() else DEFAULT_MAX_DOC_CHARS
+    return explicit if explicit > 0 else None
+
+
+def chunk_chars_for(nlp: Any, max_chars: Optional[int] = None) -> int:
+    """Chunk size for ``nlp``: ``max_chars`` (default DEFAULT_CHUNK_CHARS), below ``nlp.max_length``."""
+    limit = getattr(nlp, "max_length", None) or DEFAULT_CHUNK_CHARS
+    return max(1, min(max_chars or DEFAULT_CHUNK_CHARS, limit - 1))
+
+
+def pipe_chunked(
+    nlp: Any,
+    texts: Iterable[str],
+    batch_size: int = 64,
+    max_chunk_chars: Optional[int] = None,
+) -> Tuple[List[Any], int]:
+    """
+    Parse ``texts`` with ``nlp.pipe``, chunking long ones and stitching the results.
+
+    Returns:
+        ``(docs, chunked)``: Docs aligned with ``texts`` and the number of texts that
+        needed more than one chunk.
+    """
+    from spacy.tokens import Doc
+
+    chunk_chars = chunk_chars_for(nlp, max_chunk_chars)
+    pieces: List[str] = []
+    owners: List[int] = []
+    n_texts = 0
+    for i, text in enumerate(texts):
+        n_texts += 1
+        for piece in split_text(text, chunk_chars):
+            pieces.append(piece)
+            owners.append(i)
+
+    parts: List[List[Any]] = [[] for _ in range(n_texts)]
+    for owner, doc in zip(owners, nlp.pipe(pieces, batch_size=batch_size)):
+        parts[owner].append(doc)
+
+    docs: List[Any] = []
+    chunked = 0
+    for chunks in parts:
+        if len(chunks) == 1:
+            docs.append(chunks[0])
+        else:
+            chunked += 1
+            docs.append(Doc.from_docs(chunks, ensure_whitespace=False))
+    return docs, chunked
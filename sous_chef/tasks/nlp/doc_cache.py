@@ -0,0 +1,218 @@
+"""
+On-disk cache of parsed spaCy documents, shared by every task that parses article text.
+
+Entity extraction and sentence matching both run the same spaCy pipeline over the same
+story text. :func:`parse_texts` stores each parse as serialized ``DocBin`` bytes keyed by
+``(text hash, model, model version, spaCy version, enabled pipeline components)``, so
+whichever task parses a document first pays for it and later tasks (or reruns)
+deserialize instead of re-running the pipeline.
+
+Long texts are capped (``SOUS_CHEF_MAX_DOC_CHARS``) and parsed in paragraph-aligned
+chunks (see :mod:`.chunking`); the cache key is the capped text, and the chunk size is
+part of the key because it decides where a stitched Doc splits sentences.
+
+Layout: ``<cache dir>/docs/<model>-<version>-spacy<version>/<components + chunk size hash>/<hh>/<text hash>.spacy``.
+The cache is opt-in (``SOUS_CHEF_DOC_CACHE=1`` or ``use_cache=True``) because entries are
+never evicted; the directory can be deleted at any time.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, List, Optional
+
+from ...runtime import mark_step
+from ...utils import env_flag, get_cache_dir
+from .chunking import cap_text, chunk_chars_for, max_doc_chars, pipe_chunked
+
+logger = logging.getLogger(__name__)
+
+DOC_CACHE_ENV = "SOUS_CHEF_DOC_CACHE"
+DOC_CACHE_BATCH_SIZE = 64
+
+
+def doc_cache_enabled(explicit: Optional[bool] = None) -> bool:
+    """Explicit task argument wins; otherwise ``SOUS_CHEF_DOC_CACHE`` (default off)."""
+    if explicit is not None:
+        return explicit
+    return env_flag(DOC_CACHE_ENV, False)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _pipeline_id(nlp: Any, model: Optional[str]) -> str:
+    """Model name plus its package version and the spaCy version (parses differ across either)."""
+    import spacy
+
+    meta = getattr(nlp, "meta", {}) or {}
+    name = model or f"{meta.get('lang', 'xx')}_{meta.get('name', 'pipeline')}"
+    return f"{name}-{meta.get('version', '0')}-spacy{spacy.__version__}"
+
+
+class DocAnalysisCache:
+    """Parsed-document store for one spaCy pipeline (model + enabled components + chunk size)."""
+
+    def __init__(
+        self,
+        nlp: Any,
+        model: Optional[str] = None,
+        root: Optional[Path] = None,
+        max_chunk_chars: Optional[int] = None,
+    ):
+        from spacy.tokens import DocBin  # noqa: F401  (fail early without spaCy)
+
+        self.nlp = nlp
+        self.model = _pipeline_id(nlp, model)
+        self.components = tuple(nlp.pipe_names)
+        self.chunk_chars = chunk_chars_for(nlp, max_chunk_chars)
+        components_key = hashlib.sha1(
+            f"{','.join(self.components)}|chunk{self.chunk_chars}".encode("utf-8")
+        ).hexdigest()[:12]
+        safe_model = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.model)
+        self.directory = (root or get_cache_dir("docs")) / safe_model / components_key
+        self.max_chunk_chars = max_chunk_chars
+        self.hits = 0
+        self.misses = 0
+        self.chunked = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.spacy"
+
+    def get(self, text: str) -> Optional[Any]:
+        from spacy.tokens import DocBin
+
+        path = self._path(text_hash(text))
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            docs = list(DocBin().from_bytes(data).get_docs(self.nlp.vocab))
+        except Exception as e:
+            logger.warning("discarding unreadable doc cache entry %s: %s", path, e)
+            return None
+        if len(docs) != 1 or docs[0].text != text:
+            return None
+        return docs[0]
+
+    def put(self, text: str, doc: Any) -> None:
+        from spacy.tokens import DocBin
+
+        path = self._path(text_hash(text))
+        doc_bin = DocBin(store_user_data=False)
+        doc_bin.add(doc)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so concurrent readers never see a partial file
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(doc_bin.to_bytes())
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning("could not write doc cache entry %s: %s", path, e)
+
+    def pipe(self, texts: Iterable[str], batch_size: int = DOC_CACHE_BATCH_SIZE) -> List[Any]:
+        """Parsed docs aligned with ``texts``; only cache misses go through the pipeline."""
+        texts = list(texts)
+        docs: List[Any] = [None] * len(texts)
+        missing: List[int] = []
+        for i, text in enumerate(texts):
+            cached = self.get(text)
+            if cached is None:
+                missing.append(i)
+            else:
+                docs[i] = cached
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        # Identical texts within one call are parsed once
+        first_index: dict[str, int] = {}
+        to_parse: List[int] = []
+        for i in missing:
+            if texts[i] not in first_index:
+                first_index[texts[i]] = i
+                to_parse.append(i)
+        parsed, chunked = pipe_chunked(
+            self.nlp,
+            [texts[i] for i in to_parse],
+            batch_size=batch_size,
+            max_chunk_chars=self.max_chunk_chars,
+        )
+        self.chunked += chunked
+        for i, doc in zip(to_parse, parsed):
+            docs[i] = doc
+            self.put(texts[i], doc)
+        for i in missing:
+            if docs[i] is None:
+                docs[i] = docs[first_index[texts[i]]]
+        return docs
+
+
+def parse_texts(
+    nlp: Any,
+    texts: Iterable[Any],
+    *,
+    model: Optional[str] = None,
+    use_cache: Optional[bool] = None,
+    batch_size: int = DOC_CACHE_BATCH_SIZE,
+    max_chars: Optional[int] = None,
+    max_chunk_chars: Optional[int] = None,
+) -> List[Any]:
+    """
+    Parse ``texts`` with ``nlp`` (batched), reusing cached parses when enabled.
+
+    Non-string values (None / NaN) are parsed as empty text. Texts longer than
+    ``max_chars`` are truncated at a paragraph boundary, and long texts are parsed in
+    chunks of at most ``max_chunk_chars`` and stitched back into a single Doc.
+
+    Args:
+        nlp: spaCy Language object
+        texts: Texts to parse
+        model: Model name for the cache key (defaults to the pipeline's meta)
+        use_cache: Force the cache on/off (default: ``SOUS_CHEF_DOC_CACHE``, off)
+        batch_size: ``nlp.pipe`` batch size
+        max_chars: Per-document character cap (default: ``SOUS_CHEF_MAX_DOC_CHARS``,
+            300k; <= 0 disables)
+        max_chunk_chars: Chunk size for long documents (default 100k, always below
+            ``nlp.max_length``)
+
+    Returns:
+        List of spaCy Doc objects aligned with ``texts``
+    """
+    cap = max_doc_chars(max_chars)
+    texts = [t if isinstance(t, str) else "" for t in texts]
+    capped = [cap_text(t, cap) for t in texts]
+    truncated = sum(len(c) < len(t) for c, t in zip(capped, texts))
+    if truncated:
+        logger.warning("truncated %d document(s) to at most %d characters", truncated, cap)
+
+    if not doc_cache_enabled(use_cache):
+        docs, chunked = pipe_chunked(
+            nlp, capped, batch_size=batch_size, max_chunk_chars=max_chunk_chars
+        )
+        if chunked or truncated:
+            mark_step("long_documents", meta={"chunked": chunked, "truncated": truncated})
+        return docs
+
+    cache = DocAnalysisCache(nlp, model=model, max_chunk_chars=max_chunk_chars)
+    docs = cache.pipe(capped, batch_size=batch_size)
+    logger.info(
+        "doc cache %s: %d hits, %d parsed", cache.model, cache.hits, cache.misses
+    )
+    mark_step(
+        "doc_cache",
+        meta={
+            "model": cache.model,
+            "hits": cache.hits,
+            "misses": cache.misses,
+            "chunked": cache.chunked,
+            "truncated": truncated,
+        },
+    )
+    return docs
@@ -0,0 +1,74 @@
+"""
+Sentence embeddings from a ``transformers`` bi-encoder.
+
+:func:`embed_texts` mean-pools the last hidden state over non-padding tokens (the
+sentence-transformers recipe, without that dependency) and L2-normalises the result, so
+cosine similarity between two sets of texts is one matrix product. The tokenizer and
+model are loaded once through the model registry; texts are embedded in length-sorted
+batches so padding stays short.
+"""
+from __future__ import annotations
+
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+
+from .registry import get_model_registry, resolve_torch_device
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+EMBEDDING_TASK = "sentence-embedding"
+EMBEDDING_BATCH_SIZE = 32
+EMBEDDING_MAX_LENGTH = 256
+
+
+def load_embedding_model(model: str = DEFAULT_EMBEDDING_MODEL, device: int = -1) -> Tuple[Any, Any]:
+    """Cached ``(tokenizer, model)`` pair for ``model``, in eval mode on ``device``."""
+    torch_device = resolve_torch_device(device)
+
+    def _load() -> Tuple[Any, Any]:
+        from transformers import AutoModel, AutoTokenizer
+
+        encoder = AutoModel.from_pretrained(model)
+        encoder.eval()
+        if torch_device >= 0:
+            encoder.to(f"cuda:{torch_device}")
+        return AutoTokenizer.from_pretrained(model), encoder
+
+    return get_model_registry().get(model, EMBEDDING_TASK, str(torch_device), _load)
+
+
+def embed_texts(
+    texts: Sequence[str],
+    model: str = DEFAULT_EMBEDDING_MODEL,
+    device: int = -1,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    max_length: int = EMBEDDING_MAX_LENGTH,
+) -> np.ndarray:
+    """``(len(texts), dim)`` float32 array of unit-length embeddings (zeros for blank texts)."""
+    import torch
+
+    tokenizer, encoder = load_embedding_model(model, device)
+    positions = [pos for pos, text in enumerate(texts) if text.strip()]
+    dim = encoder.config.hidden_size
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    if not positions:
+        return out
+
+    order = sorted(positions, key=lambda pos: len(texts[pos]))
+    step = max(1, int(batch_size))
+    for start in range(0, len(order), step):
+        batch: List[int] = order[start:start + step]
+        encoded = tokenizer(
+            [texts[pos] for pos in batch],
+            padding=True,
+            truncation=True,
+            max_length=max_length,
+            return_tensors="pt",
+        ).to(encoder.device)
+        with torch.inference_mode():
+            hidden = encoder(**encoded).last_hidden_state
+        mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+        pooled = torch.nn.functional.normalize(pooled.float(), dim=-1)
+        out[batch] = pooled.cpu().numpy()
+    return out
@@ -0,0 +1,683 @@
+"""
+Long-lived local inference server shared by concurrent flow runs.
+
+Every flow run on a worker otherwise builds its own ``transformers`` pipeline for the
+zero-shot and ABSA models, paying the load time and the resident memory again. The
+server loads each model once (through the model registry) and serves it over a Unix
+socket or localhost HTTP.
+
+There is no authentication, and ``/v1/load`` loads (downloading if needed) any model a
+caller names. So the Unix socket is created owner-only (``0600``), and TCP addresses
+must be loopback unless the server is started with ``allow_remote``.
+
+- Requests from concurrent clients for the same model are batched together: one
+  batcher thread per model waits up to ``max_wait_ms`` after the first request for
+  more, up to ``max_batch_items`` items, and runs them in one length-sorted pass.
+- Zero-shot requests carry premise/hypothesis pairs (texts and hypotheses sent once,
+  pairs as index pairs) and get NLI logits back; scoring and label selection stay in
+  the client, so output columns match the in-process backends.
+- Clients find the server through ``SOUS_CHEF_INFERENCE_SERVER``
+  (``unix:///path.sock`` or ``http://127.0.0.1:8765``). With the variable unset, or a
+  server that does not answer, :func:`connect_inference_server` returns None and the
+  task loads the model in-process.
+
+Start one per worker with ``python run_inference_server.py``.
+
+Endpoints (JSON):
+
+- ``GET /v1/health``: runtime, loaded models and per-model batching counts
+- ``POST /v1/load`` ``{"task", "model"}``: load a model; its ``runtime`` (ONNX: whether
+  ``quantized``) and, for zero-shot, its ``entailment_id``
+- ``POST /v1/nli`` ``{"model", "texts", "hypotheses", "pairs"}``: ``{"results"}``, one
+  ``{"logits"}`` or ``{"error"}`` per pair
+- ``POST /v1/text-classification`` ``{"model", "inputs": [{"text", "text_pair"}]}``:
+  ``{"results"}``, one ``{"label", "score"}`` per input
+"""
+from __future__ import annotations
+
+import http.client
+import ipaddress
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import stat
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ...runtime import mark_step
+from .onnx_backend import onnx_quantize
+from .registry import get_model_registry, load_transformers_pipeline, resolve_torch_device
+
+logger = logging.getLogger(__name__)
+
+INFERENCE_SERVER_ENV = "SOUS_CHEF_INFERENCE_SERVER"
+DEFAULT_INFERENCE_SERVER_ADDRESS = "unix:///tmp/sous-chef-inference.sock"
+
+ZERO_SHOT_TASK = "zero-shot-classification"
+TEXT_CLASSIFICATION_TASK = "text-classification"
+SERVED_TASKS = (ZERO_SHOT_TASK, TEXT_CLASSIFICATION_TASK)
+
+# How long a batcher holds the first request open for others, and the most items it merges
+DEFAULT_MAX_WAIT_MS = 10.0
+DEFAULT_MAX_BATCH_ITEMS = 2048
+# Client timeout per request; a first request may wait for the model to load
+INFERENCE_SERVER_TIMEOUT_S = 600.0
+
+Address = Tuple[str, Union[str, Tuple[str, int]]]
+"""("unix", socket path) or ("tcp", (host, port))."""
+
+
+class InferenceServerError(RuntimeError):
+    """The inference server could not be reached or rejected a request."""
+
+
+def parse_server_address(raw: str) -> Address:
+    """``unix:///path``, ``/path`` or ``[http://]host:port`` -> :data:`Address`."""
+    value = raw.strip()
+    if value.startswith("unix://"):
+        return "unix", value[len("unix://"):]
+    if value.startswith("unix:"):
+        return "unix", value[len("unix:"):]
+    if value.startswith("/"):
+        return "unix", value
+    if value.startswith("http://"):
+        value = value[len("http://"):]
+    host, sep, port = value.rstrip("/").rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(
+            f"Invalid inference server address {raw!r}; expected 'unix:///path.sock' "
+            "or 'http://127.0.0.1:<port>'"
+        )
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _Job:
+    items: List[Any]
+    done: threading.Event = field(default_factory=threading.Event)
+    results: Optional[List[Any]] = None
+    error: Optional[BaseException] = None
+
+
+class _Batcher:
+    """Runs the jobs for one model from a single thread, merging those that queue up together."""
+
+    def __init__(
+        self,
+        run: Callable[[List[Any]], List[Any]],
+        max_wait_s: float,
+        max_items: int,
+    ):
+        self._run = run
+        self._max_wait_s = max_wait_s
+        self._max_items = max_items
+        self._queue: "queue.Queue[_Job]" = queue.Queue()
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.requests = 0
+        self.items = 0
+        self.max_requests_per_batch = 0
+        threading.Thread(target=self._loop, daemon=True).start()
+
+    def submit(self, items: Sequence[Any]) -> List[Any]:
+        """Results for ``items`` (in order), once the batch holding them has run."""
+        if not items:
+            return []
+        job = _Job(list(items))
+        self._queue.put(job)
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.results or []
+
+    def _collect(self) -> List[_Job]:
+        jobs = [self._queue.get()]
+        size = len(jobs[0].items)
+        deadline = time.monotonic() + self._max_wait_s
+        while size < self._max_items:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                job = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            jobs.append(job)
+            size += len(job.items)
+        return jobs
+
+    def _run_jobs(self, jobs: List[_Job]) -> None:
+        items = [item for job in jobs for item in job.items]
+        try:
+            results = self._run(items)
+        except Exception as e:
+            if len(jobs) == 1:
+                logger.warning("inference batch of %d items failed: %s", len(items), e)
+                jobs[0].error = e
+                return
+            # One client's bad input must not fail the others it was batched with
+            logger.warning(
+                "inference batch of %d requests failed (%s); retrying them one by one", len(jobs), e
+            )
+            for job in jobs:
+                self._run_jobs([job])
+            return
+        offset = 0
+        for job in jobs:
+            job.results = results[offset:offset + len(job.items)]
+            offset += len(job.items)
+
+    def _loop(self) -> None:
+        while True:
+            jobs = self._collect()
+            items = [item for job in jobs for item in job.items]
+            self._run_jobs(jobs)
+            for job in jobs:
+                job.done.set()
+            with self._lock:
+                self.batches += 1
+                self.requests += len(jobs)
+                self.items += len(items)
+                self.max_requests_per_batch = max(self.max_requests_per_batch, len(jobs))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "requests": self.requests,
+                "items": self.items,
+                "requests_per_batch": round(self.requests / self.batches, 2) if self.batches else None,
+                "max_requests_per_batch": self.max_requests_per_batch,
+            }
+
+
+class InferenceServer:
+    """
+    Loads models on first request (or :meth:`load`) and runs them for all clients.
+
+    Args:
+        runtime: "pytorch" or "onnx" for every model served
+        device: Device id for PyTorch (-1 for CPU)
+        batch_size: Pairs / inputs per forward pass
+        max_wait_ms: How long the first request of a batch waits for others
+        max_batch_items: Stop merging requests into a batch at this many items
+    """
+
+    def __init__(
+        self,
+        *,
+        runtime: str = "pytorch",
+        device: int = -1,
+        batch_size: int = 32,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        max_batch_items: int = DEFAULT_MAX_BATCH_ITEMS,
+    ):
+        if runtime not in ("pytorch", "onnx"):
+            raise ValueError(f"runtime must be 'pytorch' or 'onnx', got {runtime!r}")
+        self.runtime = runtime
+        self.device = device
+        self.batch_size = batch_size
+        self.max_wait_s = max_wait_ms / 1000.0
+        self.max_batch_items = max_batch_items
+        self.started = time.time()
+        self._batchers: Dict[Tuple[str, str], _Batcher] = {}
+        self._lock = threading.Lock()
+        self._http: Optional[socketserver.BaseServer] = None
+        self._socket_path: Optional[str] = None
+
+    def _device_key(self) -> str:
+        return "onnx" if self.runtime == "onnx" else str(resolve_torch_device(self.device))
+
+    def _zero_shot_runner(self, model: str) -> Any:
+        from ..zeroshot.batched import nli_runner
+        from ..zeroshot.local import load_local_zeroshot_classifier
+
+        clf = get_model_registry().get(
+            model,
+            ZERO_SHOT_TASK,
+            self._device_key(),
+            lambda: load_local_zeroshot_classifier(model, self.device, self.runtime),
+        )
+        runner = nli_runner(clf)
+        if runner is None:
+            raise ValueError(f"{model} cannot be run as batched NLI pairs")
+        return runner
+
+    def _text_classifier(self, model: str) -> Any:
+        if self.runtime == "onnx":
+            from .onnx_backend import load_onnx_pipeline
+
+            return load_onnx_pipeline(TEXT_CLASSIFICATION_TASK, model)
+        return load_transformers_pipeline(
+            TEXT_CLASSIFICATION_TASK, model, device=self.device, tokenizer=model
+        )
+
+    def _run_nli(self, model: str, items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        from ..zeroshot.batched import nli_pair_logits
+
+        logits, failed = nli_pair_logits(
+            self._zero_shot_runner(model),
+            [premise for premise, _ in items],
+            [hypothesis for _, hypothesis in items],
+            self.batch_size,
+        )
+        return [
+            {"error": failed[i]} if i in failed or logits is None else {"logits": logits[i].tolist()}
+            for i in range(len(items))
+        ]
+
+    def _run_text_classification(self, model: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        pipe = self._text_classifier(model)
+        # Length-sorted so each batch pads to similar lengths
+        order = sorted(range(len(items)), key=lambda i: len(items[i]["text"]))
+        results: List[Dict[str, Any]] = [{} for _ in items]
+        for i, result in zip(order, pipe([items[i] for i in order], batch_size=self.batch_size)):
+            first = result[0] if isinstance(result, list) else result
+            results[i] = {"label": first["label"], "score": float(first["score"])}
+        return results
+
+    def _batcher(self, task: str, model: str) -> _Batcher:
+        if task not in SERVED_TASKS:
+            raise ValueError(f"Unsupported task {task!r}; expected one of {SERVED_TASKS}")
+        with self._lock:
+            batcher = self._batchers.get((task, model))
+            if batcher is None:
+                run = self._run_nli if task == ZERO_SHOT_TASK else self._run_text_classification
+                batcher = _Batcher(
+                    lambda items: run(model, items), self.max_wait_s, self.max_batch_items
+                )
+                self._batchers[(task, model)] = batcher
+            return batcher
+
+    def load(self, task: str, model: str) -> Dict[str, Any]:
+        """Load ``model`` for ``task`` if needed (e.g. at start); what a client needs to use it."""
+        start = time.perf_counter()
+        self._batcher(task, model)
+        info: Dict[str, Any] = {"task": task, "model": model, "runtime": self.runtime}
+        if self.runtime == "onnx":
+            info["quantized"] = onnx_quantize()
+        if task == ZERO_SHOT_TASK:
+            info["entailment_id"] = int(self._zero_shot_runner(model).entailment_id)
+        else:
+            self._text_classifier(model)
+        info["load_ms"] = round((time.perf_counter() - start) * 1000.0, 1)
+        return info
+
+    def nli(
+        self,
+        model: str,
+        texts: Sequence[str],
+        hypotheses: Sequence[str],
+        pairs: Sequence[Sequence[int]],
+    ) -> List[Dict[str, Any]]:
+        """Logits (or an error) for each ``(text index, hypothesis index)`` pair."""
+        items = [(str(texts[t]), str(hypotheses[h])) for t, h in pairs]
+        return self._batcher(ZERO_SHOT_TASK, model).submit(items)
+
+    def text_classification(self, model: str, inputs: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Top ``{"label", "score"}`` for each ``{"text", "text_pair"}`` input."""
+        items = [{"text": str(i["text"]), "text_pair": i.get("text_pair")} for i in inputs]
+        return self._batcher(TEXT_CLASSIFICATION_TASK, model).submit(items)
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            batchers = dict(self._batchers)
+        return {
+            "runtime": self.runtime,
+            "device": self._device_key(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "registry": get_model_registry().stats(),
+            "batching": [
+                {"task": task, "model": model, **batcher.stats()}
+                for (task, model), batcher in batchers.items()
+            ],
+        }
+
+    def bind(self, address: str, allow_remote: bool = False) -> "InferenceServer":
+        """
+        Listen on ``address`` (see :func:`parse_server_address`); call :meth:`serve_forever` next.
+
+        A Unix socket left by a server that exited is replaced; one that still answers raises
+        :class:`InferenceServerError`. The socket is readable and writable by its owner only.
+        A TCP host must be loopback (``127.0.0.1``, ``::1``, ``localhost``) unless
+        ``allow_remote`` is set, since requests are not authenticated.
+        """
+        kind, target = parse_server_address(address)
+        if kind == "unix":
+            path = str(target)
+            if _unix_socket_answers(path):
+                raise InferenceServerError(f"an inference server is already listening on {path}")
+            if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+                os.unlink(path)  # stale socket from a previous server
+            http_server: socketserver.BaseServer = _UnixHTTPServer(path, _Handler, bind_and_activate=False)
+            try:
+                http_server.server_bind()
+                # Owner-only before listen(), so no other local user can ever connect
+                os.chmod(path, 0o600)
+                http_server.server_activate()
+            except BaseException:
+                http_server.server_close()
+                raise
+            self._socket_path = path
+        else:
+            host = target[0]  # type: ignore[index]
+            if not allow_remote and not _is_loopback(host):
+                raise InferenceServerError(
+                    f"refusing to listen on non-loopback host {host!r}: the inference server has "
+                    "no authentication (pass allow_remote=True / --allow-remote to override)"
+                )
+            http_server = ThreadingHTTPServer(target, _Handler)  # type: ignore[arg-type]
+        http_server.inference = self  # type: ignore[attr-defined]
+        self._http = http_server
+        return self
+
+    def serve_forever(self) -> None:
+        if self._http is None:
+            raise RuntimeError("call bind() before serve_forever()")
+        self._http.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop serving (from another thread) and remove the Unix socket."""
+        if self._http is not None:
+            self._http.shutdown()
+            self._http.server_close()
+            self._http = None
+        if self._socket_path and os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False
+
+
+def _unix_socket_answers(path: str) -> bool:
+    """Whether something accepts connections on the Unix socket at ``path``."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(1.0)
+    try:
+        sock.connect(path)
+    except OSError:
+        return False
+    finally:
+        sock.close()
+    return True
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(format, *args)
+
+    def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path == "/v1/health":
+            self._reply(200, self.server.inference.health())  # type: ignore[attr-defined]
+        else:
+            self._reply(404, {"error": f"no such endpoint {self.path}"})
+
+    def do_POST(self) -> None:
+        inference: InferenceServer = self.server.inference  # type: ignore[attr-defined]
+        routes: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "/v1/load": lambda b: inference.load(b["task"], b["model"]),
+            "/v1/nli": lambda b: {
+                "results": inference.nli(b["model"], b["texts"], b["hypotheses"], b["pairs"])
+            },
+            "/v1/text-classification": lambda b: {
+                "results": inference.text_classification(b["model"], b["inputs"])
+            },
+        }
+        route = routes.get(self.path)
+        if route is None:
+            self._reply(404, {"error": f"no such endpoint {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._reply(400, {"error": f"invalid JSON body: {e}"})
+            return
+        try:
+            self._reply(200, route(body))
+        except (KeyError, TypeError, ValueError, IndexError) as e:
+            self._reply(400, {"error": f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            logger.exception("inference request %s failed", self.path)
+            self._reply(500, {"error": f"{type(e).__name__}: {e}"[:2000]})
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self._path)
+        self.sock = sock
+
+
+class InferenceServerClient:
+    """JSON requests to an :class:`InferenceServer`; one connection per request, so thread-safe."""
+
+    def __init__(self, address: str, timeout: float = INFERENCE_SERVER_TIMEOUT_S):
+        self.address = address
+        self.timeout = timeout
+        self._target = parse_server_address(address)
+
+    def _connection(self) -> http.client.HTTPConnection:
+        kind, target = self._target
+        if kind == "unix":
+            return _UnixHTTPConnection(str(target), self.timeout)
+        host, port = target  # type: ignore[misc]
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def request(self, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        conn = self._connection()
+        try:
+            payload = None if body is None else json.dumps(body).encode("utf-8")
+            headers = {"Content-Type": "application/json"} if payload is not None else {}
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            data = json.loads(response.read() or b"{}")
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            raise InferenceServerError(f"{self.address}: {type(e).__name__}: {e}") from e
+        finally:
+            conn.close()
+        if response.status != 200:
+            raise InferenceServerError(f"{self.address}{path}: {response.status} {data.get('error', '')}")
+        return data
+
+    def health(self) -> Dict[str, Any]:
+        return self.request("GET", "/v1/health")
+
+    def load(self, task: str, model: str) -> Dict[str, Any]:
+        return self.request("POST", "/v1/load", {"task": task, "model": model})
+
+
+def served_scores_backend(info: Dict[str, Any]) -> str:
+    """
+    The in-process backend whose scores match a model the server loaded (``/v1/load`` info),
+    as score caches and memos key it: ``local`` for PyTorch, ``onnx-int8`` / ``onnx-fp32``.
+    """
+    if info.get("runtime") == "onnx":
+        return f"onnx-{'int8' if info.get('quantized', True) else 'fp32'}"
+    return "local"
+
+
+class RemoteZeroShotClassifier:
+    """
+    Zero-shot pipeline stand-in whose NLI pairs run on the inference server.
+
+    The batched local path drives it through :meth:`pair_logits` (see ``zeroshot.batched``);
+    calling it like the ``transformers`` pipeline classifies one text. ``scores_backend``
+    is what :func:`served_scores_backend` gives for the server's runtime.
+    """
+
+    def __init__(
+        self,
+        client: InferenceServerClient,
+        model: str,
+        entailment_id: int,
+        scores_backend: str = "local",
+    ):
+        self.client = client
+        self.model = model
+        self.entailment_id = entailment_id
+        self.scores_backend = scores_backend
+
+    def pair_logits(
+        self, premises: List[str], hypotheses: List[str]
+    ) -> Tuple[Optional[np.ndarray], Dict[int, str]]:
+        """Same contract as ``zeroshot.batched.nli_pair_logits``; a failed request fails every pair."""
+        texts = list(dict.fromkeys(premises))
+        hyps = list(dict.fromkeys(hypotheses))
+        text_ids = {t: i for i, t in enumerate(texts)}
+        hyp_ids = {h: i for i, h in enumerate(hyps)}
+        body = {
+            "model": self.model,
+            "texts": texts,
+            "hypotheses": hyps,
+            "pairs": [[text_ids[p], hyp_ids[h]] for p, h in zip(premises, hypotheses)],
+        }
+        try:
+            results = self.client.request("POST", "/v1/nli", body)["results"]
+        except InferenceServerError as e:
+            err = str(e)[:2000]
+            logger.warning("inference server NLI request of %d pairs failed: %s", len(premises), err)
+            return None, {i: err for i in range(len(premises))}
+
+        logits: Optional[np.ndarray] = None
+        failed: Dict[int, str] = {}
+        for i, result in enumerate(results):
+            if "error" in result:
+                failed[i] = result["error"]
+                continue
+            if logits is None:
+                logits = np.zeros((len(results), len(result["logits"])), dtype=np.float32)
+            logits[i] = result["logits"]
+        return logits, failed
+
+    def __call__(
+        self,
+        text: str,
+        candidate_labels: List[str],
+        hypothesis_template: str = "This example is {}.",
+        multi_label: bool = False,
+    ) -> Dict[str, Any]:
+        from ..zeroshot.batched import _scores
+
+        labels = list(candidate_labels)
+        logits, failed = self.pair_logits(
+            [text] * len(labels), [hypothesis_template.format(label) for label in labels]
+        )
+        if failed or logits is None:
+            raise InferenceServerError(next(iter(failed.values()), "no logits returned"))
+        scores = _scores(logits.reshape(1, len(labels), -1), self.entailment_id, multi_label)[0]
+        top = list(reversed(scores.argsort()))
+        return {
+            "sequence": text,
+            "labels": [labels[i] for i in top],
+            "scores": scores[top].tolist(),
+        }
+
+
+class RemoteTextClassifier:
+    """``text-classification`` pipeline stand-in (single text or list of ``{"text", "text_pair"}``)."""
+
+    def __init__(self, client: InferenceServerClient, model: str, scores_backend: str = "local"):
+        self.client = client
+        self.model = model
+        self.scores_backend = scores_backend
+
+    def _classify(self, inputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        body = {"model": self.model, "inputs": inputs}
+        return self.client.request("POST", "/v1/text-classification", body)["results"]
+
+    def __call__(self, inputs: Any, text_pair: Optional[str] = None, batch_size: Optional[int] = None) -> Any:
+        if isinstance(inputs, str):
+            return self._classify([{"text": inputs, "text_pair": text_pair}])
+        return self._classify(
+            [{"text": item["text"], "text_pair": item.get("text_pair")} for item in inputs]
+        )
+
+
+def inference_server_client(address: Optional[str] = None) -> Optional[InferenceServerClient]:
+    """Client for ``address`` (default ``SOUS_CHEF_INFERENCE_SERVER``), or None when unset."""
+    raw = address if address is not None else os.environ.get(INFERENCE_SERVER_ENV, "")
+    if not raw.strip():
+        return None
+    return InferenceServerClient(raw.strip())
+
+
+def connect_inference_server(task: str, model: str, address: Optional[str] = None) -> Optional[Any]:
+    """
+    Pipeline stand-in for ``task`` / ``model`` served by the inference server, or None when
+    no server is configured or it does not answer (the caller then loads ``model`` itself).
+
+    The server loads the model if it has not yet, so the first call may take a while.
+    """
+    if task not in SERVED_TASKS:
+        raise ValueError(f"Unsupported task {task!r}; expected one of {SERVED_TASKS}")
+    client = inference_server_client(address)
+    if client is None:
+        return None
+    try:
+        info = client.load(task, model)
+    except InferenceServerError as e:
+        logger.warning("inference server unavailable (%s); loading %s in this process", e, model)
+        mark_step(
+            "inference_server",
+            meta={"address": client.address, "task": task, "model": model, "fallback": True},
+        )
+        return None
+    mark_step(
+        "inference_server",
+        meta={
+            "address": client.address,
+            "task": task,
+            "model": model,
+            "fallback": False,
+            "runtime": info.get("runtime"),
+            "load_ms": info.get("load_ms"),
+        },
+    )
+    scores_backend = served_scores_backend(info)
+    if task == ZERO_SHOT_TASK:
+        return RemoteZeroShotClassifier(client, model, int(info["entailment_id"]), scores_backend)
+    return RemoteTextClassifier(client, model, scores_backend)
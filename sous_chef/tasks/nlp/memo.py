@@ -0,0 +1,174 @@
+"""
+Opt-in local memo of per-story enrichment results (keywords, entities).
+
+Reruns of a flow with different export settings see the same story text again;
+:func:`memoized_column` looks each row up in a SQLite table keyed by
+``(text hash, task name, params hash)`` and only hands the misses to the compute
+function, so a fully-memoized run never loads an NLP model. Results are stored as
+JSON. Hit rates are logged and reported as an ``enrichment_memo`` runtime step.
+
+Enable with ``SOUS_CHEF_ENRICHMENT_MEMO=1`` or a task's ``use_memo=True``. The file
+lives at ``<cache dir>/enrichment_memo.sqlite`` and can be deleted at any time.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from ...runtime import mark_step
+from ...utils import env_flag, get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+ENRICHMENT_MEMO_ENV = "SOUS_CHEF_ENRICHMENT_MEMO"
+MEMO_FILENAME = "enrichment_memo.sqlite"
+# SQLite caps the number of bound parameters per statement
+_LOOKUP_BATCH = 500
+
+
+def memo_enabled(explicit: Optional[bool] = None) -> bool:
+    """Explicit task argument wins; otherwise ``SOUS_CHEF_ENRICHMENT_MEMO`` (default off)."""
+    if explicit is not None:
+        return explicit
+    return env_flag(ENRICHMENT_MEMO_ENV, False)
+
+
+def params_hash(params: Dict[str, Any]) -> str:
+    """Stable hash of the parameters (model name, settings) that shape a result."""
+    blob = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def row_key(text: Any, *context: Any) -> str:
+    """Hash of a row's text plus any per-row inputs (e.g. language) that affect the result."""
+    text = text if isinstance(text, str) else ""
+    parts = [str(c) for c in context] + [text]
+    return hashlib.sha1("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
+class EnrichmentMemo:
+    """SQLite-backed ``(text hash, task, params hash) -> JSON`` store."""
+
+    _lock = threading.Lock()
+
+    def __init__(self, task: str, params: Dict[str, Any], path: Optional[Path] = None):
+        self.task = task
+        self.params_hash = params_hash(params)
+        self.path = path or get_cache_dir() / MEMO_FILENAME
+        self.hits = 0
+        self.misses = 0
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS memo ("
+                " text_hash TEXT NOT NULL,"
+                " task TEXT NOT NULL,"
+                " params_hash TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " PRIMARY KEY (text_hash, task, params_hash)"
+                ") WITHOUT ROWID"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """One transaction (committed, or rolled back on error) on a connection closed afterwards."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            # WAL lets concurrent workers read while one writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        found: Dict[str, Any] = {}
+        unique = list(dict.fromkeys(keys))
+        with self._connect() as conn:
+            for start in range(0, len(unique), _LOOKUP_BATCH):
+                batch = unique[start:start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(
+                    f"SELECT text_hash, value FROM memo WHERE task = ? AND params_hash = ?"
+                    f" AND text_hash IN ({placeholders})",
+                    [self.task, self.params_hash, *batch],
+                )
+                for text_hash, value in rows:
+                    found[text_hash] = json.loads(value)
+        return found
+
+    def put_many(self, items: Dict[str, Any]) -> None:
+        if not items:
+            return
+        try:
+            with self._lock, self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO memo (text_hash, task, params_hash, value) VALUES (?, ?, ?, ?)",
+                    [(k, self.task, self.params_hash, json.dumps(v)) for k, v in items.items()],
+                )
+        except sqlite3.Error as e:
+            logger.warning("could not write enrichment memo %s: %s", self.path, e)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def memoized_column(
+    keys: Sequence[str],
+    compute: Callable[[List[int]], List[Any]],
+    *,
+    task: str,
+    params: Dict[str, Any],
+    use_memo: Optional[bool] = None,
+) -> List[Any]:
+    """
+    Values for each row, served from the memo where possible.
+
+    Args:
+        keys: One :func:`row_key` per row
+        compute: Called once with the row positions that missed; returns their
+            values in the same order (this is where models get loaded)
+        task: Task name part of the memo key (e.g. "extract_entities")
+        params: Parameters part of the memo key (model name, settings)
+        use_memo: Force the memo on/off (default: ``SOUS_CHEF_ENRICHMENT_MEMO``)
+
+    Returns:
+        List of values aligned with ``keys``
+    """
+    if not memo_enabled(use_memo):
+        return compute(list(range(len(keys))))
+
+    memo = EnrichmentMemo(task, params)
+    found = memo.get_many(keys)
+    missing = [i for i, key in enumerate(keys) if key not in found]
+    memo.hits = len(keys) - len(missing)
+    memo.misses = len(missing)
+
+    values: List[Any] = [found.get(key) for key in keys]
+    if missing:
+        computed = compute(missing)
+        for i, value in zip(missing, computed):
+            values[i] = value
+        memo.put_many({keys[i]: value for i, value in zip(missing, computed)})
+
+    logger.info(
+        "enrichment memo %s: %d hits, %d computed (%.0f%% hit rate)",
+        task, memo.hits, memo.misses, memo.hit_rate * 100,
+    )
+    mark_step(
+        "enrichment_memo",
+        meta={
+            "task": task,
+            "hits": memo.hits,
+            "misses": memo.misses,
+            "hit_rate": round(memo.hit_rate, 4),
+        },
+    )
+    return values
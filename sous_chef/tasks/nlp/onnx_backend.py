@@ -0,0 +1,299 @@
+"""
+ONNX Runtime backend for ``transformers`` sequence-classification models on CPU.
+
+Workers have no GPUs, and fp32 PyTorch leaves a lot of CPU throughput on the table.
+:func:`export_onnx_model` exports a Hugging Face model to ONNX once (or picks up a
+pre-exported ``model.onnx`` shipped in a local model directory) and, by default, adds
+a dynamically int8-quantized copy; both live under ``<cache dir>/onnx/<model>``.
+
+:func:`load_onnx_pipeline` returns small callables with the same call signature and
+output shape as the ``transformers`` pipelines the tasks already use
+(``text-classification`` and ``zero-shot-classification``), so a task switches backend
+by changing how it loads the model. Sessions are cached in the model registry.
+
+- ``SOUS_CHEF_ONNX_QUANTIZE`` (default on): use the int8 model.
+- ``SOUS_CHEF_ONNX_THREADS`` (default: all cores): ONNX Runtime intra-op threads.
+
+Requires ``onnxruntime`` and ``onnx`` (``pip install sous-chef[onnx]``).
+"""
+from __future__ import annotations
+
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ...utils import env_flag, get_cache_dir
+from .registry import get_model_registry
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+logger = logging.getLogger(__name__)
+
+ONNX_QUANTIZE_ENV = "SOUS_CHEF_ONNX_QUANTIZE"
+ONNX_THREADS_ENV = "SOUS_CHEF_ONNX_THREADS"
+ONNX_OPSET = 17
+ONNX_BATCH_SIZE = 32
+# Tokenizers without a real limit report a huge sentinel model_max_length
+_MAX_SEQUENCE_LENGTH = 8192
+
+
+def _require_onnxruntime() -> None:
+    if onnxruntime is None:
+        raise ImportError(
+            "onnxruntime is required for the onnx backend. "
+            "Install it with: pip install onnxruntime onnx"
+        )
+
+
+def onnx_quantize(explicit: Optional[bool] = None) -> bool:
+    """Explicit argument wins; otherwise ``SOUS_CHEF_ONNX_QUANTIZE`` (default on)."""
+    return explicit if explicit is not None else env_flag(ONNX_QUANTIZE_ENV, True)
+
+
+def onnx_threads(explicit: Optional[int] = None) -> int:
+    """Explicit argument wins; otherwise ``SOUS_CHEF_ONNX_THREADS``, else all cores."""
+    if explicit is None:
+        raw = os.environ.get(ONNX_THREADS_ENV)
+        explicit = int(raw) if raw and raw.strip() else 0
+    return explicit if explicit > 0 else (os.cpu_count() or 1)
+
+
+def _shipped_onnx(model: str) -> Optional[Path]:
+    root = Path(model)
+    if not root.is_dir():
+        return None
+    for candidate in (root / "model.onnx", root / "onnx" / "model.onnx"):
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def export_onnx_model(
+    model: str,
+    quantize: Optional[bool] = None,
+    directory: Optional[Path] = None,
+) -> Path:
+    """
+    Path of the ONNX file for ``model``, exporting / quantizing on first use.
+
+    Args:
+        model: Hugging Face model id or local directory
+        quantize: Return the dynamically int8-quantized model (default: ``SOUS_CHEF_ONNX_QUANTIZE``)
+        directory: Where exports are kept (default ``<cache dir>/onnx/<model>``)
+    """
+    _require_onnxruntime()
+    directory = directory or get_cache_dir("onnx", re.sub(r"[^A-Za-z0-9_.-]+", "__", model))
+    directory.mkdir(parents=True, exist_ok=True)
+
+    fp32 = _shipped_onnx(model) or directory / "model.onnx"
+    if not fp32.exists():
+        _export_fp32(model, fp32)
+    if not onnx_quantize(quantize):
+        return fp32
+
+    int8 = directory / "model.int8.onnx"
+    if not int8.exists():
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logger.info("quantizing %s to int8", fp32)
+        partial = int8.with_suffix(".partial")
+        quantize_dynamic(str(fp32), str(partial), weight_type=QuantType.QInt8)
+        partial.replace(int8)
+    return int8
+
+
+def _export_fp32(model: str, path: Path) -> None:
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    logger.info("exporting %s to ONNX at %s", model, path)
+    tokenizer = AutoTokenizer.from_pretrained(model)
+    torch_model = AutoModelForSequenceClassification.from_pretrained(model).eval()
+    sample = tokenizer(
+        ["An example premise.", "Another one"],
+        ["an example hypothesis", "another"],
+        padding=True,
+        return_tensors="pt",
+    )
+    names = list(sample.keys())
+    partial = path.with_suffix(".partial")
+    with torch.no_grad():
+        torch.onnx.export(
+            torch_model,
+            (dict(sample),),
+            str(partial),
+            input_names=names,
+            output_names=["logits"],
+            dynamic_axes={
+                **{name: {0: "batch", 1: "sequence"} for name in names},
+                "logits": {0: "batch"},
+            },
+            opset_version=ONNX_OPSET,
+            dynamo=False,
+        )
+    partial.replace(path)
+
+
+def _softmax(x: np.ndarray, axis: int = -1) -> np.ndarray:
+    shifted = np.exp(x - x.max(axis=axis, keepdims=True))
+    return shifted / shifted.sum(axis=axis, keepdims=True)
+
+
+class OnnxSequenceClassifier:
+    """Tokenizer + ONNX Runtime session returning raw logits."""
+
+    def __init__(self, model: str, quantize: Optional[bool] = None, threads: Optional[int] = None):
+        _require_onnxruntime()
+        from transformers import AutoConfig, AutoTokenizer
+
+        self.model = model
+        self.quantize = onnx_quantize(quantize)
+        self.threads = onnx_threads(threads)
+        self.path = export_onnx_model(model, quantize=self.quantize)
+        self.tokenizer = AutoTokenizer.from_pretrained(model)
+        config = AutoConfig.from_pretrained(model)
+        self.id2label: Dict[int, str] = {int(k): v for k, v in config.id2label.items()}
+        self.label2id: Dict[str, int] = {k: int(v) for k, v in config.label2id.items()}
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = self.threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(
+            str(self.path), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+        self.max_length = min(self.tokenizer.model_max_length or _MAX_SEQUENCE_LENGTH, _MAX_SEQUENCE_LENGTH)
+
+    def logits(
+        self,
+        texts: Sequence[str],
+        text_pairs: Optional[Sequence[str]] = None,
+        batch_size: int = ONNX_BATCH_SIZE,
+    ) -> np.ndarray:
+        """``(len(texts), num_labels)`` float32 logits; pairs truncate the first text only."""
+        batches: List[np.ndarray] = []
+        for start in range(0, len(texts), max(1, batch_size)):
+            stop = start + max(1, batch_size)
+            encoded = self.tokenizer(
+                list(texts[start:stop]),
+                list(text_pairs[start:stop]) if text_pairs is not None else None,
+                padding=True,
+                truncation="only_first" if text_pairs is not None else True,
+                max_length=self.max_length,
+                return_tensors="np",
+            )
+            feed = {name: encoded[name].astype(np.int64) for name in self.input_names if name in encoded}
+            batches.append(self.session.run(None, feed)[0].astype(np.float32))
+        if not batches:
+            return np.zeros((0, len(self.id2label)), dtype=np.float32)
+        return np.concatenate(batches)
+
+
+class OnnxTextClassificationPipeline:
+    """Drop-in for a ``text-classification`` pipeline: top ``{"label", "score"}`` per input."""
+
+    def __init__(self, classifier: OnnxSequenceClassifier):
+        self.classifier = classifier
+
+    def __call__(
+        self,
+        inputs: Union[str, List[Any]],
+        text_pair: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        **_: Any,
+    ) -> List[Dict[str, Any]]:
+        if isinstance(inputs, str):
+            texts, pairs = [inputs], [text_pair] if text_pair is not None else None
+        else:
+            texts = [item["text"] if isinstance(item, dict) else item for item in inputs]
+            pairs = [item.get("text_pair") for item in inputs] if inputs and isinstance(inputs[0], dict) else None
+            if pairs is not None and any(p is None for p in pairs):
+                pairs = None
+        logits = self.classifier.logits(texts, pairs, batch_size=batch_size or ONNX_BATCH_SIZE)
+        # Same default as transformers: sigmoid for a single output, softmax otherwise
+        probs = 1 / (1 + np.exp(-logits)) if logits.shape[-1] == 1 else _softmax(logits)
+        best = probs.argmax(axis=-1)
+        return [
+            {"label": self.classifier.id2label[int(i)], "score": float(p[i])}
+            for i, p in zip(best, probs)
+        ]
+
+
+class OnnxZeroShotPipeline:
+    """Drop-in for a ``zero-shot-classification`` pipeline (NLI premise/hypothesis pairs)."""
+
+    def __init__(self, classifier: OnnxSequenceClassifier):
+        self.classifier = classifier
+        self.entailment_id = next(
+            (i for label, i in classifier.label2id.items() if label.lower().startswith("entail")),
+            -1,
+        )
+
+    def __call__(
+        self,
+        sequences: str,
+        candidate_labels: Sequence[str],
+        hypothesis_template: str = "This example is {}.",
+        multi_label: bool = False,
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        labels = list(candidate_labels)
+        hypotheses = [hypothesis_template.format(label) for label in labels]
+        logits = self.classifier.logits(
+            [sequences] * len(labels), hypotheses, batch_size=batch_size or ONNX_BATCH_SIZE
+        )
+        if multi_label or len(labels) == 1:
+            # Entailment vs. contradiction per label, as in transformers
+            contradiction_id = -1 if self.entailment_id == 0 else 0
+            scores = _softmax(logits[:, [contradiction_id, self.entailment_id]])[:, 1]
+        else:
+            scores = _softmax(logits[:, self.entailment_id])
+        order = np.argsort(-scores, kind="stable")
+        return {
+            "sequence": sequences,
+            "labels": [labels[i] for i in order],
+            "scores": [float(scores[i]) for i in order],
+        }
+
+
+_PIPELINES = {
+    "text-classification": OnnxTextClassificationPipeline,
+    "zero-shot-classification": OnnxZeroShotPipeline,
+}
+
+
+def load_onnx_pipeline(
+    task: str,
+    model: str,
+    quantize: Optional[bool] = None,
+    threads: Optional[int] = None,
+) -> Any:
+    """
+    Cached ONNX Runtime stand-in for ``transformers.pipeline(task, model=model)``.
+
+    Args:
+        task: "text-classification" or "zero-shot-classification"
+        model: Hugging Face model id or local directory
+        quantize: int8 model (default: ``SOUS_CHEF_ONNX_QUANTIZE``, on)
+        threads: Intra-op threads (default: ``SOUS_CHEF_ONNX_THREADS`` or all cores)
+    """
+    if task not in _PIPELINES:
+        raise ValueError(f"Unsupported onnx task {task!r}; expected one of {sorted(_PIPELINES)}")
+    _require_onnxruntime()
+    quantize = onnx_quantize(quantize)
+    threads = onnx_threads(threads)
+    variant = f"{model}@{'int8' if quantize else 'fp32'}/t{threads}"
+    return get_model_registry().get(
+        variant,
+        f"onnx-{task}",
+        "cpu",
+        lambda: _PIPELINES[task](OnnxSequenceClassifier(model, quantize=quantize, threads=threads)),
+    )
@@ -0,0 +1,385 @@
+"""
+Process-wide registry of loaded NLP models (spaCy pipelines, ``transformers`` pipelines).
+
+Tasks used to call ``spacy_download.load_spacy(model)`` or ``transformers.pipeline(...)``
+on every invocation. On a long-lived worker that means paying seconds of model load per
+task call, for every flow run. The registry keeps loaded models keyed by
+``(model name, task, device)`` and hands the same object back on later calls.
+
+- Loads are lazy: nothing is loaded until a task asks for it.
+- Entries are evicted least-recently-used first once the estimated resident size of
+  all entries exceeds the memory budget (``SOUS_CHEF_MODEL_MEMORY_BUDGET_MB``).
+- Workers can warm the registry with :func:`preload_models`; models listed in
+  ``SOUS_CHEF_PRELOAD_MODELS`` are loaded once per process when the first runtime
+  session starts (:func:`preload_models_from_env`).
+- Every load is reported to the runtime timeline via ``mark_step("model_load", ...)``.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ...runtime import mark_step
+
+# Lazy import to avoid requiring spacy at module load time
+try:
+    import spacy_download
+except ImportError:
+    spacy_download = None
+
+logger = logging.getLogger(__name__)
+
+MODEL_MEMORY_BUDGET_ENV = "SOUS_CHEF_MODEL_MEMORY_BUDGET_MB"
+PRELOAD_MODELS_ENV = "SOUS_CHEF_PRELOAD_MODELS"
+
+# Default budget for all cached models in one process (a worker holds a few spaCy
+# pipelines plus one or two transformer models comfortably within this).
+DEFAULT_MODEL_MEMORY_BUDGET_MB = 8192
+
+SPACY_TASK = "spacy"
+
+# Sentence segmentation backends, slowest / most accurate first:
+# "parser" - the full pipeline, sentences from the dependency parse
+# "senter" - the model's statistical sentence recognizer only (everything else disabled)
+# "sentencizer" - rule-based punctuation splitter on a blank pipeline (no model download)
+SENTENCE_SEGMENTERS = ("parser", "senter", "sentencizer")
+
+ModelKey = Tuple[str, str, str]
+"""(model name, task, device) — e.g. ("en_core_web_sm", "spacy", "cpu")."""
+
+
+@dataclass
+class _Entry:
+    model: Any
+    size_bytes: int
+    load_seconds: float
+
+
+def _current_rss_bytes() -> int:
+    """Resident set size of this process (Linux ``/proc``); 0 where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0
+
+
+def _torch_parameter_bytes(model: Any) -> int:
+    """Parameter + buffer bytes of a ``transformers`` pipeline (or bare torch module)."""
+    module = getattr(model, "model", model)
+    total = 0
+    for attr in ("parameters", "buffers"):
+        tensors = getattr(module, attr, None)
+        if not callable(tensors):
+            continue
+        try:
+            total += sum(t.numel() * t.element_size() for t in tensors())
+        except Exception:
+            return 0
+    return total
+
+
+def _budget_from_env() -> Optional[int]:
+    raw = os.environ.get(MODEL_MEMORY_BUDGET_ENV)
+    if raw is None or not raw.strip():
+        return DEFAULT_MODEL_MEMORY_BUDGET_MB * 1024 * 1024
+    mb = float(raw)
+    if mb <= 0:
+        return None  # unbounded
+    return int(mb * 1024 * 1024)
+
+
+class ModelRegistry:
+    """
+    LRU cache of loaded models with a memory budget.
+
+    Sizes are estimates: parameter bytes for torch-backed pipelines, otherwise the
+    change in process RSS observed across the load. The entry that was just loaded is
+    never evicted, so a single model larger than the budget still works (alone).
+    """
+
+    def __init__(self, memory_budget_bytes: Optional[int] = None):
+        self.memory_budget_bytes = memory_budget_bytes
+        self._entries: "OrderedDict[ModelKey, _Entry]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._load_locks: Dict[ModelKey, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        name: str,
+        task: str,
+        device: str,
+        loader: Callable[[], Any],
+    ) -> Any:
+        """Return the cached model for ``(name, task, device)``, loading it on first use."""
+        key: ModelKey = (name, task, str(device))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.model
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given key; others wait and then reuse it.
+        with load_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.model
+            return self._load(key, loader)
+
+    def _load(self, key: ModelKey, loader: Callable[[], Any]) -> Any:
+        rss_before = _current_rss_bytes()
+        t0 = time.monotonic()
+        model = loader()
+        load_seconds = time.monotonic() - t0
+        size_bytes = _torch_parameter_bytes(model) or max(
+            _current_rss_bytes() - rss_before, 0
+        )
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = _Entry(model, size_bytes, load_seconds)
+            evicted = self._evict_over_budget(keep=key)
+
+        name, task, device = key
+        logger.info(
+            "loaded model %s (%s, %s) in %.2fs, ~%.0f MB",
+            name,
+            task,
+            device,
+            load_seconds,
+            size_bytes / 1e6,
+        )
+        mark_step(
+            "model_load",
+            meta={
+                "model": name,
+                "task": task,
+                "device": device,
+                "load_ms": round(load_seconds * 1000.0, 1),
+                "size_mb": round(size_bytes / 1e6, 1),
+                "evicted": [k[0] for k in evicted],
+            },
+        )
+        return model
+
+    def _evict_over_budget(self, keep: ModelKey) -> List[ModelKey]:
+        evicted: List[ModelKey] = []
+        if self.memory_budget_bytes is None:
+            return evicted
+        for key in list(self._entries.keys()):
+            if self.total_bytes() <= self.memory_budget_bytes:
+                break
+            if key == keep:
+                continue
+            del self._entries[key]
+            evicted.append(key)
+        return evicted
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(e.size_bytes for e in self._entries.values())
+
+    def evict(self, name: str, task: str, device: str) -> bool:
+        with self._lock:
+            return self._entries.pop((name, task, str(device)), None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def keys(self) -> List[ModelKey]:
+        with self._lock:
+            return list(self._entries.keys())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "models": [
+                    {
+                        "model": k[0],
+                        "task": k[1],
+                        "device": k[2],
+                        "size_mb": round(e.size_bytes / 1e6, 1),
+                        "load_ms": round(e.load_seconds * 1000.0, 1),
+                    }
+                    for k, e in self._entries.items()
+                ],
+                "total_mb": round(self.total_bytes() / 1e6, 1),
+                "budget_mb": (
+                    None
+                    if self.memory_budget_bytes is None
+                    else round(self.memory_budget_bytes / 1e6, 1)
+                ),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """The process-wide registry (created on first use from the environment)."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry(memory_budget_bytes=_budget_from_env())
+        return _registry
+
+
+def resolve_torch_device(device: int = -1) -> int:
+    """Map a requested device id to a usable one: -1 (CPU) unless CUDA is available."""
+    if device == -1:
+        return -1
+    import torch
+
+    return device if torch.cuda.is_available() else -1
+
+
+def load_spacy_model(model: str) -> Any:
+    """Cached ``spacy_download.load_spacy(model)``."""
+    if spacy_download is None:
+        raise ImportError(
+            "spacy-download is required to load spaCy models. "
+            "Install it with: pip install spacy-download"
+        )
+    return get_model_registry().get(
+        model, SPACY_TASK, "cpu", lambda: spacy_download.load_spacy(model)
+    )
+
+
+def _blank_sentencizer(model: str) -> Any:
+    import spacy
+
+    # "en_core_web_sm" -> "en"; anything spaCy doesn't know falls back to multi-language
+    language = model.split("_", 1)[0]
+    try:
+        nlp = spacy.blank(language)
+    except (ImportError, KeyError, ValueError):
+        nlp = spacy.blank("xx")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+def load_sentence_segmenter(model: str, segmenter: str = "parser") -> Any:
+    """
+    Cached spaCy pipeline that only needs to produce ``doc.sents``.
+
+    Args:
+        model: spaCy model name (its language picks the ``sentencizer`` rules)
+        segmenter: One of :data:`SENTENCE_SEGMENTERS`; "parser" is the full model
+            from :func:`load_spacy_model`
+    """
+    if segmenter == "parser":
+        return load_spacy_model(model)
+    if segmenter == "sentencizer":
+        return get_model_registry().get(
+            model, "spacy-sentencizer", "cpu", lambda: _blank_sentencizer(model)
+        )
+    if segmenter == "senter":
+        if spacy_download is None:
+            raise ImportError(
+                "spacy-download is required to load spaCy models. "
+                "Install it with: pip install spacy-download"
+            )
+        return get_model_registry().get(
+            model, "spacy-senter", "cpu", lambda: spacy_download.load_spacy(model, enable=["senter"])
+        )
+    raise ValueError(
+        f"Unknown sentence segmenter {segmenter!r}; expected one of {SENTENCE_SEGMENTERS}"
+    )
+
+
+def load_transformers_pipeline(
+    task: str,
+    model: str,
+    device: int = -1,
+    **pipeline_kwargs: Any,
+) -> Any:
+    """
+    Cached ``transformers.pipeline(task, model=model, device=device, framework="pt")``.
+
+    ``pipeline_kwargs`` must not change the loaded weights (they are not part of the key).
+    """
+    torch_device = resolve_torch_device(device)
+
+    def _load() -> Any:
+        from transformers import pipeline
+
+        return pipeline(
+            task,
+            model=model,
+            device=torch_device,
+            framework="pt",
+            **pipeline_kwargs,
+        )
+
+    return get_model_registry().get(model, task, str(torch_device), _load)
+
+
+def _parse_preload_spec(spec: str) -> Tuple[str, str]:
+    """``"spacy:en_core_web_sm"`` / ``"text-classification:org/model"`` -> (task, model)."""
+    task, sep, model = spec.strip().partition(":")
+    if not sep or not task.strip() or not model.strip():
+        raise ValueError(
+            f"Invalid model preload spec {spec!r}; expected '<task>:<model>' "
+            "(e.g. 'spacy:en_core_web_sm' or 'zero-shot-classification:org/model')"
+        )
+    return task.strip(), model.strip()
+
+
+def preload_models(specs: Optional[Iterable[str]] = None, device: int = -1) -> Dict[str, Any]:
+    """
+    Warm the registry, e.g. at worker start.
+
+    Args:
+        specs: ``"<task>:<model>"`` strings; ``task`` is ``spacy`` or a ``transformers``
+            pipeline task. Defaults to the comma-separated ``SOUS_CHEF_PRELOAD_MODELS``.
+        device: Device id for transformer pipelines (-1 for CPU).
+
+    Returns:
+        :meth:`ModelRegistry.stats` after loading.
+    """
+    if specs is None:
+        raw = os.environ.get(PRELOAD_MODELS_ENV, "")
+        specs = [s for s in raw.split(",") if s.strip()]
+    for spec in specs:
+        task, model = _parse_preload_spec(spec)
+        if task == SPACY_TASK:
+            load_spacy_model(model)
+        else:
+            load_transformers_pipeline(task, model, device=device)
+    return get_model_registry().stats()
+
+
+_preload_lock = threading.Lock()
+_preloaded = False
+
+
+def preload_models_from_env() -> Optional[Dict[str, Any]]:
+    """
+    :func:`preload_models` for ``SOUS_CHEF_PRELOAD_MODELS``, at most once per process.
+
+    Called by ``runtime_session`` at start. Returns None when the variable is unset or
+    the models were already preloaded.
+    """
+    global _preloaded
+    with _preload_lock:
+        if _preloaded or not os.environ.get(PRELOAD_MODELS_ENV, "").strip():
+            return None
+        _preloaded = True
+    return preload_models()
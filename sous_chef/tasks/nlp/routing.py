@@ -0,0 +1,104 @@
+"""
+Per-language routing of rows to spaCy models.
+
+Tasks used to run one (English) model over every row, whatever its ``language``.
+:func:`route_by_language` groups row positions by the model that should parse them so
+each group goes through its own lazily loaded pipeline in one batch, and rows in a
+language no configured model covers are skipped instead of being parsed with the wrong
+model. Rows without a language value keep the old behaviour and go to the default
+model; multi-language models (``xx_*``) take every row.
+"""
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from ...runtime import mark_step
+
+logger = logging.getLogger(__name__)
+
+MULTI_LANGUAGE = "xx"
+
+
+def model_language(model: str) -> Optional[str]:
+    """Language code of a spaCy model name ("en_core_web_sm" -> "en"), None if unknown."""
+    prefix = model.split("_", 1)[0].lower()
+    if prefix == MULTI_LANGUAGE:
+        return MULTI_LANGUAGE
+    try:
+        from spacy.util import get_lang_class
+
+        get_lang_class(prefix)
+    except (ImportError, KeyError, ValueError):
+        return None
+    return prefix
+
+
+def normalize_language(value: Any) -> Optional[str]:
+    """Base language code for a row value ("EN-us" -> "en"); None when missing."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    return value.strip().lower().replace("_", "-").split("-", 1)[0]
+
+
+def route_by_language(
+    languages: Sequence[Any],
+    model: str,
+    models: Optional[Mapping[str, str]] = None,
+    task: Optional[str] = None,
+) -> Tuple[Dict[str, List[int]], List[int]]:
+    """
+    Group row positions by the model that should parse them.
+
+    Args:
+        languages: Row language values (missing values go to ``model``)
+        model: Default model; covers its own language (or everything for ``xx_*``
+            and names whose language can't be told)
+        models: Extra ``{language: model}`` routes, e.g. ``{"es": "es_core_news_sm"}``
+        task: Task name for the ``language_routing`` runtime step (no step if None)
+
+    Returns:
+        ``({model: [row positions]}, [skipped row positions])``
+    """
+    default_language = model_language(model)
+    routes: Dict[str, str] = {}
+    if default_language is not None:
+        routes[default_language] = model
+    routes.update({normalize_language(k) or k: v for k, v in (models or {}).items()})
+    catch_all = (
+        routes.pop(MULTI_LANGUAGE, None)
+        or (model if default_language in (None, MULTI_LANGUAGE) else None)
+    )
+
+    groups: Dict[str, List[int]] = {}
+    skipped: List[int] = []
+    skipped_languages: Counter = Counter()
+    for pos, value in enumerate(languages):
+        language = normalize_language(value)
+        if language is None:
+            target = model
+        else:
+            target = routes.get(language) or catch_all
+        if target is None:
+            skipped.append(pos)
+            skipped_languages[language] += 1
+        else:
+            groups.setdefault(target, []).append(pos)
+
+    if skipped:
+        logger.info(
+            "%s: skipped %d rows in languages without a model: %s",
+            task or "language routing", len(skipped), dict(skipped_languages.most_common(10)),
+        )
+    if task is not None:
+        mark_step(
+            "language_routing",
+            meta={
+                "task": task,
+                "rows_per_model": {m: len(p) for m, p in groups.items()},
+                "skipped": len(skipped),
+                "skipped_languages": dict(skipped_languages.most_common(10)),
+            },
+        )
+    return groups, skipped
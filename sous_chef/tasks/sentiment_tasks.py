@@ -1,9 +1,17 @@
-from transformers import pipeline
+import time
+from typing import Any, Dict, List, Optional
+
 import pandas as pd
 from prefect import task
-import torch
+
+from ..runtime import mark_step
+from .nlp import load_transformers_pipeline
+from .nlp.inference_server import TEXT_CLASSIFICATION_TASK, connect_inference_server
+from .nlp.onnx_backend import load_onnx_pipeline, onnx_quantize
+from .nlp.memo import memoized_column, row_key
 
 DEFAULT_TRANSFORMER_MODEL = "yangheng/deberta-v3-base-absa-v1.1" # a good one for targetted sentiment towards an entity
+ABSA_BATCH_SIZE = 32
 
 # Lazy import to avoid requiring spacy at module load time
 try:
@@ -11,11 +19,44 @@ try:
 except ImportError:
     spacy_download = None
 
+def _first(result: Any) -> Dict[str, Any]:
+    return result[0] if isinstance(result, list) else result
+
+
+def classify_aspect_sentiment(
+    absa_pipeline,
+    sentences: List[str],
+    sentiment_target: str,
+    batch_size: int = ABSA_BATCH_SIZE,
+) -> List[Dict[str, Any]]:
+    """
+    ``{"label", "score"}`` for each sentence toward ``sentiment_target``, in input order.
+
+    Sentences are sorted by length so each batch pads to similar lengths, run through the
+    pipeline ``batch_size`` at a time, and mapped back to their original positions.
+    ``batch_size <= 1`` runs one sentence per call.
+    """
+    if not sentences:
+        return []
+    if batch_size <= 1:
+        return [_first(absa_pipeline(s, text_pair=sentiment_target)) for s in sentences]
+
+    order = sorted(range(len(sentences)), key=lambda i: len(sentences[i]))
+    inputs = [{"text": sentences[i], "text_pair": sentiment_target} for i in order]
+    outputs: List[Dict[str, Any]] = [{} for _ in sentences]
+    for i, result in zip(order, absa_pipeline(inputs, batch_size=batch_size)):
+        outputs[i] = _first(result)
+    return outputs
+
+
 def add_targeted_sentiment(
     df: pd.DataFrame,
     sentiment_target: str,
     model: str = DEFAULT_TRANSFORMER_MODEL,
-    device: int = -1
+    device: int = -1,
+    batch_size: int = ABSA_BATCH_SIZE,
+    use_memo: Optional[bool] = None,
+    backend: str = "local",
 ) -> pd.DataFrame:
     """
     Adds aspect-based sentiment columns to a DataFrame containing news sentences.
@@ -25,34 +66,91 @@ def add_targeted_sentiment(
         sentiment_target:     The entity/aspect to evaluate sentiment toward (e.g. "Mamdani").
         model:      HuggingFace model identifier.
         device:     Device id for GPU (0, 1, etc.) or -1 for CPU.
+        batch_size: Sentences per inference batch (length-bucketed); 1 runs them one by one.
+        use_memo:   Keep scores in the local enrichment memo across runs, keyed by sentence,
+                    target and model (default: SOUS_CHEF_ENRICHMENT_MEMO, off).
+                    Identical sentences within a call are always scored once.
+        backend:    "local" (PyTorch), "onnx" (ONNX Runtime, int8 unless
+                    SOUS_CHEF_ONNX_QUANTIZE=0; `device` is ignored) or "server" (the
+                    worker's shared inference server at SOUS_CHEF_INFERENCE_SERVER;
+                    "local" when there is none).
 
     Returns:
         Original DataFrame with added `target_sentiment` and `target_sentiment_score` columns.
         Rows where the aspect is not mentioned are returned with NaN for both columns.
     """
-    # Determine torch device
-    if device == -1:
-        torch_device = -1  # CPU
-    else:
-        torch_device = device if torch.cuda.is_available() else -1
-
-    absa_pipeline = pipeline(
-        "text-classification",
-        model=model,
-        tokenizer=model,
-        device=torch_device,
-        framework="pt"  # Explicitly use PyTorch framework
-    )
+    if backend not in ("local", "onnx", "server"):
+        raise ValueError(f"backend must be 'local', 'onnx' or 'server', got {backend!r}")
 
     # Track which rows mention the aspect (case-insensitive)
     mask = df["sentence_text"].str.contains(sentiment_target, na=False, case=False)
     sentences = df.loc[mask, "sentence_text"].tolist()
 
-    # Run inference on each sentence individually with the sentiment target
-    outputs = []
-    for sentence in sentences:
-        result = absa_pipeline(sentence, text_pair=sentiment_target)
-        outputs.append(result[0] if isinstance(result, list) else result)
+    # Syndicated stories repeat sentences verbatim; score each distinct one once
+    unique_sentences = list(dict.fromkeys(sentences))
+    mark_step(
+        "targeted_sentiment_dedup",
+        meta={"sentences": len(sentences), "unique_sentences": len(unique_sentences)},
+    )
+
+    # The shared inference server, when one answers; otherwise "server" runs as "local"
+    served = (
+        connect_inference_server(TEXT_CLASSIFICATION_TASK, model)
+        if backend == "server" and unique_sentences
+        else None
+    )
+    if served is not None:
+        scores_backend = served.scores_backend
+    elif backend == "onnx":
+        # int8 scores drift slightly from fp32, so they are memoized separately
+        scores_backend = f"onnx-{'int8' if onnx_quantize() else 'fp32'}"
+    else:
+        scores_backend = "local"
+
+    def compute(positions: List[int]) -> List[Dict[str, Any]]:
+        if not positions:
+            return []
+        # Loaded once per worker process and reused across calls (see tasks.nlp.registry)
+        absa_pipeline = served
+        if absa_pipeline is None and backend == "onnx":
+            absa_pipeline = load_onnx_pipeline("text-classification", model)
+        elif absa_pipeline is None:
+            absa_pipeline = load_transformers_pipeline(
+                "text-classification",
+                model,
+                device=device,
+                tokenizer=model,
+            )
+        batch = [unique_sentences[i] for i in positions]
+        start = time.perf_counter()
+        outputs = classify_aspect_sentiment(absa_pipeline, batch, sentiment_target, batch_size)
+        seconds = time.perf_counter() - start
+        mark_step(
+            "targeted_sentiment_inference",
+            meta={
+                "sentences": len(batch),
+                "batch_size": batch_size,
+                "backend": backend,
+                "seconds": round(seconds, 3),
+                "sentences_per_sec": round(len(batch) / seconds, 1) if seconds > 0 else None,
+            },
+        )
+        return [{"label": o["label"], "score": float(o["score"])} for o in outputs]
+
+    # Scores from earlier runs are served from the enrichment memo (opt-in)
+    scored = memoized_column(
+        [row_key(sentence) for sentence in unique_sentences],
+        compute,
+        task="targeted_sentiment",
+        params={
+            "model": model,
+            "target": sentiment_target,
+            "backend": scores_backend,
+        },
+        use_memo=use_memo,
+    )
+    by_sentence = dict(zip(unique_sentences, scored))
+    outputs = [by_sentence[sentence] for sentence in sentences]
 
     # Write results back into the correct rows
     df = df.copy()
@@ -69,9 +167,12 @@ def targeted_sentiment(
     df: pd.DataFrame,
     sentiment_target: str,
     model: str = DEFAULT_TRANSFORMER_MODEL,
-    device: int = -1
+    device: int = -1,
+    batch_size: int = ABSA_BATCH_SIZE,
+    use_memo: Optional[bool] = None,
+    backend: str = "local",
 ) -> pd.DataFrame:
     """
     Prefect task wrapper for add_targeted_sentiment.
     """
-    return add_targeted_sentiment(df, sentiment_target, model, device)
+    return add_targeted_sentiment(df, sentiment_target, model, device, batch_size, use_memo, backend)
@@ -0,0 +1,151 @@
+"""
+Bounded-memory frequency sketches for aggregating very large corpora.
+
+- :class:`SpaceSaving`: top-k heavy hitters with a per-item overestimation bound
+  (Metwally et al., "Efficient Computation of Frequent and Top-k Elements in Data
+  Streams"). With ``capacity`` counters over a stream of ``N`` items, every item with
+  true frequency > N / capacity is guaranteed to be tracked, and each tracked item's
+  count overestimates its true count by at most its recorded ``error``.
+- :class:`CountMinSketch`: point-frequency estimates for arbitrary keys (Cormode &
+  Muthukrishnan). Estimates never undercount; with ``width = ceil(e / epsilon)`` and
+  ``depth = ceil(ln(1 / delta))`` they overcount by at most ``epsilon * N`` with
+  probability ``1 - delta``.
+
+Both are incremental and accept weighted updates, so callers can pre-aggregate a chunk
+of rows and feed ``(key, count)`` pairs in bulk.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class SpaceSaving:
+    """Space-Saving heavy-hitters summary with at most ``capacity`` counters."""
+
+    def __init__(self, capacity: int = 10_000):
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.capacity = int(capacity)
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        self.total = 0
+        # Min-heap of (count, insertion seq, key); entries go stale when a count grows
+        self._heap: List[Tuple[int, int, Hashable]] = []
+        self._seq = 0
+
+    def _push(self, key: Hashable) -> None:
+        self._seq += 1
+        heapq.heappush(self._heap, (self.counts[key], self._seq, key))
+        # Keep stale entries from growing the heap without bound
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, s, k) for c, s, k in self._heap if self.counts.get(k) == c]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> Tuple[Hashable, int]:
+        while True:
+            count, _, key = heapq.heappop(self._heap)
+            if self.counts.get(key) == count:
+                return key, count
+
+    def add(self, key: Hashable, count: int = 1) -> None:
+        self.total += count
+        if key in self.counts:
+            self.counts[key] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = count
+            self.errors[key] = 0
+        else:
+            evicted, min_count = self._pop_min()
+            del self.counts[evicted]
+            del self.errors[evicted]
+            self.counts[key] = min_count + count
+            self.errors[key] = min_count
+        self._push(key)
+
+    def update(self, keys: Iterable[Hashable], counts: Optional[Iterable[int]] = None) -> None:
+        if counts is None:
+            for key in keys:
+                self.add(key)
+        else:
+            for key, count in zip(keys, counts):
+                self.add(key, int(count))
+
+    def top(self, n: int | None = None) -> List[Tuple[Hashable, int, int]]:
+        """``(key, estimated count, max overestimate)`` sorted by estimated count."""
+        items = sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)
+        if n is not None and n > 0:
+            items = items[:n]
+        return [(k, c, self.errors[k]) for k, c in items]
+
+    @property
+    def max_error(self) -> float:
+        """Worst-case overestimate of any tracked count (N / capacity)."""
+        return self.total / self.capacity
+
+
+class CountMinSketch:
+    """Count-Min sketch of ``depth`` rows by ``width`` counters."""
+
+    def __init__(self, width: int = 2 ** 16, depth: int = 4):
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be >= 1")
+        self.width = int(width)
+        self.depth = int(depth)
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+        # One 16-byte SipHash key per row gives independent, run-to-run stable hashes
+        self._hash_keys = [f"sous-chef-cms{row:03d}" for row in range(self.depth)]
+
+    @classmethod
+    def from_error_rate(cls, epsilon: float = 1e-4, delta: float = 0.01) -> "CountMinSketch":
+        return cls(width=math.ceil(math.e / epsilon), depth=math.ceil(math.log(1.0 / delta)))
+
+    def _columns(self, keys: Sequence[Hashable]) -> np.ndarray:
+        """``(depth, len(keys))`` counter indices; keys are hashed by their ``str()``."""
+        values = np.array([k if isinstance(k, str) else str(k) for k in keys], dtype=object)
+        return np.stack(
+            [
+                (pd.util.hash_array(values, hash_key=hash_key, categorize=False) % self.width).astype(np.int64)
+                for hash_key in self._hash_keys
+            ]
+        )
+
+    def add(self, key: Hashable, count: int = 1) -> None:
+        self.update([key], [count])
+
+    def update(self, keys: Iterable[Hashable], counts: Optional[Iterable[int]] = None) -> None:
+        keys = list(keys)
+        if not keys:
+            return
+        weights = np.ones(len(keys), dtype=np.int64) if counts is None else np.asarray(list(counts), dtype=np.int64)
+        columns = self._columns(keys)
+        for row in range(self.depth):
+            np.add.at(self.table[row], columns[row], weights)
+        self.total += int(weights.sum())
+
+    def estimate(self, key: Hashable) -> int:
+        return int(self.estimate_many([key])[0])
+
+    def estimate_many(self, keys: Sequence[Hashable]) -> np.ndarray:
+        if len(keys) == 0:
+            return np.zeros(0, dtype=np.int64)
+        columns = self._columns(keys)
+        return self.table[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        return math.exp(-self.depth)
+
+    @property
+    def error_bound(self) -> int:
+        """Overestimate bound (epsilon * N) holding with probability 1 - delta."""
+        return int(math.ceil(self.epsilon * self.total))
@@ -1,14 +1,90 @@
 import re
 import pandas as pd
-from typing import List, Optional, Any, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Sequence, Tuple
 from prefect import task
 import logging
 
-# Lazy import to avoid requiring spacy at module load time
-try:
-    import spacy_download
-except ImportError:
-    spacy_download = None
+from ..runtime import mark_step
+from .nlp import (
+    SENTENCE_SEGMENTERS,
+    DocAnalysisCache,
+    doc_cache_enabled,
+    load_sentence_segmenter,
+    load_spacy_model,
+    parse_texts,
+)
+from .nlp.chunking import cap_text, max_doc_chars
+from .nlp.routing import route_by_language
+
+# Blank-line paragraph break (same boundary the long-document chunker prefers)
+_PARAGRAPH_BREAK = re.compile(r"\s*\n\s*\n\s*")
+# Anchors and negative lookarounds can match a stripped sentence but not the raw text;
+# numbered backreferences break when patterns are joined into one alternation
+_CHAR_CLASS = re.compile(r"\[(?:\\.|[^\]])*\]")
+_ANCHORED = re.compile(r"(?<!\\)[\^$]|\\[AZ]|\(\?<?!")
+_BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
+
+
+@lru_cache(maxsize=128)
+def _compile_filters(sources: Tuple[Tuple[str, int], ...]) -> Tuple[re.Pattern, ...]:
+    flags = [flag & ~re.UNICODE for _, flag in sources]
+    if len(sources) > 1 and len(set(flags)) == 1 and not any(
+        _BACKREFERENCE.search(source) for source, _ in sources
+    ):
+        alternation = "|".join(f"(?:{source})" for source, _ in sources)
+        try:
+            return (re.compile(alternation, flags[0] | re.IGNORECASE),)
+        except re.error:
+            pass
+    return tuple(re.compile(source, flag | re.IGNORECASE) for source, flag in sources)
+
+
+def compile_inclusion_filters(
+    inclusion_filters: Optional[Sequence[re.Pattern]],
+) -> Tuple[re.Pattern, ...]:
+    """
+    Case-insensitive matcher(s) for ``inclusion_filters``, compiled once per filter set.
+
+    Filters are joined into a single alternation when they share flags; patterns using
+    numbered backreferences (or that fail to combine) are kept separate.
+    """
+    if not inclusion_filters:
+        return ()
+    return _compile_filters(tuple((p.pattern, p.flags) for p in inclusion_filters))
+
+
+def _anchored(source: str) -> bool:
+    return bool(_ANCHORED.search(_CHAR_CLASS.sub("", source)))
+
+
+def _matches(text: str, matchers: Sequence[re.Pattern]) -> bool:
+    return any(m.search(text) for m in matchers)
+
+
+def segment_window(
+    text: str,
+    inclusion_filters: Optional[Sequence[re.Pattern]],
+) -> Optional[str]:
+    """
+    Part of ``text`` that has to be segmented to find sentences matching the filters.
+
+    Returns ``None`` when the raw text has no hit at all, the prefix ending at the
+    paragraph break after the last hit otherwise (every sentence before a hit is
+    still segmented so sentence ids match a full-document parse), and the whole text
+    when there are no filters or a filter is anchored (``^``, ``$``, negative
+    lookarounds) and so can't be checked against the raw text.
+    """
+    if not inclusion_filters or any(_anchored(p.pattern) for p in inclusion_filters):
+        return text
+    last_end = -1
+    for matcher in compile_inclusion_filters(inclusion_filters):
+        for hit in matcher.finditer(text):
+            last_end = max(last_end, hit.end())
+    if last_end < 0:
+        return None
+    paragraph_break = _PARAGRAPH_BREAK.search(text, last_end)
+    return text if paragraph_break is None else text[:paragraph_break.start()]
 
 
 def extract_matching_sentences(
@@ -20,6 +96,9 @@ def extract_matching_sentences(
     Extract sentences from text using spaCy's sentence segmentation. Does a case-insensitive search on any
     supplied inclusion_filters.
 
+    The raw text is scanned first: texts with no hit are never parsed and text after the paragraph holding
+    the last hit is not segmented.
+
     Args:
         nlp: spaCy Language object to use
         text: Text to extract keywords from
@@ -29,44 +108,146 @@ def extract_matching_sentences(
     Returns:
         List of tuples with sentence index and string
     """
-    doc = nlp(text)
+    window = segment_window(text, inclusion_filters)
+    if window is None:
+        return []
+    # Long texts are chunked on paragraph boundaries; sentence ids run across chunks
+    doc = parse_texts(nlp, [window], use_cache=False)[0]
+    return matching_sentences_from_doc(doc, inclusion_filters)
+
+
+def matching_sentences_from_doc(
+    doc,
+    inclusion_filters: Optional[List[re.Pattern]] = None,
+) -> List[Tuple[int, str]]:
+    """Same as extract_matching_sentences, for an already-parsed spaCy Doc."""
     sentences = [(idx, sent.text.strip()) for (idx, sent) in enumerate(doc.sents)]
     if inclusion_filters:
-        # Recompile patterns with IGNORECASE flag for case-insensitive matching
-        case_insensitive_patterns = [
-            re.compile(pattern.pattern, pattern.flags | re.IGNORECASE)
-            for pattern in inclusion_filters
-        ]
-        sentences = [
-            s for s in sentences
-            if any(pattern.search(s[1]) for pattern in case_insensitive_patterns)
-        ]
+        matchers = compile_inclusion_filters(inclusion_filters)
+        sentences = [s for s in sentences if _matches(s[1], matchers)]
     return sentences
 
 
+def _load_segmenter(model: str, segmenter: str):
+    if segmenter == "parser":
+        return load_spacy_model(model)
+    return load_sentence_segmenter(model, segmenter)
+
+
 @task
 def matching_sentences(
     df: pd.DataFrame,
     text_column: str = "text",
     language_column: str = "language",
     model: str = "en_core_web_sm",
-    inclusion_filters: Optional[List[re.Pattern]] = None
+    inclusion_filters: Optional[List[re.Pattern]] = None,
+    use_doc_cache: Optional[bool] = None,
+    max_chars_per_doc: Optional[int] = None,
+    prefilter: bool = True,
+    segmenter: str = "parser",
+    models: Optional[Dict[str, str]] = None,
 ) -> pd.DataFrame:
+    """
+    One row per sentence matching any of ``inclusion_filters`` (all sentences without filters).
+
+    With ``prefilter`` (and filters given) the raw texts are scanned with one compiled
+    case-insensitive alternation first: stories without a hit are skipped without being
+    parsed, and only the text up to the paragraph holding the last hit is segmented.
+    Sentence ids are those of a full-document parse. ``prefilter=False`` parses whole
+    stories instead.
 
-    if spacy_download is None:
-        raise ImportError(
-            "spacy-download is required for sentence splitting. "
-            "Install it with: pip install spacy-download"
+    ``use_doc_cache`` (default: ``SOUS_CHEF_DOC_CACHE``, off) stores parses in the shared
+    document cache. A prefiltered story whose whole text another task (e.g.
+    ``extract_entities``) already parsed is read from that parse instead of segmenting
+    its window; otherwise the window is parsed and cached under its own text, which is
+    the whole story's key when the window covers all of it.
+
+    ``segmenter`` picks how sentences are split: "parser" (the full ``model`` pipeline),
+    "senter" (the model's sentence recognizer only) or "sentencizer" (punctuation rules,
+    no model download). The lighter backends are much faster; see
+    ``benchmarks/bench_sentence_segmenters.py`` for agreement with the parser.
+
+    Rows are routed by ``language_column``: ``model`` covers its own language and
+    ``models`` (``{language: model}``) adds more. Stories in other languages produce no
+    sentences instead of being split by the wrong model; rows without a language value
+    use ``model``.
+    """
+    if segmenter not in SENTENCE_SEGMENTERS:
+        raise ValueError(
+            f"Unknown sentence segmenter {segmenter!r}; expected one of {SENTENCE_SEGMENTERS}"
         )
+    texts = df[text_column].tolist()
+    languages = (
+        df[language_column].tolist() if language_column in df.columns else [None] * len(df)
+    )
+    # Each language group goes through its own model; unsupported languages are skipped
+    groups, _ = route_by_language(languages, model, models, task="matching_sentences")
+    docs: List[Any] = [None] * len(df)
 
-    nlp = spacy_download.load_spacy(model)
+    if prefilter and inclusion_filters:
+        cap = max_doc_chars(max_chars_per_doc)
+        raw = [text if isinstance(text, str) else "" for text in texts]
+        capped = [cap_text(text, cap) for text in raw]
+        windows: List[Optional[str]] = [None] * len(df)
+        for positions in groups.values():
+            for pos in positions:
+                windows[pos] = segment_window(capped[pos], inclusion_filters)
+        reused = 0
+        for routed_model, positions in groups.items():
+            positions = [pos for pos in positions if windows[pos] is not None]
+            if not positions:
+                continue
+            nlp = _load_segmenter(routed_model, segmenter)
+            if doc_cache_enabled(use_doc_cache):
+                # A cached whole-story parse (same key as extract_entities uses) has the
+                # window's sentences with the same ids, so the window is not parsed again
+                cache = DocAnalysisCache(nlp, model=routed_model)
+                for pos in positions:
+                    docs[pos] = cache.get(capped[pos])
+                reused += sum(docs[pos] is not None for pos in positions)
+                positions = [pos for pos in positions if docs[pos] is None]
+            # Window parses are keyed on the window text, so partial windows never stand
+            # in for a whole-story parse; a window covering the whole story is that parse
+            parsed = parse_texts(
+                nlp,
+                [windows[pos] for pos in positions],
+                model=routed_model,
+                use_cache=use_doc_cache,
+                max_chars=0,
+            )
+            for pos, doc in zip(positions, parsed):
+                docs[pos] = doc
+        to_parse = [w for w in windows if w is not None]
+        mark_step(
+            "sentence_prefilter",
+            meta={
+                "documents": len(texts),
+                "matched": len(to_parse),
+                "reused_full_parses": reused,
+                "chars_total": sum(len(t) for t in raw),
+                "chars_segmented": sum(len(w) for w in to_parse),
+            },
+        )
+    else:
+        for routed_model, positions in groups.items():
+            # Parses are shared with other spaCy tasks (e.g. extract_entities) via the doc cache
+            parsed = parse_texts(
+                _load_segmenter(routed_model, segmenter),
+                [texts[pos] for pos in positions],
+                model=routed_model,
+                use_cache=use_doc_cache,
+                max_chars=max_chars_per_doc,
+            )
+            for pos, doc in zip(positions, parsed):
+                docs[pos] = doc
 
     results = []
 
-    for index, row in df.iterrows():
-        text = row[text_column]
-        language = row[language_column]
-        sentences = extract_matching_sentences(nlp, text, inclusion_filters) #removed language parameter for testing
+    for (index, row), doc in zip(df.iterrows(), docs):
+        if doc is None:
+            continue
+        language = row.get(language_column)
+        sentences = matching_sentences_from_doc(doc, inclusion_filters)
         for s in sentences:
             results.append({
                 "id": row["id"],
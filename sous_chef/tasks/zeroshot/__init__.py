@@ -2,13 +2,14 @@
 Zero-shot text classification (local ``transformers`` or Hugging Face Inference API).
 
 Public entry point for flows: :func:`add_zero_shot_classification` respects
-``ZEROSHOT_BACKEND`` (``local`` | ``hf_inference``).
+``ZEROSHOT_BACKEND`` (``local`` | ``onnx`` | ``hf_inference`` | ``server``).
 """
 from __future__ import annotations
 
 from .classify import add_zero_shot_classification
 from .common import (
     _truncate,
+    build_zero_shot_tag_scores_json,
     build_zero_shot_tag_scores_json_for_row,
     compute_zero_shot_label_counts,
     story_dataframe_for_zeroshot_csv,
@@ -17,25 +18,57 @@ from .common import (
 from .config import (
     DEFAULT_ZEROSHOT_MODEL,
     ZEROSHOT_BACKEND_ENV,
+    ZEROSHOT_CHUNK_POOLING,
+    ZEROSHOT_CHUNK_TOKENS,
     ZEROSHOT_CLASSIFY_DEVICE,
     ZEROSHOT_DEFAULT_STORY_COLUMNS,
+    ZEROSHOT_LOCAL_BATCH_SIZE,
+    ZEROSHOT_LOCAL_WORKERS_ENV,
+    ZEROSHOT_MAX_CHUNKS,
     ZEROSHOT_STORY_TEXT_COLUMN,
     ZEROSHOT_TEXT_MAX_CHARS_DEFAULT,
     get_zeroshot_backend,
 )
+from .cascade import zeroshot_cascade_stats
+from .reselect import (
+    reselect_zero_shot_labels,
+    stored_zeroshot_labels,
+    zeroshot_scores_frame,
+    zeroshot_scores_run,
+)
+from .score_cache import zeroshot_score_cache_counts
+from .scores import ZeroShotScoreMatrix, zeroshot_score_matrix
+from .sharded import shutdown_zeroshot_workers
+from .taxonomy import zeroshot_taxonomy_stats
 
 __all__ = [
     "DEFAULT_ZEROSHOT_MODEL",
     "ZEROSHOT_BACKEND_ENV",
+    "ZEROSHOT_CHUNK_POOLING",
+    "ZEROSHOT_CHUNK_TOKENS",
     "ZEROSHOT_CLASSIFY_DEVICE",
     "ZEROSHOT_DEFAULT_STORY_COLUMNS",
+    "ZEROSHOT_LOCAL_BATCH_SIZE",
+    "ZEROSHOT_LOCAL_WORKERS_ENV",
+    "ZEROSHOT_MAX_CHUNKS",
     "ZEROSHOT_STORY_TEXT_COLUMN",
     "ZEROSHOT_TEXT_MAX_CHARS_DEFAULT",
+    "ZeroShotScoreMatrix",
     "_truncate",
+    "build_zero_shot_tag_scores_json",
     "build_zero_shot_tag_scores_json_for_row",
     "add_zero_shot_classification",
     "compute_zero_shot_label_counts",
     "get_zeroshot_backend",
+    "reselect_zero_shot_labels",
+    "shutdown_zeroshot_workers",
+    "stored_zeroshot_labels",
     "story_dataframe_for_zeroshot_csv",
     "zeroshot_classification_failure_details",
+    "zeroshot_cascade_stats",
+    "zeroshot_score_cache_counts",
+    "zeroshot_score_matrix",
+    "zeroshot_scores_frame",
+    "zeroshot_scores_run",
+    "zeroshot_taxonomy_stats",
 ]
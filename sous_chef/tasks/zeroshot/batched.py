@@ -0,0 +1,150 @@
+"""
+Batched NLI inference for local zero-shot classification.
+
+The ``transformers`` zero-shot pipeline is called once per story and runs that story's
+``len(candidate_labels)`` premise/hypothesis pairs on their own, so the model never sees
+more than a handful of pairs at a time. :func:`classify_zero_shot_batched` tokenizes the
+pairs of many stories in one call, sorts them by token length, runs fixed-size padded
+batches, and scores each story with the pipeline's own entailment postprocessing in NumPy.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Shared with the sharded workers, which must not import sous_chef.tasks
+from ...workers.nli import NliRunner, nli_pair_logits
+
+logger = logging.getLogger(__name__)
+
+
+def nli_runner(clf: Any) -> Optional[NliRunner]:
+    """
+    Batched runner for a zero-shot pipeline, or None when ``clf`` is not one we can
+    drive directly (callers then fall back to one pipeline call per story).
+    """
+    from ..nlp.inference_server import RemoteZeroShotClassifier
+    from ..nlp.onnx_backend import OnnxZeroShotPipeline
+    from .sharded import ShardedZeroShotClassifier
+
+    if isinstance(clf, (RemoteZeroShotClassifier, ShardedZeroShotClassifier)):
+        return NliRunner(
+            tokenizer=None,
+            forward=None,
+            entailment_id=clf.entailment_id,
+            input_names=(),
+            pair_logits=clf.pair_logits,
+        )
+
+    if isinstance(clf, OnnxZeroShotPipeline):
+        classifier = clf.classifier
+
+        def onnx_forward(batch: Mapping[str, np.ndarray]) -> np.ndarray:
+            feed = {
+                name: np.asarray(batch[name], dtype=np.int64)
+                for name in classifier.input_names
+                if name in batch
+            }
+            return classifier.session.run(None, feed)[0].astype(np.float32)
+
+        return NliRunner(
+            tokenizer=classifier.tokenizer,
+            forward=onnx_forward,
+            entailment_id=clf.entailment_id,
+            input_names=classifier.input_names,
+            max_length=classifier.max_length,
+        )
+
+    try:
+        from transformers import ZeroShotClassificationPipeline
+    except ImportError:
+        return None
+    if not isinstance(clf, ZeroShotClassificationPipeline):
+        return None
+
+    import torch
+
+    model = clf.model
+
+    def torch_forward(batch: Mapping[str, np.ndarray]) -> np.ndarray:
+        inputs = {name: torch.as_tensor(array).to(clf.device) for name, array in batch.items()}
+        with torch.inference_mode():
+            return model(**inputs).logits.float().cpu().numpy()
+
+    return NliRunner(
+        tokenizer=clf.tokenizer,
+        forward=torch_forward,
+        entailment_id=clf.entailment_id,
+        input_names=clf.tokenizer.model_input_names,
+    )
+
+
+def _scores(logits: np.ndarray, entailment_id: int, multi_label: bool) -> np.ndarray:
+    """``(documents, labels)`` scores from ``(documents, labels, classes)`` logits, as in transformers."""
+    if multi_label or logits.shape[1] == 1:
+        contradiction_id = -1 if entailment_id == 0 else 0
+        pair = logits[..., [contradiction_id, entailment_id]]
+        exp = np.exp(pair - pair.max(axis=-1, keepdims=True))
+        return (exp / exp.sum(axis=-1, keepdims=True))[..., 1]
+    entail = logits[..., entailment_id]
+    exp = np.exp(entail - entail.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+def classify_zero_shot_batched(
+    runner: NliRunner,
+    texts: Sequence[str],
+    candidate_labels: Sequence[str],
+    hypothesis_template: str,
+    multi_label: bool,
+    batch_size: int,
+) -> Tuple[Dict[int, Tuple[List[str], List[float]]], Dict[int, str]]:
+    """
+    Zero-shot labels and scores for many stories at once.
+
+    Args:
+        runner: From :func:`nli_runner`
+        texts: Premises; blank ones get no labels, like the per-story path
+        candidate_labels: Labels, each formatted into ``hypothesis_template``
+        hypothesis_template: e.g. "This text is about {}"
+        multi_label: Independent entailment-vs-contradiction score per label
+        batch_size: Pairs per forward pass
+
+    Returns:
+        ``({position: (labels, scores)}, {position: error})``; positions in the error map
+        were in a batch that failed and should be retried one story at a time.
+    """
+    labels = list(candidate_labels)
+    hypotheses = [hypothesis_template.format(label) for label in labels]
+    results: Dict[int, Tuple[List[str], List[float]]] = {}
+    positions = []
+    for pos, text in enumerate(texts):
+        if text.strip():
+            positions.append(pos)
+        else:
+            results[pos] = ([], [])
+    if not positions or not labels:
+        return results, {}
+
+    n_labels = len(labels)
+    premises = [texts[pos] for pos in positions for _ in range(n_labels)]
+    if runner.pair_logits is not None:
+        logits, failed_pairs = runner.pair_logits(premises, hypotheses * len(positions))
+    else:
+        logits, failed_pairs = nli_pair_logits(runner, premises, hypotheses * len(positions), batch_size)
+
+    errors: Dict[int, str] = {}
+    for pair, err in failed_pairs.items():
+        errors.setdefault(positions[pair // n_labels], err)
+    if logits is None:
+        return results, errors
+
+    scores = _scores(logits.reshape(len(positions), n_labels, -1), runner.entailment_id, multi_label)
+    for row, pos in enumerate(positions):
+        if pos in errors:
+            continue
+        top = list(reversed(scores[row].argsort()))
+        results[pos] = ([labels[i] for i in top], scores[row, top].tolist())
+    return results, errors
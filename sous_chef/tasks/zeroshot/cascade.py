@@ -0,0 +1,197 @@
+"""
+Bi-encoder shortlist in front of NLI zero-shot classification.
+
+NLI cost is stories x labels cross-encoder passes. With ``cascade_top_k`` set,
+:func:`classify_with_cascade` first embeds every story and every label hypothesis once
+with a small bi-encoder (``tasks.nlp.embeddings``), takes cosine similarity as one matrix
+product, and sends each story only its ``top_k`` most similar labels (plus any label
+within ``margin`` of its best one) through the NLI backend. Labels that are not
+shortlisted get no score, so they are never selected and never counted.
+
+Multi-label scores depend only on the (story, label) pair, so shortlisted pairs are
+inferred one label at a time over every story that shortlisted it (full batches, exact
+scores); single-label runs normalise over each story's shortlist instead.
+
+To show what the shortlist costs in quality, up to ``validation_size`` stories (a fixed
+random sample) are also scored on every label, and the fraction of labels full NLI
+selects (top-N, threshold or top label, as the run does) that were shortlisted is
+reported as ``recall`` in ``out.attrs["zeroshot_cascade"]`` and a ``zeroshot_cascade`` step.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ...runtime import mark_step
+from ..nlp.embeddings import embed_texts
+from .common import (
+    InferFn,
+    ScoreCacheCounts,
+    _truncate,
+    _validate_zeroshot_args,
+    _zeroshot_frame_from_scores,
+    build_zeroshot_inference_label_mapping,
+    subset_label_hypotheses,
+)
+from .config import ZEROSHOT_CASCADE_EMBEDDING_MODEL, ZEROSHOT_CASCADE_VALIDATION_SIZE
+from .scores import zeroshot_score_matrix
+
+logger = logging.getLogger(__name__)
+
+# Key of the cascade stats in ``DataFrame.attrs`` of a classified frame
+CASCADE_ATTR = "zeroshot_cascade"
+
+
+def zeroshot_cascade_stats(df: pd.DataFrame) -> Dict[str, Any]:
+    """Cascade stats recorded on a classified frame (empty when the cascade was off)."""
+    return dict(df.attrs.get(CASCADE_ATTR) or {})
+
+
+def shortlist_labels(
+    similarity: np.ndarray, top_k: int, margin: Optional[float] = None
+) -> List[List[int]]:
+    """
+    Per row of a ``(stories, labels)`` similarity matrix, the indices of its ``top_k``
+    labels plus any within ``margin`` of the row's best, in label order.
+    """
+    if top_k < 1:
+        raise ValueError("cascade_top_k must be >= 1")
+    order = np.argsort(-similarity, axis=1, kind="stable")
+    shortlists: List[List[int]] = []
+    for row, ranked in zip(similarity, order):
+        keep = set(ranked[:top_k].tolist())
+        if margin is not None:
+            keep.update(np.flatnonzero(row >= row[ranked[0]] - margin).tolist())
+        shortlists.append(sorted(keep))
+    return shortlists
+
+
+def classify_with_cascade(
+    df: pd.DataFrame,
+    candidate_labels: List[str],
+    infer: InferFn,
+    *,
+    top_k: int,
+    text_column: str,
+    hypothesis_template: str,
+    text_max_chars: Optional[int],
+    multi_label: bool,
+    passing_score_threshold: Optional[float],
+    top_n: Optional[int],
+    classification_label_hypotheses: Optional[Dict[str, str]] = None,
+    margin: Optional[float] = None,
+    validation_size: int = ZEROSHOT_CASCADE_VALIDATION_SIZE,
+    embedding_model: str = ZEROSHOT_CASCADE_EMBEDDING_MODEL,
+    device: int = -1,
+    embed: Optional[Callable[..., np.ndarray]] = None,
+) -> pd.DataFrame:
+    """
+    Zero-shot columns for ``df`` with NLI run only on each story's shortlisted labels.
+
+    Args:
+        infer: Runs the NLI backend on a row subset for a subset of ``candidate_labels``
+            (with the matching ``classification_label_hypotheses``)
+        top_k: Labels shortlisted per story
+        margin: Also shortlist labels whose similarity is within this of the story's best
+        validation_size: Stories also scored on every label to measure recall (0 = none)
+        embedding_model: Bi-encoder for stories and label hypotheses
+        embed: ``embed(texts, model, device)`` -> unit-length embeddings (default
+            :func:`~sous_chef.tasks.nlp.embeddings.embed_texts`)
+
+    Returns the same columns as the backends, with stats in ``out.attrs["zeroshot_cascade"]``.
+    """
+    _validate_zeroshot_args(df, candidate_labels, text_column, top_n)
+    if int(top_k) < 1:
+        raise ValueError("cascade_top_k must be >= 1")
+
+    inference_labels, inference_template, _ = build_zeroshot_inference_label_mapping(
+        candidate_labels, hypothesis_template, classification_label_hypotheses
+    )
+    hypotheses = [inference_template.format(label) for label in inference_labels]
+
+    texts: List[str] = []
+    for raw in df[text_column].tolist():
+        if raw is None or (not isinstance(raw, str) and pd.isna(raw)):
+            texts.append("")
+        else:
+            texts.append(_truncate(str(raw), text_max_chars))
+    positions = [pos for pos, text in enumerate(texts) if text.strip()]
+
+    embed = embed or embed_texts
+    shortlist: Dict[int, List[str]] = {}
+    if positions:
+        story_vectors = embed([texts[pos] for pos in positions], embedding_model, device)
+        label_vectors = embed(hypotheses, embedding_model, device)
+        similarity = story_vectors @ label_vectors.T
+        for pos, picks in zip(positions, shortlist_labels(similarity, int(top_k), margin)):
+            shortlist[pos] = [candidate_labels[i] for i in picks]
+
+    # Multi-label: one call per label over the stories that shortlisted it
+    groups: Dict[Tuple[str, ...], List[int]] = {}
+    for pos, labels in shortlist.items():
+        keys = [(label,) for label in labels] if multi_label else [tuple(labels)]
+        for key in keys:
+            groups.setdefault(key, []).append(pos)
+
+    cache_counts = ScoreCacheCounts()
+
+    def run(rows: List[int], labels: List[str]) -> pd.DataFrame:
+        label_hypotheses = subset_label_hypotheses(classification_label_hypotheses, labels)
+        return cache_counts.add(infer(df.iloc[rows], labels, label_hypotheses))
+
+    scores: List[Dict[str, float]] = [{} for _ in texts]
+    errors: Dict[int, str] = {}
+    for labels, rows in groups.items():
+        out = run(rows, list(labels))
+        for pos, row, err in zip(rows, zeroshot_score_matrix(out, labels).row_scores(), out["zeroshot_error"]):
+            if err:
+                errors.setdefault(pos, err)
+                continue
+            scores[pos].update(row)
+
+    recall: Optional[float] = None
+    sample: List[int] = []
+    if positions and validation_size > 0:
+        rng = np.random.default_rng(0)
+        sample = sorted(rng.choice(positions, size=min(validation_size, len(positions)), replace=False).tolist())
+        full = run(sample, list(candidate_labels))
+        matrix = zeroshot_score_matrix(full, candidate_labels)
+        mask = matrix.selected(passing_score_threshold, top_n)
+        found = wanted = 0
+        for pos, picked in zip(sample, mask):
+            selected = [label for label, hit in zip(matrix.labels, picked) if hit]
+            wanted += len(selected)
+            found += sum(label in shortlist[pos] for label in selected)
+        recall = found / wanted if wanted else None
+
+    result = _zeroshot_frame_from_scores(
+        df,
+        candidate_labels,
+        scores,
+        errors,
+        passing_score_threshold=passing_score_threshold,
+        top_n=top_n,
+    )
+
+    pairs_scored = sum(len(labels) for labels in shortlist.values())
+    pairs_full = len(positions) * len(candidate_labels)
+    stats = {
+        "top_k": int(top_k),
+        "margin": margin,
+        "pairs_scored": pairs_scored,
+        "pairs_full": pairs_full,
+        "validation_stories": len(sample),
+        "recall": round(recall, 4) if recall is not None else None,
+    }
+    logger.info(
+        "zeroshot cascade (top %d of %d labels): %d of %d NLI pairs, recall %s on %d stories",
+        top_k, len(candidate_labels), pairs_scored, pairs_full,
+        "n/a" if recall is None else f"{recall:.3f}", len(sample),
+    )
+    mark_step("zeroshot_cascade", meta={**stats, "embedding_model": embedding_model})
+    result.attrs[CASCADE_ATTR] = stats
+    cache_counts.attach(result)
+    return result
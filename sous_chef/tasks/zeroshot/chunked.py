@@ -0,0 +1,263 @@
+"""
+Chunked zero-shot classification of long stories.
+
+``text_max_chars`` keeps only the head of a story, and raising it makes every NLI pass
+quadratically more expensive. With ``chunk_pooling`` set, :func:`classify_chunked`
+instead splits each story into sentence-aligned windows of at most ``chunk_tokens``
+premise tokens (counted with the model's tokenizer when one is available), keeps at most
+``max_chunks`` windows spread evenly over the story (always the first), classifies the
+windows of all stories in one backend call and pools each label's window scores into one
+story score:
+
+- ``max``: the best window (a label mentioned anywhere in the story)
+- ``mean``: the average window (a label the whole story is about)
+- ``attention``: windows weighted by ``softmax(score / 0.1)``, i.e. a smooth max that
+  still credits a label supported by several windows
+
+Pooled scores feed the usual ``zeroshot_*`` columns; in single-label mode they are
+renormalised to sum to one. A story fails if any of its windows failed.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from ...runtime import mark_step
+from ..nlp.registry import get_model_registry
+from .common import (
+    _validate_zeroshot_args,
+    _zeroshot_frame_from_scores,
+    build_zeroshot_inference_label_mapping,
+)
+from .config import ZEROSHOT_CHUNK_POOLING, ZEROSHOT_CHUNK_TOKENS, ZEROSHOT_MAX_CHUNKS
+from .scores import SCORE_MATRIX_ATTR, zeroshot_score_matrix
+
+logger = logging.getLogger(__name__)
+
+# Line breaks and sentence-final punctuation, as in ``nlp.chunking``
+_SENTENCE_BREAK = re.compile(r"\s*\n\s*|(?<=[.!?])\s+")
+# Token estimate when no tokenizer is available (roughly right for BPE / SentencePiece)
+_CHARS_PER_TOKEN = 4
+_ATTENTION_TEMPERATURE = 0.1
+
+# Texts -> token counts without special tokens
+TokenCounter = Callable[[List[str]], List[int]]
+# Window frame -> backend output frame (all candidate labels, no threshold / top-N)
+ChunkInferFn = Callable[[pd.DataFrame], pd.DataFrame]
+
+
+def estimate_token_counts(texts: List[str]) -> List[int]:
+    return [math.ceil(len(text) / _CHARS_PER_TOKEN) for text in texts]
+
+
+def tokenizer_token_counter(tokenizer: Any) -> TokenCounter:
+    def count(texts: List[str]) -> List[int]:
+        if not texts:
+            return []
+        encoded = tokenizer(texts, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+
+    return count
+
+
+def load_hosted_tokenizer(model: str) -> Optional[Any]:
+    """Tokenizer of a hosted model (cached in the model registry), or None if unavailable."""
+    try:
+        from transformers import AutoTokenizer
+
+        return get_model_registry().get(
+            model, "tokenizer", "cpu", lambda: AutoTokenizer.from_pretrained(model)
+        )
+    except Exception as e:
+        logger.warning("no tokenizer for %s (%s); estimating window token counts", model, e)
+        return None
+
+
+def split_into_windows(
+    text: str,
+    max_tokens: int = ZEROSHOT_CHUNK_TOKENS,
+    count_tokens: TokenCounter = estimate_token_counts,
+) -> List[str]:
+    """
+    Greedily pack whole sentences into windows of at most ``max_tokens`` tokens.
+
+    A sentence longer than the budget is cut on whitespace into roughly equal runs of
+    words. Blank text gives no windows.
+    """
+    if max_tokens < 1:
+        raise ValueError("chunk_tokens must be >= 1")
+    sentences = [s for s in _SENTENCE_BREAK.split(text) if s.strip()]
+    if not sentences:
+        return []
+
+    segments: List[tuple[str, int]] = []
+    for sentence, n_tokens in zip(sentences, count_tokens(sentences)):
+        if n_tokens <= max_tokens:
+            segments.append((sentence, n_tokens))
+            continue
+        words = sentence.split()
+        per_window = max(1, len(words) * max_tokens // n_tokens)
+        for start in range(0, len(words), per_window):
+            piece = words[start:start + per_window]
+            segments.append((" ".join(piece), math.ceil(n_tokens * len(piece) / len(words))))
+
+    windows: List[str] = []
+    current: List[str] = []
+    used = 0
+    for segment, n_tokens in segments:
+        if current and used + n_tokens > max_tokens:
+            windows.append(" ".join(current))
+            current, used = [], 0
+        current.append(segment)
+        used += n_tokens
+    if current:
+        windows.append(" ".join(current))
+    return windows
+
+
+def _spread(windows: List[str], max_chunks: int) -> List[str]:
+    """At most ``max_chunks`` windows evenly spaced over the story, first and last included."""
+    if len(windows) <= max_chunks:
+        return windows
+    if max_chunks == 1:
+        return windows[:1]
+    keep = np.linspace(0, len(windows) - 1, max_chunks).round().astype(int)
+    return [windows[i] for i in sorted(set(keep.tolist()))]
+
+
+def pool_chunk_scores(
+    chunk_scores: Sequence[Dict[str, float]],
+    candidate_labels: Sequence[str],
+    pooling: str,
+) -> Dict[str, float]:
+    """One score per label from the per-window scores of a story."""
+    if pooling not in ZEROSHOT_CHUNK_POOLING:
+        raise ValueError(f"chunk_pooling must be one of {', '.join(ZEROSHOT_CHUNK_POOLING)}")
+    pooled: Dict[str, float] = {}
+    for label in candidate_labels:
+        values = np.array([s[label] for s in chunk_scores if label in s], dtype=np.float64)
+        if not len(values):
+            continue
+        if pooling == "max":
+            pooled[label] = float(values.max())
+        elif pooling == "mean":
+            pooled[label] = float(values.mean())
+        else:
+            weights = np.exp((values - values.max()) / _ATTENTION_TEMPERATURE)
+            pooled[label] = float((weights * values).sum() / weights.sum())
+    return pooled
+
+
+def classify_chunked(
+    df: pd.DataFrame,
+    candidate_labels: List[str],
+    infer: ChunkInferFn,
+    *,
+    text_column: str,
+    hypothesis_template: str,
+    multi_label: bool,
+    pooling: str,
+    chunk_tokens: int = ZEROSHOT_CHUNK_TOKENS,
+    max_chunks: int = ZEROSHOT_MAX_CHUNKS,
+    passing_score_threshold: Optional[float] = None,
+    top_n: Optional[int] = None,
+    classification_label_hypotheses: Optional[Dict[str, str]] = None,
+    load_tokenizer: Optional[Callable[[], Any]] = None,
+) -> pd.DataFrame:
+    """
+    Zero-shot columns for ``df`` from pooled window scores.
+
+    Args:
+        infer: Runs the backend on a frame with one row per window (the story's other
+            columns repeated, ``text_column`` replaced by the window)
+        pooling: ``max``, ``mean`` or ``attention``
+        chunk_tokens: Premise token budget per window (the hypothesis is extra)
+        max_chunks: Windows kept per story
+        load_tokenizer: Returns the model's tokenizer, or None to estimate token
+            counts from characters; called once, after validation
+    """
+    if pooling not in ZEROSHOT_CHUNK_POOLING:
+        raise ValueError(f"chunk_pooling must be one of {', '.join(ZEROSHOT_CHUNK_POOLING)}")
+    if int(max_chunks) < 1:
+        raise ValueError("max_chunks must be >= 1")
+    _validate_zeroshot_args(df, candidate_labels, text_column, top_n)
+    build_zeroshot_inference_label_mapping(
+        candidate_labels, hypothesis_template, classification_label_hypotheses
+    )
+
+    tokenizer = load_tokenizer() if load_tokenizer is not None else None
+    count_tokens = tokenizer_token_counter(tokenizer) if tokenizer is not None else estimate_token_counts
+
+    owners: List[int] = []
+    windows: List[str] = []
+    split = capped = 0
+    for pos, raw in enumerate(df[text_column].tolist()):
+        if raw is None or (not isinstance(raw, str) and pd.isna(raw)):
+            continue
+        story_windows = split_into_windows(str(raw), chunk_tokens, count_tokens)
+        if len(story_windows) > max_chunks:
+            capped += 1
+            story_windows = _spread(story_windows, int(max_chunks))
+        if len(story_windows) > 1:
+            split += 1
+        owners.extend([pos] * len(story_windows))
+        windows.extend(story_windows)
+
+    chunk_scores: List[List[Dict[str, float]]] = [[] for _ in range(len(df))]
+    errors: Dict[int, str] = {}
+    attrs: Dict[str, Any] = {}
+    if windows:
+        frame = df.iloc[owners].reset_index(drop=True)
+        frame[text_column] = windows
+        out = infer(frame)
+        # The window-level score matrix does not describe the stories
+        attrs = {key: value for key, value in out.attrs.items() if key != SCORE_MATRIX_ATTR}
+        for pos, row, err in zip(
+            owners, zeroshot_score_matrix(out, candidate_labels).row_scores(), out["zeroshot_error"]
+        ):
+            if err:
+                errors.setdefault(pos, err)
+                continue
+            chunk_scores[pos].append(row)
+
+    scores: List[Dict[str, float]] = []
+    for pos, story_chunks in enumerate(chunk_scores):
+        pooled = {} if pos in errors else pool_chunk_scores(story_chunks, candidate_labels, pooling)
+        if pooled and not multi_label:
+            total = sum(pooled.values())
+            pooled = {label: score / total for label, score in pooled.items()} if total else pooled
+        scores.append(pooled)
+
+    logger.info(
+        "zeroshot chunking: %d stories -> %d windows (%d split, %d capped at %d), %s pooling",
+        len(df), len(windows), split, capped, max_chunks, pooling,
+    )
+    mark_step(
+        "zeroshot_chunking",
+        meta={
+            "stories": len(df),
+            "windows": len(windows),
+            "split_stories": split,
+            "capped_stories": capped,
+            "pooling": pooling,
+            "chunk_tokens": chunk_tokens,
+            "max_chunks": max_chunks,
+            "token_counts": "tokenizer" if tokenizer is not None else "estimate",
+        },
+    )
+    result = _zeroshot_frame_from_scores(
+        df,
+        candidate_labels,
+        scores,
+        errors,
+        passing_score_threshold=passing_score_threshold,
+        top_n=top_n,
+    )
+    # Score cache / cascade stats of the window run
+    result.attrs.update(attrs)
+    return result
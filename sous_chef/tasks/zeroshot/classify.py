@@ -1,17 +1,33 @@
 """Dispatch zero-shot classification to local pipeline or Hugging Face Inference API."""
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
 from .config import (
     DEFAULT_ZEROSHOT_MODEL,
+    ZEROSHOT_CASCADE_EMBEDDING_MODEL,
+    ZEROSHOT_CASCADE_VALIDATION_SIZE,
+    ZEROSHOT_CHUNK_TOKENS,
+    ZEROSHOT_LOCAL_BATCH_SIZE,
+    ZEROSHOT_MAX_CHUNKS,
+    ZEROSHOT_TAXONOMY_PARENT_THRESHOLD,
     ZEROSHOT_TEXT_MAX_CHARS_DEFAULT,
     get_zeroshot_backend,
+    get_zeroshot_cascade_top_k,
+    get_zeroshot_local_workers,
 )
+from ..nlp.inference_server import ZERO_SHOT_TASK, connect_inference_server
+from ..nlp.onnx_backend import onnx_quantize
+from .batched import nli_runner
+from .cascade import classify_with_cascade
+from .chunked import classify_chunked, load_hosted_tokenizer
 from .hf_inference import add_zero_shot_classification_hf_inference
-from .local import add_zero_shot_classification_local
+from .local import add_zero_shot_classification_local, load_local_zeroshot_classifier
+from .score_cache import classify_with_score_cache, score_cache_enabled
+from .sharded import add_zero_shot_classification_sharded
+from .taxonomy import classify_with_taxonomy, taxonomy_tree
 
 
 def add_zero_shot_classification(
@@ -28,6 +44,20 @@ def add_zero_shot_classification(
     top_n: Optional[int] = None,
     backend: Optional[str] = None,
     classification_label_hypotheses: Optional[Dict[str, str]] = None,
+    batch_size: int = ZEROSHOT_LOCAL_BATCH_SIZE,
+    max_concurrency: Optional[int] = None,
+    run_deadline_s: Optional[float] = None,
+    use_score_cache: Optional[bool] = None,
+    chunk_pooling: Optional[str] = None,
+    chunk_tokens: int = ZEROSHOT_CHUNK_TOKENS,
+    max_chunks: int = ZEROSHOT_MAX_CHUNKS,
+    cascade_top_k: Optional[int] = None,
+    cascade_margin: Optional[float] = None,
+    cascade_validation_size: int = ZEROSHOT_CASCADE_VALIDATION_SIZE,
+    embedding_model: str = ZEROSHOT_CASCADE_EMBEDDING_MODEL,
+    workers: Optional[int] = None,
+    label_taxonomy: Optional[Dict[str, List[str]]] = None,
+    taxonomy_parent_threshold: float = ZEROSHOT_TAXONOMY_PARENT_THRESHOLD,
 ) -> pd.DataFrame:
     """
     Add zero-shot classification columns to a story DataFrame.
@@ -35,8 +65,37 @@ def add_zero_shot_classification(
     ``text_max_chars`` defaults here (like ``ngram_max`` on ``extract_keywords``); flows
     need not mirror it on ``params_model`` unless operators should tune it per run.
 
-    Backend is ``local`` (``transformers.pipeline``) or ``hf_inference`` (hosted API),
-    from the ``backend`` argument or ``ZEROSHOT_BACKEND`` environment variable.
+    Backend is ``local`` (``transformers.pipeline``), ``onnx`` (same model exported to
+    ONNX, int8-quantized by default, on ONNX Runtime; see ``tasks.nlp.onnx_backend``) or
+    ``hf_inference`` (hosted API), from the ``backend`` argument or ``ZEROSHOT_BACKEND``
+    environment variable. ``server`` sends the NLI pairs to the worker's shared inference
+    server (``SOUS_CHEF_INFERENCE_SERVER``, see ``tasks.nlp.inference_server``) and runs
+    like ``local`` in this process when there is none. The local backends run the NLI pairs of all stories together in
+    batches of ``batch_size`` pairs (1 = one pipeline call per story); the hosted backend
+    keeps up to ``max_concurrency`` requests in flight (default ``ZEROSHOT_HF_MAX_CONCURRENCY``)
+    and, if ``run_deadline_s`` is set (default ``ZEROSHOT_HF_RUN_DEADLINE_S``, none), stops
+    sending once it passes.
+
+    With ``use_score_cache`` (default ``ZEROSHOT_SCORE_CACHE``, off) multi-label scores are
+    kept per (story, hypothesis) and only uncached pairs are inferred; see ``score_cache``.
+
+    With ``chunk_pooling`` (``max`` | ``mean`` | ``attention``) whole stories are split into
+    sentence-aligned windows of ``chunk_tokens`` tokens, at most ``max_chunks`` per story,
+    and window scores are pooled per label; ``text_max_chars`` is then ignored. See ``chunked``.
+
+    With ``cascade_top_k`` (default ``ZEROSHOT_CASCADE_TOP_K``, off) stories and label
+    hypotheses are embedded with ``embedding_model`` and only each story's ``cascade_top_k``
+    most similar labels (plus those within ``cascade_margin`` of its best) go through NLI;
+    recall against full NLI on ``cascade_validation_size`` stories is reported. See ``cascade``.
+
+    With ``workers`` > 1 (default ``ZEROSHOT_LOCAL_WORKERS``, 1) the local backends on CPU
+    split the stories across that many worker processes, one model replica each, as many as
+    fit ``ZEROSHOT_SHARD_MEMORY_BUDGET_MB``. See ``sharded``.
+
+    With ``label_taxonomy`` (parent label -> child labels, all in ``candidate_labels``)
+    top-level labels are scored first and a parent's children only when the parent scores
+    at least ``taxonomy_parent_threshold``; NLI passes saved against a flat run are
+    reported. Cannot be combined with the cascade. See ``taxonomy``.
 
     Adds:
       - zeroshot_labels_json: JSON list of labels (scores descending)
@@ -48,18 +107,171 @@ def add_zero_shot_classification(
       - zeroshot_labels_selected_json: selected labels for downstream consumers;
         top_n (if provided and >0) takes precedence over threshold.
     """
-    kwargs = dict(
+    mode = get_zeroshot_backend(backend)
+    top_k = get_zeroshot_cascade_top_k(cascade_top_k)
+    runtime = "onnx" if mode == "onnx" else "pytorch"
+    max_chars = None if chunk_pooling is not None else text_max_chars
+    # Sharding is for CPU; a GPU run keeps one process
+    local_workers = get_zeroshot_local_workers(workers) if device == -1 else 1
+    if label_taxonomy:
+        if top_k is not None:
+            raise ValueError("label_taxonomy cannot be combined with cascade_top_k")
+        taxonomy_tree(candidate_labels, label_taxonomy)
+    local_clf: Dict[str, Any] = {}
+
+    def served_classifier() -> Any:
+        # None when not in server mode, or when no server answers (then `local` runs here)
+        if "served" not in local_clf:
+            local_clf["served"] = (
+                connect_inference_server(ZERO_SHOT_TASK, model) if mode == "server" else None
+            )
+        return local_clf["served"]
+
+    def load_classifier() -> Any:
+        # One model load per call, however many label subsets or window frames are run
+        if "clf" not in local_clf:
+            clf = served_classifier()
+            if clf is None:
+                clf = load_local_zeroshot_classifier(model, device, runtime)
+            local_clf["clf"] = clf
+        return local_clf["clf"]
+
+    def scores_backend() -> str:
+        # Cached scores are keyed by the runtime that actually produced them
+        if mode == "onnx":
+            return f"onnx-{'int8' if onnx_quantize() else 'fp32'}"
+        if mode == "server":
+            served = served_classifier()
+            return served.scores_backend if served is not None else "local"
+        return mode
+
+    def run(
+        frame: pd.DataFrame,
+        labels: List[str],
+        label_hypotheses: Optional[Dict[str, str]],
+        threshold: Optional[float],
+        n: Optional[int],
+    ) -> pd.DataFrame:
+        kwargs = dict(
+            text_column=text_column,
+            hypothesis_template=hypothesis_template,
+            multi_label=multi_label,
+            model=model,
+            device=device,
+            text_max_chars=max_chars,
+            passing_score_threshold=threshold,
+            top_n=n,
+            classification_label_hypotheses=label_hypotheses,
+        )
+        if mode in ("local", "onnx") and local_workers > 1:
+            kwargs.pop("device")
+            return add_zero_shot_classification_sharded(
+                frame,
+                labels,
+                workers=local_workers,
+                runtime=runtime,
+                batch_size=batch_size,
+                load_classifier=load_classifier,
+                **kwargs,
+            )
+        if mode in ("local", "onnx", "server"):
+            return add_zero_shot_classification_local(
+                frame,
+                labels,
+                runtime=runtime,
+                batch_size=batch_size,
+                load_classifier=load_classifier,
+                **kwargs,
+            )
+        return add_zero_shot_classification_hf_inference(
+            frame,
+            labels,
+            max_concurrency=max_concurrency,
+            run_deadline_s=run_deadline_s,
+            **kwargs,
+        )
+
+    def infer(
+        frame: pd.DataFrame,
+        labels: List[str],
+        label_hypotheses: Optional[Dict[str, str]],
+        threshold: Optional[float],
+        n: Optional[int],
+    ) -> pd.DataFrame:
+        if not (multi_label and score_cache_enabled(use_score_cache)):
+            return run(frame, labels, label_hypotheses, threshold, n)
+        return classify_with_score_cache(
+            frame,
+            labels,
+            lambda frame, labels, label_hypotheses: run(frame, labels, label_hypotheses, None, None),
+            model=model,
+            backend=scores_backend(),
+            text_column=text_column,
+            hypothesis_template=hypothesis_template,
+            text_max_chars=max_chars,
+            passing_score_threshold=threshold,
+            top_n=n,
+            classification_label_hypotheses=label_hypotheses,
+        )
+
+    def classify(frame: pd.DataFrame, threshold: Optional[float], n: Optional[int]) -> pd.DataFrame:
+        if label_taxonomy:
+            return classify_with_taxonomy(
+                frame,
+                candidate_labels,
+                lambda frame, labels, label_hypotheses: infer(frame, labels, label_hypotheses, None, None),
+                taxonomy=label_taxonomy,
+                parent_threshold=taxonomy_parent_threshold,
+                text_column=text_column,
+                hypothesis_template=hypothesis_template,
+                text_max_chars=max_chars,
+                multi_label=multi_label,
+                passing_score_threshold=threshold,
+                top_n=n,
+                classification_label_hypotheses=classification_label_hypotheses,
+            )
+        if top_k is None:
+            return infer(frame, candidate_labels, classification_label_hypotheses, threshold, n)
+        return classify_with_cascade(
+            frame,
+            candidate_labels,
+            lambda frame, labels, label_hypotheses: infer(frame, labels, label_hypotheses, None, None),
+            top_k=top_k,
+            margin=cascade_margin,
+            validation_size=cascade_validation_size,
+            embedding_model=embedding_model,
+            device=device,
+            text_column=text_column,
+            hypothesis_template=hypothesis_template,
+            text_max_chars=max_chars,
+            multi_label=multi_label,
+            passing_score_threshold=threshold,
+            top_n=n,
+            classification_label_hypotheses=classification_label_hypotheses,
+        )
+
+    if chunk_pooling is None:
+        return classify(df, passing_score_threshold, top_n)
+
+    def load_tokenizer() -> Any:
+        if mode in ("hf_inference", "server") or local_workers > 1:
+            # The model is loaded elsewhere (hosted, inference server or sharded workers)
+            return load_hosted_tokenizer(model)
+        runner = nli_runner(load_classifier())
+        return runner.tokenizer if runner is not None else None
+
+    return classify_chunked(
+        df,
+        candidate_labels,
+        lambda frame: classify(frame, None, None),
         text_column=text_column,
         hypothesis_template=hypothesis_template,
         multi_label=multi_label,
-        model=model,
-        device=device,
-        text_max_chars=text_max_chars,
+        pooling=chunk_pooling,
+        chunk_tokens=chunk_tokens,
+        max_chunks=max_chunks,
         passing_score_threshold=passing_score_threshold,
         top_n=top_n,
         classification_label_hypotheses=classification_label_hypotheses,
+        load_tokenizer=load_tokenizer,
     )
-    mode = get_zeroshot_backend(backend)
-    if mode == "local":
-        return add_zero_shot_classification_local(df, candidate_labels, **kwargs)
-    return add_zero_shot_classification_hf_inference(df, candidate_labels, **kwargs)
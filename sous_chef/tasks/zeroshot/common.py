@@ -2,11 +2,26 @@
 from __future__ import annotations
 
 import json
-from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
 from .config import ZEROSHOT_DEFAULT_STORY_COLUMNS, ZEROSHOT_UNKNOWN_LABEL
+from .scores import (
+    SCORE_MATRIX_ATTR,
+    ZeroShotScoreMatrix,
+    _failed_mask,
+    _picked_columns,
+    zeroshot_score_matrix,
+)
+
+# Key of the score cache hit / miss counts in ``DataFrame.attrs`` of a classified frame
+SCORE_CACHE_ATTR = "zeroshot_score_cache"
+
+# (labels, hypotheses) for a subset of the candidate labels -> backend output frame
+InferFn = Callable[[pd.DataFrame, List[str], Optional[Dict[str, str]]], pd.DataFrame]
 
 
 def _zeroshot_row_error_message(row: pd.Series) -> Optional[str]:
@@ -80,6 +95,57 @@ def build_zeroshot_inference_label_mapping(
     return inference_labels, "{}", inference_to_canonical
 
 
+def _validate_zeroshot_args(
+    df: pd.DataFrame,
+    candidate_labels: Sequence[str],
+    text_column: str,
+    top_n: Optional[int],
+) -> None:
+    """Argument checks shared by the wrappers around the zero-shot backends."""
+    if top_n is not None and int(top_n) < 1:
+        raise ValueError("top_n must be >= 1 when provided")
+    if not candidate_labels:
+        raise ValueError("candidate_labels must be non-empty")
+    if text_column not in df.columns:
+        raise ValueError(f"DataFrame missing text column {text_column!r}")
+
+
+def subset_label_hypotheses(
+    classification_label_hypotheses: Optional[Dict[str, str]],
+    labels: Sequence[str],
+) -> Optional[Dict[str, str]]:
+    """The hypothesis overrides for ``labels`` only (None when none apply), for an ``InferFn``."""
+    subset = {
+        k: v
+        for k, v in (classification_label_hypotheses or {}).items()
+        if str(k).strip() in labels
+    }
+    return subset or None
+
+
+@dataclass
+class ScoreCacheCounts:
+    """Score cache hits / misses added up over the ``InferFn`` runs behind one result."""
+
+    hits: int = 0
+    misses: int = 0
+    cached: bool = False
+
+    def add(self, out: pd.DataFrame) -> pd.DataFrame:
+        """Count ``out``'s cache stats (if it went through the cache) and return it."""
+        stats = out.attrs.get(SCORE_CACHE_ATTR)
+        if stats:
+            self.cached = True
+            self.hits += int(stats.get("hits", 0))
+            self.misses += int(stats.get("misses", 0))
+        return out
+
+    def attach(self, result: pd.DataFrame) -> None:
+        """Record the totals on ``result`` when any run used the cache."""
+        if self.cached:
+            result.attrs[SCORE_CACHE_ATTR] = {"hits": self.hits, "misses": self.misses}
+
+
 def _selected_zeroshot_labels_for_row(
     row: pd.Series,
     *,
@@ -168,12 +234,38 @@ def build_zero_shot_tag_scores_json_for_row(
         return "{}"
 
 
+def build_zero_shot_tag_scores_json(
+    df: pd.DataFrame,
+    *,
+    passing_score_threshold: Optional[float] = None,
+    top_n: Optional[int] = None,
+) -> List[str]:
+    """
+    :func:`build_zero_shot_tag_scores_json_for_row` for every row at once, from the score
+    matrix: selected labels (``top_n`` over ``passing_score_threshold`` over top label)
+    mapped to their scores, ``"{}"`` for failed rows or rows with nothing selected.
+    """
+    matrix = zeroshot_score_matrix(df)
+    mode = _selection_mode(passing_score_threshold, top_n)
+    mask = matrix.selected(passing_score_threshold, top_n)
+    if mode == "threshold_ge":
+        order = np.broadcast_to(np.arange(len(matrix.labels)), mask.shape)
+    else:
+        order = matrix.ranking()
+    rows = _picked_columns(np.take_along_axis(mask, order, axis=1), order)
+    out: List[str] = []
+    for i, columns in enumerate(rows):
+        tags = {matrix.labels[j]: float(matrix.scores[i, j]) for j in columns}
+        out.append(json.dumps(tags, ensure_ascii=False) if tags else "{}")
+    return out
+
+
 def zeroshot_classification_failure_details(df: pd.DataFrame) -> List[Dict[str, str]]:
     """Structured entries for artifact / logs (story_id, title, error)."""
     if df.empty or "zeroshot_error" not in df.columns:
         return []
     out: list[dict[str, str]] = []
-    for _, row in df.iterrows():
+    for _, row in df[_failed_mask(df)].iterrows():
         msg = _zeroshot_row_error_message(row)
         if not msg:
             continue
@@ -209,31 +301,25 @@ def _append_passing_threshold_column(
     candidate_labels: List[str],
     threshold: float,
 ) -> pd.DataFrame:
-    thr = float(threshold)
-    passing_col: list[str] = []
-    for _, row in df.iterrows():
-        if _zeroshot_row_error_message(row):
-            passing_col.append(json.dumps([]))
-            continue
-        try:
-            labs = json.loads(row["zeroshot_labels_json"])
-            scs = json.loads(row["zeroshot_scores_json"])
-        except (json.JSONDecodeError, KeyError, TypeError):
-            passing_col.append(json.dumps([]))
-            continue
-        scores_by_label = dict(zip(labs, scs))
-        passed = [
-            lab
-            for lab in candidate_labels
-            if scores_by_label.get(lab) is not None
-            and float(scores_by_label[lab]) >= thr
-        ]
-        passing_col.append(json.dumps(passed))
+    matrix = zeroshot_score_matrix(df, candidate_labels)
     out = df.copy()
-    out["zeroshot_labels_passing_threshold_json"] = passing_col
+    out.attrs[SCORE_MATRIX_ATTR] = matrix
+    out["zeroshot_labels_passing_threshold_json"] = matrix.selected_json(
+        matrix.selected(threshold=float(threshold)),
+        ranked=False,
+        candidate_labels=candidate_labels,
+    )
     return out
 
 
+def _selection_mode(passing_score_threshold: Optional[float], top_n: Optional[int]) -> str:
+    if top_n is not None and top_n > 0:
+        return "top_n"
+    if passing_score_threshold is not None:
+        return "threshold_ge"
+    return "top_label"
+
+
 def _append_selected_labels_column(
     df: pd.DataFrame,
     candidate_labels: List[str],
@@ -246,48 +332,74 @@ def _append_selected_labels_column(
 
     Precedence: ``top_n`` (if provided and > 0) overrides ``passing_score_threshold``.
     """
-    selected_col: list[str] = []
-    if top_n is not None and top_n > 0:
-        mode = "top_n"
-        n = int(top_n)
-    elif passing_score_threshold is not None:
-        mode = "threshold_ge"
-        thr = float(passing_score_threshold)
-    else:
-        mode = "top_label"
+    mode = _selection_mode(passing_score_threshold, top_n)
+    matrix = zeroshot_score_matrix(df, candidate_labels)
+    out = df.copy()
+    out.attrs[SCORE_MATRIX_ATTR] = matrix
+    out["zeroshot_labels_selected_json"] = matrix.selected_json(
+        matrix.selected(passing_score_threshold, top_n),
+        ranked=mode != "threshold_ge",
+        candidate_labels=candidate_labels,
+    )
+    return out, mode
 
-    for _, row in df.iterrows():
-        if _zeroshot_row_error_message(row):
-            selected_col.append(json.dumps([]))
-            continue
-        try:
-            labs = json.loads(row["zeroshot_labels_json"])
-            scs = json.loads(row["zeroshot_scores_json"])
-        except (json.JSONDecodeError, KeyError, TypeError):
-            selected_col.append(json.dumps([]))
-            continue
 
-        if mode == "top_n":
-            selected_col.append(json.dumps(list(labs[:n])))
-            continue
-        if mode == "threshold_ge":
-            scores_by_label = dict(zip(labs, scs))
-            passed = [
-                lab
-                for lab in candidate_labels
-                if scores_by_label.get(lab) is not None
-                and float(scores_by_label[lab]) >= thr
-            ]
-            selected_col.append(json.dumps(passed))
-            continue
-        if labs:
-            selected_col.append(json.dumps([labs[0]]))
-        else:
-            selected_col.append(json.dumps([]))
+def _zeroshot_frame_from_scores(
+    df: pd.DataFrame,
+    candidate_labels: List[str],
+    scores: List[Dict[str, float]],
+    errors: Dict[int, str],
+    *,
+    passing_score_threshold: Optional[float],
+    top_n: Optional[int],
+) -> pd.DataFrame:
+    """
+    Backend output columns from per-row ``{label: score}`` maps (rows in ``errors`` failed).
+
+    The scores are kept as a :class:`ZeroShotScoreMatrix` in ``out.attrs`` and the JSON
+    columns are written from it. Ties keep ``candidate_labels`` order.
+    """
+    matrix = ZeroShotScoreMatrix.from_rows(df.index, candidate_labels, scores, errors)
+    error_col = [errors.get(pos, "") for pos in range(len(scores))]
+    return _zeroshot_frame_from_matrix(
+        df,
+        candidate_labels,
+        matrix,
+        error_col,
+        passing_score_threshold=passing_score_threshold,
+        top_n=top_n,
+    )
+
+
+def _zeroshot_frame_from_matrix(
+    df: pd.DataFrame,
+    candidate_labels: List[str],
+    matrix: ZeroShotScoreMatrix,
+    error_col: List[str],
+    *,
+    passing_score_threshold: Optional[float],
+    top_n: Optional[int],
+) -> pd.DataFrame:
+    """Backend output columns for ``df`` from a score matrix over its rows."""
+    labels_col, scores_col = matrix.json_columns()
+    top_label_col, top_score_col = matrix.top()
 
     out = df.copy()
-    out["zeroshot_labels_selected_json"] = selected_col
-    return out, mode
+    out["zeroshot_labels_json"] = labels_col
+    out["zeroshot_scores_json"] = scores_col
+    out["zeroshot_top_label"] = top_label_col
+    out["zeroshot_top_score"] = top_score_col
+    out["zeroshot_error"] = error_col
+    out.attrs[SCORE_MATRIX_ATTR] = matrix
+    if passing_score_threshold is not None:
+        out = _append_passing_threshold_column(out, candidate_labels, passing_score_threshold)
+    out, _ = _append_selected_labels_column(
+        out,
+        candidate_labels,
+        passing_score_threshold=passing_score_threshold,
+        top_n=top_n,
+    )
+    return out
 
 
 def compute_zero_shot_label_counts(
@@ -313,78 +425,8 @@ def compute_zero_shot_label_counts(
         (label_counts aligned with input_labels, stories_without_prediction,
          stories_classification_failed)
     """
-    counts = [0] * len(input_labels)
-    label_to_idx = {lab: i for i, lab in enumerate(input_labels)}
-    no_pred = 0
-    failed = 0
-
-    if summary_top_n is not None and summary_top_n > 0:
-        n = int(summary_top_n)
-        for _, row in df.iterrows():
-            if _zeroshot_row_error_message(row):
-                failed += 1
-                continue
-            try:
-                labs = json.loads(row["zeroshot_labels_json"])
-            except (json.JSONDecodeError, KeyError, TypeError):
-                no_pred += 1
-                continue
-            if not labs:
-                no_pred += 1
-                continue
-            any_hit = False
-            for lab in labs[:n]:
-                idx = label_to_idx.get(str(lab))
-                if idx is None:
-                    continue
-                counts[idx] += 1
-                any_hit = True
-            if not any_hit:
-                no_pred += 1
-    elif summary_score_threshold is None:
-        for _, row in df.iterrows():
-            if _zeroshot_row_error_message(row):
-                failed += 1
-                continue
-            tl = row.get("zeroshot_top_label")
-            if tl is None or (isinstance(tl, float) and pd.isna(tl)):
-                no_pred += 1
-                continue
-            tl_str = str(tl).strip()
-            if not tl_str:
-                no_pred += 1
-                continue
-            idx = label_to_idx.get(tl_str)
-            if idx is None:
-                no_pred += 1
-                continue
-            counts[idx] += 1
-    else:
-        thr = float(summary_score_threshold)
-        for _, row in df.iterrows():
-            if _zeroshot_row_error_message(row):
-                failed += 1
-                continue
-            try:
-                labs = json.loads(row["zeroshot_labels_json"])
-                scs = json.loads(row["zeroshot_scores_json"])
-            except (json.JSONDecodeError, KeyError, TypeError):
-                no_pred += 1
-                continue
-            if not labs:
-                no_pred += 1
-                continue
-            scores_by_label = dict(zip(labs, scs))
-            any_hit = False
-            for lab in input_labels:
-                sc = scores_by_label.get(lab)
-                if sc is not None and float(sc) >= thr:
-                    counts[label_to_idx[lab]] += 1
-                    any_hit = True
-            if not any_hit:
-                no_pred += 1
-
-    return counts, no_pred, failed
+    matrix = zeroshot_score_matrix(df, input_labels)
+    return matrix.label_counts(input_labels, summary_score_threshold, summary_top_n)
 
 
 def story_dataframe_for_zeroshot_csv(df: pd.DataFrame) -> pd.DataFrame:
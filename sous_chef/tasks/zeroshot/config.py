@@ -14,6 +14,16 @@ ZEROSHOT_STORY_TEXT_COLUMN = "text"
 ZEROSHOT_CLASSIFY_DEVICE = -1
 # Truncation before inference (task default; not a Kitchen param unless a flow exposes it).
 ZEROSHOT_TEXT_MAX_CHARS_DEFAULT = 2000
+# Premise/hypothesis pairs per forward pass for the local backends (1 = one pipeline call per story).
+ZEROSHOT_LOCAL_BATCH_SIZE = 32
+# Chunked mode (``chunk_pooling``): premise tokens per window and windows kept per story.
+ZEROSHOT_CHUNK_TOKENS = 400
+ZEROSHOT_MAX_CHUNKS = 8
+ZEROSHOT_CHUNK_POOLING = ("max", "mean", "attention")
+# Local backends on CPU: worker processes, each holding one model replica (1 = this process).
+ZEROSHOT_LOCAL_WORKERS_ENV = "ZEROSHOT_LOCAL_WORKERS"
+# Memory all replicas of a sharded run may take together; default 75% of available RAM.
+ZEROSHOT_SHARD_MEMORY_BUDGET_ENV = "ZEROSHOT_SHARD_MEMORY_BUDGET_MB"
 
 # Hugging Face InferenceClient HTTP timeout (seconds). Larger than typical gateway
 # idle limits so the client waits for slow zero-shot responses before InferenceTimeoutError.
@@ -21,6 +31,23 @@ ZEROSHOT_HF_INFERENCE_TIMEOUT_S = 180.0
 
 ZEROSHOT_BACKEND_ENV = "ZEROSHOT_BACKEND"
 
+# Hosted requests in flight at once (adaptively lowered on 429/503). Sequential by default,
+# since the endpoint's rate limits are per account; raise it where the plan allows.
+ZEROSHOT_HF_MAX_CONCURRENCY_ENV = "ZEROSHOT_HF_MAX_CONCURRENCY"
+ZEROSHOT_HF_MAX_CONCURRENCY_DEFAULT = 1
+# Optional wall-clock budget for one hosted run; rows not sent by then fail without a
+# request. Unset (or 0) = no deadline.
+ZEROSHOT_HF_RUN_DEADLINE_ENV = "ZEROSHOT_HF_RUN_DEADLINE_S"
+ZEROSHOT_HF_RUN_DEADLINE_S_DEFAULT: float | None = None
+
+# Embedding cascade: only each story's top-k labels by bi-encoder similarity go to NLI. 0 = off.
+ZEROSHOT_CASCADE_TOP_K_ENV = "ZEROSHOT_CASCADE_TOP_K"
+ZEROSHOT_CASCADE_EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+# Stories re-scored on every label to report the shortlist's recall against full NLI.
+ZEROSHOT_CASCADE_VALIDATION_SIZE = 50
+# Label taxonomy: a parent's score must reach this for its child labels to be scored.
+ZEROSHOT_TAXONOMY_PARENT_THRESHOLD = 0.5
+
 # Default metadata columns for CSV export (never includes full story `text`).
 ZEROSHOT_DEFAULT_STORY_COLUMNS: list[str] = [
     "story_id",
@@ -31,7 +58,7 @@ ZEROSHOT_DEFAULT_STORY_COLUMNS: list[str] = [
     "language",
 ]
 
-ZeroshotBackend = Literal["local", "hf_inference"]
+ZeroshotBackend = Literal["local", "onnx", "hf_inference", "server"]
 
 
 def get_zeroshot_backend(explicit: str | None = None) -> ZeroshotBackend:
@@ -39,8 +66,70 @@ def get_zeroshot_backend(explicit: str | None = None) -> ZeroshotBackend:
     raw = (explicit or os.environ.get(ZEROSHOT_BACKEND_ENV) or "hf_inference").strip().lower()
     if raw in ("local",):
         return "local"
+    if raw in ("onnx", "onnxruntime"):
+        return "onnx"
     if raw in ("hf_inference", "hf", "hosted", "inference_api"):
         return "hf_inference"
+    if raw in ("server", "inference_server"):
+        return "server"
     raise ValueError(
-        f"Invalid {ZEROSHOT_BACKEND_ENV}={raw!r}; use 'local' or 'hf_inference'"
+        f"Invalid {ZEROSHOT_BACKEND_ENV}={raw!r}; use 'local', 'onnx', 'hf_inference' or 'server'"
     )
+
+
+def get_zeroshot_hf_concurrency(explicit: int | None = None) -> int:
+    """Resolve hosted concurrency: explicit arg, then ``ZEROSHOT_HF_MAX_CONCURRENCY`` env, default 1."""
+    if explicit is None:
+        raw = (os.environ.get(ZEROSHOT_HF_MAX_CONCURRENCY_ENV) or "").strip()
+        try:
+            explicit = int(raw) if raw else ZEROSHOT_HF_MAX_CONCURRENCY_DEFAULT
+        except ValueError:
+            raise ValueError(
+                f"Invalid {ZEROSHOT_HF_MAX_CONCURRENCY_ENV}={raw!r}; expected a positive integer"
+            ) from None
+    if int(explicit) < 1:
+        raise ValueError("max_concurrency must be >= 1")
+    return int(explicit)
+
+
+def get_zeroshot_hf_run_deadline_s(explicit: float | None = None) -> float | None:
+    """Resolve the hosted run deadline (seconds): explicit arg, then env, default none; 0 = none."""
+    if explicit is None:
+        raw = (os.environ.get(ZEROSHOT_HF_RUN_DEADLINE_ENV) or "").strip()
+        try:
+            explicit = float(raw) if raw else ZEROSHOT_HF_RUN_DEADLINE_S_DEFAULT
+        except ValueError:
+            raise ValueError(
+                f"Invalid {ZEROSHOT_HF_RUN_DEADLINE_ENV}={raw!r}; expected seconds"
+            ) from None
+    return float(explicit) if explicit and explicit > 0 else None
+
+
+def get_zeroshot_cascade_top_k(explicit: int | None = None) -> int | None:
+    """Resolve the cascade shortlist size: explicit arg, then ``ZEROSHOT_CASCADE_TOP_K`` env; 0 = off."""
+    if explicit is None:
+        raw = (os.environ.get(ZEROSHOT_CASCADE_TOP_K_ENV) or "").strip()
+        try:
+            explicit = int(raw) if raw else 0
+        except ValueError:
+            raise ValueError(
+                f"Invalid {ZEROSHOT_CASCADE_TOP_K_ENV}={raw!r}; expected a non-negative integer"
+            ) from None
+    if int(explicit) < 0:
+        raise ValueError("cascade_top_k must be >= 0")
+    return int(explicit) or None
+
+
+def get_zeroshot_local_workers(explicit: int | None = None) -> int:
+    """Resolve local worker processes: explicit arg, then ``ZEROSHOT_LOCAL_WORKERS`` env, default 1."""
+    if explicit is None:
+        raw = (os.environ.get(ZEROSHOT_LOCAL_WORKERS_ENV) or "").strip()
+        try:
+            explicit = int(raw) if raw else 1
+        except ValueError:
+            raise ValueError(
+                f"Invalid {ZEROSHOT_LOCAL_WORKERS_ENV}={raw!r}; expected a positive integer"
+            ) from None
+    if int(explicit) < 1:
+        raise ValueError("workers must be >= 1")
+    return int(explicit)
@@ -1,32 +1,45 @@
 """Hugging Face Inference API (hosted) zero-shot classification."""
 from __future__ import annotations
 
-import json
 import logging
+import threading
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
 
 import pandas as pd
 from huggingface_hub import InferenceClient
 from huggingface_hub.errors import HfHubHTTPError, InferenceTimeoutError
 
+from sous_chef.runtime import mark_step
 from sous_chef.secrets import get_hf_bill_to, get_llm_api_key
 
 from .common import (
-    _append_passing_threshold_column,
-    _append_selected_labels_column,
     _truncate,
+    _zeroshot_frame_from_scores,
     build_zeroshot_inference_label_mapping,
 )
 from .config import (
     DEFAULT_ZEROSHOT_MODEL,
     ZEROSHOT_HF_INFERENCE_TIMEOUT_S,
     ZEROSHOT_TEXT_MAX_CHARS_DEFAULT,
-    ZEROSHOT_UNKNOWN_LABEL,
+    get_zeroshot_hf_concurrency,
+    get_zeroshot_hf_run_deadline_s,
 )
 
-# HTTP statuses treated as transient for hosted inference (gateway / overload / cold model).
-_RETRYABLE_HF_HTTP_STATUSES = frozenset({502, 503, 504})
+# HTTP statuses treated as transient for hosted inference (rate limit / gateway / overload / cold model).
+_RETRYABLE_HF_HTTP_STATUSES = frozenset({429, 502, 503, 504})
+# Statuses that mean "too many requests in flight": concurrent runs back off on these.
+_THROTTLE_HF_HTTP_STATUSES = frozenset({429, 503})
+# Statuses no retry will fix (auth / unknown model): every later row would fail the same way.
+_FATAL_HF_HTTP_STATUSES = frozenset({401, 403, 404})
+
+# Circuit breaker: consecutive transient failures (across rows) before all requests pause,
+# and the pause, doubled on each re-open up to the max.
+_BREAKER_FAILURE_THRESHOLD = 3
+_BREAKER_COOLDOWN_S = 5.0
+_BREAKER_MAX_COOLDOWN_S = 120.0
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +73,146 @@ def _classify_one_hf(
     return labels, scores
 
 
+class _AdaptiveConcurrency:
+    """
+    Cap on in-flight hosted requests that adapts to throttling (AIMD).
+
+    Starts at ``maximum``; a 429/503 halves the cap, and each run of ``cap``
+    consecutive successes raises it by one again, up to ``maximum``.
+    """
+
+    def __init__(self, maximum: int):
+        self.maximum = max(1, int(maximum))
+        self.limit = self.maximum
+        self.lowest = self.maximum
+        self.throttled = 0
+        self._in_flight = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    def on_success(self) -> None:
+        with self._cond:
+            self._successes += 1
+            if self.limit < self.maximum and self._successes >= self.limit:
+                self.limit += 1
+                self._successes = 0
+                self._cond.notify_all()
+
+    def on_throttle(self) -> None:
+        with self._cond:
+            self.throttled += 1
+            self._successes = 0
+            self.limit = max(1, self.limit // 2)
+            self.lowest = min(self.lowest, self.limit)
+
+
+class ZeroShotRunAborted(RuntimeError):
+    """A row was not sent: the run deadline passed or the endpoint failed permanently."""
+
+
+class _EndpointBreaker:
+    """
+    Backoff state shared by every row of a hosted zero-shot run.
+
+    ``_BREAKER_FAILURE_THRESHOLD`` consecutive transient failures (timeouts, 429/5xx)
+    open the circuit: no request is sent for the cooldown, which doubles each time the
+    circuit re-opens. After the cooldown one request goes through as a probe; success
+    closes the circuit, failure re-opens it. A 401/403/404 trips it for good, and once
+    the run deadline passes no request is sent at all; rows then fail with
+    :class:`ZeroShotRunAborted`.
+    """
+
+    def __init__(self, deadline_s: Optional[float] = None):
+        self.deadline = time.monotonic() + deadline_s if deadline_s else None
+        self.opens = 0
+        self.aborted_rows = 0
+        self._failures = 0
+        self._open_until: Optional[float] = None
+        self._probing = False
+        self._fatal: Optional[str] = None
+        self._cond = threading.Condition()
+
+    def _remaining(self) -> float:
+        return float("inf") if self.deadline is None else self.deadline - time.monotonic()
+
+    def _abort(self, reason: str) -> ZeroShotRunAborted:
+        self.aborted_rows += 1
+        return ZeroShotRunAborted(f"{reason}; request not sent")
+
+    def before_request(self) -> None:
+        """Block while the circuit is open; raise if the row must not be sent."""
+        with self._cond:
+            while True:
+                if self._fatal:
+                    raise self._abort(self._fatal)
+                if self._remaining() <= 0:
+                    raise self._abort("zero-shot run deadline passed")
+                if self._open_until is None:
+                    return
+                now = time.monotonic()
+                if now >= self._open_until and not self._probing:
+                    self._probing = True
+                    return
+                wait = self._open_until - now if now < self._open_until else None
+                self._cond.wait(min(x for x in (wait, self._remaining(), 1.0) if x is not None))
+
+    def record_success(self) -> None:
+        """The endpoint answered (even with a per-row error such as 400)."""
+        with self._cond:
+            self._failures = 0
+            self._probing = False
+            if self._open_until is not None:
+                logger.info("zeroshot hf_inference endpoint recovered; closing circuit")
+            self._open_until = None
+            self._cond.notify_all()
+
+    def record_failure(self, retry_after_s: float = 0.0) -> None:
+        """A transient failure; opens (or re-opens) the circuit past the threshold."""
+        with self._cond:
+            self._failures += 1
+            if self._probing or self._failures >= _BREAKER_FAILURE_THRESHOLD:
+                cooldown = min(_BREAKER_COOLDOWN_S * 2 ** self.opens, _BREAKER_MAX_COOLDOWN_S)
+                cooldown = max(cooldown, retry_after_s)
+                self.opens += 1
+                self._failures = 0
+                self._probing = False
+                self._open_until = time.monotonic() + cooldown
+                logger.warning(
+                    "zeroshot hf_inference endpoint unhealthy; pausing all requests for %.0fs",
+                    cooldown,
+                )
+            self._cond.notify_all()
+
+    def trip(self, reason: str) -> None:
+        with self._cond:
+            self._fatal = reason
+            self._cond.notify_all()
+
+    def sleep(self, delay_s: float) -> None:
+        """Per-row retry delay, cut short at the run deadline."""
+        time.sleep(max(0.0, min(delay_s, self._remaining())))
+
+
+def _retry_after_s(e: HfHubHTTPError) -> float:
+    try:
+        return float(e.response.headers.get("Retry-After") or 0)
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+
 def _call_with_model_loading_retry(
     client: InferenceClient,
     model: str,
@@ -70,26 +223,50 @@ def _call_with_model_loading_retry(
     *,
     max_retries: int = 6,
     base_delay_s: float = 3.0,
+    limiter: Optional[_AdaptiveConcurrency] = None,
+    breaker: Optional[_EndpointBreaker] = None,
 ) -> tuple[list[str], list[float]]:
+    if not text.strip():
+        return [], []
+    limiter = limiter or _AdaptiveConcurrency(1)
+    breaker = breaker or _EndpointBreaker()
     for attempt in range(max_retries):
+        delay = base_delay_s * (attempt + 1)
+        breaker.before_request()
         try:
-            return _classify_one_hf(
-                client,
-                model,
-                text,
-                candidate_labels,
-                hypothesis_template,
-                multi_label,
-            )
+            # Backoff sleeps happen outside the slot so other rows can use it
+            with limiter.slot():
+                result = _classify_one_hf(
+                    client,
+                    model,
+                    text,
+                    candidate_labels,
+                    hypothesis_template,
+                    multi_label,
+                )
+            limiter.on_success()
+            breaker.record_success()
+            return result
         except InferenceTimeoutError:
+            breaker.record_failure()
             if attempt >= max_retries - 1:
                 raise
         except HfHubHTTPError as e:
             code = e.response.status_code
-            if code not in _RETRYABLE_HF_HTTP_STATUSES or attempt >= max_retries - 1:
+            if code in _FATAL_HF_HTTP_STATUSES:
+                breaker.trip(f"endpoint returned HTTP {code} ({e})"[:500])
                 raise
-        delay = base_delay_s * (attempt + 1)
-        time.sleep(delay)
+            if code not in _RETRYABLE_HF_HTTP_STATUSES:
+                breaker.record_success()
+                raise
+            retry_after = _retry_after_s(e)
+            if code in _THROTTLE_HF_HTTP_STATUSES:
+                limiter.on_throttle()
+                delay = max(delay, retry_after)
+            breaker.record_failure(retry_after)
+            if attempt >= max_retries - 1:
+                raise
+        breaker.sleep(delay)
     raise RuntimeError("zero-shot HF inference retries exhausted")
 
 
@@ -106,6 +283,8 @@ def add_zero_shot_classification_hf_inference(
     passing_score_threshold: Optional[float] = None,
     top_n: Optional[int] = None,
     classification_label_hypotheses: Optional[Dict[str, str]] = None,
+    max_concurrency: Optional[int] = None,
+    run_deadline_s: Optional[float] = None,
 ) -> pd.DataFrame:
     """
     Same column contract as :func:`add_zero_shot_classification_local`.
@@ -113,6 +292,18 @@ def add_zero_shot_classification_hf_inference(
     ``device`` is ignored (remote inference). ``HUGGINGFACE_API_KEY`` (or Prefect
     secret) is recommended for higher rate limits and gated models; optional for
     some public models.
+
+    Up to ``max_concurrency`` requests (default ``ZEROSHOT_HF_MAX_CONCURRENCY``, 1) are
+    in flight at once on one client and its connection pool; 429/503 responses halve
+    the cap until requests succeed again. ``1`` sends requests one at a time; raise it
+    (e.g. ``ZEROSHOT_HF_MAX_CONCURRENCY=8``) when the endpoint's rate limit allows.
+    Row order and ``zeroshot_error`` are the same either way.
+
+    The first non-empty row is sent alone as a warm-up probe (a cold model loads before
+    the pool fans out). Backoff is shared across rows by a circuit breaker that pauses
+    every request while the endpoint keeps failing. With a ``run_deadline_s`` (default
+    ``ZEROSHOT_HF_RUN_DEADLINE_S``, none), rows not yet sent when it passes fail with a
+    ``ZeroShotRunAborted`` error instead of being requested.
     """
     del device  # hosted path has no local torch device
     if not candidate_labels:
@@ -147,67 +338,91 @@ def add_zero_shot_classification_hf_inference(
             timeout=ZEROSHOT_HF_INFERENCE_TIMEOUT_S,
         )
 
-    labels_col: list[str] = []
-    scores_col: list[str] = []
-    top_label_col: list[str] = []
-    top_score_col: list[Optional[float]] = []
-    error_col: list[str] = []
-
+    texts: list[str] = []
+    story_ids: list = []
     for _, row in df.iterrows():
         raw = row.get(text_column)
         if raw is None or pd.isna(raw):
-            text = ""
+            texts.append("")
         else:
-            text = _truncate(str(raw), text_max_chars)
-        err_msg = ""
+            texts.append(_truncate(str(raw), text_max_chars))
+        sid = row.get("story_id", "")
+        if sid is None or (isinstance(sid, float) and pd.isna(sid)):
+            sid = ""
+        story_ids.append(sid)
+
+    concurrency = get_zeroshot_hf_concurrency(max_concurrency)
+    limiter = _AdaptiveConcurrency(concurrency)
+    breaker = _EndpointBreaker(get_zeroshot_hf_run_deadline_s(run_deadline_s))
+
+    def classify_row(pos: int) -> tuple[list[str], list[float], str]:
         try:
             labels, scores = _call_with_model_loading_retry(
                 client,
                 model,
-                text,
+                texts[pos],
                 inference_candidate_labels,
                 inference_hypothesis_template,
                 multi_label,
+                limiter=limiter,
+                breaker=breaker,
             )
             labels = [inference_to_canonical_label.get(l, l) for l in labels]
         except Exception as e:
             err_msg = f"{type(e).__name__}: {e}"[:2000]
-            sid = row.get("story_id", "")
-            if sid is None or (isinstance(sid, float) and pd.isna(sid)):
-                sid = ""
             logger.warning(
                 "zeroshot hf_inference failed story_id=%s: %s",
-                sid,
+                story_ids[pos],
                 err_msg,
             )
-            labels, scores = [], []
-            top_label_col.append(ZEROSHOT_UNKNOWN_LABEL)
-            top_score_col.append(None)
-            labels_col.append(json.dumps(labels))
-            scores_col.append(json.dumps(scores))
-            error_col.append(err_msg)
-            continue
-
-        labels_col.append(json.dumps(labels))
-        scores_col.append(json.dumps(scores))
-        top_label_col.append(labels[0] if labels else "")
-        top_score_col.append(scores[0] if scores else None)
-        error_col.append(err_msg)
-
-    out = df.copy()
-    out["zeroshot_labels_json"] = labels_col
-    out["zeroshot_scores_json"] = scores_col
-    out["zeroshot_top_label"] = top_label_col
-    out["zeroshot_top_score"] = top_score_col
-    out["zeroshot_error"] = error_col
-
-    if passing_score_threshold is not None:
-        out = _append_passing_threshold_column(
-            out, candidate_labels, passing_score_threshold
-        )
-    out, _ = _append_selected_labels_column(
-        out,
+            return [], [], err_msg
+        return labels, scores, ""
+
+    start = time.perf_counter()
+    results: dict[int, tuple[list[str], list[float], str]] = {}
+    probe = next((pos for pos, text in enumerate(texts) if text.strip()), None)
+    if probe is not None:
+        results[probe] = classify_row(probe)
+    probe_seconds = time.perf_counter() - start
+    pending = [pos for pos in range(len(texts)) if pos not in results]
+    if concurrency == 1 or len(pending) <= 1:
+        results.update((pos, classify_row(pos)) for pos in pending)
+    else:
+        with ThreadPoolExecutor(
+            max_workers=min(concurrency, len(pending)),
+            thread_name_prefix="zeroshot-hf",
+        ) as pool:
+            results.update(zip(pending, pool.map(classify_row, pending)))
+    seconds = time.perf_counter() - start
+    mark_step(
+        "zeroshot_hf_inference",
+        meta={
+            "documents": len(texts),
+            "max_concurrency": concurrency,
+            "final_concurrency": limiter.limit,
+            "lowest_concurrency": limiter.lowest,
+            "throttled_responses": limiter.throttled,
+            "probe_seconds": round(probe_seconds, 3),
+            "circuit_opens": breaker.opens,
+            "rows_not_sent": breaker.aborted_rows,
+            "seconds": round(seconds, 3),
+            "docs_per_sec": round(len(texts) / seconds, 1) if seconds > 0 else None,
+        },
+    )
+
+    rows: list[dict[str, float]] = []
+    errors: dict[int, str] = {}
+    for pos in range(len(texts)):
+        labels, scores, err_msg = results[pos]
+        if err_msg:
+            errors[pos] = err_msg
+        rows.append(dict(zip(labels, scores)))
+
+    out = _zeroshot_frame_from_scores(
+        df,
         candidate_labels,
+        rows,
+        errors,
         passing_score_threshold=passing_score_threshold,
         top_n=top_n,
     )
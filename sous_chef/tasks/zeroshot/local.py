@@ -1,24 +1,26 @@
-"""Local zero-shot classification via ``transformers.pipeline``."""
+"""Local zero-shot classification via ``transformers.pipeline`` (or its ONNX Runtime stand-in)."""
 from __future__ import annotations
 
-import json
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Callable, Dict, List, Optional
 
 import pandas as pd
 import torch
 from transformers import pipeline
 
+from ...runtime import mark_step
+from ..nlp.onnx_backend import load_onnx_pipeline
+from .batched import classify_zero_shot_batched, nli_runner
 from .common import (
-    _append_passing_threshold_column,
-    _append_selected_labels_column,
     _truncate,
+    _zeroshot_frame_from_scores,
     build_zeroshot_inference_label_mapping,
 )
 from .config import (
     DEFAULT_ZEROSHOT_MODEL,
+    ZEROSHOT_LOCAL_BATCH_SIZE,
     ZEROSHOT_TEXT_MAX_CHARS_DEFAULT,
-    ZEROSHOT_UNKNOWN_LABEL,
 )
 
 logger = logging.getLogger(__name__)
@@ -44,6 +46,23 @@ def _classify_one_pipeline(
     return labels, scores
 
 
+def load_local_zeroshot_classifier(model: str, device: int = -1, runtime: str = "pytorch") -> Any:
+    """Zero-shot pipeline for ``model`` (ONNX Runtime stand-in when ``runtime="onnx"``)."""
+    if runtime == "onnx":
+        return load_onnx_pipeline("zero-shot-classification", model)
+    if device == -1:
+        torch_device = -1
+    else:
+        torch_device = device if torch.cuda.is_available() else -1
+
+    return pipeline(
+        "zero-shot-classification",
+        model=model,
+        device=torch_device,
+        framework="pt",
+    )
+
+
 def add_zero_shot_classification_local(
     df: pd.DataFrame,
     candidate_labels: List[str],
@@ -57,7 +76,24 @@ def add_zero_shot_classification_local(
     passing_score_threshold: Optional[float] = None,
     top_n: Optional[int] = None,
     classification_label_hypotheses: Optional[Dict[str, str]] = None,
+    runtime: str = "pytorch",
+    batch_size: int = ZEROSHOT_LOCAL_BATCH_SIZE,
+    load_classifier: Optional[Callable[[], Any]] = None,
 ) -> pd.DataFrame:
+    """
+    ``runtime="onnx"`` runs the same model through ONNX Runtime on CPU
+    (``device`` is ignored); output columns are identical. ``load_classifier``
+    replaces :func:`load_local_zeroshot_classifier` (e.g. to reuse one across calls);
+    it is only called after the arguments are validated.
+
+    Premise/hypothesis pairs of all stories are run together in length-sorted batches
+    of ``batch_size`` pairs (see ``batched``); ``batch_size=1`` calls the pipeline once
+    per story. Stories in a batch that fails are retried on their own, so
+    ``zeroshot_error`` still describes that story's failure.
+    """
+    if runtime not in ("pytorch", "onnx"):
+        raise ValueError(f"runtime must be 'pytorch' or 'onnx', got {runtime!r}")
+
     if top_n is not None and int(top_n) < 1:
         raise ValueError("top_n must be >= 1 when provided")
 
@@ -77,17 +113,10 @@ def add_zero_shot_classification_local(
         classification_label_hypotheses,
     )
 
-    if device == -1:
-        torch_device = -1
+    if load_classifier is not None:
+        clf = load_classifier()
     else:
-        torch_device = device if torch.cuda.is_available() else -1
-
-    clf = pipeline(
-        "zero-shot-classification",
-        model=model,
-        device=torch_device,
-        framework="pt",
-    )
+        clf = load_local_zeroshot_classifier(model, device, runtime)
 
     def classify_one(
         text: str,
@@ -97,26 +126,54 @@ def add_zero_shot_classification_local(
     ) -> tuple[list[str], list[float]]:
         return _classify_one_pipeline(clf, text, cands, hyp, multi)
 
-    labels_col: list[str] = []
-    scores_col: list[str] = []
-    top_label_col: list[str] = []
-    top_score_col: list[Optional[float]] = []
-    error_col: list[str] = []
-
-    for _, row in df.iterrows():
-        raw = row.get(text_column)
+    texts: list[str] = []
+    for raw in df[text_column].tolist():
         if raw is None or pd.isna(raw):
-            text = ""
+            texts.append("")
         else:
-            text = _truncate(str(raw), text_max_chars)
-        err_msg = ""
+            texts.append(_truncate(str(raw), text_max_chars))
+
+    batched: dict[int, tuple[list[str], list[float]]] = {}
+    runner = nli_runner(clf) if batch_size > 1 else None
+    if runner is not None:
+        start = time.perf_counter()
+        batched, batch_errors = classify_zero_shot_batched(
+            runner,
+            texts,
+            inference_candidate_labels,
+            inference_hypothesis_template,
+            multi_label,
+            batch_size,
+        )
+        seconds = time.perf_counter() - start
+        mark_step(
+            "zeroshot_local_inference",
+            meta={
+                "documents": len(texts),
+                "pairs": sum(1 for t in texts if t.strip()) * len(inference_candidate_labels),
+                "batch_size": batch_size,
+                "runtime": runtime,
+                "retried_documents": len(batch_errors),
+                "seconds": round(seconds, 3),
+                "docs_per_sec": round(len(texts) / seconds, 1) if seconds > 0 else None,
+            },
+        )
+
+    rows: list[dict[str, float]] = []
+    errors: dict[int, str] = {}
+
+    for pos, (_, row) in enumerate(df.iterrows()):
+        text = texts[pos]
         try:
-            labels, scores = classify_one(
-                text,
-                inference_candidate_labels,
-                inference_hypothesis_template,
-                multi_label,
-            )
+            if pos in batched:
+                labels, scores = batched[pos]
+            else:
+                labels, scores = classify_one(
+                    text,
+                    inference_candidate_labels,
+                    inference_hypothesis_template,
+                    multi_label,
+                )
             labels = [inference_to_canonical_label.get(l, l) for l in labels]
         except Exception as e:
             err_msg = f"{type(e).__name__}: {e}"[:2000]
@@ -128,34 +185,16 @@ def add_zero_shot_classification_local(
                 sid,
                 err_msg,
             )
-            labels, scores = [], []
-            labels_col.append(json.dumps(labels))
-            scores_col.append(json.dumps(scores))
-            top_label_col.append(ZEROSHOT_UNKNOWN_LABEL)
-            top_score_col.append(None)
-            error_col.append(err_msg)
+            errors[pos] = err_msg
+            rows.append({})
             continue
+        rows.append(dict(zip(labels, scores)))
 
-        labels_col.append(json.dumps(labels))
-        scores_col.append(json.dumps(scores))
-        top_label_col.append(labels[0] if labels else "")
-        top_score_col.append(scores[0] if scores else None)
-        error_col.append(err_msg)
-
-    out = df.copy()
-    out["zeroshot_labels_json"] = labels_col
-    out["zeroshot_scores_json"] = scores_col
-    out["zeroshot_top_label"] = top_label_col
-    out["zeroshot_top_score"] = top_score_col
-    out["zeroshot_error"] = error_col
-
-    if passing_score_threshold is not None:
-        out = _append_passing_threshold_column(
-            out, candidate_labels, passing_score_threshold
-        )
-    out, _ = _append_selected_labels_column(
-        out,
+    out = _zeroshot_frame_from_scores(
+        df,
         candidate_labels,
+        rows,
+        errors,
         passing_score_threshold=passing_score_threshold,
         top_n=top_n,
     )
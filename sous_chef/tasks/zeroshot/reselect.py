@@ -0,0 +1,140 @@
+"""
+Stored zero-shot scores and re-selection without re-inference.
+
+:func:`zeroshot_scores_frame` flattens a classified frame's score matrix into one float64
+column per label (``zeroshot_score:<label>``) next to the story metadata and
+``zeroshot_error``, which the zero-shot flow writes as Parquet beside its CSV. Run
+settings (model, hypothesis template, multi-label) ride along in ``attrs``, which pandas
+keeps in the Parquet metadata.
+
+:func:`reselect_zero_shot_labels` rebuilds the classified frame from such a file with a
+different ``passing_score_threshold`` / ``top_n`` (or a subset of the labels), so
+selections, summary counts and the export CSV can be redone without loading a model.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from ...runtime import mark_step
+from .common import _zeroshot_frame_from_matrix
+from .config import ZEROSHOT_DEFAULT_STORY_COLUMNS
+from .scores import ZeroShotScoreMatrix, _failed_mask, zeroshot_score_matrix
+
+# Prefix of the per-label score columns in a stored scores frame
+SCORE_COLUMN_PREFIX = "zeroshot_score:"
+# Key of the run settings in ``attrs`` of a stored scores frame
+SCORES_RUN_ATTR = "zeroshot_run"
+
+
+def zeroshot_scores_frame(
+    df: pd.DataFrame,
+    labels: Optional[Sequence[str]] = None,
+    *,
+    run: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Story metadata, ``zeroshot_error`` and one float64 score column per label (NaN =
+    unscored) for a classified frame; ``run`` (JSON-serialisable settings) goes in ``attrs``.
+    """
+    matrix = zeroshot_score_matrix(df, labels)
+    keep = list(labels) if labels is not None else list(matrix.labels)
+    column = {label: j for j, label in enumerate(matrix.labels)}
+
+    meta = [c for c in ZEROSHOT_DEFAULT_STORY_COLUMNS if c in df.columns]
+    out = df.loc[:, meta].reset_index(drop=True)
+    if "zeroshot_error" in df.columns:
+        out["zeroshot_error"] = df["zeroshot_error"].fillna("").astype(str).to_numpy()
+    else:
+        out["zeroshot_error"] = ""
+    scores = pd.DataFrame(
+        matrix.scores[:, [column[label] for label in keep]],
+        columns=[f"{SCORE_COLUMN_PREFIX}{label}" for label in keep],
+    )
+    out = pd.concat([out, scores], axis=1)
+    out.attrs = {SCORES_RUN_ATTR: dict(run or {})}
+    return out
+
+
+def zeroshot_scores_run(scores: pd.DataFrame) -> Dict[str, Any]:
+    """Run settings stored with a scores frame (empty if none)."""
+    return dict(scores.attrs.get(SCORES_RUN_ATTR) or {})
+
+
+def read_zeroshot_scores(source: Union[pd.DataFrame, str]) -> pd.DataFrame:
+    """A stored scores frame, as given or read from a local Parquet path."""
+    if isinstance(source, pd.DataFrame):
+        return source
+    return pd.read_parquet(source)
+
+
+def stored_zeroshot_labels(scores: pd.DataFrame) -> List[str]:
+    """Labels with a score column in a stored scores frame, in stored order."""
+    return [
+        str(c)[len(SCORE_COLUMN_PREFIX):]
+        for c in scores.columns
+        if str(c).startswith(SCORE_COLUMN_PREFIX)
+    ]
+
+
+def reselect_zero_shot_labels(
+    scores: Union[pd.DataFrame, str],
+    candidate_labels: Optional[List[str]] = None,
+    *,
+    passing_score_threshold: Optional[float] = None,
+    top_n: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Zero-shot columns recomputed from stored scores, as if the run had used these
+    selection settings.
+
+    Args:
+        scores: Frame from :func:`zeroshot_scores_frame`, or a Parquet path to one
+        candidate_labels: Subset of the stored labels to rank and select among
+            (default: all of them, in stored order)
+        passing_score_threshold: As in ``add_zero_shot_classification``
+        top_n: As in ``add_zero_shot_classification`` (overrides the threshold)
+
+    Returns the story metadata plus the same ``zeroshot_*`` columns (and score matrix) a
+    classification run with these settings would produce.
+    """
+    if top_n is not None and int(top_n) < 1:
+        raise ValueError("top_n must be >= 1 when provided")
+    frame = read_zeroshot_scores(scores)
+    stored = stored_zeroshot_labels(frame)
+    if not stored:
+        raise ValueError(f"No {SCORE_COLUMN_PREFIX}* columns; not a stored zero-shot scores frame")
+    labels = list(candidate_labels) if candidate_labels else stored
+    unknown = [label for label in labels if label not in stored]
+    if unknown:
+        raise ValueError(f"Labels without stored scores: {unknown}")
+
+    values = frame[[f"{SCORE_COLUMN_PREFIX}{label}" for label in labels]].to_numpy(dtype=np.float64)
+    meta = frame.loc[:, [c for c in frame.columns if not str(c).startswith("zeroshot_")]]
+    matrix = ZeroShotScoreMatrix(tuple(labels), values, _failed_mask(frame), meta.index)
+    errors = (
+        frame["zeroshot_error"].fillna("").astype(str).tolist()
+        if "zeroshot_error" in frame.columns
+        else [""] * len(frame)
+    )
+
+    out = _zeroshot_frame_from_matrix(
+        meta,
+        labels,
+        matrix,
+        errors,
+        passing_score_threshold=passing_score_threshold,
+        top_n=top_n,
+    )
+    mark_step(
+        "zeroshot_reselect",
+        meta={
+            "stories": len(out),
+            "labels": len(labels),
+            "passing_score_threshold": passing_score_threshold,
+            "top_n": top_n,
+        },
+    )
+    return out
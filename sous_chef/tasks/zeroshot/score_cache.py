@@ -0,0 +1,241 @@
+"""
+Persistent cache of zero-shot NLI scores, one row per (story, hypothesis).
+
+Projects re-run zero-shot flows over overlapping stories with the same labels and only
+change the threshold or top-N. With multi-label scoring each label's score depends only
+on the (premise, hypothesis) pair, so :func:`classify_with_score_cache` looks every pair
+up in a SQLite table keyed by ``(model, backend, text hash, hypothesis)`` and sends only
+the missing pairs to the backend: adding one label to a 20-label set costs one pass.
+
+Single-label runs (``multi_label=False``) normalise scores across the label set and are
+never cached. Enable with ``ZEROSHOT_SCORE_CACHE=1`` or ``use_score_cache=True``; the
+file is ``<cache dir>/zeroshot_scores.sqlite`` and can be deleted at any time.
+"""
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from ...runtime import mark_step
+from ...utils import env_flag, get_cache_dir
+from ..nlp.memo import row_key
+from .common import (
+    SCORE_CACHE_ATTR,
+    InferFn,
+    _truncate,
+    _validate_zeroshot_args,
+    _zeroshot_frame_from_scores,
+    build_zeroshot_inference_label_mapping,
+)
+from .scores import zeroshot_score_matrix
+
+logger = logging.getLogger(__name__)
+
+ZEROSHOT_SCORE_CACHE_ENV = "ZEROSHOT_SCORE_CACHE"
+SCORE_CACHE_FILENAME = "zeroshot_scores.sqlite"
+# SQLite caps the number of bound parameters per statement
+_LOOKUP_BATCH = 400
+
+
+def score_cache_enabled(explicit: Optional[bool] = None) -> bool:
+    """Explicit argument wins; otherwise ``ZEROSHOT_SCORE_CACHE`` (default off)."""
+    if explicit is not None:
+        return explicit
+    return env_flag(ZEROSHOT_SCORE_CACHE_ENV, False)
+
+
+class ZeroShotScoreCache:
+    """SQLite-backed ``(model, backend, text hash, hypothesis) -> score`` store."""
+
+    _lock = threading.Lock()
+
+    def __init__(self, model: str, backend: str, path: Optional[Path] = None):
+        self.model = model
+        self.backend = backend
+        self.path = path or get_cache_dir() / SCORE_CACHE_FILENAME
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS nli_scores ("
+                " model TEXT NOT NULL,"
+                " backend TEXT NOT NULL,"
+                " text_hash TEXT NOT NULL,"
+                " hypothesis TEXT NOT NULL,"
+                " score REAL NOT NULL,"
+                " PRIMARY KEY (model, backend, text_hash, hypothesis)"
+                ") WITHOUT ROWID"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(
+        self, text_hashes: Sequence[str], hypotheses: Sequence[str]
+    ) -> Dict[Tuple[str, str], float]:
+        found: Dict[Tuple[str, str], float] = {}
+        unique = list(dict.fromkeys(text_hashes))
+        hyps = list(dict.fromkeys(hypotheses))
+        if not unique or not hyps:
+            return found
+        hyp_placeholders = ",".join("?" * len(hyps))
+        step = max(1, _LOOKUP_BATCH - len(hyps))
+        with self._connect() as conn:
+            for start in range(0, len(unique), step):
+                batch = unique[start:start + step]
+                rows = conn.execute(
+                    "SELECT text_hash, hypothesis, score FROM nli_scores"
+                    " WHERE model = ? AND backend = ?"
+                    f" AND hypothesis IN ({hyp_placeholders})"
+                    f" AND text_hash IN ({','.join('?' * len(batch))})",
+                    [self.model, self.backend, *hyps, *batch],
+                )
+                for text_hash, hypothesis, score in rows:
+                    found[(text_hash, hypothesis)] = float(score)
+        return found
+
+    def put_many(self, scores: Dict[Tuple[str, str], float]) -> None:
+        if not scores:
+            return
+        try:
+            with self._lock, self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO nli_scores (model, backend, text_hash, hypothesis, score)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [(self.model, self.backend, h, hyp, s) for (h, hyp), s in scores.items()],
+                )
+        except sqlite3.Error as e:
+            logger.warning("could not write zero-shot score cache %s: %s", self.path, e)
+
+
+def zeroshot_score_cache_counts(df: pd.DataFrame) -> Tuple[int, int]:
+    """``(hits, misses)`` in (story, label) pairs recorded on a classified frame; zeros if uncached."""
+    stats = df.attrs.get(SCORE_CACHE_ATTR) or {}
+    return int(stats.get("hits", 0)), int(stats.get("misses", 0))
+
+
+def classify_with_score_cache(
+    df: pd.DataFrame,
+    candidate_labels: List[str],
+    infer: InferFn,
+    *,
+    model: str,
+    backend: str,
+    text_column: str,
+    hypothesis_template: str,
+    text_max_chars: Optional[int],
+    passing_score_threshold: Optional[float],
+    top_n: Optional[int],
+    classification_label_hypotheses: Optional[Dict[str, str]] = None,
+    cache: Optional[ZeroShotScoreCache] = None,
+) -> pd.DataFrame:
+    """
+    Multi-label zero-shot columns, inferring only the (story, label) pairs not cached.
+
+    Args:
+        infer: Runs the backend on a row subset for a subset of ``candidate_labels``
+            (with the matching ``classification_label_hypotheses``) and returns its
+            output frame; called once per distinct set of missing labels
+        model, backend: Cache key parts (backend includes the runtime variant, e.g. "onnx-int8")
+        cache: Store to use (default: the shared file under the cache dir)
+
+    Returns the same columns as the backends, with ``{"hits", "misses"}`` pair counts in
+    ``out.attrs["zeroshot_score_cache"]``.
+    """
+    _validate_zeroshot_args(df, candidate_labels, text_column, top_n)
+
+    inference_labels, inference_template, _ = build_zeroshot_inference_label_mapping(
+        candidate_labels, hypothesis_template, classification_label_hypotheses
+    )
+    hypothesis_for = {
+        label: inference_template.format(inference_label)
+        for label, inference_label in zip(candidate_labels, inference_labels)
+    }
+
+    texts: List[str] = []
+    for raw in df[text_column].tolist():
+        if raw is None or (not isinstance(raw, str) and pd.isna(raw)):
+            texts.append("")
+        else:
+            texts.append(_truncate(str(raw), text_max_chars))
+    hashes = [row_key(text) if text.strip() else "" for text in texts]
+
+    cache = cache or ZeroShotScoreCache(model, backend)
+    cached = cache.get_many([h for h in hashes if h], list(hypothesis_for.values()))
+
+    scores: List[Dict[str, float]] = [{} for _ in texts]
+    groups: Dict[Tuple[str, ...], List[int]] = {}
+    hits = misses = 0
+    for pos, text_hash in enumerate(hashes):
+        if not text_hash:
+            continue
+        missing = []
+        for label in candidate_labels:
+            score = cached.get((text_hash, hypothesis_for[label]))
+            if score is None:
+                missing.append(label)
+            else:
+                scores[pos][label] = score
+        hits += len(candidate_labels) - len(missing)
+        misses += len(missing)
+        if missing:
+            groups.setdefault(tuple(missing), []).append(pos)
+
+    errors: Dict[int, str] = {}
+    fresh: Dict[Tuple[str, str], float] = {}
+    for labels, positions in groups.items():
+        hypotheses = {
+            k: v
+            for k, v in (classification_label_hypotheses or {}).items()
+            if str(k).strip() in labels
+        }
+        out = infer(df.iloc[positions], list(labels), hypotheses or None)
+        for pos, row, err in zip(
+            positions, zeroshot_score_matrix(out, labels).row_scores(), out["zeroshot_error"]
+        ):
+            if err:
+                errors[pos] = err
+                continue
+            for label, score in row.items():
+                scores[pos][label] = score
+                fresh[(hashes[pos], hypothesis_for[label])] = score
+    cache.put_many(fresh)
+
+    out = _zeroshot_frame_from_scores(
+        df,
+        candidate_labels,
+        scores,
+        errors,
+        passing_score_threshold=passing_score_threshold,
+        top_n=top_n,
+    )
+
+    hit_rate = hits / (hits + misses) if hits + misses else 0.0
+    logger.info(
+        "zeroshot score cache (%s, %s): %d pair hits, %d inferred (%.0f%% hit rate)",
+        model, backend, hits, misses, hit_rate * 100,
+    )
+    mark_step(
+        "zeroshot_score_cache",
+        meta={
+            "model": model,
+            "backend": backend,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hit_rate, 4),
+            "inference_calls": len(groups),
+        },
+    )
+    out.attrs[SCORE_CACHE_ATTR] = {"hits": hits, "misses": misses}
+    return out
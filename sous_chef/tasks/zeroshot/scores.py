@@ -0,0 +1,318 @@
+"""
+Dense stories x labels zero-shot score matrix.
+
+Backends used to leave only per-row JSON strings (``zeroshot_labels_json`` /
+``zeroshot_scores_json``), and every post-processing step (threshold and selected-label
+columns, summary counts, per-tag scores for export) re-parsed them with ``iterrows`` and
+``json.loads``. Classified frames now carry a :class:`ZeroShotScoreMatrix` in
+``df.attrs["zeroshot_score_matrix"]``: one float64 score per (story, candidate label),
+NaN where a label was not scored, plus a failed-row mask and each label's position in the
+backend's output (so tied scores keep the backend's order). Ranking, selection (top label,
+threshold, top-N) and counts are NumPy operations on it, and the JSON columns are written
+from it once.
+
+The matrix is keyed by the frame's index, so it still applies after rows are filtered or
+reordered. Frames without one (e.g. read back from CSV) are parsed once by
+:func:`zeroshot_score_matrix`.
+"""
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import ZEROSHOT_UNKNOWN_LABEL
+
+# Key of the score matrix in ``DataFrame.attrs`` of a classified frame
+SCORE_MATRIX_ATTR = "zeroshot_score_matrix"
+
+
+def _failed_mask(df: pd.DataFrame) -> np.ndarray:
+    if "zeroshot_error" not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    err = df["zeroshot_error"]
+    return (err.notna() & err.astype(str).str.strip().ne("")).to_numpy()
+
+
+def _json_lists(quoted: Sequence[str], rows: Sequence[Sequence[int]]) -> List[str]:
+    """``json.dumps`` of label lists, from pre-quoted labels (same separators)."""
+    return ["[" + ", ".join(quoted[j] for j in row) + "]" for row in rows]
+
+
+def _picked_columns(picked: np.ndarray, columns: np.ndarray) -> List[List[int]]:
+    """Per row, ``columns[i, k]`` for every ``picked[i, k]``, in ``k`` order."""
+    rows, ks = np.nonzero(picked)
+    values = columns[rows, ks].tolist()
+    bounds = [0] + np.cumsum(np.bincount(rows, minlength=len(picked))).tolist()
+    return [values[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+@dataclass(frozen=True, eq=False)
+class ZeroShotScoreMatrix:
+    """
+    ``scores[i, j]``: score of ``labels[j]`` for the story at ``index[i]`` (NaN = unscored).
+
+    ``backend_order[i, j]`` is the position of ``labels[j]`` in that row's backend output;
+    it breaks ties in score. Without it, ties rank in label order.
+    """
+
+    labels: Tuple[str, ...]
+    scores: np.ndarray
+    failed: np.ndarray
+    index: pd.Index
+    backend_order: Optional[np.ndarray] = None
+
+    def __post_init__(self) -> None:
+        self.scores.flags.writeable = False
+        self.failed.flags.writeable = False
+        if self.backend_order is not None:
+            self.backend_order.flags.writeable = False
+
+    # Read-only, so frame copies (which deep-copy ``attrs``) can share one instance
+    def __deepcopy__(self, memo: dict) -> "ZeroShotScoreMatrix":
+        return self
+
+    @classmethod
+    def from_rows(
+        cls,
+        index: pd.Index,
+        labels: Sequence[str],
+        rows: Sequence[Mapping[str, float]],
+        errors: Mapping[int, str],
+    ) -> "ZeroShotScoreMatrix":
+        """
+        From per-row ``{label: score}`` maps in the backend's (ranked) order; positions in
+        ``errors`` failed.
+        """
+        column = {label: j for j, label in enumerate(labels)}
+        scores = np.full((len(rows), len(labels)), np.nan, dtype=np.float64)
+        order = np.full((len(rows), len(labels)), len(labels), dtype=np.int32)
+        for i, row in enumerate(rows):
+            if i in errors:
+                continue
+            for rank, (label, score) in enumerate(row.items()):
+                j = column.get(label)
+                if j is not None:
+                    scores[i, j] = score
+                    order[i, j] = rank
+        failed = np.zeros(len(rows), dtype=bool)
+        failed[list(errors)] = True
+        return cls(tuple(labels), scores, failed, pd.Index(index), order)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, labels: Sequence[str]) -> "ZeroShotScoreMatrix":
+        """
+        Parse the JSON columns of a frame without a matrix (labels outside ``labels`` are
+        appended as extra columns so ranks are unchanged). Falls back to
+        ``zeroshot_top_label`` / ``zeroshot_top_score`` when there are no JSON columns.
+        """
+        columns = {label: j for j, label in enumerate(labels)}
+        parsed: List[Dict[int, float]] = []
+
+        def col(label: object) -> int:
+            key = str(label).strip()
+            if key not in columns:
+                columns[key] = len(columns)
+            return columns[key]
+
+        if "zeroshot_labels_json" in df.columns:
+            raw_scores = df["zeroshot_scores_json"] if "zeroshot_scores_json" in df.columns else None
+            for i, raw in enumerate(df["zeroshot_labels_json"].tolist()):
+                try:
+                    labs = json.loads(raw)
+                    scs = json.loads(raw_scores.iat[i]) if raw_scores is not None else []
+                except (json.JSONDecodeError, TypeError, ValueError):
+                    parsed.append({})
+                    continue
+                row: Dict[int, float] = {}
+                for rank, lab in enumerate(labs or []):
+                    if lab is None or not str(lab).strip():
+                        continue
+                    try:
+                        score = float(scs[rank])
+                    except (IndexError, TypeError, ValueError):
+                        # Unscored labels keep their rank below the scored ones
+                        score = -1.0 - rank
+                    row[col(lab)] = score
+                parsed.append(row)
+        else:
+            tops = df["zeroshot_top_label"].tolist() if "zeroshot_top_label" in df.columns else [None] * len(df)
+            top_scores = (
+                df["zeroshot_top_score"].tolist() if "zeroshot_top_score" in df.columns else [None] * len(df)
+            )
+            for top, score in zip(tops, top_scores):
+                if top is None or (isinstance(top, float) and pd.isna(top)) or not str(top).strip():
+                    parsed.append({})
+                    continue
+                value = 1.0 if score is None or pd.isna(score) else float(score)
+                parsed.append({col(top): value})
+
+        scores = np.full((len(df), len(columns)), np.nan, dtype=np.float64)
+        order = np.full((len(df), len(columns)), len(columns), dtype=np.int32)
+        for i, row in enumerate(parsed):
+            for rank, (j, score) in enumerate(row.items()):
+                scores[i, j] = score
+                order[i, j] = rank
+        return cls(tuple(columns), scores, _failed_mask(df), df.index, order)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def aligned_to(self, index: pd.Index) -> Optional["ZeroShotScoreMatrix"]:
+        """This matrix re-ordered to ``index``, or None if some rows are unknown."""
+        if self.index.equals(index):
+            return self
+        if not self.index.is_unique:
+            return None
+        rows = self.index.get_indexer(index)
+        if (rows < 0).any():
+            return None
+        return ZeroShotScoreMatrix(
+            self.labels,
+            self.scores[rows],
+            self.failed[rows],
+            pd.Index(index),
+            self.backend_order[rows] if self.backend_order is not None else None,
+        )
+
+    @property
+    def scored(self) -> np.ndarray:
+        return ~np.isnan(self.scores) & ~self.failed[:, None]
+
+    def ranking(self) -> np.ndarray:
+        """Column indices per row by descending score (ties in backend order, unscored last)."""
+        return self._ranking
+
+    def ranks(self) -> np.ndarray:
+        """Rank of each (row, label) in :meth:`ranking` (0 = top)."""
+        return self._ranks
+
+    @cached_property
+    def _ranking(self) -> np.ndarray:
+        key = np.where(self.scored, -self.scores, np.inf)
+        if self.backend_order is None:
+            order = np.argsort(key, axis=1, kind="stable")
+        else:
+            order = np.lexsort((self.backend_order, key), axis=1)
+        order.flags.writeable = False
+        return order
+
+    @cached_property
+    def _ranks(self) -> np.ndarray:
+        order = self._ranking
+        ranks = np.empty_like(order)
+        np.put_along_axis(ranks, order, np.arange(order.shape[1])[None, :], axis=1)
+        ranks.flags.writeable = False
+        return ranks
+
+    def selected(self, threshold: Optional[float] = None, top_n: Optional[int] = None) -> np.ndarray:
+        """
+        Boolean ``(rows, labels)`` selection: ``top_n`` (if > 0) wins over ``threshold``,
+        else the top label. Failed rows select nothing.
+        """
+        scored = self.scored
+        if top_n is not None and top_n > 0:
+            return scored & (self.ranks() < int(top_n))
+        if threshold is not None:
+            with np.errstate(invalid="ignore"):
+                return scored & (self.scores >= float(threshold))
+        return scored & (self.ranks() == 0)
+
+    def row_scores(self) -> List[Dict[str, float]]:
+        """
+        Per row, ``{label: score}`` of its scored labels in rank order (empty for failed
+        rows), so :meth:`from_rows` rebuilds the same ranking.
+        """
+        order = self.ranking()
+        picked = np.take_along_axis(self.scored, order, axis=1)
+        rows, ks = np.nonzero(picked)
+        columns = order[rows, ks]
+        values = self.scores[rows, columns].tolist()
+        out: List[Dict[str, float]] = [{} for _ in range(len(self))]
+        for i, j, score in zip(rows.tolist(), columns.tolist(), values):
+            out[i][self.labels[j]] = score
+        return out
+
+    def top(self) -> Tuple[List[str], List[Optional[float]]]:
+        """``zeroshot_top_label`` / ``zeroshot_top_score`` values."""
+        order = self.ranking()[:, 0] if self.labels else np.zeros(len(self), dtype=int)
+        has_score = self.scored.any(axis=1) if self.labels else np.zeros(len(self), dtype=bool)
+        labels: List[str] = []
+        scores: List[Optional[float]] = []
+        for i, (j, ok, failed) in enumerate(zip(order.tolist(), has_score.tolist(), self.failed.tolist())):
+            if failed:
+                labels.append(ZEROSHOT_UNKNOWN_LABEL)
+                scores.append(None)
+            elif ok:
+                labels.append(self.labels[j])
+                scores.append(float(self.scores[i, j]))
+            else:
+                labels.append("")
+                scores.append(None)
+        return labels, scores
+
+    def json_columns(self) -> Tuple[List[str], List[str]]:
+        """``zeroshot_labels_json`` / ``zeroshot_scores_json`` (scored labels, descending)."""
+        order = self.ranking()
+        counts = self.scored.sum(axis=1).tolist()
+        ranked = self.scores[np.arange(len(self))[:, None], order]
+        quoted = [json.dumps(label) for label in self.labels]
+        rows = [row[:n] for row, n in zip(order.tolist(), counts)]
+        labels_col = _json_lists(quoted, rows)
+        scores_col = [json.dumps(row[:n]) for row, n in zip(ranked.tolist(), counts)]
+        return labels_col, scores_col
+
+    def selected_json(
+        self, mask: np.ndarray, *, ranked: bool, candidate_labels: Optional[Sequence[str]] = None
+    ) -> List[str]:
+        """
+        JSON label lists of a selection mask, in rank order or in ``candidate_labels`` order.
+        """
+        quoted = [json.dumps(label) for label in self.labels]
+        if ranked:
+            order = self.ranking()
+            rows = _picked_columns(np.take_along_axis(mask, order, axis=1), order)
+        else:
+            columns = np.arange(len(self.labels))
+            if candidate_labels is not None:
+                position = {label: j for j, label in enumerate(self.labels)}
+                columns = np.array([position[label] for label in candidate_labels if label in position], dtype=int)
+            rows = _picked_columns(mask[:, columns], np.broadcast_to(columns, (len(self), len(columns))))
+        return _json_lists(quoted, rows)
+
+    def label_counts(
+        self,
+        input_labels: Sequence[str],
+        threshold: Optional[float] = None,
+        top_n: Optional[int] = None,
+    ) -> Tuple[List[int], int, int]:
+        """``(counts aligned with input_labels, stories_without_prediction, failed)``."""
+        mask = self.selected(threshold, top_n)
+        column = {label: j for j, label in enumerate(self.labels)}
+        keep = [column.get(label) for label in input_labels]
+        counted = np.zeros((len(self), len(input_labels)), dtype=bool)
+        for k, j in enumerate(keep):
+            if j is not None:
+                counted[:, k] = mask[:, j]
+        failed = int(self.failed.sum())
+        no_prediction = int((~counted.any(axis=1) & ~self.failed).sum())
+        return counted.sum(axis=0).astype(int).tolist(), no_prediction, failed
+
+
+def zeroshot_score_matrix(
+    df: pd.DataFrame, labels: Optional[Sequence[str]] = None
+) -> ZeroShotScoreMatrix:
+    """
+    The frame's score matrix (aligned to ``df.index``), parsing the JSON columns when
+    the frame carries none or it does not cover ``df``'s rows or ``labels``.
+    """
+    matrix = df.attrs.get(SCORE_MATRIX_ATTR)
+    if isinstance(matrix, ZeroShotScoreMatrix):
+        aligned = matrix.aligned_to(df.index)
+        if aligned is not None and (labels is None or set(labels) <= set(aligned.labels)):
+            return aligned
+    return ZeroShotScoreMatrix.from_frame(df, list(labels or []))
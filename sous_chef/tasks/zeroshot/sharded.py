@@ -0,0 +1,354 @@
+"""
+Sharded multi-process execution of the local zero-shot backends.
+
+Even with batched NLI pairs, one PyTorch process leaves most of a many-core worker idle:
+intra-op parallelism stops paying off well below 32 threads for encoder-sized batches.
+With ``workers > 1``, :func:`add_zero_shot_classification_sharded` runs
+:func:`~.local.add_zero_shot_classification_local` here with a
+:class:`ShardedZeroShotClassifier`, which splits the premise/hypothesis pairs into
+contiguous shards for the workers of a long-lived ``spawn`` process pool (as
+``keyword_tasks`` does).
+
+- Workers run ``sous_chef.workers.zeroshot``, which never imports ``sous_chef.tasks``.
+- Each worker loads one model replica on its first shard and keeps it for later calls;
+  for ``runtime="onnx"`` the model is exported once, here, and workers open the file.
+- Each worker's intra-op threads are set to its share of the cores.
+- Shards come back as raw logits and are scored here, so the columns are those of a
+  single-process run.
+- The number of replicas is bounded by a memory budget
+  (``ZEROSHOT_SHARD_MEMORY_BUDGET_MB``, default 75% of available RAM) divided by the
+  estimated size of one replica (weight files on disk plus working memory), less the
+  replica this process holds for its own fallback. When fewer than two workers fit,
+  the stories run in this process instead.
+
+Pairs whose shard fails fail their stories with the error in ``zeroshot_error``. Once a
+worker dies (e.g. a replica killed for memory) the rest of the call fails fast, and the
+pool is rebuilt on the next call.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ...runtime import mark_step
+from ...workers.zeroshot import init_worker, shard_pair_logits
+from ..nlp.onnx_backend import _MAX_SEQUENCE_LENGTH, export_onnx_model
+from .batched import NliRunner, classify_zero_shot_batched
+from .common import _validate_zeroshot_args
+from .config import (
+    DEFAULT_ZEROSHOT_MODEL,
+    ZEROSHOT_LOCAL_BATCH_SIZE,
+    ZEROSHOT_SHARD_MEMORY_BUDGET_ENV,
+    ZEROSHOT_TEXT_MAX_CHARS_DEFAULT,
+)
+from .local import add_zero_shot_classification_local
+
+logger = logging.getLogger(__name__)
+
+# Weights assumed when a model's files are not on disk yet (bge-m3 sized)
+DEFAULT_REPLICA_WEIGHT_BYTES = 2300 * 1024 * 1024
+# Activations, tokenizer and interpreter on top of the weights, per replica
+REPLICA_OVERHEAD_BYTES = 768 * 1024 * 1024
+# Used when /proc/meminfo is unavailable
+DEFAULT_SHARD_MEMORY_BUDGET_MB = 8192
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_key: Tuple[int, int] = (0, 0)
+_process_pool_lock = threading.Lock()
+
+
+def _weight_files(model: str) -> List[Path]:
+    root = Path(model)
+    if not root.is_dir():
+        try:
+            from huggingface_hub import snapshot_download
+
+            root = Path(snapshot_download(model, local_files_only=True))
+        except Exception:
+            return []
+    for pattern in ("*.safetensors", "pytorch_model*.bin", "*.onnx"):
+        files = sorted(root.rglob(pattern))
+        if files:
+            return files
+    return []
+
+
+def estimate_replica_bytes(model: str) -> int:
+    """Resident bytes one worker's copy of ``model`` is expected to take."""
+    files = _weight_files(model)
+    weights = sum(f.stat().st_size for f in files) if files else DEFAULT_REPLICA_WEIGHT_BYTES
+    return weights + REPLICA_OVERHEAD_BYTES
+
+
+def _available_memory_bytes() -> int:
+    """``MemAvailable`` from ``/proc/meminfo``; 0 where unavailable."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def shard_memory_budget_bytes(explicit_mb: Optional[float] = None) -> int:
+    """Explicit MB, then ``ZEROSHOT_SHARD_MEMORY_BUDGET_MB``, else 75% of available RAM."""
+    if explicit_mb is None:
+        raw = (os.environ.get(ZEROSHOT_SHARD_MEMORY_BUDGET_ENV) or "").strip()
+        try:
+            explicit_mb = float(raw) if raw else None
+        except ValueError:
+            raise ValueError(
+                f"Invalid {ZEROSHOT_SHARD_MEMORY_BUDGET_ENV}={raw!r}; expected megabytes"
+            ) from None
+    if explicit_mb is not None:
+        return int(explicit_mb * 1024 * 1024)
+    available = _available_memory_bytes()
+    return int(available * 0.75) if available else DEFAULT_SHARD_MEMORY_BUDGET_MB * 1024 * 1024
+
+
+def plan_replicas(
+    workers: int, replica_bytes: int, budget_bytes: int, resident_replicas: int = 0
+) -> int:
+    """
+    Worker processes to start: ``workers``, capped by how many replicas fit the budget
+    next to the ``resident_replicas`` this process already holds.
+    """
+    fit = budget_bytes // max(1, replica_bytes) - resident_replicas
+    return int(max(1, min(workers, fit)))
+
+
+def _replica_spec(model: str, runtime: str, threads: int) -> Dict[str, Any]:
+    """What a worker needs to load its replica (see ``sous_chef.workers.zeroshot``)."""
+    from transformers import AutoConfig
+
+    label2id = AutoConfig.from_pretrained(model).label2id
+    spec: Dict[str, Any] = {
+        "model": model,
+        "runtime": runtime,
+        "threads": threads,
+        # Same lookup as the transformers zero-shot pipeline
+        "entailment_id": next(
+            (int(i) for label, i in label2id.items() if label.lower().startswith("entail")), -1
+        ),
+        "onnx_path": None,
+        "max_length": None,
+    }
+    if runtime == "onnx":
+        # Export (and quantize) once here rather than racing in every worker
+        spec["onnx_path"] = str(export_onnx_model(model))
+        spec["max_length"] = _MAX_SEQUENCE_LENGTH
+    return spec
+
+
+def _get_process_pool(workers: int, threads: int) -> ProcessPoolExecutor:
+    """Shared worker pool, rebuilt only when the size or thread split changes."""
+    global _process_pool, _process_pool_key
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_key != (workers, threads):
+            if _process_pool is not None:
+                _process_pool.shutdown(wait=True)
+            # spawn: never fork a process that may hold Prefect / torch threads
+            _process_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+                initargs=(threads,),
+            )
+            _process_pool_key = (workers, threads)
+        return _process_pool
+
+
+@atexit.register
+def shutdown_zeroshot_workers() -> None:
+    """Stop the sharded zero-shot workers and free their replicas (also runs at exit)."""
+    global _process_pool, _process_pool_key
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
+        _process_pool_key = (0, 0)
+
+
+class ShardedZeroShotClassifier:
+    """
+    Zero-shot pipeline stand-in whose NLI pairs run across the worker pool.
+
+    The batched local path drives it through :meth:`pair_logits` (see ``zeroshot.batched``);
+    calling it like the ``transformers`` pipeline classifies one text.
+    """
+
+    def __init__(self, spec: Dict[str, Any], replicas: int, threads: int, batch_size: int):
+        self.spec = spec
+        self.replicas = replicas
+        self.threads = threads
+        self.batch_size = batch_size
+        self.entailment_id = spec["entailment_id"]
+        self.failed_shards = 0
+        # Set once a worker dies; later requests fail with it instead of respawning replicas
+        self.broken: Optional[str] = None
+
+    def pair_logits(
+        self, premises: List[str], hypotheses: List[str]
+    ) -> Tuple[Optional[np.ndarray], Dict[int, str]]:
+        """Same contract as ``zeroshot.batched.nli_pair_logits``; a failed shard fails its pairs."""
+        if self.broken is not None:
+            return None, {i: self.broken for i in range(len(premises))}
+        pool = _get_process_pool(self.replicas, self.threads)
+        shards = [
+            part
+            for part in np.array_split(np.arange(len(premises)), min(self.replicas, len(premises)))
+            if len(part)
+        ]
+        futures = [
+            pool.submit(
+                shard_pair_logits,
+                self.spec,
+                [premises[i] for i in part],
+                [hypotheses[i] for i in part],
+                self.batch_size,
+            )
+            for part in shards
+        ]
+        logits: Optional[np.ndarray] = None
+        failed: Dict[int, str] = {}
+        for part, future in zip(shards, futures):
+            offset = int(part[0])
+            try:
+                shard_logits, shard_failed = future.result()
+            except Exception as e:
+                err_msg = f"{type(e).__name__}: {e}"[:2000]
+                logger.warning("zeroshot shard of %d pairs failed: %s", len(part), err_msg)
+                self.failed_shards += 1
+                if isinstance(e, BrokenProcessPool):
+                    self.broken = err_msg
+                failed.update(zip(part.tolist(), repeat(err_msg)))
+                continue
+            failed.update({offset + i: err for i, err in shard_failed.items()})
+            if shard_logits is None:
+                continue
+            if logits is None:
+                logits = np.zeros((len(premises), shard_logits.shape[-1]), dtype=np.float32)
+            logits[offset:offset + len(part)] = shard_logits
+        if self.broken is not None:
+            shutdown_zeroshot_workers()
+        return logits, failed
+
+    def __call__(
+        self,
+        text: str,
+        candidate_labels: List[str],
+        hypothesis_template: str = "This example is {}.",
+        multi_label: bool = False,
+    ) -> Dict[str, Any]:
+        runner = NliRunner(
+            tokenizer=None,
+            forward=None,
+            entailment_id=self.entailment_id,
+            input_names=(),
+            pair_logits=self.pair_logits,
+        )
+        results, errors = classify_zero_shot_batched(
+            runner, [text], candidate_labels, hypothesis_template, multi_label, self.batch_size
+        )
+        if errors:
+            raise RuntimeError(errors[0])
+        labels, scores = results[0]
+        return {"sequence": text, "labels": labels, "scores": scores}
+
+
+def add_zero_shot_classification_sharded(
+    df: pd.DataFrame,
+    candidate_labels: List[str],
+    *,
+    workers: int,
+    text_column: str = "text",
+    hypothesis_template: str = "This text is about {}",
+    multi_label: bool = True,
+    model: str = DEFAULT_ZEROSHOT_MODEL,
+    text_max_chars: Optional[int] = ZEROSHOT_TEXT_MAX_CHARS_DEFAULT,
+    passing_score_threshold: Optional[float] = None,
+    top_n: Optional[int] = None,
+    classification_label_hypotheses: Optional[Dict[str, str]] = None,
+    runtime: str = "pytorch",
+    batch_size: int = ZEROSHOT_LOCAL_BATCH_SIZE,
+    memory_budget_mb: Optional[float] = None,
+    load_classifier: Optional[Callable[[], Any]] = None,
+) -> pd.DataFrame:
+    """
+    :func:`~.local.add_zero_shot_classification_local` on CPU across up to ``workers``
+    processes (one model replica each); same output columns.
+
+    ``memory_budget_mb`` overrides ``ZEROSHOT_SHARD_MEMORY_BUDGET_MB``. ``load_classifier``
+    is used when the run falls back to this process (fewer than two workers fit, or one
+    story); the replica it holds is counted against the budget.
+    """
+    _validate_zeroshot_args(df, candidate_labels, text_column, top_n)
+
+    kwargs: Dict[str, Any] = dict(
+        text_column=text_column,
+        hypothesis_template=hypothesis_template,
+        multi_label=multi_label,
+        model=model,
+        device=-1,
+        text_max_chars=text_max_chars,
+        passing_score_threshold=passing_score_threshold,
+        top_n=top_n,
+        classification_label_hypotheses=classification_label_hypotheses,
+        runtime=runtime,
+        batch_size=batch_size,
+    )
+    replica_bytes = estimate_replica_bytes(model)
+    budget_bytes = shard_memory_budget_bytes(memory_budget_mb)
+    resident = 1 if load_classifier is not None else 0
+    replicas = min(plan_replicas(workers, replica_bytes, budget_bytes, resident), len(df))
+    if replicas < 2:
+        if workers > 1 and len(df) > 1:
+            logger.warning(
+                "zeroshot sharding: %.0f MB replicas leave room for one worker in a %.0f MB "
+                "budget; running in-process",
+                replica_bytes / 2**20, budget_bytes / 2**20,
+            )
+        return add_zero_shot_classification_local(
+            df, candidate_labels, load_classifier=load_classifier, **kwargs
+        )
+
+    threads = max(1, (os.cpu_count() or 1) // replicas)
+    clf = ShardedZeroShotClassifier(
+        _replica_spec(model, runtime, threads), replicas, threads, batch_size
+    )
+    start = time.perf_counter()
+    out = add_zero_shot_classification_local(
+        df, candidate_labels, load_classifier=lambda: clf, **kwargs
+    )
+    seconds = time.perf_counter() - start
+
+    mark_step(
+        "zeroshot_sharded_inference",
+        meta={
+            "documents": len(df),
+            "workers_requested": workers,
+            "replicas": replicas,
+            "threads_per_replica": threads,
+            "replica_mb": round(replica_bytes / 2**20),
+            "memory_budget_mb": round(budget_bytes / 2**20),
+            "failed_shards": clf.failed_shards,
+            "failed_documents": int((out["zeroshot_error"] != "").sum()),
+            "seconds": round(seconds, 3),
+            "docs_per_sec": round(len(df) / seconds, 1) if seconds > 0 else None,
+        },
+    )
+    return out
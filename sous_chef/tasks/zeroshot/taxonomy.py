@@ -0,0 +1,205 @@
+"""
+Hierarchical label taxonomies for zero-shot classification.
+
+Flat classification scores every story on every label, so NLI cost grows linearly with
+the label set. With ``label_taxonomy`` (parent label -> child labels, nesting allowed),
+:func:`classify_with_taxonomy` scores each story on the top-level labels first and
+descends only into the children of parents scoring at least ``parent_threshold``.
+Children of parents that did not pass get no score, so they are never selected and
+never counted; scores that are computed are the same as in a flat run.
+
+- Every parent and child is one of ``candidate_labels``. Labels that are nobody's
+  child (including labels outside the taxonomy) are top-level.
+- Multi-label scores depend only on the (story, label) pair, so each level runs one
+  call per label over every story that reached it. Single-label runs normalise over
+  each group of siblings instead, and ``parent_threshold`` applies to those scores.
+
+NLI passes run, the flat equivalent and the passes saved are reported in
+``out.attrs["zeroshot_taxonomy"]`` and a ``zeroshot_taxonomy`` step.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from ...runtime import mark_step
+from .common import (
+    InferFn,
+    ScoreCacheCounts,
+    _truncate,
+    _validate_zeroshot_args,
+    _zeroshot_frame_from_scores,
+    build_zeroshot_inference_label_mapping,
+    subset_label_hypotheses,
+)
+from .config import ZEROSHOT_TAXONOMY_PARENT_THRESHOLD
+from .scores import zeroshot_score_matrix
+
+logger = logging.getLogger(__name__)
+
+# Key of the taxonomy stats in ``DataFrame.attrs`` of a classified frame
+TAXONOMY_ATTR = "zeroshot_taxonomy"
+
+
+def zeroshot_taxonomy_stats(df: pd.DataFrame) -> Dict[str, Any]:
+    """Taxonomy stats recorded on a classified frame (empty when no taxonomy was used)."""
+    return dict(df.attrs.get(TAXONOMY_ATTR) or {})
+
+
+def taxonomy_tree(
+    candidate_labels: Sequence[str],
+    taxonomy: Mapping[str, Sequence[str]],
+) -> Tuple[List[str], Dict[str, List[str]]]:
+    """
+    ``(top-level labels, {parent: children})`` for ``taxonomy`` over ``candidate_labels``,
+    both in ``candidate_labels`` order.
+
+    Raises ValueError for labels outside ``candidate_labels``, a child with two parents,
+    or a cycle.
+    """
+    labels = list(dict.fromkeys(str(label) for label in candidate_labels))
+    known = set(labels)
+    parent_of: Dict[str, str] = {}
+    children: Dict[str, List[str]] = {}
+    for raw_parent, raw_children in taxonomy.items():
+        parent = str(raw_parent).strip()
+        kids = [str(child).strip() for child in raw_children or [] if str(child).strip()]
+        unknown = [label for label in [parent, *kids] if label not in known]
+        if unknown:
+            raise ValueError(f"label_taxonomy contains labels not present in candidate_labels: {unknown}")
+        for child in kids:
+            if parent_of.get(child, parent) != parent:
+                raise ValueError(
+                    f"label_taxonomy lists {child!r} under both {parent_of[child]!r} and {parent!r}"
+                )
+            parent_of[child] = parent
+        if kids:
+            order = set(kids)
+            children[parent] = [label for label in labels if label in order]
+
+    roots = [label for label in labels if label not in parent_of]
+    reachable = set(roots)
+    frontier = list(roots)
+    while frontier:
+        frontier = [child for label in frontier for child in children.get(label, [])]
+        reachable.update(frontier)
+    if len(reachable) != len(labels):
+        raise ValueError(
+            "label_taxonomy has a cycle through "
+            f"{[label for label in labels if label not in reachable]}"
+        )
+    return roots, children
+
+
+def classify_with_taxonomy(
+    df: pd.DataFrame,
+    candidate_labels: List[str],
+    infer: InferFn,
+    *,
+    taxonomy: Mapping[str, Sequence[str]],
+    text_column: str,
+    text_max_chars: Optional[int],
+    multi_label: bool,
+    passing_score_threshold: Optional[float],
+    top_n: Optional[int],
+    classification_label_hypotheses: Optional[Dict[str, str]] = None,
+    hypothesis_template: str = "This text is about {}",
+    parent_threshold: float = ZEROSHOT_TAXONOMY_PARENT_THRESHOLD,
+) -> pd.DataFrame:
+    """
+    Zero-shot columns for ``df`` with child labels scored only under passing parents.
+
+    Args:
+        infer: Runs the NLI backend on a row subset for a subset of ``candidate_labels``
+            (with the matching ``classification_label_hypotheses``)
+        taxonomy: Parent label -> child labels; see :func:`taxonomy_tree`
+        parent_threshold: A parent's score must reach this for its children to be scored
+
+    Returns the same columns as the backends, with stats in ``out.attrs["zeroshot_taxonomy"]``.
+    """
+    _validate_zeroshot_args(df, candidate_labels, text_column, top_n)
+    # Same validation of per-label hypotheses as a flat run
+    build_zeroshot_inference_label_mapping(
+        candidate_labels, hypothesis_template, classification_label_hypotheses
+    )
+    roots, children = taxonomy_tree(candidate_labels, taxonomy)
+
+    positions: List[int] = []
+    for pos, raw in enumerate(df[text_column].tolist()):
+        if raw is None or (not isinstance(raw, str) and pd.isna(raw)):
+            continue
+        if _truncate(str(raw), text_max_chars).strip():
+            positions.append(pos)
+
+    cache_counts = ScoreCacheCounts()
+
+    def run(rows: List[int], labels: List[str]) -> pd.DataFrame:
+        label_hypotheses = subset_label_hypotheses(classification_label_hypotheses, labels)
+        return cache_counts.add(infer(df.iloc[rows], labels, label_hypotheses))
+
+    scores: List[Dict[str, float]] = [{} for _ in range(len(df))]
+    errors: Dict[int, str] = {}
+    # Sibling groups each story is scored on at the current level
+    frontier: Dict[int, List[Tuple[str, ...]]] = {pos: [tuple(roots)] for pos in positions}
+    levels: List[Dict[str, int]] = []
+    while frontier:
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for pos, siblings in frontier.items():
+            keys = [(label,) for group in siblings for label in group] if multi_label else siblings
+            for key in keys:
+                groups.setdefault(key, []).append(pos)
+        for labels, rows in groups.items():
+            out = run(rows, list(labels))
+            for pos, row, err in zip(rows, zeroshot_score_matrix(out, labels).row_scores(), out["zeroshot_error"]):
+                if err:
+                    errors.setdefault(pos, err)
+                    continue
+                scores[pos].update(row)
+        levels.append({
+            "stories": len(frontier),
+            "pairs": sum(len(group) for siblings in frontier.values() for group in siblings),
+        })
+
+        descend: Dict[int, List[Tuple[str, ...]]] = {}
+        for pos, siblings in frontier.items():
+            if pos in errors:
+                continue
+            passed = [
+                tuple(children[label])
+                for group in siblings
+                for label in group
+                if label in children and scores[pos].get(label, -1.0) >= parent_threshold
+            ]
+            if passed:
+                descend[pos] = passed
+        frontier = descend
+
+    result = _zeroshot_frame_from_scores(
+        df,
+        candidate_labels,
+        scores,
+        errors,
+        passing_score_threshold=passing_score_threshold,
+        top_n=top_n,
+    )
+
+    pairs_scored = sum(level["pairs"] for level in levels)
+    pairs_flat = len(positions) * len(candidate_labels)
+    stats = {
+        "parent_threshold": parent_threshold,
+        "levels_run": len(levels),
+        "pairs_scored": pairs_scored,
+        "pairs_flat": pairs_flat,
+        "pairs_saved": pairs_flat - pairs_scored,
+        "levels": levels,
+    }
+    logger.info(
+        "zeroshot taxonomy (%d top-level of %d labels): %d of %d NLI pairs, %d saved",
+        len(roots), len(candidate_labels), pairs_scored, pairs_flat, pairs_flat - pairs_scored,
+    )
+    mark_step("zeroshot_taxonomy", meta=stats)
+    result.attrs[TAXONOMY_ATTR] = stats
+    cache_counts.attach(result)
+    return result
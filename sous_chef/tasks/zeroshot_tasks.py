@@ -3,7 +3,7 @@ Zero-shot classification tasks: Prefect entrypoints re-exporting the ``zeroshot`
 """
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 
 import pandas as pd
 from prefect import task
@@ -17,12 +17,25 @@ from .zeroshot import (
     add_zero_shot_classification,
     compute_zero_shot_label_counts,
     get_zeroshot_backend,
+    reselect_zero_shot_labels,
+    stored_zeroshot_labels,
     story_dataframe_for_zeroshot_csv,
+    zeroshot_cascade_stats,
     zeroshot_classification_failure_details,
+    zeroshot_score_cache_counts,
+    zeroshot_scores_frame,
+    zeroshot_scores_run,
+    zeroshot_taxonomy_stats,
 )
 from .zeroshot.config import (
     ZEROSHOT_BACKEND_ENV,
+    ZEROSHOT_CASCADE_EMBEDDING_MODEL,
+    ZEROSHOT_CASCADE_VALIDATION_SIZE,
+    ZEROSHOT_CHUNK_TOKENS,
     ZEROSHOT_DEFAULT_STORY_COLUMNS,
+    ZEROSHOT_LOCAL_BATCH_SIZE,
+    ZEROSHOT_MAX_CHUNKS,
+    ZEROSHOT_TAXONOMY_PARENT_THRESHOLD,
 )
 
 __all__ = [
@@ -36,8 +49,16 @@ __all__ = [
     "add_zero_shot_classification",
     "compute_zero_shot_label_counts",
     "get_zeroshot_backend",
+    "reselect_zero_shot_labels",
+    "reselect_zero_shot_stories",
+    "stored_zeroshot_labels",
     "story_dataframe_for_zeroshot_csv",
+    "zeroshot_cascade_stats",
     "zeroshot_classification_failure_details",
+    "zeroshot_score_cache_counts",
+    "zeroshot_scores_frame",
+    "zeroshot_scores_run",
+    "zeroshot_taxonomy_stats",
     "zero_shot_classify_stories",
 ]
 
@@ -57,6 +78,20 @@ def zero_shot_classify_stories(
     top_n: Optional[int] = None,
     backend: Optional[str] = None,
     classification_label_hypotheses: Optional[Dict[str, str]] = None,
+    batch_size: int = ZEROSHOT_LOCAL_BATCH_SIZE,
+    max_concurrency: Optional[int] = None,
+    run_deadline_s: Optional[float] = None,
+    use_score_cache: Optional[bool] = None,
+    chunk_pooling: Optional[str] = None,
+    chunk_tokens: int = ZEROSHOT_CHUNK_TOKENS,
+    max_chunks: int = ZEROSHOT_MAX_CHUNKS,
+    cascade_top_k: Optional[int] = None,
+    cascade_margin: Optional[float] = None,
+    cascade_validation_size: int = ZEROSHOT_CASCADE_VALIDATION_SIZE,
+    embedding_model: str = ZEROSHOT_CASCADE_EMBEDDING_MODEL,
+    workers: Optional[int] = None,
+    label_taxonomy: Optional[Dict[str, List[str]]] = None,
+    taxonomy_parent_threshold: float = ZEROSHOT_TAXONOMY_PARENT_THRESHOLD,
 ) -> pd.DataFrame:
     """Prefect task wrapper for add_zero_shot_classification."""
     return add_zero_shot_classification(
@@ -72,4 +107,35 @@ def zero_shot_classify_stories(
         top_n=top_n,
         backend=backend,
         classification_label_hypotheses=classification_label_hypotheses,
+        batch_size=batch_size,
+        max_concurrency=max_concurrency,
+        run_deadline_s=run_deadline_s,
+        use_score_cache=use_score_cache,
+        chunk_pooling=chunk_pooling,
+        chunk_tokens=chunk_tokens,
+        max_chunks=max_chunks,
+        cascade_top_k=cascade_top_k,
+        cascade_margin=cascade_margin,
+        cascade_validation_size=cascade_validation_size,
+        embedding_model=embedding_model,
+        workers=workers,
+        label_taxonomy=label_taxonomy,
+        taxonomy_parent_threshold=taxonomy_parent_threshold,
+    )
+
+
+@task
+def reselect_zero_shot_stories(
+    scores: Union[pd.DataFrame, str],
+    candidate_labels: Optional[List[str]] = None,
+    *,
+    passing_score_threshold: Optional[float] = None,
+    top_n: Optional[int] = None,
+) -> pd.DataFrame:
+    """Prefect task wrapper for reselect_zero_shot_labels (no model is loaded)."""
+    return reselect_zero_shot_labels(
+        scores,
+        candidate_labels,
+        passing_score_threshold=passing_score_threshold,
+        top_n=top_n,
     )
@@ -7,6 +7,7 @@ import os
 import re
 import time
 import unicodedata
+from pathlib import Path
 
 # Try to import Prefect logging utilities
 try:
@@ -58,6 +59,37 @@ def is_test_mode() -> bool:
     )
 
 
+CACHE_DIR_ENV = "SOUS_CHEF_CACHE_DIR"
+
+
+def get_cache_dir(*parts: str) -> Path:
+    """
+    Local on-disk cache directory for sous-chef (created if missing).
+    
+    Rooted at ``SOUS_CHEF_CACHE_DIR`` when set, otherwise ``~/.cache/sous-chef``.
+    
+    Args:
+        *parts: Optional sub-directory segments, e.g. ``get_cache_dir("docs")``
+        
+    Returns:
+        Path to the (existing) cache directory
+    """
+    root = os.getenv(CACHE_DIR_ENV) or os.path.join(
+        os.path.expanduser("~"), ".cache", "sous-chef"
+    )
+    path = Path(root).joinpath(*parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def env_flag(name: str, default: bool) -> bool:
+    """Read a boolean environment variable ("1"/"true"/"yes" vs "0"/"false"/"no")."""
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    return raw.strip().lower() in ("true", "1", "yes", "on")
+
+
 def create_url_safe_slug(text: str, max_length: int = 16) -> str:
     """
     Create a URL-safe slug from a string, with a maximum length.
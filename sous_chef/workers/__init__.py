@@ -0,0 +1,7 @@
+"""
+Entry points for spawned worker processes.
+
+A spawned worker imports the module that holds its target function. Modules here stay
+outside ``sous_chef.tasks`` (whose package init pulls in Prefect tasks, LLM clients and
+their start-up network calls) and import only what the work itself needs.
+"""
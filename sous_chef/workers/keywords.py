@@ -0,0 +1,78 @@
+"""
+YAKE keyword extraction, shared by ``tasks.keyword_tasks`` and its process pool.
+
+``KeywordExtractor`` objects are kept in a process-wide pool (one per language and
+parameter set), so repeated calls in a process reuse them.
+"""
+from typing import Any, Dict, List, Sequence, Tuple
+
+import yake
+
+# (top_n, ngram_max, dedup_limit) -> {language: KeywordExtractor}; one per process
+_EXTRACTOR_POOLS: Dict[Tuple[int, int, float], Dict[str, Any]] = {}
+
+
+def get_extractor_pool(top_n: int, ngram_max: int, dedup_limit: float) -> Dict[str, Any]:
+    """This process's language -> KeywordExtractor dict for one parameter set."""
+    return _EXTRACTOR_POOLS.setdefault((top_n, ngram_max, dedup_limit), {})
+
+
+def extract_keywords_row(
+    text: str,
+    language: str,
+    extractors: dict,
+    top_n: int = 50,
+    ngram_max: int = 3,
+    dedup_limit: float = 0.9
+) -> List[str]:
+    """
+    Extract keywords from a single text using YAKE.
+    
+    This is the core row-processing function.
+    
+    Args:
+        text: Text to extract keywords from
+        language: Language code (e.g., "en", "es")
+        extractors: Dict of language -> KeywordExtractor (for caching)
+        top_n: Number of top keywords to return
+        ngram_max: Maximum n-gram size
+        dedup_limit: Deduplication limit
+        
+    Returns:
+        List of keywords
+    """
+    # Get or create extractor for this language
+    if language not in extractors:
+        extractors[language] = yake.KeywordExtractor(
+            lan=language,
+            n=ngram_max,
+            dedupLim=dedup_limit,
+            top=top_n,
+            features=None
+        )
+    
+    extractor = extractors[language]
+    keywords = extractor.extract_keywords(text)
+    # Extract just the keyword text (first element of each tuple)
+    return [kw[0] for kw in keywords]
+
+
+def extract_keywords_chunk(
+    chunk: Tuple[Sequence[str], Sequence[str]],
+    params: Tuple[int, int, float],
+) -> List[List[str]]:
+    """Worker entry point: keywords for one chunk of (texts, languages)."""
+    top_n, ngram_max, dedup_limit = params
+    extractors = get_extractor_pool(top_n, ngram_max, dedup_limit)
+    texts, languages = chunk
+    return [
+        extract_keywords_row(
+            text,
+            language,
+            extractors,
+            top_n=top_n,
+            ngram_max=ngram_max,
+            dedup_limit=dedup_limit,
+        )
+        for text, language in zip(texts, languages)
+    ]
@@ -0,0 +1,85 @@
+"""
+Length-sorted, padded batches of NLI premise/hypothesis pairs.
+
+Used by the batched local zero-shot path (``tasks.zeroshot.batched``) and by the sharded
+zero-shot workers; it only needs NumPy and the tokenizer / forward function it is given.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+PairLogits = Callable[[List[str], List[str]], Tuple[Optional[np.ndarray], Dict[int, str]]]
+"""(premises, hypotheses) -> (``(pairs, classes)`` logits or None, {pair index: error})."""
+
+
+@dataclass
+class NliRunner:
+    """
+    Tokenizer plus a forward function from padded input arrays to float32 logits.
+
+    ``pair_logits`` replaces tokenizing and running the pairs here (see
+    :func:`nli_pair_logits`), e.g. when a local inference server or the sharded worker
+    pool runs the model.
+    """
+
+    tokenizer: Any
+    forward: Optional[Callable[[Mapping[str, np.ndarray]], np.ndarray]]
+    entailment_id: int
+    input_names: Sequence[str]
+    max_length: Optional[int] = None
+    pair_logits: Optional[PairLogits] = None
+
+
+def nli_pair_logits(
+    runner: NliRunner,
+    premises: Sequence[str],
+    hypotheses: Sequence[str],
+    batch_size: int,
+) -> Tuple[Optional[np.ndarray], Dict[int, str]]:
+    """
+    ``(pairs, classes)`` logits for premise/hypothesis pairs, run in length-sorted padded
+    batches of ``batch_size``; None when no batch succeeded.
+
+    Pairs whose batch (or the tokenization of all pairs) failed are returned with the error.
+    """
+    try:
+        encoded = runner.tokenizer(
+            list(premises),
+            list(hypotheses),
+            truncation="only_first",
+            max_length=runner.max_length,
+        )
+    except Exception as e:
+        err = f"{type(e).__name__}: {e}"[:2000]
+        logger.warning("zeroshot batch tokenization failed: %s", err)
+        return None, {i: err for i in range(len(premises))}
+    input_ids = encoded["input_ids"]
+    order = sorted(range(len(input_ids)), key=lambda i: len(input_ids[i]))
+
+    logits: Optional[np.ndarray] = None
+    failed_pairs: Dict[int, str] = {}
+    step = max(1, int(batch_size))
+    for start in range(0, len(order), step):
+        chunk = order[start:start + step]
+        features = [
+            {name: encoded[name][i] for name in runner.input_names if name in encoded}
+            for i in chunk
+        ]
+        try:
+            batch = runner.tokenizer.pad(features, padding=True, return_tensors="np")
+            out = runner.forward({name: batch[name] for name in batch.keys()})
+        except Exception as e:
+            err = f"{type(e).__name__}: {e}"[:2000]
+            logger.warning("zeroshot batch of %d pairs failed: %s", len(chunk), err)
+            failed_pairs.update((i, err) for i in chunk)
+            continue
+        if logits is None:
+            logits = np.zeros((len(premises), out.shape[-1]), dtype=np.float32)
+        logits[chunk] = out
+    return logits, failed_pairs
@@ -0,0 +1,94 @@
+"""
+NLI model replicas for sharded local zero-shot classification (``tasks.zeroshot.sharded``).
+
+Each pool worker loads one replica on its first shard and keeps it for later calls: the
+PyTorch model, or an ONNX Runtime session over the file the parent process exported. A
+shard is a list of premise/hypothesis pairs and comes back as raw logits, so scoring,
+ranking and the output columns stay in the parent.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from .nli import NliRunner, nli_pair_logits
+
+# (model, runtime, onnx path) -> runner; one replica per worker process
+_REPLICAS: Dict[Tuple[str, str, Optional[str]], NliRunner] = {}
+
+
+def init_worker(threads: int) -> None:
+    """Pool initializer: this replica's share of the cores."""
+    import torch
+
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass
+
+
+def _load_replica(spec: Mapping[str, Any]) -> NliRunner:
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(spec["model"])
+    if spec["runtime"] == "onnx":
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = spec["threads"]
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = onnxruntime.InferenceSession(
+            spec["onnx_path"], options, providers=["CPUExecutionProvider"]
+        )
+        input_names = [i.name for i in session.get_inputs()]
+
+        def onnx_forward(batch: Mapping[str, np.ndarray]) -> np.ndarray:
+            feed = {
+                name: np.asarray(batch[name], dtype=np.int64)
+                for name in input_names
+                if name in batch
+            }
+            return session.run(None, feed)[0].astype(np.float32)
+
+        # Same truncation length as tasks.nlp.onnx_backend.OnnxSequenceClassifier
+        cap = spec["max_length"]
+        return NliRunner(
+            tokenizer=tokenizer,
+            forward=onnx_forward,
+            entailment_id=spec["entailment_id"],
+            input_names=input_names,
+            max_length=min(tokenizer.model_max_length or cap, cap),
+        )
+
+    import torch
+    from transformers import AutoModelForSequenceClassification
+
+    model = AutoModelForSequenceClassification.from_pretrained(spec["model"]).eval()
+
+    def torch_forward(batch: Mapping[str, np.ndarray]) -> np.ndarray:
+        inputs = {name: torch.as_tensor(array) for name, array in batch.items()}
+        with torch.inference_mode():
+            return model(**inputs).logits.float().numpy()
+
+    return NliRunner(
+        tokenizer=tokenizer,
+        forward=torch_forward,
+        entailment_id=spec["entailment_id"],
+        input_names=tokenizer.model_input_names,
+    )
+
+
+def shard_pair_logits(
+    spec: Mapping[str, Any],
+    premises: List[str],
+    hypotheses: List[str],
+    batch_size: int,
+) -> Tuple[Optional[np.ndarray], Dict[int, str]]:
+    """Worker entry point: :func:`~.nli.nli_pair_logits` for one shard on this worker's replica."""
+    key = (spec["model"], spec["runtime"], spec.get("onnx_path"))
+    if key not in _REPLICAS:
+        _REPLICAS[key] = _load_replica(spec)
+    return nli_pair_logits(_REPLICAS[key], premises, hypotheses, batch_size)
@@ -0,0 +1,56 @@
+"""Fake ``transformers`` zero-shot pipeline for tests that only need scores, not a model."""
+from typing import Callable, List, Optional, Tuple
+from unittest.mock import patch
+
+import pandas as pd
+
+from sous_chef.tasks.zeroshot_tasks import add_zero_shot_classification
+
+Scorer = Callable[[str, str, str], float]
+"""``(text, candidate label, formatted hypothesis) -> score``."""
+
+
+def table_scorer(scores: dict) -> Scorer:
+    """Scores looked up as ``scores[text][label]``."""
+    return lambda text, label, hypothesis: scores[text][label]
+
+
+def keyword_scorer(hit: float = 0.9, miss: float = 0.1) -> Scorer:
+    """``hit`` when the text mentions the label, else ``miss``."""
+    return lambda text, label, hypothesis: hit if label in text else miss
+
+
+class FakeNli:
+    """
+    Zero-shot pipeline stand-in: each label's score comes from ``scorer`` alone.
+
+    Records every call as ``(text, labels)``; raises for texts containing ``fail_on``.
+    """
+
+    def __init__(self, scorer: Scorer, fail_on: Optional[str] = None):
+        self.scorer = scorer
+        self.fail_on = fail_on
+        self.calls: List[Tuple[str, List[str]]] = []
+
+    @property
+    def premises(self) -> List[str]:
+        return [text for text, _ in self.calls]
+
+    @property
+    def pairs(self) -> int:
+        return sum(len(labels) for _, labels in self.calls)
+
+    def __call__(self, text, labels, hypothesis_template, multi_label):
+        self.calls.append((text, list(labels)))
+        if self.fail_on and self.fail_on in text:
+            raise RuntimeError("boom")
+        scores = {lab: self.scorer(text, lab, hypothesis_template.format(lab)) for lab in labels}
+        ranked = sorted(labels, key=lambda lab: -scores[lab])
+        return {"labels": ranked, "scores": [scores[lab] for lab in ranked]}
+
+
+def classify_with_fake_nli(nli: FakeNli, df: pd.DataFrame, labels: List[str], **kwargs) -> pd.DataFrame:
+    """``add_zero_shot_classification`` on the local backend with ``nli`` as the pipeline."""
+    kwargs.setdefault("backend", "local")
+    with patch("sous_chef.tasks.zeroshot.local.pipeline", return_value=nli):
+        return add_zero_shot_classification(df, labels, **kwargs)
@@ -0,0 +1,72 @@
+"""Tests for paragraph-aligned chunking of long documents."""
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from sous_chef.tasks.extraction_tasks import extract_entities
+from sous_chef.tasks.nlp.chunking import cap_text, split_text
+from sous_chef.tasks.nlp.doc_cache import parse_texts
+from sous_chef.tasks.tokenization_tasks import matching_sentences_from_doc
+
+LIVE_BLOG = "\n\n".join(
+    f"Update {i}: Acme said the vote was delayed. Officials in Boston disagreed."
+    for i in range(40)
+)
+
+
+@pytest.fixture
+def nlp():
+    pipeline = spacy.blank("en")
+    pipeline.add_pipe("sentencizer")
+    ruler = pipeline.add_pipe("entity_ruler")
+    ruler.add_patterns(
+        [{"label": "ORG", "pattern": "Acme"}, {"label": "GPE", "pattern": "Boston"}]
+    )
+    return pipeline
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOUS_CHEF_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("SOUS_CHEF_MAX_DOC_CHARS", raising=False)
+
+
+@pytest.mark.parametrize("max_chars", [1, 7, 50, 200, 10_000])
+def test_split_text_round_trips_within_limit(max_chars):
+    pieces = split_text(LIVE_BLOG, max_chars)
+    assert "".join(pieces) == LIVE_BLOG
+    assert all(0 < len(p) <= max_chars for p in pieces)
+
+
+def test_split_text_prefers_paragraph_boundaries():
+    pieces = split_text(LIVE_BLOG, 200)
+    assert all(p.startswith("\n\nUpdate") for p in pieces[1:])
+
+
+def test_cap_text_cuts_at_paragraph_boundary():
+    capped = cap_text(LIVE_BLOG, 500)
+    assert len(capped) <= 500
+    assert LIVE_BLOG.startswith(capped)
+    assert capped.endswith("disagreed.")
+    assert cap_text(LIVE_BLOG, None) == LIVE_BLOG
+
+
+def test_chunked_parse_matches_whole_parse(nlp):
+    whole = nlp(LIVE_BLOG)
+    chunked = parse_texts(nlp, [LIVE_BLOG], use_cache=False, max_chars=0, max_chunk_chars=300)[0]
+    assert chunked.text == LIVE_BLOG
+    assert [(e.text, e.label_, e.start_char) for e in chunked.ents] == [
+        (e.text, e.label_, e.start_char) for e in whole.ents
+    ]
+    assert matching_sentences_from_doc(chunked) == matching_sentences_from_doc(whole)
+
+
+def test_extract_entities_caps_outlier_documents(nlp):
+    df = pd.DataFrame({"text": [LIVE_BLOG, "Acme in Boston."]})
+    with patch("sous_chef.tasks.extraction_tasks.load_spacy_model", return_value=nlp):
+        out = extract_entities.fn(df, model="blank_en", max_chars_per_doc=200)
+    assert [e["text"] for e in out["entities"][0]] == ["Acme", "Boston", "Acme", "Boston"]
+    assert [e["text"] for e in out["entities"][1]] == ["Acme", "Boston"]
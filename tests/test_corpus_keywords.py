@@ -0,0 +1,77 @@
+"""Tests for the corpus-level hashed n-gram keyword mode."""
+import pandas as pd
+import pytest
+
+pytest.importorskip("yake")
+
+from sous_chef.tasks.aggregator_tasks import top_n_unique_values
+from sous_chef.tasks.corpus_keyword_tasks import build_hashed_ngram_matrix, top_corpus_keywords
+
+
+def _articles() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "text": [
+                "The city council approved the transit budget. The city council met again.",
+                "City council of Boston, transit budget vote!",
+                "La ciudad de Boston aprobó el presupuesto de la ciudad.",
+                None,
+            ],
+            "language": ["en", "en", "es", None],
+        }
+    )
+
+
+def test_document_frequency_counts_each_story_once():
+    top = top_corpus_keywords.fn(_articles(), top_n=-1)
+    counts = dict(zip(top["value"], top["count"]))
+    assert counts["city council"] == 2
+    assert counts["transit budget"] == 2
+    assert counts["ciudad"] == 1
+    assert counts["boston"] == 2
+
+
+def test_stopwords_and_punctuation_bound_ngrams():
+    values = set(top_corpus_keywords.fn(_articles(), top_n=-1)["value"])
+    # no n-gram starts/ends with a stopword in its story's language
+    assert "the" not in values and "the city" not in values
+    assert "de" not in values and "ciudad de" not in values
+    # stopwords may sit inside a phrase, but phrases never cross punctuation
+    assert "presupuesto de la ciudad" not in values  # longer than ngram_max
+    assert "budget city" not in values
+    assert "approved the transit" in values
+
+
+def test_output_is_compatible_with_top_n_unique_values():
+    top = top_corpus_keywords.fn(_articles(), top_n=5)
+    assert list(top.columns) == list(top_n_unique_values.fn(pd.DataFrame({"k": [["a"]]}), column="k").columns)
+    assert len(top) == 5
+    assert top["count"].is_monotonic_decreasing
+
+
+def test_tfidf_ranking_adds_score_column():
+    top = top_corpus_keywords.fn(_articles(), top_n=3, rank_by="tfidf")
+    assert list(top.columns) == ["value", "count", "score"]
+    assert top["score"].is_monotonic_decreasing
+    with pytest.raises(ValueError, match="rank_by"):
+        top_corpus_keywords.fn(_articles(), rank_by="bm25")
+
+
+def test_chunking_does_not_change_matrix():
+    texts = [t or "" for t in _articles()["text"]]
+    languages = ["en", "en", "es", "en"]
+    whole, whole_seen = build_hashed_ngram_matrix(texts, languages, n_features=2 ** 12)
+    chunked, chunked_seen = build_hashed_ngram_matrix(texts, languages, n_features=2 ** 12, chunk_size=1)
+    assert (whole != chunked).nnz == 0
+    assert (whole_seen == chunked_seen).all()
+
+
+def test_first_seen_covers_only_found_features():
+    texts = [t or "" for t in _articles()["text"]]
+    matrix, first_seen = build_hashed_ngram_matrix(texts, ["en", "en", "es", "en"])
+    assert first_seen.shape == (len(set(matrix.indices)), 4)
+    assert (first_seen[:, 0] == sorted(set(matrix.indices))).all()
+
+
+def test_empty_frame():
+    assert list(top_corpus_keywords.fn(pd.DataFrame({"text": []})).columns) == ["value", "count"]
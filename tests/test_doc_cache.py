@@ -0,0 +1,141 @@
+"""Tests for the shared parsed-document (DocBin) cache, using a blank spaCy pipeline."""
+import re
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+spacy = pytest.importorskip("spacy")
+from spacy.language import Language
+
+from sous_chef.tasks.extraction_tasks import extract_entities
+from sous_chef.tasks.nlp.doc_cache import DocAnalysisCache, parse_texts
+from sous_chef.tasks.tokenization_tasks import matching_sentences
+
+PARSE_CALLS = {"count": 0}
+
+
+@Language.component("test_parse_counter")
+def _parse_counter(doc):
+    PARSE_CALLS["count"] += 1
+    return doc
+
+
+@pytest.fixture
+def nlp():
+    pipeline = spacy.blank("en")
+    pipeline.add_pipe("sentencizer")
+    pipeline.add_pipe("test_parse_counter")
+    PARSE_CALLS["count"] = 0
+    return pipeline
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOUS_CHEF_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("SOUS_CHEF_DOC_CACHE", "1")
+    return tmp_path
+
+
+def _articles() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "media_name": ["a", "b", "c"],
+            "title": ["t1", "t2", "t3"],
+            "publish_date": ["2024-01-01"] * 3,
+            "url": ["u1", "u2", "u3"],
+            "language": ["en"] * 3,
+            "text": [
+                "Mamdani spoke today. The bus plan is free.",
+                "Nothing to see here. Move along.",
+                "Mamdani spoke today. The bus plan is free.",
+            ],
+        }
+    )
+
+
+def test_parse_texts_round_trips_through_cache(nlp):
+    texts = ["One sentence. Two sentences.", "Another doc."]
+    first = parse_texts(nlp, texts, model="blank_en")
+    assert PARSE_CALLS["count"] == 2
+    second = parse_texts(nlp, texts, model="blank_en")
+    assert PARSE_CALLS["count"] == 2
+    assert [d.text for d in second] == texts
+    assert [s.text for s in second[0].sents] == [s.text for s in first[0].sents]
+
+
+def test_parse_texts_cache_can_be_disabled(nlp, monkeypatch):
+    monkeypatch.setenv("SOUS_CHEF_DOC_CACHE", "0")
+    parse_texts(nlp, ["a b c."], model="blank_en")
+    parse_texts(nlp, ["a b c."], model="blank_en")
+    assert PARSE_CALLS["count"] == 2
+
+
+def test_parse_texts_cache_is_off_by_default(nlp, monkeypatch, cache_dir):
+    monkeypatch.delenv("SOUS_CHEF_DOC_CACHE")
+    parse_texts(nlp, ["a b c."], model="blank_en")
+    parse_texts(nlp, ["a b c."], model="blank_en")
+    assert PARSE_CALLS["count"] == 2
+    assert not (cache_dir / "docs").exists()
+    parse_texts(nlp, ["a b c."], model="blank_en", use_cache=True)
+    assert (cache_dir / "docs").exists()
+
+
+def test_cache_key_includes_pipeline_components(nlp):
+    parse_texts(nlp, ["Same text."], model="blank_en")
+    other = spacy.blank("en")
+    other.add_pipe("sentencizer")
+    assert DocAnalysisCache(other, model="blank_en").get("Same text.") is None
+    assert DocAnalysisCache(nlp, model="blank_en").get("Same text.") is not None
+
+
+def test_cache_key_includes_model_and_spacy_versions(nlp):
+    parse_texts(nlp, ["Same text."], model="blank_en")
+    cache = DocAnalysisCache(nlp, model="blank_en")
+    assert cache.model == f"blank_en-{nlp.meta['version']}-spacy{spacy.__version__}"
+    nlp.meta["version"] = "9.9.9"
+    assert DocAnalysisCache(nlp, model="blank_en").get("Same text.") is None
+
+
+def test_entities_and_matching_sentences_parse_each_document_once(nlp):
+    articles = _articles()
+    with patch("sous_chef.tasks.extraction_tasks.load_spacy_model", return_value=nlp), patch(
+        "sous_chef.tasks.tokenization_tasks.load_spacy_model", return_value=nlp
+    ):
+        with_entities = extract_entities.fn(articles.copy(), model="blank_en")
+        sentences = matching_sentences.fn(articles, model="blank_en")
+
+    # two distinct texts -> two parses across both tasks
+    assert PARSE_CALLS["count"] == 2
+    assert with_entities["entities"].tolist() == [[], [], []]
+    assert len(sentences) == 6
+    assert sentences["sentence_id"].tolist() == [0, 1, 0, 1, 0, 1]
+
+
+def test_entities_then_filtered_sentences_parse_each_document_once(nlp):
+    articles = _articles()
+    # The hit is in the first paragraph, so the prefilter window is shorter than the story
+    articles["text"] = [
+        "Mamdani spoke today.\n\nThe bus plan is free. Riders cheered.",
+        "Nothing to see here.\n\nMove along.",
+        "The bus plan is free.\n\nMamdani spoke today.",
+    ]
+    with patch("sous_chef.tasks.extraction_tasks.load_spacy_model", return_value=nlp), patch(
+        "sous_chef.tasks.tokenization_tasks.load_spacy_model", return_value=nlp
+    ):
+        extract_entities.fn(articles.copy(), model="blank_en")
+        sentences = matching_sentences.fn(
+            articles, model="blank_en", inclusion_filters=[re.compile("mamdani")]
+        )
+
+    assert PARSE_CALLS["count"] == 3
+    assert sentences["id"].tolist() == [1, 3]
+    assert sentences["sentence_id"].tolist() == [0, 1]
+    assert sentences["sentence_text"].tolist() == ["Mamdani spoke today.", "Mamdani spoke today."]
+
+
+def test_cache_key_includes_chunk_size(nlp):
+    parse_texts(nlp, ["Same text."], model="blank_en")
+    assert DocAnalysisCache(nlp, model="blank_en", max_chunk_chars=10).get("Same text.") is None
+    assert DocAnalysisCache(nlp, model="blank_en").get("Same text.") is not None
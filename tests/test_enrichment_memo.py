@@ -0,0 +1,117 @@
+"""Tests for the opt-in enrichment memo used by extract_keywords / extract_entities."""
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from sous_chef.tasks.extraction_tasks import extract_entities
+from sous_chef.tasks.keyword_tasks import extract_keywords
+from sous_chef.tasks.nlp.memo import EnrichmentMemo, memoized_column, row_key
+
+
+def _stories() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "text": [
+                "Acme opened a new office in Boston. The city council approved the transit budget.",
+                "Boston officials said Acme would hire local workers for the transit project.",
+                "Acme opened a new office in Boston. The city council approved the transit budget.",
+            ],
+            "language": ["en", "en", "en"],
+        }
+    )
+
+
+def _nlp():
+    pipeline = spacy.blank("en")
+    pipeline.add_pipe("sentencizer")
+    ruler = pipeline.add_pipe("entity_ruler")
+    ruler.add_patterns(
+        [{"label": "ORG", "pattern": "Acme"}, {"label": "GPE", "pattern": "Boston"}]
+    )
+    return pipeline
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOUS_CHEF_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("SOUS_CHEF_DOC_CACHE", "0")
+    monkeypatch.delenv("SOUS_CHEF_ENRICHMENT_MEMO", raising=False)
+
+
+def test_memoized_column_computes_only_misses():
+    keys = [row_key(t) for t in ["a", "b", "c"]]
+    calls = []
+
+    def compute(positions):
+        calls.append(positions)
+        return [{"n": p} for p in positions]
+
+    memoized_column(keys[:2], compute, task="t", params={"p": 1}, use_memo=True)
+    values = memoized_column(keys, compute, task="t", params={"p": 1}, use_memo=True)
+    assert calls == [[0, 1], [2]]
+    assert values == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+    # A different parameter set is a different memo key
+    memoized_column(keys, compute, task="t", params={"p": 2}, use_memo=True)
+    assert calls[-1] == [0, 1, 2]
+
+
+def test_memo_is_off_by_default():
+    calls = []
+    memoized_column([row_key("a")], lambda p: calls.append(p) or [1], task="t", params={})
+    memoized_column([row_key("a")], lambda p: calls.append(p) or [1], task="t", params={})
+    assert calls == [[0], [0]]
+
+
+def test_memo_closes_its_connections(tmp_path):
+    import sqlite3
+
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        opened.append(connect(*args, **kwargs))
+        return opened[-1]
+
+    with patch("sous_chef.tasks.nlp.memo.sqlite3.connect", tracking_connect):
+        memo = EnrichmentMemo("t", {}, path=tmp_path / "memo.sqlite")
+        memo.put_many({row_key("a"): 1})
+        assert memo.get_many([row_key("a")]) == {row_key("a"): 1}
+    assert len(opened) == 3
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+
+def test_entities_hits_skip_model_load():
+    with patch("sous_chef.tasks.extraction_tasks.load_spacy_model", return_value=_nlp()) as load:
+        first = extract_entities.fn(_stories(), use_memo=True)
+    assert load.call_count == 1
+
+    with patch("sous_chef.tasks.extraction_tasks.load_spacy_model") as load, \
+            patch("sous_chef.tasks.nlp.memo.mark_step") as mark_step:
+        second = extract_entities.fn(_stories(), use_memo=True)
+    load.assert_not_called()
+    assert second["entities"].tolist() == first["entities"].tolist()
+    meta = mark_step.call_args.kwargs["meta"]
+    assert meta["task"] == "extract_entities"
+    assert meta["hits"] == 3 and meta["misses"] == 0
+
+
+def test_keywords_memo_matches_fresh_extraction(monkeypatch):
+    fresh = extract_keywords.fn(_stories(), top_n=5)
+    monkeypatch.setenv("SOUS_CHEF_ENRICHMENT_MEMO", "1")
+    extract_keywords.fn(_stories().head(1), top_n=5)
+    with patch("sous_chef.tasks.nlp.memo.mark_step") as mark_step:
+        memoized = extract_keywords.fn(_stories(), top_n=5)
+    assert memoized["keywords"].tolist() == fresh["keywords"].tolist()
+    meta = mark_step.call_args.kwargs["meta"]
+    # Rows 0 and 2 share a text, both hit
+    assert (meta["hits"], meta["misses"]) == (2, 1)
+    assert meta["hit_rate"] == pytest.approx(2 / 3, abs=1e-4)
+
+    store = EnrichmentMemo("extract_keywords", {})
+    assert store.path.exists()
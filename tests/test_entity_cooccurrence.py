@@ -0,0 +1,99 @@
+"""Tests for the sparse entity co-occurrence task and Parquet export."""
+import math
+import os
+
+import pandas as pd
+import pytest
+
+from sous_chef.tasks.cooccurrence_tasks import build_document_entity_matrix, entity_cooccurrence
+from sous_chef.tasks.export_tasks import parquet_to_b2
+
+
+def _ent(text, entity_type="PERSON"):
+    return {"text": text, "type": entity_type}
+
+
+def _articles() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "entities": [
+                [_ent("Alice"), _ent("Bob"), _ent("Acme", "ORG"), _ent("Alice")],
+                [_ent("Alice"), _ent("Bob")],
+                [_ent("Alice"), _ent("Carol")],
+                None,
+                [_ent("Dave"), _ent("Acme", "ORG")],
+            ]
+        }
+    )
+
+
+def _edge(edges, a, b):
+    rows = edges[
+        ((edges["source"] == a) & (edges["target"] == b))
+        | ((edges["source"] == b) & (edges["target"] == a))
+    ]
+    assert len(rows) == 1
+    return rows.iloc[0]
+
+
+def test_document_entity_matrix_is_binary_and_keeps_empty_rows():
+    matrix, vocabulary = build_document_entity_matrix(_articles()["entities"])
+    assert matrix.shape == (5, 5)
+    assert matrix.toarray().max() == 1
+    assert matrix[3].nnz == 0
+    assert dict(zip(vocabulary["entity"], vocabulary["document_count"]))["Alice"] == 3
+
+
+def test_counts_and_pmi():
+    edges = entity_cooccurrence.fn(_articles(), top_k=0)
+    assert len(edges) == 5
+    alice_bob = _edge(edges, "Alice", "Bob")
+    assert alice_bob["cooccurrence"] == 2
+    assert alice_bob["pmi"] == pytest.approx(math.log(2 * 5 / (3 * 2)))
+    assert alice_bob["npmi"] == pytest.approx(alice_bob["pmi"] / -math.log(2 / 5))
+    assert edges["pmi"].is_monotonic_decreasing
+
+
+def test_type_filter_and_min_counts():
+    edges = entity_cooccurrence.fn(_articles(), entity_types=["PERSON"], top_k=0)
+    assert set(edges["source_type"]) | set(edges["target_type"]) == {"PERSON"}
+
+    frequent = entity_cooccurrence.fn(_articles(), min_document_count=2, min_cooccurrence=2, top_k=0)
+    assert len(frequent) == 1
+    assert {frequent.iloc[0]["source"], frequent.iloc[0]["target"]} == {"Alice", "Bob"}
+
+
+def test_top_k_keeps_edges_from_either_endpoint():
+    edges = entity_cooccurrence.fn(_articles(), weight="count", top_k=1)
+    # Alice's strongest edge is Bob; Carol's and Dave's only edges survive too
+    pairs = {frozenset((r.source, r.target)) for r in edges.itertuples()}
+    assert frozenset(("Alice", "Bob")) in pairs
+    assert frozenset(("Alice", "Carol")) in pairs
+    assert frozenset(("Dave", "Acme")) in pairs
+
+
+def test_block_size_does_not_change_result():
+    full = entity_cooccurrence.fn(_articles(), top_k=2)
+    blocked = entity_cooccurrence.fn(_articles(), top_k=2, block_size=1)
+    pd.testing.assert_frame_equal(full, blocked)
+
+
+def test_bad_weight_raises():
+    with pytest.raises(ValueError, match="weight"):
+        entity_cooccurrence.fn(_articles(), weight="jaccard")
+
+
+def test_parquet_to_b2_dry_run_writes_parquet():
+    pytest.importorskip("pyarrow")
+    edges = entity_cooccurrence.fn(_articles())
+    metadata, artifact = parquet_to_b2.fn(
+        edges,
+        object_name="sous-chef-two/graphs/edges.parquet",
+        add_date_slug=False,
+        ensure_unique=False,
+        dry_run=True,
+    )
+    assert metadata["object"].endswith("edges.parquet")
+    assert artifact.file_type == "parquet"
+    assert os.path.exists(artifact.object_key)
+    pd.testing.assert_frame_equal(pd.read_parquet(artifact.object_key), edges)
@@ -0,0 +1,204 @@
+"""Tests for the shared local inference server (tiny randomly initialised BERT models)."""
+import json
+import os
+import socket
+import threading
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("transformers")
+
+from sous_chef.tasks.nlp.inference_server import (
+    TEXT_CLASSIFICATION_TASK,
+    ZERO_SHOT_TASK,
+    InferenceServer,
+    InferenceServerError,
+    _Batcher,
+    connect_inference_server,
+    parse_server_address,
+    served_scores_backend,
+)
+from sous_chef.tasks.sentiment_tasks import add_targeted_sentiment
+from sous_chef.tasks.zeroshot.score_cache import ZeroShotScoreCache
+from sous_chef.tasks.zeroshot_tasks import add_zero_shot_classification
+from tests.tiny_models import tiny_sequence_classifier
+
+LABELS = ["city budget", "transit", "vote"]
+TEXTS = ["the mayor said", "", "transit vote was bad", "a plan was good for the city budget", None]
+SENTENCES = ["acme said the plan was good", "the mayor said", "acme vote was bad", "acme said the plan was good"]
+
+
+@pytest.fixture(scope="module")
+def models(tmp_path_factory):
+    return {
+        "nli": tiny_sequence_classifier(
+            tmp_path_factory.mktemp("nli"), ["entailment", "neutral", "contradiction"]
+        ),
+        "absa": tiny_sequence_classifier(
+            tmp_path_factory.mktemp("absa"), ["Negative", "Neutral", "Positive"]
+        ),
+    }
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    address = f"unix://{tmp_path / 'inference.sock'}"
+    srv = InferenceServer(batch_size=4, max_wait_ms=300).bind(address)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    monkeypatch.setenv("SOUS_CHEF_INFERENCE_SERVER", address)
+    yield srv
+    srv.shutdown()
+
+
+def _batching(srv, task):
+    return next(b for b in srv.health()["batching"] if b["task"] == task)
+
+
+def test_parse_server_address():
+    assert parse_server_address("unix:///tmp/x.sock") == ("unix", "/tmp/x.sock")
+    assert parse_server_address("/tmp/x.sock") == ("unix", "/tmp/x.sock")
+    assert parse_server_address("http://127.0.0.1:8765") == ("tcp", ("127.0.0.1", 8765))
+    with pytest.raises(ValueError, match="Invalid inference server address"):
+        parse_server_address("localhost")
+
+
+def test_bind_replaces_only_a_stale_socket(tmp_path, server):
+    # The fixture's server is still listening on its socket
+    with pytest.raises(InferenceServerError, match="already listening"):
+        InferenceServer().bind(f"unix://{server._socket_path}")
+
+    stale = tmp_path / "stale.sock"
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(str(stale))
+    sock.close()  # left behind, nothing listening
+    srv = InferenceServer().bind(f"unix://{stale}")
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    srv.shutdown()
+    assert not stale.exists()
+
+
+def test_socket_is_owner_only(server):
+    assert os.stat(server._socket_path).st_mode & 0o777 == 0o600
+
+
+def test_tcp_bind_requires_loopback_host():
+    with pytest.raises(InferenceServerError, match="non-loopback"):
+        InferenceServer().bind("http://0.0.0.0:0")
+    srv = InferenceServer().bind("http://127.0.0.1:0")
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    srv.shutdown()
+
+
+def test_failed_batch_is_retried_per_request():
+    def run(items):
+        if "bad" in items:
+            raise ValueError("bad input")
+        return [item.upper() for item in items]
+
+    batcher = _Batcher(run, max_wait_s=0.3, max_items=100)
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def client(name, items):
+        barrier.wait()
+        try:
+            results[name] = batcher.submit(items)
+        except ValueError as e:
+            results[name] = e
+
+    threads = [
+        threading.Thread(target=client, args=("good", ["a", "b"])),
+        threading.Thread(target=client, args=("bad", ["c", "bad"])),
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results["good"] == ["A", "B"]
+    assert isinstance(results["bad"], ValueError)
+    assert batcher.stats()["max_requests_per_batch"] == 2
+
+
+def test_served_scores_backend():
+    assert served_scores_backend({"runtime": "pytorch"}) == "local"
+    assert served_scores_backend({"runtime": "onnx", "quantized": True}) == "onnx-int8"
+    assert served_scores_backend({"runtime": "onnx", "quantized": False}) == "onnx-fp32"
+
+
+def test_zeroshot_server_backend_matches_local(server, models):
+    df = pd.DataFrame({"story_id": range(len(TEXTS)), "text": TEXTS})
+    kwargs = dict(model=models["nli"], top_n=2, batch_size=4)
+    local = add_zero_shot_classification(df, LABELS, backend="local", **kwargs)
+    served = add_zero_shot_classification(df, LABELS, backend="server", **kwargs)
+
+    assert served["zeroshot_error"].tolist() == local["zeroshot_error"].tolist()
+    assert served["zeroshot_top_label"].tolist() == local["zeroshot_top_label"].tolist()
+    for a, b in zip(local["zeroshot_scores_json"], served["zeroshot_scores_json"]):
+        assert json.loads(b) == pytest.approx(json.loads(a), abs=1e-5)
+    # 3 non-blank stories x 3 labels went through the server
+    assert _batching(server, ZERO_SHOT_TASK)["items"] == 9
+
+
+def test_concurrent_clients_share_batches(server, models):
+    clf = connect_inference_server(ZERO_SHOT_TASK, models["nli"])
+    premises = ["the mayor said", "transit vote was bad"]
+    hypotheses = ["This text is about transit", "This text is about vote"]
+    barrier = threading.Barrier(4)
+    results = {}
+
+    def client(i):
+        barrier.wait()
+        results[i] = clf.pair_logits(premises, hypotheses)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    logits, failed = results[0]
+    assert failed == {} and logits.shape == (2, 3)
+    for other, other_failed in results.values():
+        assert other_failed == {}
+        assert other == pytest.approx(logits, abs=1e-5)
+    stats = _batching(server, ZERO_SHOT_TASK)
+    assert stats["requests"] == 4 and stats["items"] == 8
+    assert stats["max_requests_per_batch"] > 1
+
+
+def test_sentiment_server_backend_matches_local(server, models):
+    df = pd.DataFrame({"sentence_text": SENTENCES})
+    local = add_targeted_sentiment(df, "acme", model=models["absa"], batch_size=2)
+    served = add_targeted_sentiment(df, "acme", model=models["absa"], batch_size=2, backend="server")
+    pd.testing.assert_frame_equal(served, local)
+    assert _batching(server, TEXT_CLASSIFICATION_TASK)["items"] == 2
+
+
+def test_falls_back_in_process_without_server(tmp_path, monkeypatch, models):
+    monkeypatch.setenv("SOUS_CHEF_INFERENCE_SERVER", f"unix://{tmp_path / 'missing.sock'}")
+    assert connect_inference_server(ZERO_SHOT_TASK, models["nli"]) is None
+
+    df = pd.DataFrame({"text": TEXTS})
+    local = add_zero_shot_classification(df, LABELS, model=models["nli"], backend="local")
+    served = add_zero_shot_classification(df, LABELS, model=models["nli"], backend="server")
+    pd.testing.assert_frame_equal(served, local)
+
+    sentences = pd.DataFrame({"sentence_text": SENTENCES})
+    pd.testing.assert_frame_equal(
+        add_targeted_sentiment(sentences, "acme", model=models["absa"], backend="server"),
+        add_targeted_sentiment(sentences, "acme", model=models["absa"]),
+    )
+
+
+def test_score_cache_keys_on_the_runtime_that_scored(server, models, tmp_path, monkeypatch):
+    monkeypatch.setenv("SOUS_CHEF_CACHE_DIR", str(tmp_path))
+    df = pd.DataFrame({"text": ["transit vote was bad"]})
+    add_zero_shot_classification(
+        df, LABELS, model=models["nli"], backend="server", use_score_cache=True, multi_label=True
+    )
+    # A PyTorch server scores like the in-process `local` backend, never under "server"
+    with ZeroShotScoreCache(models["nli"], "local")._connect() as conn:
+        backends = {row[0] for row in conn.execute("SELECT DISTINCT backend FROM nli_scores")}
+    assert backends == {"local"}
@@ -0,0 +1,50 @@
+"""Tests for YAKE keyword extraction (serial and process-pool modes)."""
+import pandas as pd
+import pytest
+
+pytest.importorskip("yake")
+
+from sous_chef.tasks.keyword_tasks import (
+    extract_keywords,
+    get_extractor_pool,
+    shutdown_keyword_pool,
+)
+
+TEXTS = [
+    "The city council approved the new transit budget after a long debate.",
+    "El alcalde anunció un nuevo plan de transporte público para la ciudad.",
+    "Wildfire smoke drifted across the valley, closing schools for a second day.",
+    "Researchers published a study on coral reef recovery in the Pacific.",
+    "La economía creció más de lo esperado durante el último trimestre.",
+]
+
+
+def _articles(repeat: int = 1) -> pd.DataFrame:
+    texts = [f"{t} Story {i}." for i in range(repeat) for t in TEXTS]
+    languages = ["es" if "ciudad" in t or "economía" in t else "en" for t in texts]
+    return pd.DataFrame({"text": texts, "language": languages})
+
+
+def test_extractors_are_reused_across_calls():
+    extract_keywords.fn(_articles(), top_n=5)
+    pool = get_extractor_pool(5, 3, 0.9)
+    english = pool["en"]
+    extract_keywords.fn(_articles(), top_n=5)
+    assert get_extractor_pool(5, 3, 0.9)["en"] is english
+    assert set(pool) == {"en", "es"}
+
+
+def test_parallel_mode_matches_serial_in_order():
+    articles = _articles(repeat=4)
+    serial = extract_keywords.fn(articles.copy(), top_n=5)
+    try:
+        parallel = extract_keywords.fn(articles.copy(), top_n=5, workers=2, chunk_size=3)
+    finally:
+        shutdown_keyword_pool()
+    assert parallel["keywords"].tolist() == serial["keywords"].tolist()
+    assert parallel["text"].tolist() == articles["text"].tolist()
+
+
+def test_empty_frame_gets_keywords_column():
+    out = extract_keywords.fn(pd.DataFrame({"text": [], "language": []}), workers=4)
+    assert "keywords" in out.columns
@@ -0,0 +1,103 @@
+"""Tests for per-language routing of rows to spaCy models."""
+import re
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from sous_chef.tasks.extraction_tasks import extract_entities
+from sous_chef.tasks.nlp.routing import model_language, route_by_language
+from sous_chef.tasks.tokenization_tasks import matching_sentences
+
+
+def _pipeline(language: str, entity: str):
+    nlp = spacy.blank(language)
+    nlp.add_pipe("sentencizer")
+    nlp.add_pipe("entity_ruler").add_patterns([{"label": "ORG", "pattern": entity}])
+    return nlp
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOUS_CHEF_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("SOUS_CHEF_DOC_CACHE", "0")
+
+
+@pytest.fixture
+def models():
+    loaded = {
+        "en_core_web_sm": _pipeline("en", "Acme"),
+        "es_core_news_sm": _pipeline("es", "Acme"),
+    }
+    calls = []
+
+    def load(name):
+        calls.append(name)
+        return loaded[name]
+
+    with patch("sous_chef.tasks.extraction_tasks.load_spacy_model", side_effect=load), \
+            patch("sous_chef.tasks.tokenization_tasks.load_spacy_model", side_effect=load):
+        yield calls
+
+
+def _stories() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3, 4],
+            "media_name": ["a"] * 4,
+            "title": ["t"] * 4,
+            "publish_date": ["2026-01-01"] * 4,
+            "url": ["u"] * 4,
+            "language": ["en", "es", "de", None],
+            "text": [
+                "Acme hired workers. The plant opened.",
+                "Acme contrató trabajadores. La planta abrió.",
+                "Acme stellte Arbeiter ein. Das Werk öffnete.",
+                "Acme closed a plant. Workers left.",
+            ],
+        }
+    )
+
+
+def test_route_by_language():
+    assert model_language("en_core_web_sm") == "en"
+    assert model_language("xx_ent_wiki_sm") == "xx"
+    assert model_language("blank_en") is None
+
+    groups, skipped = route_by_language(["en", "EN-us", "fr", None], "en_core_web_sm")
+    assert groups == {"en_core_web_sm": [0, 1, 3]}
+    assert skipped == [2]
+
+    groups, skipped = route_by_language(
+        ["en", "fr"], "en_core_web_sm", {"xx": "xx_ent_wiki_sm"}
+    )
+    assert groups == {"en_core_web_sm": [0], "xx_ent_wiki_sm": [1]}
+    assert skipped == []
+    # A model whose language can't be told takes every row
+    assert route_by_language(["en", "fr"], "blank_en") == ({"blank_en": [0, 1]}, [])
+
+
+def test_entities_skip_unsupported_languages(models):
+    result = extract_entities.fn(_stories())
+    assert [len(e) for e in result["entities"]] == [1, 0, 0, 1]
+    assert models == ["en_core_web_sm"]
+
+
+def test_entities_load_each_language_model_once(models):
+    result = extract_entities.fn(_stories(), models={"es": "es_core_news_sm"})
+    assert [len(e) for e in result["entities"]] == [1, 1, 0, 1]
+    assert sorted(models) == ["en_core_web_sm", "es_core_news_sm"]
+
+
+@pytest.mark.parametrize("prefilter", [True, False])
+def test_matching_sentences_routes_by_language(models, prefilter):
+    sentences = matching_sentences.fn(
+        _stories(),
+        inclusion_filters=[re.compile("acme")],
+        models={"es": "es_core_news_sm"},
+        prefilter=prefilter,
+    )
+    assert sentences["id"].tolist() == [1, 2, 4]
+    assert sentences["language"].tolist() == ["en", "es", None]
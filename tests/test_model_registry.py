@@ -0,0 +1,146 @@
+"""Tests for the process-wide NLP model registry (no real models loaded)."""
+import json
+from unittest.mock import patch
+
+import pytest
+
+from sous_chef.runtime import runtime_session
+from sous_chef.tasks.nlp.registry import (
+    ModelRegistry,
+    _parse_preload_spec,
+    load_sentence_segmenter,
+    preload_models,
+)
+
+
+class _Tensor:
+    def __init__(self, n: int):
+        self._n = n
+
+    def numel(self) -> int:
+        return self._n
+
+    def element_size(self) -> int:
+        return 1
+
+
+class _FakePipeline:
+    """Looks like a transformers pipeline: ``.model.parameters()``."""
+
+    def __init__(self, size: int):
+        self.model = self
+        self._size = size
+
+    def parameters(self):
+        return [_Tensor(self._size)]
+
+    def buffers(self):
+        return []
+
+
+def test_registry_loads_once_and_reuses():
+    reg = ModelRegistry(memory_budget_bytes=None)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return _FakePipeline(10)
+
+    first = reg.get("m", "text-classification", "-1", loader)
+    second = reg.get("m", "text-classification", "-1", loader)
+    assert first is second
+    assert len(calls) == 1
+    assert reg.hits == 1
+    assert reg.misses == 1
+
+
+def test_registry_key_includes_task_and_device():
+    reg = ModelRegistry(memory_budget_bytes=None)
+    a = reg.get("m", "spacy", "cpu", lambda: _FakePipeline(1))
+    b = reg.get("m", "spacy", "0", lambda: _FakePipeline(1))
+    assert a is not b
+    assert len(reg.keys()) == 2
+
+
+def test_registry_evicts_least_recently_used_over_budget():
+    reg = ModelRegistry(memory_budget_bytes=250)
+    reg.get("a", "t", "cpu", lambda: _FakePipeline(100))
+    reg.get("b", "t", "cpu", lambda: _FakePipeline(100))
+    # touch "a" so "b" becomes least recently used
+    reg.get("a", "t", "cpu", lambda: _FakePipeline(100))
+    reg.get("c", "t", "cpu", lambda: _FakePipeline(100))
+    assert [k[0] for k in reg.keys()] == ["a", "c"]
+    assert reg.total_bytes() == 200
+
+
+def test_registry_keeps_single_model_larger_than_budget():
+    reg = ModelRegistry(memory_budget_bytes=10)
+    model = reg.get("big", "t", "cpu", lambda: _FakePipeline(1000))
+    assert reg.get("big", "t", "cpu", lambda: _FakePipeline(1000)) is model
+
+
+def test_registry_reports_load_to_runtime_timeline():
+    reg = ModelRegistry(memory_budget_bytes=None)
+    with runtime_session(recipe_name="registry_test") as rec:
+        reg.get("m", "zero-shot-classification", "-1", lambda: _FakePipeline(5))
+        reg.get("m", "zero-shot-classification", "-1", lambda: _FakePipeline(5))
+    rows = rec.to_timeline_artifact().rows
+    loads = [r for r in rows if r["name"] == "model_load"]
+    assert len(loads) == 1
+    meta = json.loads(loads[0]["meta_json"])
+    assert meta["model"] == "m"
+    assert meta["task"] == "zero-shot-classification"
+    assert "load_ms" in meta
+
+
+def test_parse_preload_spec():
+    assert _parse_preload_spec("spacy:en_core_web_sm") == ("spacy", "en_core_web_sm")
+    assert _parse_preload_spec(" text-classification:org/model ") == (
+        "text-classification",
+        "org/model",
+    )
+    with pytest.raises(ValueError, match="preload spec"):
+        _parse_preload_spec("en_core_web_sm")
+
+
+def test_preload_models_from_env(monkeypatch):
+    monkeypatch.setenv(
+        "SOUS_CHEF_PRELOAD_MODELS",
+        "spacy:en_core_web_sm, text-classification:org/absa",
+    )
+    with patch("sous_chef.tasks.nlp.registry.load_spacy_model") as spacy_load, patch(
+        "sous_chef.tasks.nlp.registry.load_transformers_pipeline"
+    ) as hf_load:
+        preload_models()
+    spacy_load.assert_called_once_with("en_core_web_sm")
+    hf_load.assert_called_once_with("text-classification", "org/absa", device=-1)
+
+
+def test_sentence_segmenter_backends():
+    pytest.importorskip("spacy")
+    nlp = load_sentence_segmenter("en_core_web_sm", "sentencizer")
+    assert nlp.pipe_names == ["sentencizer"]
+    assert load_sentence_segmenter("en_core_web_sm", "sentencizer") is nlp
+    assert len(list(nlp("One. Two!").sents)) == 2
+    assert load_sentence_segmenter("unknown_model", "sentencizer").lang == "xx"
+    with pytest.raises(ValueError, match="segmenter"):
+        load_sentence_segmenter("en_core_web_sm", "regex")
+
+
+def test_runtime_session_preloads_env_models_once(monkeypatch):
+    monkeypatch.setenv("SOUS_CHEF_PRELOAD_MODELS", "spacy:en_core_web_sm")
+    monkeypatch.setattr("sous_chef.tasks.nlp.registry._preloaded", False)
+    with patch("sous_chef.tasks.nlp.registry.load_spacy_model") as spacy_load:
+        with runtime_session(recipe_name="preload_a"):
+            pass
+        with runtime_session(recipe_name="preload_b"):
+            pass
+    spacy_load.assert_called_once_with("en_core_web_sm")
+
+
+def test_runtime_session_survives_bad_preload_spec(monkeypatch):
+    monkeypatch.setenv("SOUS_CHEF_PRELOAD_MODELS", "en_core_web_sm")
+    monkeypatch.setattr("sous_chef.tasks.nlp.registry._preloaded", False)
+    with runtime_session(recipe_name="preload_bad") as rec:
+        pass
+    assert rec.to_timeline_artifact().rows
@@ -0,0 +1,68 @@
+"""Tests for the ONNX Runtime backend (tiny randomly initialised BERT, built locally)."""
+import pandas as pd
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+
+from sous_chef.tasks.nlp import get_model_registry, load_onnx_pipeline, load_transformers_pipeline
+from sous_chef.tasks.sentiment_tasks import add_targeted_sentiment
+from sous_chef.tasks.zeroshot_tasks import add_zero_shot_classification, get_zeroshot_backend
+from tests.tiny_models import tiny_sequence_classifier
+
+
+@pytest.fixture
+def onnx_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOUS_CHEF_CACHE_DIR", str(tmp_path / "cache"))
+    get_model_registry().clear()
+    yield
+    get_model_registry().clear()
+
+
+@pytest.fixture
+def nli_model(tmp_path):
+    return tiny_sequence_classifier(tmp_path / "nli", ["entailment", "neutral", "contradiction"])
+
+
+def test_get_zeroshot_backend_onnx():
+    assert get_zeroshot_backend("onnx") == "onnx"
+    assert get_zeroshot_backend("onnxruntime") == "onnx"
+
+
+def test_onnx_fp32_matches_pytorch_zero_shot(onnx_cache, nli_model):
+    labels = ["city budget", "transit", "vote"]
+    text = "the mayor said the plan was good for the city budget"
+    torch_clf = load_transformers_pipeline("zero-shot-classification", nli_model, tokenizer=nli_model)
+    onnx_clf = load_onnx_pipeline("zero-shot-classification", nli_model, quantize=False, threads=1)
+    for multi_label in (True, False):
+        expected = torch_clf(text, labels, hypothesis_template="This is about {}", multi_label=multi_label)
+        got = onnx_clf(text, labels, hypothesis_template="This is about {}", multi_label=multi_label)
+        expected_scores = dict(zip(expected["labels"], expected["scores"]))
+        got_scores = dict(zip(got["labels"], got["scores"]))
+        assert got_scores == pytest.approx(expected_scores, abs=1e-5)
+        assert got["scores"] == sorted(got["scores"], reverse=True)
+
+
+def test_onnx_int8_export_is_cached(onnx_cache, nli_model):
+    clf = load_onnx_pipeline("zero-shot-classification", nli_model, quantize=True, threads=1)
+    assert clf.classifier.path.name == "model.int8.onnx"
+    assert clf.classifier.path.exists()
+    assert load_onnx_pipeline("zero-shot-classification", nli_model, quantize=True, threads=1) is clf
+
+
+def test_zero_shot_onnx_backend_columns(onnx_cache, nli_model, monkeypatch):
+    monkeypatch.setenv("SOUS_CHEF_ONNX_QUANTIZE", "0")
+    df = pd.DataFrame({"text": ["the mayor said a plan was good", ""]})
+    out = add_zero_shot_classification(df, ["transit", "vote"], model=nli_model, backend="onnx")
+    assert out.loc[0, "zeroshot_top_label"] in {"transit", "vote"}
+    assert out.loc[1, "zeroshot_top_label"] == ""
+
+
+def test_targeted_sentiment_onnx_backend(onnx_cache, tmp_path):
+    model = tiny_sequence_classifier(tmp_path / "absa", ["Negative", "Neutral", "Positive"])
+    df = pd.DataFrame({"sentence_text": ["acme said the plan was good", "the city vote was bad"]})
+    local = add_targeted_sentiment(df.copy(), "acme", model=model, backend="local")
+    onnx = add_targeted_sentiment(df.copy(), "acme", model=model, backend="onnx")
+    assert list(onnx.columns) == list(local.columns)
+    with pytest.raises(ValueError, match="backend"):
+        add_targeted_sentiment(df.copy(), "acme", model=model, backend="tensorrt")
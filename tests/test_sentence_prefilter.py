@@ -0,0 +1,118 @@
+"""Tests for the regex prefilter in front of matching_sentences segmentation."""
+import re
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from sous_chef.tasks.nlp.chunking import pipe_chunked
+from sous_chef.tasks.tokenization_tasks import (
+    compile_inclusion_filters,
+    extract_matching_sentences,
+    matching_sentences,
+    matching_sentences_from_doc,
+    segment_window,
+)
+
+STORY = "\n\n".join(
+    [
+        "The council met on Monday. Members discussed the budget.",
+        "Transit funding was approved! Riders welcomed the TRANSIT plan.",
+        "Schools were not on the agenda. The meeting ended late.",
+        "A final vote on housing is expected. Nobody mentioned buses.",
+    ]
+)
+FILTERS = [re.compile(r"transit"), re.compile(r"housing")]
+
+
+@pytest.fixture
+def nlp():
+    pipeline = spacy.blank("en")
+    pipeline.add_pipe("sentencizer")
+    return pipeline
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOUS_CHEF_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _stories() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "media_name": ["a", "b", "c"],
+            "title": ["t1", "t2", "t3"],
+            "publish_date": ["2026-01-01"] * 3,
+            "url": ["u1", "u2", "u3"],
+            "language": ["en"] * 3,
+            "text": [STORY, "Nothing relevant here. Just weather.", STORY.split("\n\n")[1]],
+        }
+    )
+
+
+def test_filters_compile_to_one_case_insensitive_alternation():
+    matchers = compile_inclusion_filters(FILTERS)
+    assert len(matchers) == 1
+    assert matchers[0].search("HOUSING") and matchers[0].search("Transit")
+    assert compile_inclusion_filters(FILTERS) is matchers
+    # Numbered backreferences can't share an alternation
+    assert len(compile_inclusion_filters([re.compile(r"(a)\1"), re.compile("b")])) == 2
+
+
+def test_segment_window_skips_misses_and_trailing_text():
+    assert segment_window("no hits at all", FILTERS) is None
+    window = segment_window(STORY, [re.compile("transit")])
+    assert window == "\n\n".join(STORY.split("\n\n")[:2])
+    # Anchored patterns can't be checked on raw text, so the whole story is segmented
+    assert segment_window(STORY, [re.compile(r"^Riders")]) == STORY
+    assert segment_window(STORY, [re.compile(r"[^x]transit")]) != STORY
+
+
+def test_sentence_ids_match_full_segmentation(nlp):
+    for filters in ([re.compile("transit")], FILTERS, [re.compile(r"^Riders")]):
+        expected = matching_sentences_from_doc(nlp(STORY), filters)
+        assert extract_matching_sentences(nlp, STORY, filters) == expected
+    assert [i for i, _ in extract_matching_sentences(nlp, STORY, FILTERS)] == [2, 3, 6]
+
+
+def test_task_skips_unmatched_stories(nlp):
+    with patch("sous_chef.tasks.tokenization_tasks.load_spacy_model", return_value=nlp), \
+            patch("sous_chef.tasks.tokenization_tasks.mark_step") as mark_step:
+        fast = matching_sentences.fn(_stories(), inclusion_filters=FILTERS)
+    with patch("sous_chef.tasks.tokenization_tasks.load_spacy_model", return_value=nlp):
+        full = matching_sentences.fn(_stories(), inclusion_filters=FILTERS, prefilter=False, use_doc_cache=False)
+    pd.testing.assert_frame_equal(fast, full)
+    assert set(fast["id"]) == {1, 3}
+    meta = mark_step.call_args.kwargs["meta"]
+    assert meta["documents"] == 3 and meta["matched"] == 2
+    assert meta["chars_segmented"] < meta["chars_total"]
+
+
+def test_prefiltered_windows_use_the_doc_cache_when_asked(nlp, cache_dir):
+    with patch("sous_chef.tasks.tokenization_tasks.load_spacy_model", return_value=nlp):
+        first = matching_sentences.fn(_stories(), inclusion_filters=FILTERS, use_doc_cache=True)
+        with patch("sous_chef.tasks.nlp.doc_cache.pipe_chunked", wraps=pipe_chunked) as pipe:
+            again = matching_sentences.fn(_stories(), inclusion_filters=FILTERS, use_doc_cache=True)
+    pd.testing.assert_frame_equal(first, again)
+    # Every window was served from the cache
+    assert all(not call.args[1] for call in pipe.call_args_list)
+    assert list((cache_dir / "docs").rglob("*.spacy"))
+
+
+def test_task_without_language_column(nlp):
+    stories = _stories().drop(columns=["language"])
+    with patch("sous_chef.tasks.tokenization_tasks.load_spacy_model", return_value=nlp):
+        sentences = matching_sentences.fn(stories, inclusion_filters=FILTERS)
+    assert set(sentences["id"]) == {1, 3}
+    assert sentences["language"].isna().all()
+
+
+def test_task_with_sentencizer_backend_needs_no_model_download():
+    sentences = matching_sentences.fn(_stories(), inclusion_filters=FILTERS, segmenter="sentencizer")
+    assert sentences["sentence_id"].tolist() == [2, 3, 6, 0, 1]
+    with pytest.raises(ValueError, match="segmenter"):
+        matching_sentences.fn(_stories(), segmenter="regex")
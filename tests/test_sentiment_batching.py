@@ -0,0 +1,73 @@
+"""Tests for length-bucketed, batched ABSA inference in add_targeted_sentiment."""
+from unittest.mock import patch
+
+import pandas as pd
+
+from sous_chef.tasks.sentiment_tasks import add_targeted_sentiment, classify_aspect_sentiment
+
+
+class _FakeAbsa:
+    """Scores by sentence length; accepts single calls and batched dict inputs."""
+
+    def __init__(self):
+        self.calls = []
+
+    def _score(self, text):
+        return {"label": "Positive" if len(text) % 2 else "Negative", "score": len(text) / 1000}
+
+    def __call__(self, inputs, text_pair=None, batch_size=None):
+        self.calls.append((inputs, batch_size))
+        if isinstance(inputs, str):
+            return [self._score(inputs)]
+        assert len({item["text_pair"] for item in inputs}) == 1
+        return [self._score(item["text"]) for item in inputs]
+
+
+SENTENCES = ["Acme grew a lot this year.", "Acme.", "Nothing here.", "Acme lost the long court case again."]
+
+
+def test_batched_results_match_per_sentence_order():
+    absa = _FakeAbsa()
+    mentions = [s for s in SENTENCES if "Acme" in s]
+    looped = classify_aspect_sentiment(absa, mentions, "Acme", batch_size=1)
+    batched = classify_aspect_sentiment(absa, mentions, "Acme", batch_size=2)
+    assert batched == looped
+    inputs, batch_size = absa.calls[-1]
+    assert batch_size == 2
+    # Sorted by length so batches pad to similar lengths
+    assert [len(item["text"]) for item in inputs] == sorted(len(s) for s in mentions)
+    assert classify_aspect_sentiment(absa, [], "Acme") == []
+
+
+def test_add_targeted_sentiment_reports_throughput():
+    absa = _FakeAbsa()
+    df = pd.DataFrame({"sentence_text": SENTENCES})
+    with patch("sous_chef.tasks.sentiment_tasks.load_transformers_pipeline", return_value=absa), \
+            patch("sous_chef.tasks.sentiment_tasks.mark_step") as mark_step:
+        result = add_targeted_sentiment(df, sentiment_target="acme", batch_size=8)
+    assert result["target_sentiment"].tolist() == ["Negative", "Positive", None, "Negative"]
+    assert result["target_sentiment_score"].tolist()[0] == round(len(SENTENCES[0]) / 1000, 4)
+    meta = mark_step.call_args.kwargs["meta"]
+    assert meta["sentences"] == 3 and meta["batch_size"] == 8
+    assert meta["sentences_per_sec"] > 0
+
+
+def test_identical_sentences_are_scored_once_and_memoized(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOUS_CHEF_CACHE_DIR", str(tmp_path))
+    absa = _FakeAbsa()
+    syndicated = pd.DataFrame({"sentence_text": SENTENCES * 50})
+    with patch("sous_chef.tasks.sentiment_tasks.load_transformers_pipeline", return_value=absa) as load:
+        first = add_targeted_sentiment(syndicated, sentiment_target="Acme", use_memo=True)
+        inputs, _ = absa.calls[-1]
+        assert len(absa.calls) == 1 and len(inputs) == 3
+
+        second = add_targeted_sentiment(syndicated, sentiment_target="Acme", use_memo=True)
+        assert len(absa.calls) == 1
+        assert load.call_count == 1
+
+        add_targeted_sentiment(syndicated, sentiment_target="ACME", use_memo=True)
+        assert len(absa.calls) == 2
+
+    pd.testing.assert_frame_equal(first, second)
+    assert first["target_sentiment"].tolist()[:4] == ["Negative", "Positive", None, "Negative"]
+    assert first["target_sentiment"].tolist()[4:8] == first["target_sentiment"].tolist()[:4]
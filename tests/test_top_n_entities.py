@@ -0,0 +1,111 @@
+"""Tests for top_n_entities (exact and sketch modes) and the underlying sketches."""
+import random
+
+import pandas as pd
+import pytest
+
+from sous_chef.tasks.extraction_tasks import top_n_entities
+from sous_chef.tasks.sketches import CountMinSketch, SpaceSaving
+
+
+def _articles() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "entities": [
+                [
+                    {"text": "Apple", "type": "ORG"},
+                    {"text": "Apple", "type": "ORG"},
+                    {"text": "Tim Cook", "type": "PERSON"},
+                ],
+                [{"text": "Apple", "type": "PRODUCT"}, {"text": "Boston", "type": "GPE"}],
+                {"text": "Boston", "type": "GPE"},
+                None,
+                "not a list",
+                [{"text": None, "type": "ORG"}, "junk"],
+            ]
+        }
+    )
+
+
+def test_exact_counts_types_and_percentages():
+    out = top_n_entities.fn(_articles(), top_n=-1)
+    assert out["entity"].tolist() == ["Apple", "Boston", "Tim Cook"]
+    assert out["type"].tolist() == ["ORG", "GPE", "PERSON"]
+    assert out["count"].tolist() == [3, 2, 1]
+    assert out["document_count"].tolist() == [2, 2, 1]
+    assert out["appearance_percent"].tolist() == pytest.approx([200 / 6, 200 / 6, 100 / 6])
+
+
+def test_exact_filter_and_sort_by_percentage():
+    out = top_n_entities.fn(_articles(), top_n=1, filter_type="GPE", sort_by="percentage")
+    assert out.to_dict("records") == [
+        {
+            "entity": "Boston",
+            "type": "GPE",
+            "count": 2,
+            "appearance_percent": pytest.approx(200 / 6),
+            "document_count": 2,
+        }
+    ]
+
+
+def test_exact_ties_keep_first_seen_order():
+    df = pd.DataFrame({"entities": [[{"text": t, "type": "ORG"} for t in "cab"]]})
+    assert top_n_entities.fn(df, top_n=2)["entity"].tolist() == ["c", "a"]
+
+
+def test_empty_inputs_and_bad_arguments():
+    empty = top_n_entities.fn(pd.DataFrame({"entities": [None, []]}))
+    assert empty.empty
+    assert list(empty.columns) == ["entity", "type", "count", "appearance_percent", "document_count"]
+    with pytest.raises(ValueError, match="sort_by"):
+        top_n_entities.fn(_articles(), sort_by="bogus")
+    with pytest.raises(ValueError, match="method"):
+        top_n_entities.fn(_articles(), method="bogus")
+
+
+def test_sketch_mode_matches_exact_on_small_input():
+    exact = top_n_entities.fn(_articles(), top_n=3)
+    sketch = top_n_entities.fn(_articles(), top_n=3, method="sketch", sketch_capacity=10)
+    assert sketch["entity"].tolist() == exact["entity"].tolist()
+    assert sketch["count"].tolist() == exact["count"].tolist()
+    assert sketch["document_count"].tolist() == exact["document_count"].tolist()
+    assert sketch["type"].tolist() == exact["type"].tolist()
+    assert (sketch["count_error_bound"] == 0).all()
+
+
+def test_sketch_mode_error_bounds_hold_on_skewed_stream():
+    rng = random.Random(0)
+    vocab = [f"e{i}" for i in range(2000)]
+    weights = [1.0 / (i + 1) for i in range(len(vocab))]
+    rows = [
+        [{"text": t, "type": "ORG"} for t in rng.choices(vocab, weights, k=20)]
+        for _ in range(500)
+    ]
+    df = pd.DataFrame({"entities": rows})
+    exact = top_n_entities.fn(df, top_n=-1).set_index("entity")
+    sketch = top_n_entities.fn(df, top_n=10, method="sketch", sketch_capacity=200)
+
+    assert sketch["entity"].tolist()[:3] == exact.index.tolist()[:3]
+    for row in sketch.itertuples():
+        true_count = exact.loc[row.entity, "count"]
+        true_docs = exact.loc[row.entity, "document_count"]
+        # Both sketches only ever overestimate, by at most the reported bound
+        assert true_count <= row.count <= true_count + row.count_error_bound
+        assert true_docs <= row.document_count <= true_docs + row.document_count_error_bound
+
+
+def test_space_saving_keeps_capacity_counters():
+    ss = SpaceSaving(capacity=3)
+    ss.update("aaaaabbbbccd e")
+    assert len(ss.counts) == 3
+    key, count, error = ss.top(1)[0]
+    assert (key, count, error) == ("a", 5, 0)
+    assert ss.max_error == pytest.approx(ss.total / 3)
+
+
+def test_count_min_never_undercounts():
+    cms = CountMinSketch(width=8, depth=3)
+    cms.update(["x"] * 5 + [f"k{i}" for i in range(50)])
+    assert cms.estimate("x") >= 5
+    assert cms.estimate("x") <= 5 + cms.total
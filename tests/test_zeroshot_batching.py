@@ -0,0 +1,91 @@
+"""Tests for batched local zero-shot inference (tiny randomly initialised BERT NLI model)."""
+import json
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("transformers")
+
+from sous_chef.tasks.zeroshot.batched import classify_zero_shot_batched, nli_runner
+from sous_chef.tasks.zeroshot_tasks import add_zero_shot_classification
+from tests.tiny_models import tiny_sequence_classifier
+
+LABELS = ["city budget", "transit", "vote", "mayor"]
+TEXTS = [
+    "the mayor said the plan was good",
+    "",
+    None,
+    "transit vote was bad for the city budget and the mayor said a plan was good " * 3,
+    "acme",
+]
+
+
+@pytest.fixture(scope="module")
+def nli_model(tmp_path_factory):
+    return tiny_sequence_classifier(
+        tmp_path_factory.mktemp("nli"), ["entailment", "neutral", "contradiction"]
+    )
+
+
+@pytest.mark.parametrize("multi_label", [True, False])
+def test_batched_matches_per_story_pipeline(nli_model, multi_label):
+    df = pd.DataFrame({"story_id": range(len(TEXTS)), "text": TEXTS})
+    kwargs = dict(model=nli_model, backend="local", multi_label=multi_label, top_n=2)
+    looped = add_zero_shot_classification(df, LABELS, batch_size=1, **kwargs)
+    batched = add_zero_shot_classification(df, LABELS, batch_size=3, **kwargs)
+
+    assert list(batched.columns) == list(looped.columns)
+    assert batched["zeroshot_error"].tolist() == looped["zeroshot_error"].tolist()
+
+    def scores_by_label(frame):
+        return [
+            dict(zip(json.loads(labels), json.loads(scores)))
+            for labels, scores in zip(frame["zeroshot_labels_json"], frame["zeroshot_scores_json"])
+        ]
+
+    # Padding changes scores in the last float bits, so only near-ties may reorder
+    for a, b in zip(scores_by_label(looped), scores_by_label(batched)):
+        assert b == pytest.approx(a, abs=1e-5)
+
+    # Rows whose ranking has no near-tie at the top must select exactly the same labels
+    checked = 0
+    for i, scores in enumerate(scores_by_label(looped)):
+        ranked = sorted(scores.values(), reverse=True)
+        if any(x - y < 1e-4 for x, y in zip(ranked, ranked[1:])):
+            continue
+        checked += 1
+        for col in ("zeroshot_top_label", "zeroshot_labels_selected_json"):
+            assert batched.loc[i, col] == looped.loc[i, col]
+    assert checked > 0
+    assert batched.loc[1, "zeroshot_labels_json"] == "[]"
+
+
+def test_failed_batch_falls_back_to_per_story_calls(nli_model):
+    from transformers import pipeline
+
+    clf = pipeline("zero-shot-classification", model=nli_model)
+    runner = nli_runner(clf)
+    real_forward = runner.forward
+    calls = {"n": 0}
+
+    def flaky(batch):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise RuntimeError("out of memory")
+        return real_forward(batch)
+
+    runner.forward = flaky
+    texts = ["the mayor said", "a plan was good", "city budget vote"]
+    results, errors = classify_zero_shot_batched(runner, texts, LABELS, "This is about {}", True, 4)
+    assert errors and set(errors.values()) == {"RuntimeError: out of memory"}
+    assert set(results) | set(errors) == {0, 1, 2}
+    assert not set(results) & set(errors)
+
+    df = pd.DataFrame({"text": texts})
+    with patch("sous_chef.tasks.zeroshot.local.pipeline", return_value=clf), \
+            patch("sous_chef.tasks.zeroshot.local.nli_runner", return_value=runner):
+        calls["n"] = 0
+        out = add_zero_shot_classification(df, LABELS, backend="local", batch_size=4)
+    assert (out["zeroshot_error"] == "").all()
+    assert all(len(json.loads(labels)) == len(LABELS) for labels in out["zeroshot_labels_json"])
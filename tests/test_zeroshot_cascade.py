@@ -0,0 +1,106 @@
+"""Tests for the bi-encoder shortlist in front of NLI zero-shot (fake embedder, mocked pipeline)."""
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sous_chef.artifacts import ZeroShotClassificationSummary
+from sous_chef.tasks.nlp import embed_texts, get_model_registry
+from sous_chef.tasks.zeroshot.cascade import shortlist_labels
+from sous_chef.tasks.zeroshot_tasks import zeroshot_cascade_stats
+from tests.fake_nli import FakeNli, classify_with_fake_nli
+from tests.tiny_models import tiny_sequence_classifier
+
+LABELS = ["transit", "housing", "crime", "schools"]
+
+
+def _keyword_embed(texts, model, device):
+    """One dimension per label, set when the text mentions it (plus a small shared component)."""
+    vectors = np.array([[1.0 if lab in t else 0.0 for lab in LABELS] + [0.1] for t in texts])
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _keyword_nli():
+    return FakeNli(lambda text, label, hypothesis: 0.9 if label in text else 0.05 + 0.01 * LABELS.index(label))
+
+
+def _classify(df, nli, **kwargs):
+    with patch("sous_chef.tasks.zeroshot.cascade.embed_texts", _keyword_embed):
+        return classify_with_fake_nli(nli, df, LABELS, **kwargs)
+
+
+DF = pd.DataFrame({
+    "story_id": [1, 2, 3, 4],
+    "text": ["transit fares rise", "housing and crime downtown", "", "schools reopen"],
+})
+
+
+def test_shortlist_labels_top_k_and_margin():
+    sim = np.array([[0.1, 0.9, 0.85, 0.2], [0.5, 0.5, 0.1, 0.0]])
+    assert shortlist_labels(sim, 1) == [[1], [0]]
+    assert shortlist_labels(sim, 1, margin=0.1) == [[1, 2], [0, 1]]
+    assert shortlist_labels(sim, 3) == [[1, 2, 3], [0, 1, 2]]
+    with pytest.raises(ValueError, match="cascade_top_k"):
+        shortlist_labels(sim, 0)
+
+
+def test_cascade_scores_only_shortlisted_pairs():
+    full = _classify(DF, _keyword_nli(), top_n=1)
+
+    nli = _keyword_nli()
+    out = _classify(DF, nli, top_n=1, cascade_top_k=2, cascade_validation_size=0)
+    assert nli.pairs == 3 * 2
+    assert list(out.columns) == list(full.columns)
+    assert out["zeroshot_top_label"].tolist() == full["zeroshot_top_label"].tolist()
+    assert out["zeroshot_labels_selected_json"].tolist() == full["zeroshot_labels_selected_json"].tolist()
+    assert [len(json.loads(labels)) for labels in out["zeroshot_labels_json"]] == [2, 2, 0, 2]
+    # Scores of shortlisted labels are exactly those of the full run
+    for got, want, got_labels, want_labels in zip(
+        out["zeroshot_scores_json"], full["zeroshot_scores_json"],
+        out["zeroshot_labels_json"], full["zeroshot_labels_json"],
+    ):
+        want_by_label = dict(zip(json.loads(want_labels), json.loads(want)))
+        assert all(want_by_label[lab] == s for lab, s in zip(json.loads(got_labels), json.loads(got)))
+
+    stats = zeroshot_cascade_stats(out)
+    assert stats["pairs_scored"] == 6 and stats["pairs_full"] == 12
+    assert stats["recall"] is None
+
+
+def test_cascade_reports_recall_against_full_nli():
+    nli = _keyword_nli()
+    out = _classify(DF, nli, passing_score_threshold=0.5, cascade_top_k=1, cascade_validation_size=10)
+    stats = zeroshot_cascade_stats(out)
+    # Story 2 needs housing and crime but only one survives a top-1 shortlist
+    assert stats["validation_stories"] == 3
+    assert stats["recall"] == pytest.approx(3 / 4)
+    assert nli.pairs == 3 * 1 + 3 * len(LABELS)
+
+    summary = ZeroShotClassificationSummary(
+        input_labels=LABELS, cascade_top_k=stats["top_k"], cascade_recall=stats["recall"],
+        cascade_validation_stories=stats["validation_stories"],
+    )
+    assert "cascade top-1 (recall 0.75 on 3 stories)" in summary.get_artifact_description()
+
+
+def test_cascade_off_by_default_and_from_env(monkeypatch):
+    assert zeroshot_cascade_stats(_classify(DF, _keyword_nli())) == {}
+    monkeypatch.setenv("ZEROSHOT_CASCADE_TOP_K", "2")
+    nli = _keyword_nli()
+    _classify(DF, nli, cascade_validation_size=0)
+    assert nli.pairs == 6
+
+
+def test_embed_texts_unit_length_and_batch_independent(tmp_path):
+    get_model_registry().clear()
+    model = tiny_sequence_classifier(tmp_path / "enc", ["a", "b"])
+    texts = ["the mayor said", "", "a plan was good for the city budget", "transit vote"]
+    one = embed_texts(texts, model, batch_size=1)
+    many = embed_texts(texts, model, batch_size=8)
+    assert one.shape == (4, 32) and one.dtype == np.float32
+    assert np.allclose(np.linalg.norm(one[[0, 2, 3]], axis=1), 1.0, atol=1e-5)
+    assert not one[1].any()
+    assert np.allclose(one, many, atol=1e-5)
+    get_model_registry().clear()
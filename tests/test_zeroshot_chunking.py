@@ -0,0 +1,90 @@
+"""Tests for chunked long-story zero-shot classification (mocked local pipeline)."""
+import json
+
+import pandas as pd
+import pytest
+
+from sous_chef.tasks.zeroshot.chunked import pool_chunk_scores, split_into_windows
+from tests.fake_nli import FakeNli, classify_with_fake_nli, keyword_scorer
+
+
+def _words(texts):
+    return [len(t.split()) for t in texts]
+
+
+def _keyword_nli(fail_on=None):
+    # 0.9 when the window mentions the label, else 0.1
+    return FakeNli(keyword_scorer(), fail_on)
+
+
+def _classify(df, labels, nli, **kwargs):
+    return classify_with_fake_nli(nli, df, labels, **kwargs)
+
+
+def test_split_into_windows_packs_whole_sentences():
+    text = "One two three. Four five six.\nSeven eight. Nine ten eleven twelve."
+    windows = split_into_windows(text, 6, _words)
+    assert windows == ["One two three. Four five six.", "Seven eight. Nine ten eleven twelve."]
+    assert split_into_windows("   ", 6, _words) == []
+
+
+def test_split_into_windows_cuts_overlong_sentence_on_words():
+    windows = split_into_windows(" ".join(f"w{i}" for i in range(10)) + ".", 4, _words)
+    assert [len(w.split()) for w in windows] == [4, 4, 2]
+
+
+def test_pool_chunk_scores():
+    chunks = [{"a": 0.2, "b": 0.6}, {"a": 0.8, "b": 0.6}]
+    assert pool_chunk_scores(chunks, ["a", "b"], "max") == pytest.approx({"a": 0.8, "b": 0.6})
+    assert pool_chunk_scores(chunks, ["a", "b"], "mean") == pytest.approx({"a": 0.5, "b": 0.6})
+    attention = pool_chunk_scores(chunks, ["a", "b"], "attention")
+    assert 0.5 < attention["a"] < 0.8
+    assert attention["b"] == pytest.approx(0.6)
+    with pytest.raises(ValueError, match="chunk_pooling"):
+        pool_chunk_scores(chunks, ["a"], "median")
+
+
+def test_chunked_mode_sees_the_tail_of_long_stories():
+    filler = " ".join(["The council met again today."] * 600)
+    df = pd.DataFrame({"story_id": [1, 2], "text": [f"{filler} Then transit was cut.", ""]})
+    labels = ["transit", "housing"]
+
+    truncated = _classify(df, labels, _keyword_nli(), top_n=1, passing_score_threshold=0.5)
+    assert truncated.loc[0, "zeroshot_top_score"] == pytest.approx(0.1)
+
+    nli = _keyword_nli()
+    out = _classify(df, labels, nli, chunk_pooling="max", chunk_tokens=100, max_chunks=200,
+                    top_n=1, passing_score_threshold=0.5)
+    assert list(out.columns) == list(truncated.columns)
+    assert out.loc[0, "zeroshot_top_label"] == "transit"
+    assert out.loc[0, "zeroshot_top_score"] == pytest.approx(0.9)
+    assert json.loads(out.loc[0, "zeroshot_labels_selected_json"]) == ["transit"]
+    assert out.loc[1, "zeroshot_top_label"] == ""
+    assert len(nli.premises) > 1 and all(len(p) < 450 for p in nli.premises)
+
+    mean = _classify(df, labels, _keyword_nli(), chunk_pooling="mean", chunk_tokens=100, max_chunks=200)
+    assert 0.1 < mean.loc[0, "zeroshot_top_score"] < 0.9
+
+
+def test_max_chunks_keeps_first_and_last_windows():
+    text = " ".join(f"Sentence number {i} is here." for i in range(50))
+    nli = _keyword_nli()
+    _classify(pd.DataFrame({"text": [text]}), ["x"], nli, chunk_pooling="max", chunk_tokens=10, max_chunks=3)
+    assert len(nli.premises) == 3
+    assert nli.premises[0].startswith("Sentence number 0 ")
+    assert nli.premises[-1].endswith("number 49 is here.")
+
+
+def test_failed_window_fails_the_story():
+    df = pd.DataFrame({"story_id": [1, 2], "text": ["Calm start. Then boom here.", "Transit news."]})
+    out = _classify(df, ["transit"], _keyword_nli(fail_on="boom"), chunk_pooling="attention", chunk_tokens=2)
+    assert out.loc[0, "zeroshot_top_label"] == "unknown"
+    assert "boom" in out.loc[0, "zeroshot_error"]
+    assert out.loc[1, "zeroshot_error"] == ""
+
+
+def test_single_label_pooled_scores_sum_to_one():
+    df = pd.DataFrame({"text": ["transit here. housing there. nothing else."]})
+    out = _classify(df, ["transit", "housing"], _keyword_nli(), multi_label=False,
+                    chunk_pooling="max", chunk_tokens=2)
+    assert sum(json.loads(out.loc[0, "zeroshot_scores_json"])) == pytest.approx(1.0)
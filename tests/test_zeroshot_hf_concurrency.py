@@ -0,0 +1,179 @@
+"""Tests for concurrent hosted zero-shot requests and shared backoff (mocked InferenceClient)."""
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import pandas as pd
+import pytest
+from huggingface_hub.errors import HfHubHTTPError
+
+from sous_chef.tasks.zeroshot.config import get_zeroshot_hf_concurrency, get_zeroshot_hf_run_deadline_s
+from sous_chef.tasks.zeroshot.hf_inference import _AdaptiveConcurrency, _EndpointBreaker, ZeroShotRunAborted
+from sous_chef.tasks.zeroshot_tasks import add_zero_shot_classification
+
+HF = "sous_chef.tasks.zeroshot.hf_inference"
+
+
+def _http_error(status):
+    request = httpx.Request("POST", "https://router.huggingface.co/x")
+    return HfHubHTTPError(str(status), response=httpx.Response(status, request=request))
+
+
+class _FakeClient:
+    """Scores "politics" by text length; tracks peak concurrency; scripted failures by text."""
+
+    def __init__(self, failures=None, delay=0.02):
+        self.failures = failures or {}
+        self.delay = delay
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def zero_shot_classification(self, text, candidate_labels, multi_label, hypothesis_template, model):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            pending = self.failures.get(text)
+            if pending:
+                error = pending.pop(0)
+        try:
+            threading.Event().wait(self.delay)  # time.sleep is patched out for retry backoff
+            if pending is not None and error is not None:
+                raise error
+            score = len(text) / 100
+            return [
+                SimpleNamespace(label="politics", score=score),
+                SimpleNamespace(label="economy", score=score / 2),
+            ]
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _classify(df, client, **kwargs):
+    with patch(f"{HF}._hf_token_optional", return_value=None), \
+            patch(f"{HF}.get_hf_bill_to", return_value=None), \
+            patch(f"{HF}.InferenceClient", return_value=client), \
+            patch(f"{HF}.time.sleep"):
+        return add_zero_shot_classification(df, ["politics", "economy"], backend="hf_inference", **kwargs)
+
+
+def test_concurrent_requests_keep_row_order_and_cap():
+    texts = ["x" * n for n in range(1, 21)]
+    df = pd.DataFrame({"story_id": range(20), "text": texts})
+    client = _FakeClient()
+    out = _classify(df, client, max_concurrency=4)
+
+    assert 1 < client.peak <= 4
+    assert out["zeroshot_top_score"].tolist() == pytest.approx([len(t) / 100 for t in texts])
+    sequential = _classify(df, _FakeClient(delay=0), max_concurrency=1)
+    pd.testing.assert_frame_equal(out, sequential)
+
+
+def test_throttling_is_retried_and_errors_stay_per_row():
+    texts = ["aa", "bbb", "cccc", "ddddd"]
+    client = _FakeClient(
+        failures={
+            "bbb": [_http_error(429), _http_error(503), None],
+            "cccc": [_http_error(400)],
+        }
+    )
+    out = _classify(pd.DataFrame({"text": texts}), client, max_concurrency=3)
+
+    assert out["zeroshot_error"].tolist() == ["", "", "HfHubHTTPError: 400", ""]
+    assert out["zeroshot_top_label"].tolist() == ["politics", "politics", "unknown", "politics"]
+    assert json.loads(out.loc[2, "zeroshot_labels_json"]) == []
+    assert pd.isna(out.loc[2, "zeroshot_top_score"])
+
+
+def test_adaptive_concurrency_halves_on_throttle_and_recovers():
+    limiter = _AdaptiveConcurrency(8)
+    limiter.on_throttle()
+    limiter.on_throttle()
+    assert (limiter.limit, limiter.lowest, limiter.throttled) == (2, 2, 2)
+    for _ in range(2):
+        limiter.on_success()
+    assert limiter.limit == 3
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.limit == 8
+
+
+def test_get_zeroshot_hf_concurrency(monkeypatch):
+    monkeypatch.delenv("ZEROSHOT_HF_MAX_CONCURRENCY", raising=False)
+    assert get_zeroshot_hf_concurrency() == 1
+    monkeypatch.setenv("ZEROSHOT_HF_MAX_CONCURRENCY", "2")
+    assert get_zeroshot_hf_concurrency() == 2
+    assert get_zeroshot_hf_concurrency(5) == 5
+    with pytest.raises(ValueError):
+        get_zeroshot_hf_concurrency(0)
+
+
+def test_fatal_probe_error_fails_remaining_rows_without_requests():
+    texts = ["", "aa", "bbb", "cccc"]
+    client = _FakeClient(failures={"aa": [_http_error(404)]})
+    out = _classify(pd.DataFrame({"text": texts}), client, max_concurrency=4)
+
+    assert client.calls == 1
+    errors = out["zeroshot_error"].tolist()
+    assert errors[0] == ""
+    assert errors[1] == "HfHubHTTPError: 404"
+    assert all(e.startswith("ZeroShotRunAborted: endpoint returned HTTP 404") for e in errors[2:])
+    assert out["zeroshot_top_label"].tolist() == ["", "unknown", "unknown", "unknown"]
+
+
+def test_run_deadline_stops_requests_while_endpoint_is_down():
+    texts = [f"story {i}" for i in range(30)]
+    client = _FakeClient(failures={t: [_http_error(503)] * 100 for t in texts}, delay=0)
+    with patch(f"{HF}._BREAKER_COOLDOWN_S", 0.05):
+        start = time.monotonic()
+        out = _classify(pd.DataFrame({"text": texts}), client, max_concurrency=4, run_deadline_s=0.3)
+    assert time.monotonic() - start < 5
+    assert (out["zeroshot_top_label"] == "unknown").all()
+    assert out["zeroshot_error"].str.startswith("ZeroShotRunAborted: zero-shot run deadline passed").sum() > 20
+    # The open circuit keeps rows from each burning their own retries
+    assert client.calls < 30
+
+
+def test_breaker_opens_after_threshold_and_probe_closes_it():
+    breaker = _EndpointBreaker()
+    with patch(f"{HF}._BREAKER_COOLDOWN_S", 0.05):
+        for _ in range(3):
+            breaker.before_request()
+            breaker.record_failure()
+        assert breaker.opens == 1
+        start = time.monotonic()
+        breaker.before_request()  # waits out the cooldown, then lets one probe through
+        assert time.monotonic() - start >= 0.04
+        breaker.record_failure()  # failed probe re-opens with a doubled cooldown
+        assert breaker.opens == 2
+        start = time.monotonic()
+        breaker.before_request()
+        assert time.monotonic() - start >= 0.09
+        breaker.record_success()
+        breaker.before_request()
+
+
+def test_breaker_deadline():
+    breaker = _EndpointBreaker(deadline_s=0.01)
+    time.sleep(0.02)
+    with pytest.raises(ZeroShotRunAborted, match="deadline"):
+        breaker.before_request()
+    assert breaker.aborted_rows == 1
+
+
+def test_get_zeroshot_hf_run_deadline_s(monkeypatch):
+    monkeypatch.delenv("ZEROSHOT_HF_RUN_DEADLINE_S", raising=False)
+    assert get_zeroshot_hf_run_deadline_s() is None
+    assert get_zeroshot_hf_run_deadline_s(0) is None
+    assert get_zeroshot_hf_run_deadline_s(120) == 120.0
+    monkeypatch.setenv("ZEROSHOT_HF_RUN_DEADLINE_S", "900")
+    assert get_zeroshot_hf_run_deadline_s() == 900.0
+    monkeypatch.setenv("ZEROSHOT_HF_RUN_DEADLINE_S", "soon")
+    with pytest.raises(ValueError):
+        get_zeroshot_hf_run_deadline_s()
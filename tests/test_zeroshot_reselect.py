@@ -0,0 +1,67 @@
+"""Tests for stored zero-shot score matrices and re-selection without a model."""
+import pandas as pd
+import pytest
+
+from sous_chef.tasks.export_tasks import parquet_from_b2
+from sous_chef.tasks.zeroshot_tasks import (
+    compute_zero_shot_label_counts,
+    reselect_zero_shot_labels,
+    stored_zeroshot_labels,
+    story_dataframe_for_zeroshot_csv,
+    zeroshot_scores_frame,
+    zeroshot_scores_run,
+)
+from tests.fake_nli import FakeNli, classify_with_fake_nli, table_scorer
+
+LABELS = ["transit", "housing", "crime"]
+SCORES = {
+    "transit fares": {"transit": 0.9, "housing": 0.4, "crime": 0.1},
+    "housing and crime": {"transit": 0.2, "housing": 0.7, "crime": 0.6},
+    "nothing here": {"transit": 0.3, "housing": 0.2, "crime": 0.1},
+}
+
+DF = pd.DataFrame({
+    "story_id": [11, 12, 13, 14, 15],
+    "title": ["a", "b", "c", "d", "e"],
+    "text": ["transit fares", "housing and crime", "boom", "nothing here", ""],
+})
+
+
+def _classify(labels=LABELS, **kwargs):
+    return classify_with_fake_nli(FakeNli(table_scorer(SCORES), fail_on="boom"), DF, labels, **kwargs)
+
+
+@pytest.fixture
+def stored(tmp_path):
+    path = tmp_path / "scores.parquet"
+    scores = zeroshot_scores_frame(_classify(), LABELS, run={"model_id": "m", "multi_label": True})
+    scores.to_parquet(path, index=False)
+    return str(path)
+
+
+def test_scores_frame_round_trips_through_parquet(stored):
+    scores = parquet_from_b2.fn(stored)
+    assert stored_zeroshot_labels(scores) == LABELS
+    assert list(scores.columns[:3]) == ["story_id", "title", "zeroshot_error"]
+    assert "text" not in scores.columns
+    assert scores["zeroshot_score:housing"].dtype == "float64"
+    assert zeroshot_scores_run(scores) == {"model_id": "m", "multi_label": True}
+
+
+@pytest.mark.parametrize("threshold,top_n", [(None, None), (0.5, None), (None, 2), (0.5, 1)])
+def test_reselect_matches_a_fresh_run(stored, threshold, top_n):
+    fresh = story_dataframe_for_zeroshot_csv(_classify(passing_score_threshold=threshold, top_n=top_n))
+    out = reselect_zero_shot_labels(stored, passing_score_threshold=threshold, top_n=top_n)
+    pd.testing.assert_frame_equal(story_dataframe_for_zeroshot_csv(out), fresh)
+    assert compute_zero_shot_label_counts(out, LABELS, threshold, top_n) == \
+        compute_zero_shot_label_counts(fresh, LABELS, threshold, top_n)
+
+
+def test_reselect_label_subset(stored):
+    out = reselect_zero_shot_labels(stored, ["crime", "transit"], top_n=1)
+    assert out["zeroshot_top_label"].tolist() == ["transit", "crime", "unknown", "transit", ""]
+    assert out.loc[2, "zeroshot_error"] != ""
+    with pytest.raises(ValueError, match="without stored scores"):
+        reselect_zero_shot_labels(stored, ["sports"])
+    with pytest.raises(ValueError, match="top_n"):
+        reselect_zero_shot_labels(stored, top_n=0)
@@ -0,0 +1,81 @@
+"""Tests for the persistent zero-shot NLI score cache (mocked local pipeline)."""
+import pandas as pd
+import pytest
+
+from sous_chef.artifacts import ZeroShotClassificationSummary
+from sous_chef.tasks.zeroshot.score_cache import ZeroShotScoreCache
+from sous_chef.tasks.zeroshot_tasks import zeroshot_score_cache_counts
+from tests.fake_nli import FakeNli, classify_with_fake_nli
+
+
+def _fake_nli(fail_on=None):
+    # Each label's score depends only on (text, hypothesis)
+    return FakeNli(lambda text, label, hypothesis: (len(text) * 7 + len(hypothesis) * 3) % 100 / 100, fail_on)
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SOUS_CHEF_CACHE_DIR", str(tmp_path))
+
+
+def _classify(df, labels, nli, **kwargs):
+    return classify_with_fake_nli(nli, df, labels, use_score_cache=True, **kwargs)
+
+
+DF = pd.DataFrame({"story_id": [1, 2, 3], "text": ["the mayor spoke", "", "a transit plan"]})
+
+
+def test_rerun_with_extra_label_only_infers_new_label():
+    first = _classify(DF, ["politics", "economy"], _fake_nli(), top_n=1)
+    assert zeroshot_score_cache_counts(first) == (0, 4)
+
+    nli = _fake_nli()
+    second = _classify(DF, ["politics", "economy", "transit"], nli, passing_score_threshold=0.5)
+    assert zeroshot_score_cache_counts(second) == (4, 2)
+    assert [labels for _, labels in nli.calls] == [["transit"], ["transit"]]
+
+    uncached = classify_with_fake_nli(
+        _fake_nli(), DF, ["politics", "economy", "transit"], passing_score_threshold=0.5,
+        use_score_cache=False,
+    )
+    assert list(second.columns) == list(uncached.columns)
+    for column in ["zeroshot_labels_json", "zeroshot_top_label", "zeroshot_labels_passing_threshold_json",
+                   "zeroshot_labels_selected_json", "zeroshot_error"]:
+        assert second[column].tolist() == uncached[column].tolist()
+    assert second["zeroshot_scores_json"].tolist() == uncached["zeroshot_scores_json"].tolist()
+
+
+def test_failed_rows_are_not_cached():
+    out = _classify(DF, ["politics"], _fake_nli(fail_on="a transit plan"))
+    assert out.loc[2, "zeroshot_error"] == "RuntimeError: boom"
+    assert out.loc[2, "zeroshot_top_label"] == "unknown"
+
+    nli = _fake_nli()
+    again = _classify(DF, ["politics"], nli)
+    assert zeroshot_score_cache_counts(again) == (1, 1)
+    assert nli.calls == [("a transit plan", ["politics"])]
+    assert again.loc[2, "zeroshot_error"] == ""
+
+
+def test_single_label_mode_bypasses_cache():
+    _classify(DF, ["politics", "economy"], _fake_nli())
+    nli = _fake_nli()
+    out = _classify(DF, ["politics", "economy"], nli, multi_label=False)
+    assert len(nli.calls) == 2
+    assert zeroshot_score_cache_counts(out) == (0, 0)
+
+
+def test_cache_key_includes_model_and_backend(tmp_path):
+    ZeroShotScoreCache("m", "local").put_many({("h", "This text is about x"): 0.5})
+    assert ZeroShotScoreCache("m", "local").get_many(["h"], ["This text is about x"]) == {
+        ("h", "This text is about x"): 0.5
+    }
+    assert ZeroShotScoreCache("m", "onnx-int8").get_many(["h"], ["This text is about x"]) == {}
+    assert ZeroShotScoreCache("other", "local").get_many(["h"], ["This text is about x"]) == {}
+
+
+def test_summary_reports_cache_counts():
+    summary = ZeroShotClassificationSummary(
+        input_labels=["a"], stories_classified=3, score_cache_hits=4, score_cache_misses=2
+    )
+    assert "4 of 6 label scores from cache" in summary.get_artifact_description()
@@ -0,0 +1,105 @@
+"""Tests for the dense zero-shot score matrix and the post-processing built on it."""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sous_chef.tasks.zeroshot import (
+    ZeroShotScoreMatrix,
+    build_zero_shot_tag_scores_json,
+    build_zero_shot_tag_scores_json_for_row,
+    compute_zero_shot_label_counts,
+    zeroshot_score_matrix,
+)
+from sous_chef.tasks.zeroshot.scores import SCORE_MATRIX_ATTR
+from tests.fake_nli import FakeNli, classify_with_fake_nli, table_scorer
+
+LABELS = ["transit", "housing", "crime"]
+SCORES = {
+    "transit fares": {"transit": 0.9, "housing": 0.4, "crime": 0.1},
+    "housing and crime": {"transit": 0.2, "housing": 0.7, "crime": 0.7},
+    "nothing here": {"transit": 0.3, "housing": 0.2, "crime": 0.1},
+}
+
+
+DF = pd.DataFrame({
+    "story_id": [1, 2, 3, 4],
+    "text": ["transit fares", "housing and crime", "boom", "nothing here"],
+})
+
+
+def _classify(**kwargs):
+    return classify_with_fake_nli(FakeNli(table_scorer(SCORES), fail_on="boom"), DF, LABELS, **kwargs)
+
+
+def _without_matrix(df):
+    out = df.copy()
+    out.attrs = {}
+    return out
+
+
+def test_classified_frame_carries_matrix():
+    out = _classify(top_n=2)
+    matrix = zeroshot_score_matrix(out)
+    assert out.attrs[SCORE_MATRIX_ATTR] is matrix
+    assert matrix.labels == tuple(LABELS)
+    assert matrix.scores.dtype == np.float64 and not matrix.scores.flags.writeable
+    assert matrix.failed.tolist() == [False, False, True, False]
+    assert np.isnan(matrix.scores[2]).all()
+    # Ties keep candidate label order
+    assert json.loads(out.loc[1, "zeroshot_labels_json"]) == ["housing", "crime", "transit"]
+    assert json.loads(out.loc[1, "zeroshot_labels_selected_json"]) == ["housing", "crime"]
+    assert out.loc[2, "zeroshot_top_label"] == "unknown"
+
+
+def test_ties_keep_backend_order_and_exact_scores():
+    rows = [{"a": 0.9123, "c": 0.5, "b": 0.5}]
+    matrix = ZeroShotScoreMatrix.from_rows(pd.RangeIndex(1), ["a", "b", "c"], rows, {})
+    labels_json, scores_json = matrix.json_columns()
+    assert labels_json == ['["a", "c", "b"]']
+    assert scores_json == ["[0.9123, 0.5, 0.5]"]
+    assert matrix.selected_json(matrix.selected(top_n=2), ranked=True) == ['["a", "c"]']
+    assert matrix.label_counts(["a", "b", "c"], top_n=2)[0] == [1, 0, 1]
+    assert matrix.selected(threshold=0.9123)[0].tolist() == [True, False, False]
+    assert list(matrix.row_scores()[0].items()) == list(rows[0].items())
+
+    frame = pd.DataFrame({"zeroshot_labels_json": labels_json, "zeroshot_scores_json": scores_json})
+    parsed = ZeroShotScoreMatrix.from_frame(frame, ["a", "b", "c"])
+    assert parsed.json_columns() == (labels_json, scores_json)
+
+
+@pytest.mark.parametrize("threshold,top_n", [(None, None), (0.35, None), (0.35, 2), (None, 1)])
+def test_matrix_and_json_fallback_agree(threshold, top_n):
+    out = _classify(passing_score_threshold=threshold, top_n=top_n)
+    parsed = ZeroShotScoreMatrix.from_frame(out, LABELS)
+    assert np.array_equal(parsed.scores, zeroshot_score_matrix(out).scores, equal_nan=True)
+
+    bare = _without_matrix(out)
+    assert compute_zero_shot_label_counts(out, LABELS, threshold, top_n) == \
+        compute_zero_shot_label_counts(bare, LABELS, threshold, top_n)
+    batch = build_zero_shot_tag_scores_json(out, passing_score_threshold=threshold, top_n=top_n)
+    assert batch == build_zero_shot_tag_scores_json(bare, passing_score_threshold=threshold, top_n=top_n)
+
+    mode = "top_n" if top_n else "threshold_ge" if threshold is not None else "top_label"
+    per_row = [build_zero_shot_tag_scores_json_for_row(row, selection_mode=mode) for _, row in out.iterrows()]
+    assert [json.loads(s) for s in batch] == [json.loads(s) for s in per_row]
+
+
+def test_matrix_follows_filtered_and_reordered_rows():
+    out = _classify(passing_score_threshold=0.35)
+    subset = out[out["story_id"] != 1].iloc[::-1]
+    matrix = zeroshot_score_matrix(subset)
+    assert matrix.index.equals(subset.index)
+    assert matrix.scores[0].tolist() == pytest.approx([0.3, 0.2, 0.1])
+    assert compute_zero_shot_label_counts(subset, LABELS, summary_score_threshold=0.35) == ([0, 1, 1], 1, 1)
+    assert build_zero_shot_tag_scores_json(subset, top_n=1)[1] == "{}"
+
+
+def test_counts_and_selection():
+    out = _classify()
+    assert compute_zero_shot_label_counts(out, LABELS, None) == ([2, 1, 0], 0, 1)
+    assert compute_zero_shot_label_counts(out, LABELS, None, summary_top_n=2) == ([2, 3, 1], 0, 1)
+    assert compute_zero_shot_label_counts(out, ["crime"], summary_score_threshold=0.5) == ([1], 2, 1)
+    tags = json.loads(build_zero_shot_tag_scores_json(out, passing_score_threshold=0.5)[1])
+    assert list(tags) == ["housing", "crime"] and tags["crime"] == pytest.approx(0.7)
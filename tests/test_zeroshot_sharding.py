@@ -0,0 +1,78 @@
+"""Tests for sharded multi-process local zero-shot (tiny randomly initialised BERT NLI model)."""
+import json
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("transformers")
+
+from sous_chef.tasks.zeroshot import sharded
+from sous_chef.tasks.zeroshot.sharded import estimate_replica_bytes, plan_replicas, shard_memory_budget_bytes
+from sous_chef.tasks.zeroshot_tasks import add_zero_shot_classification
+from tests.tiny_models import tiny_sequence_classifier
+
+LABELS = ["city budget", "transit", "vote"]
+TEXTS = ["the mayor said", "", "transit vote was bad", "a plan was good for the city budget", "acme", None, "vote"]
+
+
+@pytest.fixture(scope="module")
+def nli_model(tmp_path_factory):
+    return tiny_sequence_classifier(
+        tmp_path_factory.mktemp("nli"), ["entailment", "neutral", "contradiction"]
+    )
+
+
+def test_plan_replicas_respects_budget():
+    gb = 1024 ** 3
+    assert plan_replicas(8, 2 * gb, 5 * gb) == 2
+    assert plan_replicas(2, 1 * gb, 64 * gb) == 2
+    assert plan_replicas(4, 3 * gb, 1 * gb) == 1
+    # The replica this process already holds takes its share of the budget
+    assert plan_replicas(8, 2 * gb, 5 * gb, resident_replicas=1) == 1
+    assert plan_replicas(2, 1 * gb, 64 * gb, resident_replicas=1) == 2
+
+
+def test_budget_and_replica_size(monkeypatch, nli_model):
+    monkeypatch.setenv("ZEROSHOT_SHARD_MEMORY_BUDGET_MB", "512")
+    assert shard_memory_budget_bytes() == 512 * 1024 * 1024
+    assert shard_memory_budget_bytes(100) == 100 * 1024 * 1024
+    tiny = estimate_replica_bytes(nli_model)
+    assert sharded.REPLICA_OVERHEAD_BYTES < tiny < sharded.REPLICA_OVERHEAD_BYTES + 10 * 1024 * 1024
+
+
+def test_worker_modules_do_not_import_tasks_package():
+    # Spawned workers import these; sous_chef.tasks pulls in LLM clients and network calls
+    code = (
+        "import sys, sous_chef.workers.zeroshot, sous_chef.workers.keywords;"
+        "print(sorted(m for m in sys.modules if m.startswith('sous_chef.tasks')))"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_sharded_matches_single_process(nli_model, monkeypatch):
+    monkeypatch.setenv("ZEROSHOT_SHARD_MEMORY_BUDGET_MB", "4096")
+    df = pd.DataFrame({"story_id": range(len(TEXTS)), "text": TEXTS}, index=range(100, 100 + len(TEXTS)))
+    kwargs = dict(model=nli_model, backend="local", top_n=2, batch_size=4)
+    single = add_zero_shot_classification(df, LABELS, **kwargs)
+    try:
+        out = add_zero_shot_classification(df, LABELS, workers=2, **kwargs)
+    finally:
+        sharded.shutdown_zeroshot_workers()
+
+    assert list(out.columns) == list(single.columns)
+    assert out.index.equals(df.index)
+    assert out["zeroshot_error"].tolist() == single["zeroshot_error"].tolist()
+    for a, b in zip(single["zeroshot_scores_json"], out["zeroshot_scores_json"]):
+        assert json.loads(b) == pytest.approx(json.loads(a), abs=1e-5)
+    assert out.loc[101, "zeroshot_labels_json"] == "[]"
+
+
+def test_one_replica_runs_in_process(nli_model, monkeypatch):
+    monkeypatch.setenv("ZEROSHOT_SHARD_MEMORY_BUDGET_MB", "1")
+    monkeypatch.setattr(sharded, "_get_process_pool", pytest.fail)
+    df = pd.DataFrame({"text": TEXTS})
+    out = add_zero_shot_classification(df, LABELS, model=nli_model, backend="local", workers=4)
+    assert (out["zeroshot_error"] == "").all()
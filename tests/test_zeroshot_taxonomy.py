@@ -0,0 +1,95 @@
+"""Tests for hierarchical (taxonomy) zero-shot classification."""
+import json
+
+import pandas as pd
+import pytest
+
+from sous_chef.artifacts import ZeroShotClassificationSummary
+from sous_chef.tasks.zeroshot.taxonomy import taxonomy_tree
+from sous_chef.tasks.zeroshot_tasks import (
+    add_zero_shot_classification,
+    compute_zero_shot_label_counts,
+    zeroshot_taxonomy_stats,
+)
+from tests.fake_nli import FakeNli, classify_with_fake_nli
+
+LABELS = ["politics", "elections", "primaries", "budget", "sports", "soccer", "weather"]
+TAXONOMY = {"politics": ["elections", "budget"], "elections": ["primaries"], "sports": ["soccer"]}
+SCORES = {
+    "vote": {"politics": 0.9, "elections": 0.8, "primaries": 0.7, "budget": 0.2,
+             "sports": 0.1, "soccer": 0.9, "weather": 0.3},
+    "match": {"politics": 0.1, "elections": 0.9, "primaries": 0.9, "budget": 0.1,
+              "sports": 0.95, "soccer": 0.8, "weather": 0.6},
+}
+PRIMARY_HYPOTHESIS = "This story is about a primary election"
+
+DF = pd.DataFrame({"story_id": [1, 2, 3], "text": ["vote", "match", ""]})
+
+
+def _score(text, label, hypothesis):
+    # Candidate labels reach the pipeline as hypotheses; score them as the label they stand for
+    canonical = "primaries" if label == PRIMARY_HYPOTHESIS else label.replace("This text is about ", "")
+    return SCORES[text][canonical]
+
+
+def _classify(**kwargs):
+    nli = FakeNli(_score)
+    out = classify_with_fake_nli(nli, DF, LABELS, batch_size=1, **kwargs)
+    return out, nli.pairs
+
+
+def test_children_scored_only_under_passing_parents():
+    flat, flat_pairs = _classify()
+    out, pairs = _classify(label_taxonomy=TAXONOMY)
+
+    vote = dict(zip(json.loads(out.loc[0, "zeroshot_labels_json"]), json.loads(out.loc[0, "zeroshot_scores_json"])))
+    match = dict(zip(json.loads(out.loc[1, "zeroshot_labels_json"]), json.loads(out.loc[1, "zeroshot_scores_json"])))
+    assert set(vote) == {"politics", "sports", "weather", "elections", "budget", "primaries"}
+    assert set(match) == {"politics", "sports", "weather", "soccer"}
+    assert vote == {label: SCORES["vote"][label] for label in vote}
+    assert out.loc[2, "zeroshot_labels_json"] == "[]"
+
+    # 2 stories x 3 top-level, then elections/budget + soccer, then primaries
+    assert (flat_pairs, pairs) == (14, 10)
+    stats = zeroshot_taxonomy_stats(out)
+    assert stats["pairs_scored"] == 10 and stats["pairs_flat"] == 14 and stats["pairs_saved"] == 4
+    assert [level["pairs"] for level in stats["levels"]] == [6, 3, 1]
+    assert zeroshot_taxonomy_stats(flat) == {}
+
+    # Unscored children are never counted
+    counts, without, failed = compute_zero_shot_label_counts(out, LABELS, 0.5, None)
+    assert counts == [1, 1, 1, 0, 1, 1, 1]
+    assert (without, failed) == (1, 0)
+
+
+def test_taxonomy_keeps_canonical_labels_for_custom_hypotheses():
+    out, _ = _classify(
+        label_taxonomy=TAXONOMY,
+        classification_label_hypotheses={"primaries": PRIMARY_HYPOTHESIS},
+        top_n=2,
+    )
+    assert "primaries" in json.loads(out.loc[0, "zeroshot_labels_json"])
+    assert json.loads(out.loc[1, "zeroshot_labels_selected_json"]) == ["sports", "soccer"]
+
+
+def test_summary_reports_passes_saved():
+    summary = ZeroShotClassificationSummary(input_labels=LABELS, taxonomy_nli_passes=10, taxonomy_nli_passes_saved=4)
+    assert "taxonomy ran 10 of 14 NLI passes" in summary.get_artifact_description()
+
+
+@pytest.mark.parametrize(
+    "taxonomy,match",
+    [
+        ({"politics": ["nope"]}, "not present"),
+        ({"politics": ["budget"], "sports": ["budget"]}, "under both"),
+        ({"politics": ["sports"], "sports": ["politics"]}, "cycle"),
+    ],
+)
+def test_invalid_taxonomy(taxonomy, match):
+    with pytest.raises(ValueError, match=match):
+        taxonomy_tree(LABELS, taxonomy)
+
+
+def test_taxonomy_and_cascade_are_exclusive():
+    with pytest.raises(ValueError, match="cascade_top_k"):
+        add_zero_shot_classification(DF, LABELS, backend="local", label_taxonomy=TAXONOMY, cascade_top_k=2)